@@ -21,6 +21,8 @@ from typing import Dict, List, Optional
 
 import yfinance as yf
 
+from data.reference import get_store
+
 # 캐시 (4시간 TTL — 일중 업데이트 없음)
 _CACHE: Dict[str, tuple] = {}
 _CACHE_TTL = 14_400
@@ -110,7 +112,9 @@ def _fetch_fundamental(symbol: str) -> FundamentalScore:
             info.get("currentPrice") or info.get("regularMarketPrice") or
             (ticker.fast_info.last_price if hasattr(ticker, "fast_info") else None)
         )
-        fs.market_cap_b = _safe_float(info.get("marketCap", 0.0)) / 1e9
+        # 시총: 받은 info 로 참조 데이터 저장소를 채움 (같은 종목 중복 조회 방지)
+        ref = get_store().put(symbol, info)
+        fs.market_cap_b = _safe_float(ref.get("marketCap") or info.get("marketCap", 0.0)) / 1e9
 
         # 부채비율: totalDebt / totalEquity (%)
         total_debt   = _safe_float(info.get("totalDebt"))
@@ -18,6 +18,8 @@ from typing import Dict, List, Optional
 
 import yfinance as yf
 
+from data.reference import get_store
+
 # 캐시 (15분 TTL — 거버넌스 데이터는 자주 바뀌지 않음)
 _CACHE: Dict[str, tuple] = {}
 _CACHE_TTL = 900
@@ -79,9 +81,8 @@ def _fetch_governance(symbol: str) -> GovernanceInfo:
             pct_raw = top.get("% Out", 0.0) if hasattr(top, "get") else 0.0
             info.top_holder_pct = round(float(pct_raw or 0.0) * 100, 2)
 
-        # ── 공매도 비율 ───────────────────────────────────────────────
-        ticker_info = ticker.info or {}
-        short_pct   = ticker_info.get("shortPercentOfFloat", 0.0) or 0.0
+        # ── 공매도 비율 (참조 데이터 저장소 — 일 1회 갱신) ───────────
+        short_pct   = get_store().get(symbol).get("shortPercentOfFloat", 0.0) or 0.0
         info.short_pct_float = round(float(short_pct) * 100, 2)
 
         # ── 내부자 거래 방향 ──────────────────────────────────────────
@@ -12,6 +12,7 @@ analyzer.py — 페이퍼 트레이딩 전략 파라미터 최적화 분석기
     python analyzer.py --bucket b4             # B4 집중 분석
     python analyzer.py --notify                # 텔레그램 알림 포함
     python analyzer.py --days 30 --notify      # 조합 가능
+    python analyzer.py --mc                    # 버킷별 몬테카를로 (최종자산 CI · MDD · 파산확률)
 """
 from __future__ import annotations
 
@@ -26,6 +27,10 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from backtest.metrics import daily_pnl, max_drawdown_abs, profit_factor, sharpe, sortino
+from backtest.montecarlo import DEFAULT_PATHS, MonteCarloResult, bucket_bootstrap, format_lines, trades_by_bucket
+from storage.db import query_rollup
+
 # ── pandas 의존성 체크 ────────────────────────────────────────────────
 try:
     import pandas as pd
@@ -48,6 +53,8 @@ DB_B4       = str(_ROOT / "storage" / "db" / "trading_data.db")
 CFG_PATH    = str(_ROOT / "config.yaml")
 LOG_PATH    = str(_ROOT / "recommendations.log")
 
+DEFAULT_EQUITY = 14_800.0   # 계좌 자산 기본값 (main.py TOSS_PAPER_EQUITY 와 동일)
+
 # 최적 기준 (명세서)
 MIN_TRADES_FOR_TUNING = 10
 OPTIMAL_WIN_RATE      = 50.0   # %
@@ -84,6 +91,9 @@ class BucketMetrics:
     total_pnl:      float      # $
     avg_hold_min:   float
     has_enough_data: bool = True
+    sharpe:         float = 0.0    # 일별 실현 손익 기준 연환산
+    sortino:        float = 0.0
+    max_drawdown:   float = 0.0    # 누적 실현 손익 최대 낙폭 ($)
 
     @property
     def is_optimal(self) -> bool:
@@ -111,6 +121,7 @@ class AnalysisResult:
     metrics:         Dict[str, BucketMetrics] = field(default_factory=dict)
     b4_matrix:       Optional[pd.DataFrame]  = None
     recommendations: List[Recommendation]    = field(default_factory=list)
+    monte_carlo:     Dict[str, MonteCarloResult] = field(default_factory=dict)
 
 
 # ═════════════════════════════════════════════════════════════════════
@@ -216,14 +227,66 @@ def load_config(cfg_path: str = CFG_PATH) -> dict:
         return {}
 
 
+def load_rollup_metrics(db_path: str = DB_MAIN, days: int = 30) -> Dict[str, BucketMetrics]:
+    """
+    closed_trades_rollup 에서 전략별 지표 직접 집계 (원본 거래 미조회).
+    롤업 테이블이 없거나 비어 있으면 {} → 호출부가 load_closed_trades 경로로 폴백.
+    """
+    conn = _connect(db_path)
+    if conn is None:
+        return {}
+    try:
+        cutoff = conn.execute("SELECT date('now', ?)", (f"-{days} days",)).fetchone()[0]
+        rows   = query_rollup(conn, cutoff, by=("strategy",))
+        daily  = query_rollup(conn, cutoff, by=("strategy", "date"))
+    except Exception as exc:
+        logging.debug("[analyzer] closed_trades_rollup 조회 실패: %s", exc)
+        return {}
+    finally:
+        conn.close()
+
+    by_strat: Dict[str, List[dict]] = {}
+    for d in daily:
+        by_strat.setdefault(d["strategy"], []).append(d)
+    risk = {
+        s: _daily_risk([d["total_pnl"] for d in ds], [d["date"] for d in ds])
+        for s, ds in by_strat.items()
+    }
+
+    return {
+        r["strategy"]: BucketMetrics(
+            bucket          = r["strategy"],
+            trades          = r["total"],
+            wins            = r["wins"],
+            losses          = r["losses"],
+            win_rate        = round(r["win_rate"], 1),
+            avg_win_pct     = round(r["avg_win_pct"], 2),
+            avg_loss_pct    = round(r["avg_loss_pct"], 2),
+            profit_factor   = round(r["profit_factor"], 2),
+            expectancy      = round(r["total_pnl"] / r["total"], 2),
+            total_pnl       = round(r["total_pnl"], 2),
+            avg_hold_min    = round(r["avg_hold_min"], 0),
+            has_enough_data = (r["total"] >= MIN_TRADES_FOR_TUNING),
+            **risk.get(r["strategy"], {}),
+        )
+        for r in rows
+    }
+
+
 # ═════════════════════════════════════════════════════════════════════
 # 2. 지표 계산
 # ═════════════════════════════════════════════════════════════════════
 
-def _profit_factor(wins: pd.Series, losses: pd.Series) -> float:
-    total_win  = wins[wins > 0].sum()
-    total_loss = abs(losses[losses < 0].sum())
-    return float(total_win / total_loss) if total_loss > 0 else float("inf")
+def _daily_risk(pnl, dates) -> Dict[str, float]:
+    """거래별(또는 일별) 실현 손익 → 일별 손익 기준 샤프 · 소르티노 · 최대 낙폭 ($)."""
+    day = daily_pnl(pnl, dates)
+    if day.empty:
+        return {}
+    return {
+        "sharpe":       round(sharpe(day), 2),
+        "sortino":      round(sortino(day), 2),
+        "max_drawdown": round(max_drawdown_abs(day), 2),
+    }
 
 
 def compute_metrics(df: pd.DataFrame, bucket_col: str = "strategy") -> Dict[str, BucketMetrics]:
@@ -240,7 +303,7 @@ def compute_metrics(df: pd.DataFrame, bucket_col: str = "strategy") -> Dict[str,
         losses = grp[grp["pnl"] <= 0]
         n      = len(grp)
         w      = len(wins)
-        pf     = _profit_factor(grp["pnl"], grp["pnl"])
+        pf     = profit_factor(grp["pnl"])
 
         results[str(bucket)] = BucketMetrics(
             bucket          = str(bucket),
@@ -255,21 +318,27 @@ def compute_metrics(df: pd.DataFrame, bucket_col: str = "strategy") -> Dict[str,
             total_pnl       = round(float(grp["pnl"].sum()), 2),
             avg_hold_min    = round(float(grp["hold_minutes"].mean()), 0) if "hold_minutes" in grp.columns else 0.0,
             has_enough_data = (n >= MIN_TRADES_FOR_TUNING),
+            **(_daily_risk(grp["pnl"], grp["date"]) if "date" in grp.columns else {}),
         )
     return results
 
 
+def b4_pnl_usd(b4_df: pd.DataFrame) -> pd.Series:
+    """b4_trades → 거래별 손익 ($, 옵션 계약 승수 100)."""
+    return (b4_df["sell_price"] - b4_df["buy_price"]) * b4_df["qty"] * 100
+
+
 def compute_b4_metrics(b4_df: pd.DataFrame) -> Optional[BucketMetrics]:
     """b4_trades DataFrame → B4 전용 지표 계산."""
     if b4_df.empty:
         return None
 
-    pnl_usd   = (b4_df["sell_price"] - b4_df["buy_price"]) * b4_df["qty"] * 100
+    pnl_usd   = b4_pnl_usd(b4_df)
     pnl_pct   = b4_df["result_pct"] * 100   # decimal → %
     n         = len(b4_df)
     wins      = pnl_usd[pnl_usd > 0]
     losses    = pnl_usd[pnl_usd <= 0]
-    pf        = _profit_factor(pnl_usd, pnl_usd)
+    pf        = profit_factor(pnl_usd)
 
     return BucketMetrics(
         bucket          = "B4",
@@ -284,6 +353,7 @@ def compute_b4_metrics(b4_df: pd.DataFrame) -> Optional[BucketMetrics]:
         total_pnl       = round(float(pnl_usd.sum()), 2),
         avg_hold_min    = 0.0,
         has_enough_data = (n >= MIN_TRADES_FOR_TUNING),
+        **_daily_risk(pnl_usd, b4_df["trade_date"]),
     )
 
 
@@ -766,7 +836,7 @@ def build_telegram_message(result: AnalysisResult) -> str:
             icon = "🔴"
         lines.append(
             f"{icon} <b>{name}</b>: 승률 {m.win_rate:.0f}%"
-            f" | N={m.trades} | PF={m.profit_factor:.1f}"
+            f" | N={m.trades} | PF={m.profit_factor:.1f} | Sharpe={m.sharpe:.1f}"
         )
 
     # 실행 가능한 추천만 표시
@@ -791,6 +861,12 @@ def build_telegram_message(result: AnalysisResult) -> str:
         for rec in insufficient:
             lines.append(f"⏳ {rec.bucket}: 샘플 부족으로 튜닝 불가 ({rec.current_val})")
 
+    if result.monte_carlo:
+        paths = next(iter(result.monte_carlo.values())).paths
+        lines.append("")
+        lines.append(f"🎲 <b>몬테카를로</b> ({paths:,}경로)")
+        lines.extend(format_lines(result.monte_carlo))
+
     lines.append("")
     lines.append(f"📁 상세 내역: recommendations.log")
     return "\n".join(lines)
@@ -837,7 +913,8 @@ def print_report(result: AnalysisResult) -> None:
     # ── 버킷별 성과 ──────────────────────────────────────────────────
     print(f"\n  ■ 버킷별 성과 요약")
     print(f"  {'─'*66}")
-    hdr = f"  {'버킷':<12} {'N':>4} {'승률':>7} {'PF':>6} {'기대값':>10} {'평균보유':>8}  상태"
+    hdr = (f"  {'버킷':<12} {'N':>4} {'승률':>7} {'PF':>6} {'기대값':>10} {'평균보유':>8}"
+           f" {'샤프':>6} {'소르티노':>6} {'MDD':>9}  상태")
     print(hdr)
     print(f"  {'─'*66}")
     for name, m in result.metrics.items():
@@ -846,7 +923,8 @@ def print_report(result: AnalysisResult) -> None:
         )
         print(
             f"  {name:<12} {m.trades:>4} {m.win_rate:>6.1f}% {m.profit_factor:>6.2f}"
-            f" ${m.expectancy:>+9.2f} {m.avg_hold_min:>6.0f}분  {status}"
+            f" ${m.expectancy:>+9.2f} {m.avg_hold_min:>6.0f}분"
+            f" {m.sharpe:>6.2f} {m.sortino:>6.2f} ${m.max_drawdown:>8.2f}  {status}"
         )
     print(f"  {'─'*66}")
 
@@ -875,6 +953,14 @@ def print_report(result: AnalysisResult) -> None:
             print(f"       근거  : {rec.reason}")
             print(f"       기대  : {rec.expected}")
 
+    # ── 몬테카를로 ──────────────────────────────────────────────────
+    if result.monte_carlo:
+        r0 = next(iter(result.monte_carlo.values()))
+        print(f"\n  ■ 몬테카를로 거래 재표본 ({r0.paths:,}경로, 파산 = 버킷 자본 50% 손실)")
+        print(f"  {'─'*66}")
+        for line in format_lines(result.monte_carlo):
+            print(line)
+
     print(f"\n{'='*W}\n")
 
 
@@ -890,6 +976,8 @@ def run_analysis(
     days:       int  = 30,
     bucket:     Optional[str] = None,
     notify:     bool = False,
+    mc_paths:   int  = 0,
+    equity:     float = DEFAULT_EQUITY,
 ) -> AnalysisResult:
     """
     전체 분석 파이프라인 실행.
@@ -902,6 +990,8 @@ def run_analysis(
         days:       분석 기간 (일)
         bucket:     특정 버킷만 분석 ("b1"~"b4", None = 전체)
         notify:     True 시 텔레그램 알림 전송
+        mc_paths:   몬테카를로 경로 수 (0 = 생략)
+        equity:     몬테카를로 버킷 시작 자본 산정용 계좌 자산 ($)
 
     Returns:
         AnalysisResult
@@ -911,15 +1001,22 @@ def run_analysis(
     b4_cfg  = load_b4_config()
 
     # ── 데이터 로딩 ──────────────────────────────────────────────────
-    closed_df = load_closed_trades(db_path,    days=days)
     b4_df     = load_b4_trades    (b4_db_path, days=days)
 
-    # ── 지표 계산 ────────────────────────────────────────────────────
+    # ── 지표 계산 (롤업 우선, 없으면 원본 거래 집계) ────────────────
     all_metrics: Dict[str, BucketMetrics] = {}
 
-    if not closed_df.empty:
+    closed_df      = pd.DataFrame()
+    closed_metrics = load_rollup_metrics(db_path, days=days)
+    if not closed_metrics or mc_paths:
+        closed_df = load_closed_trades(db_path, days=days)
+    if not closed_metrics:
+        if not closed_df.empty:
+            closed_metrics = compute_metrics(closed_df, bucket_col="strategy")
+
+    if closed_metrics:
         bucket_filter = bucket.lower() if bucket else None
-        for strat, m in compute_metrics(closed_df, bucket_col="strategy").items():
+        for strat, m in closed_metrics.items():
             if bucket_filter and bucket_filter not in strat.lower():
                 continue
             all_metrics[strat] = m
@@ -934,6 +1031,14 @@ def run_analysis(
     if (bucket is None or "b4" in (bucket or "").lower()) and not b4_df.empty:
         b4_matrix = compute_b4_matrix(b4_df, b4_cfg)
 
+    # ── 몬테카를로 (분석 대상 버킷만) ─────────────────────────────────
+    monte_carlo: Dict[str, MonteCarloResult] = {}
+    if mc_paths:
+        pnls = {k: v for k, v in trades_by_bucket(closed_df).items() if k in all_metrics}
+        if "B4" in all_metrics:
+            pnls["B4"] = b4_pnl_usd(b4_df).to_numpy(float)
+        monte_carlo = bucket_bootstrap(pnls, equity, paths=mc_paths)
+
     # ── 추천 생성 ────────────────────────────────────────────────────
     recs = generate_recommendations(all_metrics, b4_matrix, config, b4_cfg)
 
@@ -943,6 +1048,7 @@ def run_analysis(
         metrics         = all_metrics,
         b4_matrix       = b4_matrix,
         recommendations = recs,
+        monte_carlo     = monte_carlo,
     )
 
     # ── 콘솔 출력 ────────────────────────────────────────────────────
@@ -984,6 +1090,12 @@ def main() -> None:
                         help=f"설정 파일 경로 (기본: {CFG_PATH})")
     parser.add_argument("--log",    default=LOG_PATH,
                         help=f"추천 로그 경로 (기본: {LOG_PATH})")
+    parser.add_argument("--mc",     action="store_true",
+                        help="버킷별 몬테카를로 거래 재표본 (최종자산 CI · MDD · 파산확률)")
+    parser.add_argument("--mc-paths", type=int, default=DEFAULT_PATHS,
+                        help=f"몬테카를로 경로 수 (기본: {DEFAULT_PATHS:,})")
+    parser.add_argument("--equity", type=float, default=DEFAULT_EQUITY,
+                        help=f"계좌 자산 USD — 버킷 시작 자본 = 자산 × 기본 비중 (기본: {DEFAULT_EQUITY:,.0f})")
     args = parser.parse_args()
 
     logging.basicConfig(
@@ -999,6 +1111,8 @@ def main() -> None:
         days       = args.days,
         bucket     = args.bucket,
         notify     = args.notify,
+        mc_paths   = args.mc_paths if args.mc else 0,
+        equity     = args.equity,
     )
 
 
@@ -2,17 +2,19 @@
 """
 단순 바-단위 이벤트 드리븐 백테스트.
 동일한 strategy/ 함수들을 재사용하므로 전략 코드와 백테스트가 일치.
-주의: 체결가 = close (슬리피지 미반영 v1)
+체결: fill_model 미지정 시 신호 봉 종가에 전량 체결 (슬리피지 미반영 v1).
+      지정 시 trader.fill_model 로 다음 봉 시가 도착 주문을 체결 —
+      진입은 ask×1.002 IOC 지정가(부분 체결·미체결 가능), 청산은 잔량이 없어질 때까지 봉마다 재주문.
 """
 from __future__ import annotations
 
-import math
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
 import numpy as np
 import pandas as pd
 
+from backtest.metrics import excursions, holdings_value, performance, position_matrix
 from strategy.entries import momentum_entry
 from strategy.exits import (
     eod_exit,
@@ -21,7 +23,8 @@ from strategy.exits import (
     take_profit_hit,
     trailing_stop_active,
 )
-from strategy.signals import compute_indicators
+from strategy.indicator_state import IndicatorState
+from trader.fill_model import FillModel
 
 
 @dataclass
@@ -52,6 +55,45 @@ class BacktestTrade:
 class _OpenPos:
     trade: BacktestTrade
     peak_price: float
+    reason:   str   = ""     # 청산 신호 발생 후 체결 대기 중이면 사유 (fill_model 사용 시)
+    sold:     int   = 0      # 청산 체결 누적 수량
+    proceeds: float = 0.0    # 청산 체결 누적 대금 (수수료 차감)
+
+    @property
+    def held(self) -> int:
+        return self.trade.qty - self.sold
+
+
+def _fill_entry(model: FillModel, df: pd.DataFrame, row: int, qty: int, cash: float) -> tuple[int, float]:
+    """row 봉 시가 도착 진입 주문 체결 → (수량, 수수료 포함 실효가). 현금 한도로 수량 축소."""
+    bar = df.iloc[row]
+    n, px = model.entry_order(qty, bar["open"], bar["high"], bar["low"], bar["volume"])
+    n, px = int(n), float(px) + model.commission_per_share
+    if n > 0 and px * n > cash:
+        n = int(cash // px)
+    return n, px
+
+
+def _fill_exit(model: FillModel, df: pd.DataFrame, row: int, qty: int) -> tuple[int, float]:
+    """row 봉 시가 도착 청산 주문 체결 → (수량, 수수료 차감 실효가)."""
+    bar = df.iloc[row]
+    n, px = model.exit_order(qty, bar["open"], bar["high"], bar["low"], bar["volume"])
+    return int(n), float(px) - model.commission_per_share
+
+
+def _close_trade(pos: _OpenPos, ts, price: float, reason: str) -> BacktestTrade:
+    """잔량을 price 에 마감 — 청산가는 전체 수량 가중 평균."""
+    t = pos.trade
+    t.exit_ts     = ts
+    t.exit_price  = (pos.proceeds + price * pos.held) / t.qty if pos.sold else price
+    t.exit_reason = reason
+    return t
+
+
+def _last_valid(st: IndicatorState, key: str) -> float:
+    """atr_for_sizing 과 동일 — 최신 유효값, 없으면 0.0 (EWM 은 유효해진 뒤 NaN 으로 돌아가지 않음)."""
+    val = st.values.get(key, float("nan"))
+    return float(val) if val == val else 0.0
 
 
 def run_backtest(
@@ -63,6 +105,7 @@ def run_backtest(
     max_positions: int = 3,
     risk_per_trade_pct: float = 0.01,
     atr_multiplier: float = 2.0,
+    fill_model: Optional[FillModel] = None,
 ) -> dict:
     """
     Args:
@@ -75,22 +118,62 @@ def run_backtest(
         max_positions: 동시 보유 최대 종목 수.
         risk_per_trade_pct: 거래당 리스크 비율.
         atr_multiplier: ATR 기반 손절 배수.
+        fill_model: 체결 모델 — None 이면 신호 봉 종가에 전량 체결.
 
     Returns:
-        dict with keys: trades, total_pnl, win_rate, max_drawdown_pct,
-                        sharpe_approx, summary_df, equity_curve
+        summarize 결과 dict (trades, total_pnl, win_rate, max_drawdown_pct,
+                             sharpe_approx, sortino, exposure_pct, summary_df, equity_curve, ...)
     """
     cash      = initial_cash
     open_pos: Dict[str, _OpenPos] = {}
     all_trades: List[BacktestTrade] = []
-    equity_history: List[float] = []
+    # 봉별 현금 + 체결 이벤트 (봉, 종목 열, 수량 변화) → 끝나고 자산 곡선을 행렬로 한 번에 계산
+    cash_history: List[float] = []
+    events: List[tuple] = []
+    traded = 0.0
+    # 종목별 증분 지표 상태 — 시계열이 앞으로만 진행하므로 봉당 1회 갱신
+    ind_states: Dict[str, IndicatorState] = {}
+    # 다음 봉 체결 대기 진입 주문 {symbol: 수량} (fill_model 사용 시)
+    pending: Dict[str, int] = {}
 
     # 모든 심볼의 타임스탬프 합집합으로 공통 시계열 구성
     all_ts = sorted(
         set(ts for df in symbol_dfs.values() if df is not None for ts in df.index)
     )
+    cols = {s: c for c, s in enumerate(s for s, df in symbol_dfs.items() if df is not None)}
 
     for i, ts in enumerate(all_ts):
+        # ── 대기 주문 체결 (이 봉 시가 도착) ──────────────────────
+        if fill_model is not None:
+            for sym in list(open_pos.keys()):
+                df, pos = symbol_dfs[sym], open_pos[sym]
+                if not pos.reason or ts not in df.index:
+                    continue
+                n, px = _fill_exit(fill_model, df, df.index.get_loc(ts), pos.held)
+                if n > 0:
+                    pos.sold     += n
+                    pos.proceeds += px * n
+                    cash         += px * n
+                    traded       += px * n
+                    events.append((i, cols[sym], -n))
+                    if pos.held == 0:
+                        all_trades.append(_close_trade(pos, ts, px, pos.reason))
+                        del open_pos[sym]
+            for sym in list(pending):
+                df = symbol_dfs[sym]
+                if ts not in df.index:
+                    continue
+                n, px = _fill_entry(fill_model, df, df.index.get_loc(ts), pending.pop(sym), cash)
+                if n > 0:
+                    cash   -= px * n
+                    traded += px * n
+                    events.append((i, cols[sym], n))
+                    trade = BacktestTrade(
+                        symbol=sym, strategy="momentum",
+                        entry_ts=ts, entry_price=px, qty=n,
+                    )
+                    open_pos[sym] = _OpenPos(trade=trade, peak_price=px)
+
         # ── 기존 포지션 종료 검사 ─────────────────────────────────
         for sym in list(open_pos.keys()):
             df = symbol_dfs.get(sym)
@@ -98,6 +181,8 @@ def run_backtest(
                 continue
 
             pos  = open_pos[sym]
+            if pos.reason:
+                continue
             last = float(df.loc[ts, "close"])
             pos.peak_price = max(pos.peak_price, last)
 
@@ -114,19 +199,23 @@ def run_backtest(
             elif eod_exit(ts.to_pydatetime(), int(risk_cfg.get("eod_exit_minutes_before_close", 15))):
                 reason = "eod"
 
-            if reason:
+            if reason and fill_model is not None:
+                pos.reason = reason     # 다음 봉부터 청산 주문 체결
+            elif reason:
                 t = pos.trade
                 t.exit_ts    = ts
                 t.exit_price = last
                 t.exit_reason = reason
-                cash += last * t.qty
+                cash   += last * t.qty
+                traded += last * t.qty
+                events.append((i, cols[sym], -t.qty))
                 all_trades.append(t)
                 del open_pos[sym]
 
         # ── 신규 진입 검사 ────────────────────────────────────────
-        if len(open_pos) < max_positions:
+        if len(open_pos) + len(pending) < max_positions:
             for sym, df in symbol_dfs.items():
-                if sym in open_pos or df is None:
+                if sym in open_pos or sym in pending or df is None:
                     continue
                 idx = df.index.get_loc(ts) if ts in df.index else -1
                 if idx < lookback_bars:
@@ -136,12 +225,13 @@ def run_backtest(
                     continue
 
                 price  = float(df.loc[ts, "close"])
-                df_ind = compute_indicators(slice_df)
-                from strategy.signals import atr_for_sizing
+                # 증분 지표 상태를 idx 까지만 전진 (진입마다 전체 재계산 대체)
+                st = ind_states.setdefault(sym, IndicatorState())
+                st.extend(df.iloc[len(st): idx + 1])
                 from strategy.sizing import atr_position_size, budget_cap_size
-                atr   = atr_for_sizing(df_ind)
+                atr   = _last_valid(st, "atr_14")
                 equity = cash + sum(
-                    p.trade.qty * symbol_dfs[s].loc[ts, "close"]
+                    p.held * symbol_dfs[s].loc[ts, "close"]
                     for s, p in open_pos.items()
                     if ts in symbol_dfs[s].index
                 )
@@ -151,23 +241,24 @@ def run_backtest(
                 if qty <= 0 or price * qty > cash:
                     continue
 
-                trade = BacktestTrade(
-                    symbol=sym, strategy="momentum",
-                    entry_ts=ts, entry_price=price, qty=qty,
-                )
-                cash -= price * qty
-                open_pos[sym] = _OpenPos(trade=trade, peak_price=price)
+                if fill_model is not None:
+                    if idx + 1 >= len(df):
+                        continue            # 다음 봉 없음 — 체결 불가, 슬롯을 잡지 않고 주문 폐기
+                    pending[sym] = qty
+                else:
+                    trade = BacktestTrade(
+                        symbol=sym, strategy="momentum",
+                        entry_ts=ts, entry_price=price, qty=qty,
+                    )
+                    cash   -= price * qty
+                    traded += price * qty
+                    events.append((i, cols[sym], qty))
+                    open_pos[sym] = _OpenPos(trade=trade, peak_price=price)
 
-                if len(open_pos) >= max_positions:
+                if len(open_pos) + len(pending) >= max_positions:
                     break
 
-        # ── 자산 평가 기록 ────────────────────────────────────────
-        unrealized = sum(
-            p.trade.qty * symbol_dfs[s].loc[ts, "close"]
-            for s, p in open_pos.items()
-            if ts in symbol_dfs[s].index
-        )
-        equity_history.append(cash + unrealized)
+        cash_history.append(cash)
 
     # ── 미청산 포지션 강제 종료 (마지막 봉) ───────────────────────
     if all_ts:
@@ -178,30 +269,43 @@ def run_backtest(
                 continue
             last_bar = df.index[-1]
             price = float(df.loc[last_bar, "close"])
-            t = pos.trade
-            t.exit_ts    = last_bar
-            t.exit_price = price
-            t.exit_reason = "end_of_data"
-            cash += price * t.qty
-            all_trades.append(t)
-
-    # ── 통계 계산 ─────────────────────────────────────────────────
+            cash   += price * pos.held
+            traded += price * pos.held
+            all_trades.append(_close_trade(pos, last_bar, price, pos.reason or "end_of_data"))
+
+    # ── 자산 평가 (보유 수량 행렬 × 종가 행렬) ──────────────────
+    close = np.column_stack(
+        [symbol_dfs[s]["close"].reindex(all_ts).to_numpy(float) for s in cols]
+    ) if cols else np.zeros((len(all_ts), 0))
+    rows, cs, dq = zip(*events) if events else ((), (), ())
+    holdings = holdings_value(position_matrix(len(all_ts), len(cols), rows, cs, dq), close)
+    return summarize(all_trades, np.asarray(cash_history) + holdings, all_ts,
+                     holdings=holdings, traded=traded, symbol_dfs=symbol_dfs)
+
+
+def summarize(
+    all_trades:     List[BacktestTrade],
+    equity_history: List[float],
+    all_ts:         list,
+    holdings:       Optional[List[float]] = None,
+    traded:         Optional[float] = None,
+    symbol_dfs:     Optional[Dict[str, pd.DataFrame]] = None,
+) -> dict:
+    """
+    거래 목록 + 봉별 자산 → run_backtest 결과 dict (엔진 공용, 지표는 backtest.metrics).
+
+    holdings(봉별 보유 평가액) · traded(총 거래대금) 를 주면 노출 · 회전율,
+    symbol_dfs 를 주면 거래별 MAE/MFE 를 함께 계산.
+    sharpe_approx 는 일간 수익률 기준 (봉 수와 무관하게 √252 연환산).
+    """
     closed = [t for t in all_trades if t.exit_price is not None]
     total_pnl = sum(t.pnl for t in closed)
 
     wins    = [t for t in closed if t.pnl > 0]
     win_rate = len(wins) / len(closed) if closed else 0.0
 
-    eq = np.array(equity_history, dtype=float)
-    if len(eq) > 1:
-        peak       = np.maximum.accumulate(eq)
-        drawdown   = (eq - peak) / np.where(peak > 0, peak, 1.0) * 100.0
-        max_dd_pct = float(drawdown.min())
-        daily_ret  = np.diff(eq) / np.where(eq[:-1] > 0, eq[:-1], 1.0)
-        sharpe     = float(np.mean(daily_ret) / (np.std(daily_ret) + 1e-9) * math.sqrt(252))
-    else:
-        max_dd_pct = 0.0
-        sharpe     = 0.0
+    equity = pd.Series(np.asarray(equity_history, dtype=float), index=all_ts[: len(equity_history)])
+    perf   = performance(equity, holdings, traded)
 
     summary_rows = [
         {
@@ -217,13 +321,22 @@ def run_backtest(
         }
         for t in closed
     ]
+    summary_df = pd.DataFrame(summary_rows)
+    if symbol_dfs is not None and closed:
+        summary_df = pd.concat([summary_df, excursions(closed, symbol_dfs)], axis=1)
 
     return {
-        "trades":           closed,
-        "total_pnl":        total_pnl,
-        "win_rate":         win_rate,
-        "max_drawdown_pct": max_dd_pct,
-        "sharpe_approx":    sharpe,
-        "summary_df":       pd.DataFrame(summary_rows),
-        "equity_curve":     pd.Series(equity_history, index=all_ts[: len(equity_history)]),
+        "trades":             closed,
+        "total_pnl":          total_pnl,
+        "win_rate":           win_rate,
+        "max_drawdown_pct":   perf["max_drawdown_pct"],
+        "sharpe_approx":      perf["sharpe"],
+        "sortino":            perf["sortino"],
+        "exposure_pct":       perf["exposure_pct"],
+        "time_in_market_pct": perf["time_in_market_pct"],
+        "turnover":           perf["turnover"],
+        "summary_df":         summary_df,
+        "equity_curve":       equity,
+        "daily_returns":      perf["daily_returns"],
+        "rolling_drawdown":   perf["rolling_drawdown"],
     }
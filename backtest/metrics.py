@@ -0,0 +1,212 @@
+# backtest/metrics.py
+"""
+성과 지표 — 백테스트 엔진 · 리포트 · analyzer.py 공용.
+
+  - 자산 곡선:  현금 + 보유 수량 행렬 × 가격 행렬 (시간 × 종목) 을 한 번에 계산
+  - 샤프/소르티노: 봉 수익률이 아니라 일간 수익률 기준 (분봉도 거래일 마지막 자산으로 리샘플 후 √252)
+  - 낙폭:      봉 단위(장중) 최대 낙폭 · 롤링 창 고점 대비 낙폭
+  - 노출·회전율: 보유 평가액 / 자산, 거래대금 / 평균 자산
+  - MAE/MFE:   거래별 보유 구간 저가·고가의 진입가 대비 최대 역행·순행 (%)
+
+장중 봉(tz-aware)은 뉴욕 시간 날짜로 거래일을 나눈다 (UTC 자정이 장중에 걸리지 않도록).
+"""
+from __future__ import annotations
+
+import math
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+TRADING_DAYS = 252
+ET           = "America/New_York"
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 자산 곡선
+# ─────────────────────────────────────────────────────────────────────
+
+def position_matrix(n_rows: int, n_cols: int, rows, cols, deltas) -> np.ndarray:
+    """체결 이벤트 (행, 종목 열, 수량 변화) → 봉별 보유 수량 행렬 (누적합)."""
+    qty = np.zeros((n_rows, n_cols))
+    np.add.at(qty, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)),
+              np.asarray(deltas, dtype=float))
+    return np.cumsum(qty, axis=0)
+
+
+def holdings_value(qty: np.ndarray, price: np.ndarray) -> np.ndarray:
+    """봉별 보유 평가액 — 가격 NaN(해당 봉 없음) 종목은 0 으로."""
+    with np.errstate(invalid="ignore"):
+        return np.nansum(qty * price, axis=1)
+
+
+def equity_from_positions(cash, qty: np.ndarray, price: np.ndarray) -> np.ndarray:
+    """봉별 자산 = 현금 + 보유 평가액."""
+    return np.asarray(cash, dtype=float) + holdings_value(qty, price)
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 수익률 · 위험 조정 지표
+# ─────────────────────────────────────────────────────────────────────
+
+def _days(index: pd.Index) -> np.ndarray:
+    """인덱스 → 거래일 키 (tz-aware 는 뉴욕 날짜, naive 는 날짜)."""
+    idx = pd.DatetimeIndex(index)
+    if idx.tz is not None:
+        idx = idx.tz_convert(ET).tz_localize(None)
+    return idx.normalize().to_numpy()
+
+
+def daily_equity(equity: pd.Series) -> pd.Series:
+    """봉 단위 자산 곡선 → 거래일 마지막 자산."""
+    if equity.empty or not isinstance(equity.index, pd.DatetimeIndex):
+        return equity
+    return equity.groupby(_days(equity.index)).last()
+
+
+def daily_returns(equity: pd.Series) -> pd.Series:
+    """거래일 수익률 — 첫날은 곡선 시작 자산 대비."""
+    if len(equity) < 2:
+        return pd.Series(dtype=float)
+    daily = daily_equity(equity)
+    prev  = daily.shift(1)
+    prev.iloc[0] = float(equity.iloc[0])
+    return (daily / prev.where(prev > 0) - 1.0).fillna(0.0)
+
+
+def daily_pnl(pnl: Iterable[float], dates: Iterable, fill_days: bool = True) -> pd.Series:
+    """실현 손익 + 날짜 → 일별 합계 (fill_days: 사이 영업일을 0 으로 채움)."""
+    s = pd.Series(list(pnl), index=pd.to_datetime(list(dates)), dtype=float)
+    if s.empty:
+        return s
+    s = s.groupby(s.index.normalize()).sum()
+    if fill_days:
+        s = s.reindex(pd.bdate_range(s.index.min(), s.index.max()).union(s.index), fill_value=0.0)
+    return s
+
+
+def sharpe(returns: Sequence[float], periods: int = TRADING_DAYS) -> float:
+    """연환산 샤프 (무위험 0) — 표본 2개 미만 · 표준편차 0 이면 0."""
+    r = np.asarray(returns, dtype=float)
+    if len(r) < 2:
+        return 0.0
+    sd = float(np.std(r, ddof=1))
+    return float(np.mean(r) / sd * math.sqrt(periods)) if sd > 0 else 0.0
+
+
+def sortino(returns: Sequence[float], periods: int = TRADING_DAYS) -> float:
+    """연환산 소르티노 — 하방 편차 = √mean(min(r, 0)²)."""
+    r = np.asarray(returns, dtype=float)
+    if len(r) < 2:
+        return 0.0
+    dd = float(np.sqrt(np.mean(np.minimum(r, 0.0) ** 2)))
+    return float(np.mean(r) / dd * math.sqrt(periods)) if dd > 0 else 0.0
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 낙폭
+# ─────────────────────────────────────────────────────────────────────
+
+def drawdown_pct(equity: Sequence[float]) -> np.ndarray:
+    """봉별 누적 고점 대비 낙폭 (%, ≤ 0)."""
+    eq = np.asarray(equity, dtype=float)
+    if eq.size == 0:
+        return eq
+    peak = np.maximum.accumulate(eq)
+    return (eq - peak) / np.where(peak > 0, peak, 1.0) * 100.0
+
+
+def max_drawdown_pct(equity: Sequence[float]) -> float:
+    dd = drawdown_pct(equity)
+    return float(dd.min()) if dd.size > 1 else 0.0
+
+
+def max_drawdown_abs(pnl: Sequence[float]) -> float:
+    """손익 시퀀스 누적합의 최대 낙폭 ($, ≤ 0) — 시작 0 을 고점으로 포함."""
+    cum  = np.concatenate([[0.0], np.cumsum(np.asarray(pnl, dtype=float))])
+    return float((cum - np.maximum.accumulate(cum)).min())
+
+
+def rolling_drawdown_pct(equity: pd.Series, window="30D") -> pd.Series:
+    """롤링 창 고점 대비 낙폭 (%) — window: 시간 문자열(DatetimeIndex) 또는 봉 수."""
+    if equity.empty:
+        return equity.astype(float)
+    if isinstance(window, str) and not isinstance(equity.index, pd.DatetimeIndex):
+        window = 20
+    peak = equity.rolling(window, min_periods=1).max()
+    return (equity / peak.where(peak > 0) - 1.0).fillna(0.0) * 100.0
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 거래 단위
+# ─────────────────────────────────────────────────────────────────────
+
+def profit_factor(pnl: Sequence[float]) -> float:
+    """총이익 / 총손실 — 손실 없으면 이익 유무에 따라 inf / 0."""
+    p = np.asarray(pnl, dtype=float)
+    gain = float(p[p > 0].sum())
+    loss = float(-p[p < 0].sum())
+    return gain / loss if loss > 0 else (float("inf") if gain > 0 else 0.0)
+
+
+def excursions(trades: Sequence, symbol_dfs: Dict[str, Optional[pd.DataFrame]]) -> pd.DataFrame:
+    """
+    거래별 MAE/MFE (%) — 진입 봉 ~ 청산 봉 저가·고가 (없으면 종가) 의 진입가 대비.
+
+    trades: symbol · entry_ts · exit_ts · entry_price 속성을 가진 객체 (BacktestTrade).
+    """
+    out = np.full((len(trades), 2), np.nan)
+    arrays: Dict[str, tuple] = {}
+    for i, t in enumerate(trades):
+        df = symbol_dfs.get(t.symbol)
+        if df is None or df.empty or not t.entry_price:
+            continue
+        if t.symbol not in arrays:
+            lo = df["low"] if "low" in df.columns else df["close"]
+            hi = df["high"] if "high" in df.columns else df["close"]
+            arrays[t.symbol] = (df.index, lo.to_numpy(float), hi.to_numpy(float))
+        idx, lo, hi = arrays[t.symbol]
+        a = idx.searchsorted(t.entry_ts, side="left")
+        b = idx.searchsorted(t.exit_ts if t.exit_ts is not None else idx[-1], side="right")
+        if b <= a:
+            continue
+        out[i, 0] = (np.nanmin(lo[a:b]) / t.entry_price - 1.0) * 100.0
+        out[i, 1] = (np.nanmax(hi[a:b]) / t.entry_price - 1.0) * 100.0
+    return pd.DataFrame(out, columns=["mae_pct", "mfe_pct"])
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 종합
+# ─────────────────────────────────────────────────────────────────────
+
+def performance(
+    equity:   pd.Series,
+    holdings: Optional[Sequence[float]] = None,
+    traded:   Optional[float] = None,
+    window="30D",
+) -> dict:
+    """
+    자산 곡선 (+ 봉별 보유 평가액 · 총 거래대금) → 포트폴리오 지표.
+
+    Returns: sharpe, sortino, max_drawdown_pct, exposure_pct, time_in_market_pct,
+             turnover, daily_returns, rolling_drawdown
+    """
+    rets = daily_returns(equity)
+    out = {
+        "sharpe":             sharpe(rets),
+        "sortino":            sortino(rets),
+        "max_drawdown_pct":   max_drawdown_pct(equity.to_numpy(float)),
+        "exposure_pct":       0.0,
+        "time_in_market_pct": 0.0,
+        "turnover":           0.0,
+        "daily_returns":      rets,
+        "rolling_drawdown":   rolling_drawdown_pct(equity, window),
+    }
+    eq = equity.to_numpy(float)
+    if holdings is not None and eq.size:
+        h = np.asarray(holdings, dtype=float)
+        out["exposure_pct"]       = float(np.nanmean(np.abs(h) / np.where(eq > 0, eq, np.nan))) * 100.0
+        out["time_in_market_pct"] = float(np.mean(h != 0)) * 100.0
+    if traded is not None and eq.size and eq.mean() > 0:
+        out["turnover"] = float(traded / eq.mean())
+    return out
@@ -0,0 +1,186 @@
+# backtest/montecarlo.py
+"""
+몬테카를로 거래 재표본 — 청산 거래 손익 순서를 복원 추출로 섞어 결과 분포를 본다.
+
+수십 건 거래의 승률 · PF 점추정 대신, 같은 거래 분포가 반복될 때
+  - 최종 자산 신뢰구간
+  - 최대 낙폭 분포 (중앙값 · 하위 꼬리)
+  - 파산 확률 (경로 중 자산이 시작 대비 ruin_pct 이상 줄어든 비율)
+을 버킷별로 계산한다. 거래 손익($)은 고정 사이징 가정으로 누적 (복리 아님).
+
+경로 전체를 (경로 × 거래) 행렬로 한 번에 계산 — 메모리 상한을 넘으면 경로 묶음 단위로 나눠 처리.
+
+입력: closed_trades · b4_trades (analyzer 로더) · 백테스트 결과 (summary_df / to_csv CSV)
+
+사용법:
+  python -m backtest.montecarlo --csv results/etf_swing.csv --equity 14800 --bucket etf_swing
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from core.bucket_capital import BASE_WEIGHTS
+
+DEFAULT_PATHS = 100_000
+RUIN_PCT      = 0.5             # 시작 자본의 50% 손실 = 파산
+_BLOCK_CELLS  = 4_000_000       # 묶음당 (경로 × 거래) 원소 수 상한 (~32MB float64)
+
+
+@dataclass
+class MonteCarloResult:
+    """버킷 1개 재표본 결과 — 금액은 $, 낙폭은 % (≤ 0)."""
+    bucket:       str
+    trades:       int
+    paths:        int
+    start_equity: float
+    final_lo:     float     # 최종 자산 하단 (ci 하한 분위)
+    final_med:    float
+    final_hi:     float
+    mdd_med:      float     # 경로별 최대 낙폭 중앙값
+    mdd_tail:     float     # 최대 낙폭 하위 꼬리 (ci 하한 분위 — 더 나쁜 쪽)
+    ruin_prob:    float     # %
+    loss_prob:    float     # 최종 자산 < 시작 자산 비율 %
+    ci:           float = 90.0
+
+    @property
+    def return_med_pct(self) -> float:
+        return (self.final_med / self.start_equity - 1.0) * 100.0 if self.start_equity else 0.0
+
+
+def bootstrap(
+    pnl:          Sequence[float],
+    start_equity: float,
+    paths:        int = DEFAULT_PATHS,
+    horizon:      Optional[int] = None,
+    ruin_pct:     float = RUIN_PCT,
+    ci:           float = 90.0,
+    seed:         Optional[int] = None,
+    bucket:       str = "",
+) -> Optional[MonteCarloResult]:
+    """
+    거래 손익 복원 추출 → MonteCarloResult (거래 없으면 None).
+
+    horizon: 경로당 거래 수 (기본: 표본 거래 수 — 같은 기간을 다시 거래한다고 가정)
+    ci:      양측 신뢰구간 폭 (%) — 90 이면 5 · 50 · 95 분위
+    """
+    p = np.asarray(pnl, dtype=float)
+    p = p[np.isfinite(p)]
+    n = int(horizon or len(p))
+    if p.size == 0 or n <= 0 or start_equity <= 0:
+        return None
+
+    rng    = np.random.default_rng(seed)
+    floor  = start_equity * (1.0 - ruin_pct)
+    finals = np.empty(paths)
+    mdds   = np.empty(paths)
+    ruined = np.empty(paths, dtype=bool)
+    block  = max(1, min(paths, _BLOCK_CELLS // n))
+    for lo in range(0, paths, block):
+        hi = min(lo + block, paths)
+        eq = p[rng.integers(0, p.size, size=(hi - lo, n))]
+        np.cumsum(eq, axis=1, out=eq)
+        eq += start_equity
+        peak = np.maximum(np.maximum.accumulate(eq, axis=1), start_equity)
+        finals[lo:hi] = eq[:, -1]
+        mdds[lo:hi]   = ((eq - peak) / peak).min(axis=1) * 100.0
+        ruined[lo:hi] = eq.min(axis=1) <= floor
+
+    tail = (100.0 - ci) / 2.0
+    f_lo, f_med, f_hi = np.percentile(finals, [tail, 50.0, 100.0 - tail])
+    return MonteCarloResult(
+        bucket       = bucket,
+        trades       = int(p.size),
+        paths        = paths,
+        start_equity = float(start_equity),
+        final_lo     = float(f_lo),
+        final_med    = float(f_med),
+        final_hi     = float(f_hi),
+        mdd_med      = float(np.percentile(mdds, 50.0)),
+        mdd_tail     = float(np.percentile(mdds, tail)),
+        ruin_prob    = float(ruined.mean() * 100.0),
+        loss_prob    = float((finals < start_equity).mean() * 100.0),
+        ci           = ci,
+    )
+
+
+def bucket_bootstrap(
+    pnls:    Dict[str, Sequence[float]],
+    equity:  float,
+    weights: Optional[Dict[str, float]] = None,
+    **kwargs,
+) -> Dict[str, MonteCarloResult]:
+    """
+    버킷별 손익 → 버킷별 결과. 시작 자본 = 계좌 자산 × 버킷 기본 비중 (모르는 버킷은 계좌 전체).
+    """
+    weights = BASE_WEIGHTS if weights is None else weights
+    out: Dict[str, MonteCarloResult] = {}
+    for bucket, pnl in pnls.items():
+        res = bootstrap(pnl, equity * weights.get(bucket, 1.0), bucket=bucket, **kwargs)
+        if res is not None:
+            out[bucket] = res
+    return out
+
+
+def trades_by_bucket(df: pd.DataFrame, bucket_col: str = "strategy", pnl_col: str = "pnl") -> Dict[str, np.ndarray]:
+    """거래 DataFrame (closed_trades / summary_df) → {버킷: 손익 배열}."""
+    if df is None or df.empty or pnl_col not in df.columns:
+        return {}
+    if bucket_col not in df.columns:
+        return {"all": df[pnl_col].to_numpy(float)}
+    return {str(k): g[pnl_col].to_numpy(float) for k, g in df.groupby(bucket_col)}
+
+
+def format_lines(results: Dict[str, MonteCarloResult]) -> List[str]:
+    """버킷별 결과 → 콘솔 · 텔레그램 공용 요약 줄."""
+    lines: List[str] = []
+    for name, r in results.items():
+        lines.append(
+            f"  {name:<12}: N={r.trades}  최종 ${r.final_lo:,.0f} ~ ${r.final_hi:,.0f}"
+            f" (중앙 {r.return_med_pct:+.1f}%, {r.ci:.0f}% 구간)"
+        )
+        lines.append(
+            f"  {'':<12}  MDD 중앙 {r.mdd_med:.1f}% / 꼬리 {r.mdd_tail:.1f}%"
+            f"  손실확률 {r.loss_prob:.0f}%  파산확률 {r.ruin_prob:.1f}%"
+        )
+    return lines
+
+
+# ─────────────────────────────────────────────────────────────────────
+# CLI — 백테스트 거래 CSV (backtest.run --csv)
+# ─────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="백테스트 거래 몬테카를로 재표본")
+    parser.add_argument("--csv",     required=True, help="거래 CSV (pnl 컬럼 — backtest.run --csv 결과)")
+    parser.add_argument("--equity",  type=float, default=14_800.0, help="계좌 자산 USD")
+    parser.add_argument("--bucket",  default=None,
+                        help="버킷 이름 (시작 자본 = 자산 × 기본 비중, 미지정 시 자산 전체)")
+    parser.add_argument("--paths",   type=int, default=DEFAULT_PATHS)
+    parser.add_argument("--horizon", type=int, default=None, help="경로당 거래 수 (기본: 표본 수)")
+    parser.add_argument("--ruin",    type=float, default=RUIN_PCT, help="파산 기준 손실 비율")
+    parser.add_argument("--seed",    type=int, default=None)
+    args = parser.parse_args()
+
+    df   = pd.read_csv(args.csv)
+    name = args.bucket or "all"
+    res  = bucket_bootstrap({name: df["pnl"].to_numpy(float)}, args.equity,
+                            weights=None if args.bucket else {},
+                            paths=args.paths, horizon=args.horizon, ruin_pct=args.ruin, seed=args.seed)
+    if not res:
+        print("거래 없음")
+        sys.exit(1)
+    print(f"\n몬테카를로 {args.paths:,}경로 — {args.csv}")
+    print("\n".join(format_lines(res)))
+
+
+if __name__ == "__main__":
+    main()
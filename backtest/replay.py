@@ -0,0 +1,664 @@
+# backtest/replay.py
+"""
+전략 리플레이 백테스트 — 실전 Orchestrator 결정 함수를 과거 봉 스트림 위에서 그대로 실행.
+
+backtest.engine / vector_engine 은 momentum_entry + strategy/exits 단순 청산만 흉내낸다.
+여기서는 Orchestrator 를 상속한 ReplayOrchestrator 가 데이터 · 시계 · 브로커 접점만 바꿔 끼우고,
+진입 · 청산 판단은 실전 코드(on_bar · _bucket2_cycle · _b2_alloc_cycle · _exit_cycle)를 그대로 호출한다.
+
+  - SimClock:        시뮬 시각 — 결정 경로 모듈의 datetime.now / time.monotonic / date.today 대체
+  - HistoricalFeed:  기준 봉(1Min/5Min) → 시뮬 시각까지 마감된 봉 + 진행 중인 상위 봉 (미래 봉 비노출)
+                     data.alpaca_bars.get_bars 자리에 꽂혀 B2 배분 엔진 · 신뢰도 스캐너 QQQ 도 같은 봉을 본다
+  - ReplayBroker:    현재가(기준 봉 종가)로 즉시 체결 — 지정가는 체결 가능(매수 ≥ 현재가 · 매도 ≤ 현재가)할 때만,
+                     아니면 거부 · 현금/보유/평가액 · 왕복 거래 기록
+  - ReplayStrategy:  플러그인 — 시뮬 시각마다 on_step (B3: 새 봉마다 on_bar / B2: 15분 사이클)
+  - 청산:            exit_every 마다 Orchestrator._exit_cycle (3분 룰 · ExitStrategyEngine 개미 털기 대기 ·
+                     분배 부분청산 · B2 방어 손절 · EOD 포함)
+  - 모니터 대체:     매 스텝 킬스위치 · BucketCapitalManager 총 자산 갱신
+
+외부 데이터(VIX · 시장 레짐)는 regime / vix 인자(상수 또는 시각 → 값 함수)로 주입한다.
+
+B4 스나이퍼(strategy.strategy_engine.run_b4_sniper_mode)는 리플레이하지 않는다.
+Orchestrator 밖의 독립 태스크이고, 매매 대상이 옵션 계약이라 진입 · 청산 판단이 옵션체인 조회와
+실시간 옵션 호가(프리미엄)에 달려 있는데 봉 저장소 · HistoricalFeed 에는 주식 봉만 있다.
+기초자산 봉으로 프리미엄을 흉내내면 실전 결정 경로가 아닌 대리 모델이 되므로 플러그인을 두지 않는다.
+결과 dict 는 run_backtest 와 같은 형식(summarize) — print_report / to_csv 를 그대로 쓴다.
+
+사용법:
+  python -m backtest.replay --bucket squeeze --offline --interval 1Min --days 20
+  python -m backtest.replay --bucket etf_swing --offline --interval 5Min --days 120 --alloc
+"""
+from __future__ import annotations
+
+import abc
+import argparse
+import asyncio
+import importlib
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from analysis.market import MarketRegime
+from backtest.engine import BacktestTrade, summarize
+from core.bucket_capital import BucketCapitalManager
+from core.kill_switch import KillSwitch
+from core.orchestrator import Orchestrator
+from core.price_snapshot import PriceSnapshot
+from storage.db import PositionDB
+from storage.position_book import PositionBook
+from strategy.exits import ET
+
+_OHLCV = ["open", "high", "low", "close", "volume"]
+
+# 분 단위 타임프레임 (기준 봉 · 상위 봉 공용). 1Day / 1Week 는 ET 달력 기준으로 묶는다.
+_TF_FREQ = {"1Min": "1min", "5Min": "5min", "15Min": "15min", "30Min": "30min", "1Hour": "1h"}
+_TF_ORDER = ["1Min", "5Min", "15Min", "30Min", "1Hour", "1Day", "1Week"]
+
+# 결정 경로에서 현재 시각을 직접 읽는 모듈 속성 → SimClock 대체물 이름
+_CLOCK_PATCHES: List[Tuple[str, str]] = [
+    ("core.orchestrator",           "datetime"),
+    ("core.orchestrator",           "time"),
+    ("storage.position_book",       "datetime"),
+    ("storage.db",                  "datetime"),
+    ("core.bucket_capital",         "_date"),
+    ("core.regime_engine",          "datetime"),
+    ("core.regime_engine",          "_date"),
+    ("core.regime_engine",          "time"),
+    ("strategy.exit_strategy",      "time"),
+    ("strategy.confidence_scanner", "time"),
+    ("strategy.confidence_scanner", "_date"),
+    ("strategy.b2_allocation",      "time"),
+]
+
+Provider = Union[Any, Callable[[datetime], Any]]
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 시뮬 시계
+# ─────────────────────────────────────────────────────────────────────
+
+class SimClock:
+    """리플레이 현재 시각 (UTC). monotonic 은 시뮬 epoch 초 — 대기 · TTL 이 시뮬 시간으로 흐른다."""
+
+    def __init__(self, start: Optional[datetime] = None) -> None:
+        self._now = start or datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+    def set(self, now: datetime) -> None:
+        self._now = now if now.tzinfo else now.replace(tzinfo=timezone.utc)
+
+    def now(self, tz=None) -> datetime:
+        return self._now.astimezone(tz) if tz else self._now.replace(tzinfo=None)
+
+    def monotonic(self) -> float:
+        return self._now.timestamp()
+
+    def today(self) -> date:
+        """ET 기준 오늘 (당일 블랙리스트 · 킬스위치 리셋)."""
+        return self._now.astimezone(ET).date()
+
+    def shims(self) -> Dict[str, Any]:
+        """모듈 속성 대체물: datetime / _date 서브클래스 + monotonic·time 만 바꾼 time 모듈 프록시."""
+        clock = self
+
+        class _SimDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return clock.now(tz)
+
+        class _SimDate(date):
+            @classmethod
+            def today(cls):
+                return clock.today()
+
+        class _SimTime:
+            monotonic = staticmethod(clock.monotonic)
+            time      = staticmethod(clock.monotonic)
+
+            def __getattr__(self, name: str) -> Any:
+                return getattr(time, name)
+
+        return {"datetime": _SimDatetime, "_date": _SimDate, "time": _SimTime()}
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 과거 봉 피드
+# ─────────────────────────────────────────────────────────────────────
+
+def _labels(idx: pd.DatetimeIndex, timeframe: str) -> pd.DatetimeIndex:
+    """봉 시각 → 상위 타임프레임 구간 시작 (분봉은 UTC 내림, 일·주봉은 ET 자정)."""
+    if timeframe in _TF_FREQ:
+        return idx.floor(_TF_FREQ[timeframe])
+    wall = idx.tz_convert(ET).tz_localize(None).normalize()
+    if timeframe == "1Week":
+        wall = wall - pd.to_timedelta(wall.weekday, unit="D")
+    return wall.tz_localize(ET).tz_convert("UTC")
+
+
+def _agg(df: pd.DataFrame) -> Tuple[float, float, float, float, float]:
+    v = df.to_numpy(float)
+    return v[0, 0], v[:, 1].max(), v[:, 2].min(), v[-1, 3], v[:, 4].sum()
+
+
+class HistoricalFeed:
+    """
+    종목별 기준 봉 → 시뮬 시각 기준 조회.
+
+    기준 봉은 마감(시각 + 봉 길이 ≤ 현재) 된 것만 보인다. 상위 타임프레임은 마감된 구간 +
+    지금까지 마감된 기준 봉으로 만든 진행 중 구간 (실시간 Alpaca 일봉처럼 당일 봉이 마지막 행).
+    기준보다 잘은 타임프레임 요청은 None.
+    """
+
+    def __init__(self, bars: Dict[str, pd.DataFrame], clock: SimClock, base: str = "1Min") -> None:
+        if base not in _TF_FREQ:
+            raise ValueError(f"기준 봉은 분봉이어야 함: {base}")
+        self.clock = clock
+        self.base  = base
+        self.span  = pd.Timedelta(_TF_FREQ[base])
+        self._bars: Dict[str, pd.DataFrame] = {}
+        self._ts:   Dict[str, np.ndarray]   = {}
+        for sym, df in bars.items():
+            if df is None or df.empty:
+                continue
+            df = df[_OHLCV].astype(float).sort_index()
+            idx = pd.DatetimeIndex(df.index)
+            df.index = (idx.tz_localize("UTC") if idx.tz is None else idx.tz_convert("UTC")).as_unit("ns")
+            self._bars[sym] = df
+            self._ts[sym]   = df.index.asi8
+        self._grouped: Dict[Tuple[str, str], Tuple[pd.DataFrame, np.ndarray, np.ndarray]] = {}
+
+    @property
+    def symbols(self) -> List[str]:
+        return list(self._bars)
+
+    def timestamps(self) -> pd.DatetimeIndex:
+        """전 종목 기준 봉 시각 합집합 (리플레이 스텝)."""
+        if not self._bars:
+            return pd.DatetimeIndex([], tz="UTC")
+        return pd.DatetimeIndex(np.unique(np.concatenate(list(self._ts.values())))).tz_localize("UTC")
+
+    def _visible(self, symbol: str) -> int:
+        cutoff = pd.Timestamp(self.clock.now(timezone.utc)) - self.span
+        return int(np.searchsorted(self._ts[symbol], cutoff.value, side="right"))
+
+    def bar_at(self, symbol: str, ts: pd.Timestamp) -> Optional[SimpleNamespace]:
+        """ts 에 시작한 기준 봉 (스트림 on_bar 페이로드 형태), 없으면 None."""
+        arr = self._ts.get(symbol)
+        if arr is None:
+            return None
+        i = int(np.searchsorted(arr, ts.value))
+        if i >= len(arr) or arr[i] != ts.value:
+            return None
+        o, h, l, c, v = self._bars[symbol].iloc[i].to_numpy(float)
+        return SimpleNamespace(symbol=symbol, timestamp=ts, open=o, high=h, low=l, close=c, volume=v)
+
+    def last(self, symbol: str) -> float:
+        """마지막 마감 기준 봉 종가 (없으면 0.0)."""
+        if symbol not in self._bars:
+            return 0.0
+        n = self._visible(symbol)
+        return float(self._bars[symbol]["close"].iat[n - 1]) if n else 0.0
+
+    def bars(
+        self, symbol: str, timeframe: str = "1Min", limit: int = 60, session: bool = False,
+    ) -> Optional[pd.DataFrame]:
+        """
+        시뮬 시각까지의 최근 limit 봉.
+
+        session=True 면 ET 당일 봉만 (StreamBarAggregator 처럼 날짜가 바뀌면 버퍼를 비우는 스트림 경로).
+        """
+        out = self._bars_upto(symbol, timeframe, limit)
+        if session and out is not None:
+            day = pd.Timestamp(self.clock.today()).tz_localize(ET)
+            out = out[out.index >= day]
+            return out if len(out) else None
+        return out
+
+    def _bars_upto(self, symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
+        df = self._bars.get(symbol)
+        if df is None or timeframe not in _TF_ORDER or _TF_ORDER.index(timeframe) < _TF_ORDER.index(self.base):
+            return None
+        n = self._visible(symbol)
+        if n == 0:
+            return None
+        if timeframe == self.base:
+            return df.iloc[max(0, n - limit):n]
+
+        full, codes, first = self._group(symbol, timeframe)
+        g = int(codes[n - 1])
+        partial = pd.DataFrame([_agg(df.iloc[first[g]:n])], columns=_OHLCV, index=full.index[g:g + 1])
+        return pd.concat([full.iloc[max(0, g - limit + 1):g], partial])
+
+    def get_bars(
+        self, symbol: str, timeframe: str = "1Day", limit: int = 60, extended_hours: bool = False,
+    ) -> Optional[pd.DataFrame]:
+        """data.alpaca_bars.get_bars 와 같은 시그니처."""
+        return self.bars(symbol, timeframe, limit)
+
+    def prices(self, symbols: List[str]) -> Dict[str, float]:
+        return {s: p for s in symbols if (p := self.last(s)) > 0}
+
+    def _group(self, symbol: str, timeframe: str) -> Tuple[pd.DataFrame, np.ndarray, np.ndarray]:
+        key = (symbol, timeframe)
+        hit = self._grouped.get(key)
+        if hit is None:
+            df = self._bars[symbol]
+            codes, uniques = pd.factorize(_labels(df.index, timeframe))
+            full = df.groupby(codes).agg(
+                {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+            )
+            full.index = pd.DatetimeIndex(uniques)
+            first = np.searchsorted(codes, np.arange(len(uniques)))
+            hit = self._grouped[key] = (full, codes, first)
+        return hit
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 시뮬 브로커
+# ─────────────────────────────────────────────────────────────────────
+
+class _Account(dict):
+    """dict(AccountManager: acct.get) · 속성(Orchestrator._get_account: acct.equity) 겸용 계좌 조회."""
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class ReplayBroker:
+    """
+    Orchestrator 가 쓰는 브로커 메서드만 구현한 시뮬 브로커.
+
+    submit_order 는 현재가로 즉시 전량 체결. 지정가(Paper 슬리피지 포함)는 체결 한도로만 쓰고,
+    현재가가 한도를 넘으면(매수 한도 < 현재가 · 매도 한도 > 현재가) ok False 로 거부한다.
+    매수 대금이 현금을 넘으면 예외 (실 브로커 거부와 같이 Orchestrator 가 주문 실패로 처리).
+    매도 체결마다 평균단가 기준 왕복 거래(BacktestTrade) 1건 — 전략·사유는 label 로 붙인다.
+    """
+
+    def __init__(self, feed: HistoricalFeed, cash: float) -> None:
+        self.feed   = feed
+        self.cash   = float(cash)
+        self.qty:    Dict[str, int]   = {}
+        self._cost:  Dict[str, float] = {}          # 평균 단가
+        self._since: Dict[str, pd.Timestamp] = {}   # 보유 시작 (첫 매수 체결)
+        self._strat: Dict[str, str]   = {}
+        self.fills:  List[dict] = []
+        self.trades: List[BacktestTrade] = []
+
+    def submit_order(
+        self, symbol: str, qty: int, side: str, type: str = "market",
+        price: Optional[float] = None, tif: str = "day", **_: Any,
+    ) -> dict:
+        px = self.feed.last(symbol)
+        if px <= 0 or qty <= 0:
+            raise ValueError(f"{symbol} 주문 불가 (가격 {px}, 수량 {qty})")
+        if type == "limit" and price and (px > price if side == "buy" else px < price):
+            return {"ok": False, "reason": "not marketable", "symbol": symbol, "qty": 0, "side": side}
+        now  = pd.Timestamp(self.feed.clock.now(timezone.utc))
+        held = self.qty.get(symbol, 0)
+        if side == "buy":
+            if px * qty > self.cash + 1e-9:
+                raise RuntimeError(f"{symbol} 매수 가능 금액 부족 (${px * qty:,.2f} > ${self.cash:,.2f})")
+            self.cash -= px * qty
+            self._cost[symbol] = (self._cost.get(symbol, 0.0) * held + px * qty) / (held + qty)
+            self._since.setdefault(symbol, now)
+            self.qty[symbol] = held + qty
+        else:
+            qty = min(qty, held)
+            if qty <= 0:
+                raise ValueError(f"{symbol} 보유 없음")
+            self.cash += px * qty
+            self.trades.append(BacktestTrade(
+                symbol=symbol, strategy=self._strat.get(symbol, ""),
+                entry_ts=self._since[symbol], entry_price=self._cost[symbol], qty=qty,
+                exit_ts=now, exit_price=px,
+            ))
+            self.qty[symbol] = held - qty
+            if self.qty[symbol] == 0:
+                for book in (self.qty, self._cost, self._since, self._strat):
+                    book.pop(symbol, None)
+        fill = {"ts": now, "symbol": symbol, "side": side, "qty": qty, "price": px,
+                "strategy": "", "reason": ""}
+        self.fills.append(fill)
+        return {"ok": True, "symbol": symbol, "qty": qty, "side": side, "price": px}
+
+    def label(self, symbol: str, side: str, strategy: str, reason: str) -> None:
+        """직전 체결에 전략·사유 기록 (Orchestrator 의 record_trade 직후 호출)."""
+        fill = next((f for f in reversed(self.fills) if f["symbol"] == symbol), None)
+        if fill is None or fill["side"] != side or fill["reason"]:
+            return
+        fill["strategy"], fill["reason"] = strategy, reason
+        if side == "buy":
+            self._strat.setdefault(symbol, strategy)
+        elif self.trades and self.trades[-1].symbol == symbol and not self.trades[-1].exit_reason:
+            self.trades[-1].strategy    = self.trades[-1].strategy or strategy
+            self.trades[-1].exit_reason = reason
+
+    def market_value(self) -> float:
+        return sum(q * self.feed.last(s) for s, q in self.qty.items())
+
+    def unrealized(self) -> float:
+        return sum(q * (self.feed.last(s) - self._cost[s]) for s, q in self.qty.items())
+
+    def equity(self) -> float:
+        return self.cash + self.market_value()
+
+    def get_account(self) -> _Account:
+        eq = self.equity()
+        return _Account(cash=self.cash, portfolio_value=eq, equity=eq, unrealized_pl=self.unrealized())
+
+    def get_settled_cash(self) -> float:
+        return self.cash
+
+    def close_all(self, reason: str = "end_of_data") -> None:
+        """남은 보유를 현재가로 청산 (엔진의 end_of_data 와 같은 처리)."""
+        for sym in list(self.qty):
+            strategy = self._strat.get(sym, "")
+            self.submit_order(sym, self.qty[sym], "sell")
+            self.label(sym, "sell", strategy, reason)
+
+
+class _ReplayBook(PositionBook):
+    """record_trade 를 가로채 ReplayBroker 체결에 전략·사유를 붙이는 포지션 북."""
+
+    def __init__(self, db: PositionDB, broker: ReplayBroker) -> None:
+        super().__init__(db)
+        self._broker = broker
+
+    def record_trade(self, symbol: str, side: str, qty: int, price: float,
+                     strategy: str, reason: str = "") -> None:
+        self._broker.label(symbol, side, strategy, reason)
+        self.db.record_trade(symbol, side, qty, price, strategy, reason)
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 리플레이 Orchestrator
+# ─────────────────────────────────────────────────────────────────────
+
+class ReplayOrchestrator(Orchestrator):
+    """데이터 조회만 HistoricalFeed 로 바꾼 Orchestrator (Paper 모드 · Alpaca 경로 고정)."""
+
+    def __init__(self, feed: HistoricalFeed, broker: ReplayBroker, cfg: Dict[str, Any], db: PositionDB) -> None:
+        super().__init__(
+            broker         = broker,
+            data_client    = None,
+            db             = _ReplayBook(db, broker),
+            cfg            = cfg,
+            kill_switch    = KillSwitch(
+                daily_loss_limit_pct=float(cfg.get("risk", {}).get("daily_loss_limit_pct", 0.02))
+            ),
+            bucket_capital = BucketCapitalManager(total_equity=max(broker.equity(), 1.0)),
+        )
+        self.feed  = feed
+        self.clock = feed.clock
+        self.conf_scanner.bar_source = self._session_bars
+        self.prices = PriceSnapshot(
+            self._fetch_prices,
+            max_age=float(cfg.get("engine", {}).get("price_max_age_sec", 15)),
+            clock=self.clock.monotonic,
+        )
+
+    def _is_toss(self) -> bool:
+        return False
+
+    def _is_paper(self) -> bool:
+        return True
+
+    def _fetch_last(self, symbol: str) -> float:
+        return self.feed.last(symbol)
+
+    def _fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        return self.feed.prices(symbols)
+
+    def _fetch_ask(self, symbol: str) -> float:
+        return self.feed.last(symbol)
+
+    def _fetch_bars(self, symbol: str, timeframe: str, limit: int):
+        return self.feed.bars(symbol, timeframe, limit)
+
+    def _fetch_rolling(self, symbol: str, timeframe: str, limit: int):
+        return self.feed.bars(symbol, timeframe, limit)
+
+    def _session_bars(self, symbol: str, timeframe: str, limit: int):
+        return self.feed.bars(symbol, timeframe, limit, session=True)
+
+    async def _stream_bars(self, symbol: str, timeframe: str, limit: int):
+        """스트림 집계 봉 경로 — 당일 봉 + 진행 중 구간 (StreamBarAggregator.bars include_partial)."""
+        return self._session_bars(symbol, timeframe, limit)
+
+    def sync_account(self) -> None:
+        """모니터 루프 대체 — 킬스위치(미실현 손익) · 버킷 자본 총 자산 갱신."""
+        equity = self.broker.equity()
+        self.kill_switch.update(equity, self.broker.unrealized(), today=self.clock.today())
+        if equity > 0:
+            self.bucket_capital.update_equity(equity)
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 전략 플러그인
+# ─────────────────────────────────────────────────────────────────────
+
+class ReplayStrategy(abc.ABC):
+    """리플레이 플러그인 — 시뮬 시각마다 on_step 에서 Orchestrator 결정 함수를 호출."""
+
+    name = ""
+
+    @abc.abstractmethod
+    async def on_step(
+        self, orch: ReplayOrchestrator, now: datetime, new_bars: Dict[str, SimpleNamespace],
+    ) -> None:
+        ...
+
+
+class SqueezeReplay(ReplayStrategy):
+    """B3 — 새 기준 봉마다 Orchestrator.on_bar (Gap&Go → VWAP 풀백 → 신뢰도 스코어 → 켈리 사이징)."""
+
+    name = "squeeze"
+
+    def __init__(self, symbols: Optional[List[str]] = None) -> None:
+        self.symbols = set(symbols) if symbols else None
+
+    async def on_step(self, orch, now, new_bars):
+        for sym, bar in new_bars.items():
+            if self.symbols is None or sym in self.symbols:
+                await orch.on_bar(sym, bar)
+
+
+class EtfSwingReplay(ReplayStrategy):
+    """B2 — every_min 분마다 _bucket2_cycle, alloc=True 면 B2AllocationEngine 리밸런싱(_b2_alloc_cycle)."""
+
+    name = "etf_swing"
+
+    def __init__(self, every_min: int = 15, alloc: bool = False) -> None:
+        self.every = timedelta(minutes=every_min)
+        self.alloc = alloc
+        self._next: Optional[datetime] = None
+
+    async def on_step(self, orch, now, new_bars):
+        if self._next is not None and now < self._next:
+            return
+        self._next = now + self.every
+        if orch._is_tradeable():
+            await asyncio.to_thread(orch._b2_alloc_cycle if self.alloc else orch._bucket2_cycle)
+
+
+# B4 (옵션) 는 제외 — 모듈 docstring 참고
+REPLAY_STRATEGIES: Dict[str, Callable[..., ReplayStrategy]] = {
+    "squeeze":   SqueezeReplay,
+    "etf_swing": EtfSwingReplay,
+}
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 실행
+# ─────────────────────────────────────────────────────────────────────
+
+def _provider(value: Provider, clock: SimClock) -> Callable[[], Any]:
+    return (lambda: value(clock.now(timezone.utc))) if callable(value) else (lambda: value)
+
+
+@contextmanager
+def _replay_env(feed: HistoricalFeed, regime: Provider, vix: Provider) -> Iterator[None]:
+    """리플레이 동안만 시각 · 봉 조회 · VIX · 시장 레짐 · 매매 일지 쓰기를 시뮬 대상으로 교체."""
+    shims  = feed.clock.shims()
+    get_regime, get_vix = _provider(regime, feed.clock), _provider(vix, feed.clock)
+    patches = [(mod, attr, shims[attr]) for mod, attr in _CLOCK_PATCHES] + [
+        ("data.alpaca_bars", "get_bars",       feed.get_bars),
+        ("strategy.regime",  "fetch_vix",      lambda timeout=8: float(get_vix())),
+        ("analysis.market",  "analyze_market", get_regime),
+        ("core.orchestrator", "dbm",           SimpleNamespace(
+            save_trade=lambda **_: None, get_system_state=lambda *_a, **_k: None,
+        )),
+    ]
+    saved: List[Tuple[Any, str, Any]] = []
+    try:
+        for mod_name, attr, value in patches:
+            mod = importlib.import_module(mod_name)
+            saved.append((mod, attr, getattr(mod, attr)))
+            setattr(mod, attr, value)
+        yield
+    finally:
+        for mod, attr, value in reversed(saved):
+            setattr(mod, attr, value)
+
+
+async def _drive(
+    orch:       ReplayOrchestrator,
+    strategies: List[ReplayStrategy],
+    steps:      pd.DatetimeIndex,
+    exit_every: timedelta,
+    equity:     List[float],
+    holdings:   List[float],
+) -> None:
+    feed = orch.feed
+    next_exit: Optional[datetime] = None
+    for ts in steps:
+        now = (ts + feed.span).to_pydatetime()
+        orch.clock.set(now)
+        new_bars = {s: b for s in feed.symbols if (b := feed.bar_at(s, ts)) is not None}
+        orch.sync_account()
+        if next_exit is None or now >= next_exit:
+            await orch._exit_cycle()
+            next_exit = now + exit_every
+        for strat in strategies:
+            await strat.on_step(orch, now, new_bars)
+        equity.append(orch.broker.equity())
+        holdings.append(orch.broker.market_value())
+
+
+def run_replay(
+    symbol_dfs:   Dict[str, pd.DataFrame],
+    cfg:          Dict[str, Any],
+    strategies:   List[ReplayStrategy],
+    initial_cash: float = 14_800.0,
+    base:         str = "1Min",
+    trade_from:   Optional[pd.Timestamp] = None,
+    regime:       Provider = MarketRegime(regime="bull", vix=15.0, trend_bias="bullish"),
+    vix:          Provider = 15.0,
+    exit_every:   Optional[timedelta] = None,
+    db_path:      str = ":memory:",
+) -> dict:
+    """
+    실전 Orchestrator 결정 경로 리플레이 → run_backtest 와 같은 결과 dict (+ "fills" 체결 표).
+
+    trade_from: 이전 봉은 지표 · 일봉 워밍업 전용 (스텝은 이 시각부터).
+    regime / vix: 상수 또는 시각(UTC datetime) → MarketRegime / VIX 값 함수.
+    exit_every: 청산 사이클 주기 (기본: 기준 봉마다 — 실전 30초 루프에 가장 가까운 값).
+    db_path: 리플레이 포지션 DB (파일 경로를 주면 stats.py / analyzer.py 로 그대로 분석 가능).
+    """
+    clock  = SimClock()
+    feed   = HistoricalFeed(symbol_dfs, clock, base=base)
+    broker = ReplayBroker(feed, initial_cash)
+    steps  = feed.timestamps()
+    if trade_from is not None:
+        steps = steps[steps >= pd.Timestamp(trade_from)]
+    exit_every = exit_every or feed.span.to_pytimedelta()
+
+    equity: List[float] = []
+    holdings: List[float] = []
+    db = PositionDB(db_path)
+    try:
+        with _replay_env(feed, regime, vix):
+            orch = ReplayOrchestrator(feed, broker, cfg, db)
+            asyncio.run(_drive(orch, strategies, steps, exit_every, equity, holdings))
+            broker.close_all()
+    finally:
+        db.close()
+
+    fills  = pd.DataFrame(broker.fills)
+    traded = float((fills["qty"] * fills["price"]).sum()) if not fills.empty else 0.0
+    result = summarize(broker.trades, equity, list(steps + feed.span),
+                       holdings=holdings, traded=traded, symbol_dfs=symbol_dfs)
+    result["fills"] = fills
+    return result
+
+
+# ─────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    from backtest.report import print_report, to_csv
+    from backtest.run import DEFAULT_SYMBOLS, fetch_data, load_config
+
+    parser = argparse.ArgumentParser(description="실전 Orchestrator 전략 리플레이 백테스트")
+    parser.add_argument("--bucket",      default="squeeze", choices=list(REPLAY_STRATEGIES))
+    parser.add_argument("--symbols",     nargs="+", default=None)
+    parser.add_argument("--days",        type=int, default=20, help="리플레이 기간 (거래일)")
+    parser.add_argument("--warmup-days", type=int, default=30, help="일봉 지표 워밍업 (거래일)")
+    parser.add_argument("--interval",    default="1Min", choices=["1Min", "5Min"], help="기준 봉")
+    parser.add_argument("--alloc",       action="store_true",
+                        help="etf_swing: B2AllocationEngine 리밸런싱 경로(_b2_alloc_cycle)")
+    parser.add_argument("--regime",      default="bull",
+                        choices=["bull", "correction", "bear", "panic"], help="고정 시장 레짐")
+    parser.add_argument("--vix",         type=float, default=15.0, help="고정 VIX")
+    parser.add_argument("--cash",        type=float, default=14_800.0)
+    parser.add_argument("--config",      default="config.yaml")
+    parser.add_argument("--offline",     action="store_true", help="네트워크 없이 로컬 봉 저장소만 사용")
+    parser.add_argument("--store",       default=None, help="봉 저장소 경로 (기본: storage/bars)")
+    parser.add_argument("--end",         default=None, help="기간 종료일 YYYY-MM-DD")
+    parser.add_argument("--db",          default=":memory:", help="리플레이 포지션 DB 경로")
+    parser.add_argument("--csv",         default=None, help="거래 CSV 저장 경로")
+    args = parser.parse_args()
+
+    symbols = args.symbols or DEFAULT_SYMBOLS[args.bucket]
+    # 신뢰도 스캐너 Alpha 기준(QQQ) · B2 배분 엔진 유니버스는 피드에 함께 싣는다
+    extra = ["QQQ"] if args.bucket == "squeeze" else ["QQQ", "SPY", "TQQQ", "SOXL", "FNGU", "LABU"]
+    universe = list(dict.fromkeys(symbols + extra))
+    days = args.days + args.warmup_days
+    dfs = fetch_data(universe, days=days, interval={"1Min": "1m", "5Min": "5m"}[args.interval],
+                     offline=args.offline, store_dir=args.store, end=args.end)
+    if not dfs:
+        print("ERROR: 데이터를 가져올 수 없습니다.")
+        sys.exit(1)
+
+    last = max(df.index[-1] for df in dfs.values())
+    trade_from = (last - pd.Timedelta(days=int(args.days * 7 / 5))).normalize()
+    strat = (SqueezeReplay(symbols) if args.bucket == "squeeze" else EtfSwingReplay(alloc=args.alloc))
+    regime = MarketRegime(regime=args.regime, vix=args.vix)
+
+    t0 = time.perf_counter()
+    result = run_replay(dfs, load_config(args.config), [strat], initial_cash=args.cash,
+                        base=args.interval, trade_from=trade_from, regime=regime, vix=args.vix,
+                        db_path=args.db)
+    logging.info("리플레이 %.1f초", time.perf_counter() - t0)
+
+    print_report(result)
+    if args.csv:
+        Path(args.csv).parent.mkdir(parents=True, exist_ok=True)
+        to_csv(result, args.csv)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,11 +14,21 @@ def print_report(result: Dict[str, Any]) -> None:
     print(f"  총 거래 수        : {len(trades)}")
     print(f"  총 손익           : ${result.get('total_pnl', 0):.2f}")
     print(f"  승률              : {result.get('win_rate', 0) * 100:.1f}%")
-    print(f"  최대 낙폭         : {result.get('max_drawdown_pct', 0):.2f}%")
-    print(f"  샤프 지수(근사)   : {result.get('sharpe_approx', 0):.2f}")
+    print(f"  최대 낙폭(장중)   : {result.get('max_drawdown_pct', 0):.2f}%")
+    rolling = result.get("rolling_drawdown")
+    if rolling is not None and not rolling.empty:
+        print(f"  현재 30일 낙폭    : {rolling.iloc[-1]:.2f}%")
+    print(f"  샤프 (일간)       : {result.get('sharpe_approx', 0):.2f}")
+    print(f"  소르티노 (일간)   : {result.get('sortino', 0):.2f}")
+    print(f"  평균 노출         : {result.get('exposure_pct', 0):.1f}%"
+          f"  (보유 시간 {result.get('time_in_market_pct', 0):.1f}%)")
+    print(f"  회전율            : {result.get('turnover', 0):.2f}x")
     print("-" * 55)
 
     df = result.get("summary_df")
+    if df is not None and not df.empty and "mae_pct" in df.columns:
+        print(f"  평균 MAE / MFE    : {df['mae_pct'].mean():+.2f}% / {df['mfe_pct'].mean():+.2f}%")
+        print("-" * 55)
     if df is not None and not df.empty:
         print("\n  [상위 5개 거래]")
         top = df.nlargest(5, "pnl")[["symbol", "entry_price", "exit_price", "pnl", "pnl_pct", "exit_reason"]]
@@ -21,7 +21,15 @@
   # CSV 저장
   python -m backtest.run --bucket etf_swing --csv results/etf_swing.csv
 
-데이터 한계:
+  # 체결 모델 — 다음 봉 시가 · IOC 지정가 진입 · 거래량 참여율 상한 (config fills)
+  python -m backtest.run --bucket squeeze --fills
+
+  # 오프라인 — 로컬 봉 저장소(storage/bars)만 사용, 네트워크 없음
+  python -m backtest.run --bucket squeeze --days 120 --offline
+  python -m backtest.run --bucket etf_swing --offline --end 2024-06-28
+
+데이터:
+  봉은 data.bar_store (Parquet, 종목×타임프레임×월) 에 누적 — 온라인 실행은 마지막 봉 이후만 받음
   yfinance 1분봉 → 최근 60일만 제공
   yfinance 일봉  → 5년치 가능
   갭업 필터(B3)  → open/prev_close 비율로 근사
@@ -40,7 +48,9 @@ import yaml
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 from backtest.engine import run_backtest
+from backtest.vector_engine import run_backtest_vectorized
 from backtest.report import print_report, to_csv
+from trader.fill_model import FillModel
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 
@@ -54,14 +64,48 @@ DEFAULT_SYMBOLS = {
     "squeeze":    ["TSLA", "NVDA", "AMD", "MARA", "RIOT", "SOUN", "MSTR", "GME", "AMC", "PLTR"],
 }
 
+MAX_POSITIONS = {"value_long": 2, "etf_swing": 3, "squeeze": 3}
+
+
+def bucket_window(bucket: str, days: int | None, offline: bool = False) -> tuple[int, str]:
+    """버킷별 기본 기간/인터벌 → (days, interval)."""
+    if not days:
+        days = 60 if bucket == "squeeze" else 365
+
+    # yfinance 인터벌 제한:
+    #   1m  → 최근 7일만
+    #   5m  → 최근 60일
+    #   1d  → 5년+
+    if bucket == "squeeze":
+        if days > 60 and not offline:
+            logging.warning("yfinance 5분봉은 최대 60일. days=60으로 조정합니다.")
+            days = 60
+        return days, "5m"
+    return days, "1d"
+
 
 # ─────────────────────────────────────────────────────────────────────
 # 데이터 페치
 # ─────────────────────────────────────────────────────────────────────
 
-def fetch_data(symbols: list[str], days: int, interval: str) -> dict[str, pd.DataFrame]:
-    """Alpaca Historical Data API로 OHLCV 데이터 페치."""
-    from data.alpaca_bars import fetch_bars
+def fetch_data(
+    symbols:   list[str],
+    days:      int,
+    interval:  str,
+    offline:   bool = False,
+    store_dir: str | None = None,
+    end:       str | None = None,
+) -> dict[str, pd.DataFrame]:
+    """
+    OHLCV 로드 — 로컬 Parquet 봉 저장소(data.bar_store) 경유.
+
+    online : 저장소를 Alpaca 로 증분 동기화 (종목별 마지막 저장 봉 이후만 다운로드) 후 디스크에서 읽음
+    offline: 네트워크 없이 저장소의 봉만 사용. end 미지정 시 저장된 마지막 봉 기준으로
+             기간을 잡으므로 같은 저장소면 언제 돌려도 같은 결과.
+    """
+    from datetime import datetime, timedelta, timezone
+
+    from data.bar_store import DEFAULT_ROOT, BarStore
 
     _tf_map = {
         "1d": ("1Day",  days),
@@ -69,24 +113,39 @@ def fetch_data(symbols: list[str], days: int, interval: str) -> dict[str, pd.Dat
         "5m": ("5Min",  days * 78),
     }
     tf, limit = _tf_map.get(interval, ("1Day", days))
+    store = BarStore(store_dir or DEFAULT_ROOT)
 
-    dfs = {}
-    logging.info("데이터 다운로드: %d종목 / %s / %dd", len(symbols), interval, days)
+    if end:
+        end_ts = pd.Timestamp(end, tz="UTC") + pd.Timedelta(days=1) - pd.Timedelta(1, "ns")
+    elif offline:
+        lasts  = [t for t in (store.last_timestamp(s, tf) for s in symbols) if t is not None]
+        end_ts = max(lasts) if lasts else pd.Timestamp.now(tz="UTC")
+    else:
+        end_ts = pd.Timestamp(datetime.now(timezone.utc))
+    # 거래일 → 달력일 환산 (주말/휴장 여유 포함)
+    start = end_ts - timedelta(days=int(days * 7 / 5) + 10)
 
-    for sym in symbols:
+    if offline:
+        logging.info("오프라인 로드: %d종목 / %s / %dd (~%s)", len(symbols), interval, days, end_ts.date())
+    else:
+        logging.info("데이터 동기화: %d종목 / %s / %dd", len(symbols), interval, days)
         try:
-            df = fetch_bars(sym, tf, limit)
-            if df is None or df.empty:
-                logging.warning("%s: 데이터 없음", sym)
-                continue
-            df = df[["open", "high", "low", "close", "volume"]].dropna()
-            if len(df) < 20:
-                logging.warning("%s: 데이터 부족 (%d봉)", sym, len(df))
-                continue
-            dfs[sym] = df
-            logging.info("  %s: %d봉", sym, len(df))
-        except Exception as e:
-            logging.warning("%s: 페치 실패 — %s", sym, e)
+            store.sync(symbols, tf, start.to_pydatetime())
+        except RuntimeError as exc:
+            logging.error("데이터 동기화 실패 — 저장된 봉으로 진행: %s", exc)
+
+    dfs = {}
+    for sym in symbols:
+        df = store.read(sym, tf, start=start, end=end_ts).tail(limit)
+        if df.empty:
+            logging.warning("%s: 데이터 없음", sym)
+            continue
+        df = df[["open", "high", "low", "close", "volume"]].dropna()
+        if len(df) < 20:
+            logging.warning("%s: 데이터 부족 (%d봉)", sym, len(df))
+            continue
+        dfs[sym] = df
+        logging.info("  %s: %d봉", sym, len(df))
 
     return dfs
 
@@ -95,14 +154,21 @@ def fetch_data(symbols: list[str], days: int, interval: str) -> dict[str, pd.Dat
 # 버킷별 설정 로더
 # ─────────────────────────────────────────────────────────────────────
 
-def load_bucket_cfg(bucket: str, config_path: str = "config.yaml") -> tuple[dict, dict]:
-    """config.yaml에서 버킷별 + risk 설정 로드."""
+def load_config(config_path: str = "config.yaml") -> dict:
     try:
         with open(config_path, "r") as f:
-            cfg = yaml.safe_load(f) or {}
+            return yaml.safe_load(f) or {}
     except FileNotFoundError:
-        cfg = {}
+        return {}
 
+
+def load_bucket_cfg(bucket: str, config_path: str = "config.yaml") -> tuple[dict, dict]:
+    """config.yaml에서 버킷별 + risk 설정 로드."""
+    return bucket_cfg(load_config(config_path), bucket)
+
+
+def bucket_cfg(cfg: dict, bucket: str) -> tuple[dict, dict]:
+    """설정 dict → (모멘텀 진입 설정, 리스크 설정). 스윕은 섹션 값을 바꾼 dict 로 호출."""
     risk_cfg = cfg.get("risk", {
         "stop_loss_pct": 0.05,
         "take_profit_pct": 0.10,
@@ -123,11 +189,11 @@ def load_bucket_cfg(bucket: str, config_path: str = "config.yaml") -> tuple[dict
             "rsi_entry_max": 75.0,
             "require_macd_positive": True,
         })
-        # B3: 더 공격적인 손익 설정
+        # B3: 더 공격적인 손익 설정 — squeeze 섹션 값이 risk 공통값을 덮어씀
         risk_cfg = dict(risk_cfg)
-        risk_cfg.setdefault("stop_loss_pct",      cfg.get("squeeze", {}).get("scalp_sl_pct", 0.05))
-        risk_cfg.setdefault("take_profit_pct",    cfg.get("squeeze", {}).get("scalp_tp_pct", 0.20))
-        risk_cfg.setdefault("atr_multiplier",     cfg.get("squeeze", {}).get("atr_multiplier", 3.0))
+        risk_cfg["stop_loss_pct"]   = cfg.get("squeeze", {}).get("scalp_sl_pct", 0.05)
+        risk_cfg["take_profit_pct"] = cfg.get("squeeze", {}).get("scalp_tp_pct", 0.20)
+        risk_cfg["atr_multiplier"]  = cfg.get("squeeze", {}).get("atr_multiplier", 3.0)
 
     elif bucket == "etf_swing":
         mom_cfg = {
@@ -158,6 +224,34 @@ def load_bucket_cfg(bucket: str, config_path: str = "config.yaml") -> tuple[dict
     return mom_cfg, risk_cfg
 
 
+# bucket_cfg 가 엔진에 넘기는 키 — 스윕 그리드 검증용
+RISK_KEYS = (
+    "stop_loss_pct", "take_profit_pct", "trailing_stop_pct", "trail_after_profit_pct",
+    "rsi_overbought_exit", "eod_exit_minutes_before_close", "atr_multiplier", "per_trade_risk_pct",
+)
+MOMENTUM_KEYS = (
+    "lookback_minutes", "min_intraday_change_pct", "vol_spike_ratio",
+    "min_price_usd", "rsi_entry_max", "require_macd_positive",
+)
+# 버킷 섹션 키 → 덮어쓰는 risk 키
+BUCKET_RISK_KEYS = {
+    "squeeze":    {"scalp_sl_pct": "stop_loss_pct", "scalp_tp_pct": "take_profit_pct",
+                   "atr_multiplier": "atr_multiplier"},
+    "etf_swing":  {"swing_sl_pct": "stop_loss_pct", "swing_tp_pct": "take_profit_pct"},
+    "value_long": {"stop_loss_pct": "stop_loss_pct", "take_profit_pct": "take_profit_pct"},
+}
+
+
+def bucket_keys(bucket: str) -> set[str]:
+    """bucket_cfg 가 실제로 읽는 "섹션.키" 집합 (버킷 섹션이 덮어쓴 risk 키는 제외)."""
+    own = BUCKET_RISK_KEYS[bucket]
+    keys = {f"risk.{k}" for k in RISK_KEYS if k not in own.values()}
+    keys |= {f"{bucket}.{k}" for k in own}
+    if bucket == "squeeze":
+        keys |= {f"momentum_rules.{k}" for k in MOMENTUM_KEYS}
+    return keys
+
+
 # ─────────────────────────────────────────────────────────────────────
 # 메인
 # ─────────────────────────────────────────────────────────────────────
@@ -177,47 +271,45 @@ def main():
                         help="결과 CSV 저장 경로 (예: results/etf_swing.csv)")
     parser.add_argument("--config",  default="config.yaml",
                         help="설정 파일 경로")
+    parser.add_argument("--engine",  default="vector", choices=["vector", "loop"],
+                        help="백테스트 엔진 (vector: 벡터화, loop: 기존 봉 루프 — 결과 동일)")
+    parser.add_argument("--fills",   action="store_true",
+                        help="체결 모델 적용 (config fills — 다음 봉 시가 · IOC 진입 · 참여율 상한)")
+    parser.add_argument("--offline", action="store_true",
+                        help="네트워크 없이 로컬 봉 저장소만 사용")
+    parser.add_argument("--store",   default=None,
+                        help="봉 저장소 경로 (기본: storage/bars)")
+    parser.add_argument("--end",     default=None,
+                        help="기간 종료일 YYYY-MM-DD (기본: 온라인=오늘, 오프라인=저장된 마지막 봉)")
     args = parser.parse_args()
 
     bucket  = args.bucket
     symbols = args.symbols or DEFAULT_SYMBOLS[bucket]
 
-    # 버킷별 기본 기간/인터벌
-    if args.days:
-        days = args.days
-    else:
-        days = 60 if bucket == "squeeze" else 365
-
-    # yfinance 인터벌 제한:
-    #   1m  → 최근 7일만
-    #   5m  → 최근 60일
-    #   1d  → 5년+
-    if bucket == "squeeze":
-        interval = "5m"
-        if days > 60:
-            logging.warning("yfinance 5분봉은 최대 60일. days=60으로 조정합니다.")
-            days = 60
-    else:
-        interval = "1d"
+    days, interval = bucket_window(bucket, args.days, args.offline)
 
     print(f"\n{'='*55}")
     print(f"  백테스트: {bucket.upper()}")
     print(f"  종목: {', '.join(symbols)}")
-    print(f"  기간: {days}일  |  인터벌: {interval}  |  자본: ${args.cash:,.0f}")
+    print(f"  기간: {days}일  |  인터벌: {interval}  |  자본: ${args.cash:,.0f}"
+          f"{'  |  오프라인' if args.offline else ''}{'  |  체결 모델' if args.fills else ''}")
     print(f"{'='*55}\n")
 
     # 데이터 페치
-    dfs = fetch_data(symbols, days=days, interval=interval)
+    dfs = fetch_data(symbols, days=days, interval=interval,
+                     offline=args.offline, store_dir=args.store, end=args.end)
     if not dfs:
         print("ERROR: 데이터를 가져올 수 없습니다.")
         sys.exit(1)
 
     # 버킷 설정 로드
-    mom_cfg, risk_cfg = load_bucket_cfg(bucket, config_path=args.config)
+    cfg = load_config(args.config)
+    mom_cfg, risk_cfg = bucket_cfg(cfg, bucket)
 
     # 백테스트 실행
-    max_pos = {"value_long": 2, "etf_swing": 3, "squeeze": 3}[bucket]
-    result  = run_backtest(
+    max_pos = MAX_POSITIONS[bucket]
+    engine  = run_backtest_vectorized if args.engine == "vector" else run_backtest
+    result  = engine(
         symbol_dfs          = dfs,
         mom_cfg             = mom_cfg,
         risk_cfg            = risk_cfg,
@@ -225,6 +317,7 @@ def main():
         max_positions       = max_pos,
         risk_per_trade_pct  = float(risk_cfg.get("per_trade_risk_pct", 0.01)),
         atr_multiplier      = float(risk_cfg.get("atr_multiplier", 2.0)),
+        fill_model          = FillModel.from_cfg(cfg.get("fills")) if args.fills else None,
     )
 
     # 결과 출력
@@ -0,0 +1,301 @@
+# backtest/sweep.py
+"""
+파라미터 그리드 스윕 — config.yaml 섹션 값 조합을 프로세스 풀로 병렬 백테스트.
+
+사용법:
+  # B3 손절 × 익절 × 거래량 스파이크 (3×3×3 = 27 조합)
+  python -m backtest.sweep --bucket squeeze --offline \\
+      --grid squeeze.scalp_sl_pct=0.03,0.05,0.08 \\
+      --grid squeeze.scalp_tp_pct=0.10,0.20,0.30 \\
+      --grid momentum_rules.vol_spike_ratio=1.5,2,3
+
+  # 그리드 파일 (섹션.키: [값, ...])
+  python -m backtest.sweep --bucket etf_swing --grid-file sweeps/etf.yaml --out results/etf_sweep.csv
+
+구조:
+  - 봉 데이터는 부모가 1회 로드 → SharedMemory 한 블록(timestamp int64 + OHLCV float64)에 적재
+  - 워커는 초기화 때 블록에 붙어 종목별 DataFrame 을 1회 구성 (조합마다 데이터 복사·피클 없음)
+  - 조합마다 설정 dict 사본에 값만 덮어써 backtest.run.bucket_cfg → run_backtest_vectorized
+  - 결과: 조합별 Sharpe · Profit Factor · 최대 낙폭 · 거래 수 · 손익 · 승률 한 표 (CSV)
+
+grid 키는 config.yaml 섹션 경로 (squeeze / etf_swing / value_long / risk / momentum_rules).
+값은 YAML 스칼라로 해석 (0.05, 2, true ...).
+버킷 손절·익절(squeeze 는 ATR 배수 포함)은 bucket_cfg 가 섹션 키(scalp_sl_pct · swing_sl_pct ·
+stop_loss_pct 등)로 risk.* 를 덮어쓰므로 해당 섹션 키로 지정해야 한다.
+bucket_cfg 가 읽지 않는 키는 check_grid 가 실행 전에 거부한다.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import fields as dataclass_fields
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backtest.metrics import profit_factor
+from backtest.run import (
+    DEFAULT_SYMBOLS, MAX_POSITIONS, bucket_cfg, bucket_keys, bucket_window, fetch_data, load_config,
+)
+from backtest.vector_engine import run_backtest_vectorized
+from trader.fill_model import FillModel
+
+_OHLCV = ["open", "high", "low", "close", "volume"]
+
+# (symbol, 시작 행, 끝 행, tz) — 공유 블록 안 종목별 구간
+Layout = List[Tuple[str, int, int, Optional[str]]]
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 그리드
+# ─────────────────────────────────────────────────────────────────────
+
+def parse_grid(items: List[str]) -> Dict[str, list]:
+    """["risk.stop_loss_pct=0.03,0.05", ...] → {"risk.stop_loss_pct": [0.03, 0.05]}."""
+    grid: Dict[str, list] = {}
+    for item in items:
+        key, sep, vals = item.partition("=")
+        if not sep or "." not in key:
+            raise ValueError(f"grid 형식 오류 (섹션.키=값,값): {item}")
+        grid[key.strip()] = [yaml.safe_load(v) for v in vals.split(",") if v.strip()]
+    return grid
+
+
+def check_grid(keys, bucket: str, fills: bool = False) -> None:
+    """버킷 백테스트가 읽지 않는 그리드 키 → ValueError (값을 바꿔도 결과가 같은 조합 방지)."""
+    known = bucket_keys(bucket)
+    if fills:
+        known |= {f"fills.{f.name}" for f in dataclass_fields(FillModel)}
+    unread = sorted(set(keys) - known)
+    if unread:
+        raise ValueError(f"{bucket} 백테스트가 읽지 않는 grid 키: {', '.join(unread)}")
+
+
+def expand_grid(grid: Dict[str, list]) -> List[Dict[str, Any]]:
+    """키 정렬 순서의 데카르트 곱 → 조합 dict 리스트."""
+    keys = sorted(grid)
+    return [dict(zip(keys, combo)) for combo in itertools.product(*(grid[k] for k in keys))]
+
+
+def apply_params(cfg: dict, params: Dict[str, Any]) -> dict:
+    """설정 dict 사본에 "섹션.키" 값 덮어쓰기 (중첩 경로 허용)."""
+    out = copy.deepcopy(cfg)
+    for path, val in params.items():
+        node = out
+        *parents, leaf = path.split(".")
+        for p in parents:
+            node = node.setdefault(p, {})
+        node[leaf] = val
+    return out
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 공유 메모리 봉 데이터
+# ─────────────────────────────────────────────────────────────────────
+
+def pack_bars(dfs: Dict[str, pd.DataFrame]) -> Tuple[shared_memory.SharedMemory, Layout, int]:
+    """종목별 OHLCV → SharedMemory [timestamp ns (n) | OHLCV (n×5)]. 반환 블록은 호출부가 unlink."""
+    layout: Layout = []
+    total = 0
+    for sym, df in dfs.items():
+        tz = str(df.index.tz) if getattr(df.index, "tz", None) is not None else None
+        layout.append((sym, total, total + len(df), tz))
+        total += len(df)
+
+    shm = shared_memory.SharedMemory(create=True, size=max(total, 1) * 8 * (1 + len(_OHLCV)))
+    ts, vals = _views(shm, total)
+    for (sym, lo, hi, _), df in zip(layout, dfs.values()):
+        ts[lo:hi]   = pd.DatetimeIndex(df.index).as_unit("ns").asi8
+        vals[lo:hi] = df[_OHLCV].to_numpy(float)
+    return shm, layout, total
+
+
+def _views(shm: shared_memory.SharedMemory, total: int) -> Tuple[np.ndarray, np.ndarray]:
+    ts   = np.ndarray((total,), dtype=np.int64, buffer=shm.buf)
+    vals = np.ndarray((total, len(_OHLCV)), dtype=np.float64, buffer=shm.buf, offset=total * 8)
+    return ts, vals
+
+
+def unpack_bars(shm: shared_memory.SharedMemory, layout: Layout, total: int) -> Dict[str, pd.DataFrame]:
+    """공유 블록 → 종목별 DataFrame (읽기 전용 뷰 위에 구성)."""
+    ts, vals = _views(shm, total)
+    ts.flags.writeable = vals.flags.writeable = False
+    out: Dict[str, pd.DataFrame] = {}
+    for sym, lo, hi, tz in layout:
+        idx = pd.DatetimeIndex(ts[lo:hi].view("datetime64[ns]"))
+        if tz:
+            idx = idx.tz_localize("UTC").tz_convert(tz)
+        out[sym] = pd.DataFrame(vals[lo:hi], index=idx, columns=_OHLCV, copy=False)
+    return out
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 워커
+# ─────────────────────────────────────────────────────────────────────
+
+_W: Dict[str, Any] = {}   # 워커 프로세스 전역 (초기화 1회)
+
+
+def _init_worker(shm_name: str, layout: Layout, total: int, base_cfg: dict, opts: dict) -> None:
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _W.update(shm=shm, dfs=unpack_bars(shm, layout, total), cfg=base_cfg, opts=opts)
+
+
+def backtest_combo(params: Dict[str, Any], dfs: Dict[str, pd.DataFrame], base_cfg: dict, opts: dict) -> dict:
+    """
+    조합 1개 백테스트 → run_backtest_vectorized 결과 dict (opts: bucket, cash, trade_from, fills).
+
+    opts["fills"] 가 참이면 설정 fills 섹션의 체결 모델 사용 (fills.* 도 그리드 키로 스윕 가능).
+    """
+    bucket = opts["bucket"]
+    cfg    = apply_params(base_cfg, params)
+    mom_cfg, risk_cfg = bucket_cfg(cfg, bucket)
+    return run_backtest_vectorized(
+        symbol_dfs          = dfs,
+        mom_cfg             = mom_cfg,
+        risk_cfg            = risk_cfg,
+        initial_cash        = opts["cash"],
+        max_positions       = MAX_POSITIONS[bucket],
+        risk_per_trade_pct  = float(risk_cfg.get("per_trade_risk_pct", 0.01)),
+        atr_multiplier      = float(risk_cfg.get("atr_multiplier", 2.0)),
+        trade_from          = opts.get("trade_from"),
+        fill_model          = FillModel.from_cfg(cfg.get("fills")) if opts.get("fills") else None,
+    )
+
+
+def result_metrics(res: dict) -> dict:
+    """백테스트 결과 → 스윕 표 지표 컬럼."""
+    summary = res["summary_df"]
+    pnl = summary["pnl"] if not summary.empty else pd.Series(dtype=float)
+    return {
+        "trades":           len(res["trades"]),
+        "sharpe":           round(res["sharpe_approx"], 4),
+        "sortino":          round(res["sortino"], 4),
+        "profit_factor":    round(profit_factor(pnl), 4),
+        "max_drawdown_pct": round(res["max_drawdown_pct"], 4),
+        "total_pnl":        round(res["total_pnl"], 2),
+        "win_rate":         round(res["win_rate"] * 100, 2),
+    }
+
+
+def run_combo(params: Dict[str, Any], dfs: Dict[str, pd.DataFrame], base_cfg: dict, opts: dict) -> dict:
+    """조합 1개 백테스트 → 결과 행 (파라미터 + 지표)."""
+    return {**params, **result_metrics(backtest_combo(params, dfs, base_cfg, opts))}
+
+
+def _worker_run(params: Dict[str, Any]) -> dict:
+    return run_combo(params, _W["dfs"], _W["cfg"], _W["opts"])
+
+
+def sweep(
+    dfs:      Dict[str, pd.DataFrame],
+    combos:   List[Dict[str, Any]],
+    base_cfg: dict,
+    bucket:   str,
+    cash:     float = 14_800.0,
+    workers:  Optional[int] = None,
+    fills:    bool = False,
+) -> pd.DataFrame:
+    """
+    조합 전체를 프로세스 풀로 실행 → 결과 DataFrame (입력 조합 순서).
+
+    workers=1 이면 풀 없이 현재 프로세스에서 순차 실행. fills=True 면 체결 모델 적용.
+    """
+    for p in combos:
+        check_grid(p, bucket, fills)
+    opts    = {"bucket": bucket, "cash": cash, "fills": fills}
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(combos) <= 1:
+        return pd.DataFrame([run_combo(p, dfs, base_cfg, opts) for p in combos])
+
+    shm, layout, total = pack_bars(dfs)
+    try:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(combos)),
+            initializer=_init_worker,
+            initargs=(shm.name, layout, total, base_cfg, opts),
+        ) as pool:
+            chunk = max(1, len(combos) // (workers * 4))
+            rows  = list(pool.map(_worker_run, combos, chunksize=chunk))
+    finally:
+        shm.close()
+        shm.unlink()
+    return pd.DataFrame(rows)
+
+
+# ─────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="백테스트 파라미터 그리드 스윕")
+    parser.add_argument("--bucket",    default="squeeze", choices=list(MAX_POSITIONS))
+    parser.add_argument("--grid",      action="append", default=[],
+                        help="섹션.키=값,값,... (반복 지정)")
+    parser.add_argument("--grid-file", default=None,
+                        help="YAML 그리드 파일 ({섹션.키: [값, ...]})")
+    parser.add_argument("--symbols",   nargs="+", default=None)
+    parser.add_argument("--days",      type=int, default=None)
+    parser.add_argument("--cash",      type=float, default=14_800.0)
+    parser.add_argument("--config",    default="config.yaml")
+    parser.add_argument("--workers",   type=int, default=None,
+                        help="프로세스 수 (기본: 전체 코어)")
+    parser.add_argument("--offline",   action="store_true",
+                        help="네트워크 없이 로컬 봉 저장소만 사용")
+    parser.add_argument("--store",     default=None, help="봉 저장소 경로 (기본: storage/bars)")
+    parser.add_argument("--end",       default=None, help="기간 종료일 YYYY-MM-DD")
+    parser.add_argument("--fills",     action="store_true",
+                        help="체결 모델 적용 (config fills — 다음 봉 시가 · IOC 진입 · 참여율 상한)")
+    parser.add_argument("--sort",      default="sharpe",
+                        choices=["sharpe", "sortino", "profit_factor", "total_pnl", "max_drawdown_pct"])
+    parser.add_argument("--out",       default="results/sweep.csv", help="결과 CSV 경로")
+    args = parser.parse_args()
+
+    grid = {}
+    if args.grid_file:
+        with open(args.grid_file, "r") as f:
+            grid.update({k: list(v) for k, v in (yaml.safe_load(f) or {}).items()})
+    grid.update(parse_grid(args.grid))
+    if not grid:
+        parser.error("--grid 또는 --grid-file 필요")
+    try:
+        check_grid(grid, args.bucket, args.fills)
+    except ValueError as exc:
+        parser.error(str(exc))
+    combos = expand_grid(grid)
+
+    days, interval = bucket_window(args.bucket, args.days, args.offline)
+    symbols = args.symbols or DEFAULT_SYMBOLS[args.bucket]
+    dfs = fetch_data(symbols, days=days, interval=interval,
+                     offline=args.offline, store_dir=args.store, end=args.end)
+    if not dfs:
+        print("ERROR: 데이터를 가져올 수 없습니다.")
+        sys.exit(1)
+
+    workers = args.workers or os.cpu_count() or 1
+    print(f"\n스윕: {args.bucket} / {len(combos)}조합 / {len(dfs)}종목 / {workers}프로세스")
+    t0 = time.perf_counter()
+    table = sweep(dfs, combos, load_config(args.config), args.bucket, args.cash, workers, args.fills)
+    elapsed = time.perf_counter() - t0
+
+    table = table.sort_values(args.sort, ascending=False)    # 낙폭은 음수 → 0 에 가까울수록 위
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(args.out, index=False, encoding="utf-8-sig")
+
+    print(table.head(15).to_string(index=False))
+    print(f"\n{len(combos)}조합 {elapsed:.1f}초 → {os.path.abspath(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
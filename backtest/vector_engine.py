@@ -0,0 +1,394 @@
+# backtest/vector_engine.py
+"""
+벡터화 포트폴리오 백테스트 — backtest.engine.run_backtest 와 같은 입력·같은 거래.
+
+기존 엔진은 합집합 타임스탬프마다 종목별 df.loc / get_loc / `ts in index` 를 호출하고,
+RSI 과매수 청산을 df.loc[:ts] 전체로 재계산해 봉 수에 대해 2차 비용이 든다.
+여기서는 종목별로 한 번만 계산해 (시간 × 종목) 조밀 행렬에 정렬한다.
+
+  - 진입 후보 마스크: 변동률 · 최소가 · 거래량 스파이크를 배열로 (momentum_entry 의 필요조건)
+                     → 후보 봉에서만 윈도 RSI/MACD 확인 (momentum_entry 와 같은 compute_rsi /
+                       compute_macd 를 같은 윈도에 적용 — 전체 compute_indicators 생략)
+  - 청산 마스크:      RSI 과매수(전체 이력 RSI) · EOD 는 종목별 배열,
+                     손절 · 익절+트레일링은 진입가 기준이라 진입 시점에 이후 구간을 배열로 탐색
+                     → 포지션마다 청산 봉·사유를 진입 즉시 확정
+  - 루프:            현금 · 보유만 봉 단위로 (보유 수 ≤ max_positions)
+  - 자산 곡선:        체결 이벤트 → 보유 수량 행렬 × 종가 행렬 (backtest.metrics) 한 번에
+
+사이징(IndicatorState ATR)·합산 순서·체결가까지 기존 엔진과 같게 두어 거래 목록이 정확히 일치한다.
+fill_model 을 주면 기존 엔진과 같은 규칙(다음 봉 시가 도착 · IOC 진입 · 잔량 재주문 청산)으로 체결하며,
+청산 체결 일정(봉별 수량·가격)도 진입 시점에 참여율 상한 누적합으로 한 번에 계산한다.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtest.engine import BacktestTrade, _close_trade, _fill_entry, _last_valid, summarize
+from backtest.metrics import holdings_value, position_matrix
+from strategy.entries import momentum_entry
+from strategy.exits import ET, eod_exit
+from strategy.indicator_state import IndicatorState
+from strategy.signals import compute_macd, compute_rsi
+from strategy.sizing import atr_position_size, budget_cap_size
+from trader.fill_model import FillModel
+
+_SCAN_CHUNK = 256       # 청산 탐색 첫 구간 (봉) — 못 찾으면 두 배씩 확장
+_VOL_SLACK  = 1e-9      # 롤링 평균 반올림 오차 여유 — 경계값 봉은 momentum_entry 로 재판정
+
+
+@dataclass
+class _SymbolArrays:
+    df:        pd.DataFrame
+    close:     np.ndarray
+    rows:      np.ndarray       # 종목 행 → 공통 시계열 위치
+    candidate: np.ndarray       # 진입 후보 (필요조건 통과)
+    vol_clear: np.ndarray       # 거래량 조건을 오차 여유 밖에서 통과 (경계값이면 원 함수로 판정)
+    rsi_exit:  np.ndarray
+    eod:       np.ndarray
+
+
+def _entry_candidates(
+    df: pd.DataFrame, mom_cfg: dict, lookback_bars: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    momentum_entry(df.iloc[:i+1]) 가 True 일 수 있는 봉 — RSI/MACD 이전 조건만 배열로.
+
+    Returns: (후보 마스크, 거래량 조건 확실 통과 마스크)
+    """
+    n = len(df)
+    if not {"close", "volume"}.issubset(df.columns):
+        return np.zeros(n, dtype=bool), np.zeros(n, dtype=bool)
+    close  = df["close"].to_numpy(float)
+    volume = df["volume"].to_numpy(float)
+    i      = np.arange(n)
+
+    window = max(int(mom_cfg.get("lookback_minutes", 120)), 30)
+    first  = close[np.maximum(i + 1 - window, 0)]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change_pct = (close - first) / first * 100.0
+
+    # 윈도 길이 ≥ 20 → 직전 20봉 평균, 미만 → 윈도(=처음부터) 평균
+    vol = pd.Series(volume)
+    avg = np.where(np.minimum(i + 1, window) >= 20,
+                   vol.rolling(20).mean().to_numpy(), vol.expanding().mean().to_numpy())
+    avg = np.where(avg == 0, 1.0, avg)
+
+    spike = float(mom_cfg.get("vol_spike_ratio", 2.0)) * avg
+    ok = i >= lookback_bars
+    ok &= ~(first <= 0)
+    ok &= ~(change_pct < float(mom_cfg.get("min_intraday_change_pct", 5.0)))
+    ok &= ~(volume < spike * (1.0 - _VOL_SLACK))
+    ok &= ~(close < float(mom_cfg.get("min_price_usd", 3.0)))
+    return ok, ~(volume < spike * (1.0 + _VOL_SLACK))
+
+
+def _confirm_entry(sa: _SymbolArrays, idx: int, mom_cfg: dict) -> bool:
+    """후보 봉 최종 판정 — momentum_entry 의 RSI 과매수 · MACD 히스토그램 조건."""
+    if not sa.vol_clear[idx]:
+        return momentum_entry(sa.df.iloc[: idx + 1], mom_cfg)
+    window = max(int(mom_cfg.get("lookback_minutes", 120)), 30)
+    close  = sa.df["close"].iloc[max(idx + 1 - window, 0): idx + 1]
+
+    rsi = compute_rsi(close).dropna()
+    if (float(rsi.iloc[-1]) if not rsi.empty else 50.0) > float(mom_cfg.get("rsi_entry_max", 75.0)):
+        return False
+    if mom_cfg.get("require_macd_positive", True):
+        hist = compute_macd(close)[2].dropna()
+        if not hist.empty and float(hist.iloc[-1]) <= 0:
+            return False
+    return True
+
+
+def _eod_mask(index: pd.Index, minutes_before_close: int) -> np.ndarray:
+    """eod_exit 배열판 — 벽시계 기준 16:00 ET 까지 남은 분 (DST 포함 동일 규칙)."""
+    if not isinstance(index, pd.DatetimeIndex) or index.tz is None:
+        return np.fromiter(
+            (eod_exit(ts.to_pydatetime(), minutes_before_close) for ts in index),
+            dtype=bool, count=len(index),
+        )
+    et = index.tz_convert(ET)
+    wall_us = ((et.hour * 60 + et.minute) * 60 + et.second).to_numpy(np.int64) * 1_000_000 \
+        + et.microsecond.to_numpy(np.int64)
+    mins = (16 * 3600 * 1_000_000 - wall_us) / 1_000_000 / 60.0
+    return (et.weekday.to_numpy() < 5) & (mins >= 0) & (mins <= minutes_before_close)
+
+
+def _rsi_exit_mask(close: pd.Series, threshold: float) -> np.ndarray:
+    """rsi_overbought_exit(df.loc[:ts]) — 전체 이력 RSI 의 최신 유효값(없으면 50) ≥ threshold."""
+    rsi = compute_rsi(close).ffill().fillna(50.0).to_numpy()
+    return rsi >= threshold
+
+
+def _prepare(
+    symbol_dfs:    Dict[str, Optional[pd.DataFrame]],
+    all_ts:        pd.DatetimeIndex,
+    mom_cfg:       dict,
+    risk_cfg:      dict,
+    lookback_bars: int,
+) -> Dict[str, _SymbolArrays]:
+    rsi_th  = float(risk_cfg.get("rsi_overbought_exit", 80.0))
+    eod_min = int(risk_cfg.get("eod_exit_minutes_before_close", 15))
+    out: Dict[str, _SymbolArrays] = {}
+    for sym, df in symbol_dfs.items():
+        if df is None:
+            continue
+        candidate, vol_clear = _entry_candidates(df, mom_cfg, lookback_bars)
+        out[sym] = _SymbolArrays(
+            df        = df,
+            close     = df["close"].to_numpy(float),
+            rows      = all_ts.get_indexer(df.index),
+            candidate = candidate,
+            vol_clear = vol_clear,
+            rsi_exit  = _rsi_exit_mask(df["close"], rsi_th),
+            eod       = _eod_mask(df.index, eod_min),
+        )
+    return out
+
+
+def _find_exit(sa: _SymbolArrays, j: int, entry: float, risk_cfg: dict) -> Tuple[int, str]:
+    """
+    j 행 진입 포지션의 첫 청산 행·사유 (없으면 (-1, "")).
+
+    기존 엔진과 같은 우선순위: stop_loss > trailing_stop(익절 도달 + 트레일링) > rsi_overbought > eod.
+    peak 는 진입가에서 시작해 종가 누적 최대 (NaN 무시 — Python max 와 동일).
+    """
+    sl_px    = entry * (1.0 - float(risk_cfg.get("stop_loss_pct", 0.05)))
+    tp_px    = entry * (1.0 + float(risk_cfg.get("take_profit_pct", 0.10)))
+    trail_at = entry * (1.0 + float(risk_cfg.get("trail_after_profit_pct", 0.10)))
+    trail_k  = 1.0 - float(risk_cfg.get("trailing_stop_pct", 0.02))
+
+    n, start, size, peak = len(sa.close), j + 1, _SCAN_CHUNK, entry
+    while start < n:
+        end  = min(start + size, n)
+        last = sa.close[start:end]
+        pk   = np.fmax(np.fmax.accumulate(last), peak)
+        stop  = last <= sl_px
+        trail = (last >= tp_px) & (pk >= trail_at) & (last <= pk * trail_k)
+        rsi   = sa.rsi_exit[start:end]
+        eod   = sa.eod[start:end]
+        hit   = np.flatnonzero(stop | trail | rsi | eod)
+        if hit.size:
+            k = int(hit[0])
+            reason = ("stop_loss" if stop[k] else "trailing_stop" if trail[k]
+                      else "rsi_overbought" if rsi[k] else "eod")
+            return start + k, reason
+        peak  = float(pk[-1])
+        start = end
+        size *= 2
+    return -1, ""
+
+
+def _exit_schedule(
+    model: FillModel, sa: _SymbolArrays, start: int, qty: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    start 봉부터 잔량이 없어질 때까지 봉마다 재주문하는 청산 체결 일정.
+
+    봉별 체결 수량 = min(잔량, 참여율 상한) → 상한 누적합을 주문 수량으로 자른 차분.
+    Returns: (종목 행, 수량, 수수료 차감 체결가) — 체결 없는 봉 제외
+    """
+    df, n = sa.df, len(sa.close)
+    volume = df["volume"].to_numpy(float)
+    rows, qtys, done, size = [], [], 0, _SCAN_CHUNK
+    while start < n and done < qty:
+        end = min(start + size, n)
+        cum = np.minimum(np.cumsum(np.floor(model.participation * volume[start:end])) + done, qty)
+        q   = np.diff(cum, prepend=done).astype(np.int64)
+        hit = np.flatnonzero(q > 0)
+        rows.append(start + hit)
+        qtys.append(q[hit])
+        done  = int(cum[-1])
+        start = end
+        size *= 2
+    rows = np.concatenate(rows) if rows else np.zeros(0, dtype=np.int64)
+    qtys = np.concatenate(qtys) if qtys else np.zeros(0, dtype=np.int64)
+    # 봉별 주문 수량 = 그 봉 직전 잔량 (충격 비용은 체결 수량 기준)
+    remain = qty - np.concatenate([[0], np.cumsum(qtys)[:-1]])
+    _, px = model.exit_order(remain, df["open"].to_numpy(float)[rows], df["high"].to_numpy(float)[rows],
+                             df["low"].to_numpy(float)[rows], volume[rows])
+    return rows, qtys, px - model.commission_per_share
+
+
+@dataclass
+class _Pos:
+    trade:    BacktestTrade
+    exit_row: int       # 공통 시계열 위치 (-1 = 데이터 끝까지 보유)
+    reason:   str
+    col:      int
+    # fill_model 사용 시 청산 체결 일정 (공통 시계열 위치 · 수량 · 체결가)
+    sched:    Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+    nxt:      int   = 0
+    sold:     int   = 0
+    proceeds: float = 0.0
+
+    @property
+    def held(self) -> int:
+        return self.trade.qty - self.sold
+
+
+def run_backtest_vectorized(
+    symbol_dfs: Dict[str, pd.DataFrame],
+    mom_cfg: dict,
+    risk_cfg: dict,
+    initial_cash: float = 100_000.0,
+    lookback_bars: int = 30,
+    max_positions: int = 3,
+    risk_per_trade_pct: float = 0.01,
+    atr_multiplier: float = 2.0,
+    trade_from: Optional[pd.Timestamp] = None,
+    fill_model: Optional[FillModel] = None,
+) -> dict:
+    """
+    run_backtest 와 같은 인자·같은 반환 dict (거래 목록 동일).
+
+    trade_from: 이 시각 이전 봉은 지표 워밍업으로만 사용 (진입·자산 기록은 이 시각부터).
+                워크포워드 구간 백테스트용 — None 이면 전체 구간.
+    fill_model: 체결 모델 — None 이면 신호 봉 종가에 전량 체결.
+    """
+    all_ts = sorted(
+        set(ts for df in symbol_dfs.values() if df is not None for ts in df.index)
+    )
+    ts_index = pd.DatetimeIndex(all_ts) if all_ts else pd.DatetimeIndex([])
+    arrays   = _prepare(symbol_dfs, ts_index, mom_cfg, risk_cfg, lookback_bars)
+    syms     = list(arrays)
+    n_ts     = len(all_ts)
+
+    # (시간 × 종목) 조밀 행렬: 종목 행 번호 (-1 = 해당 시각 봉 없음) · 종가
+    row_mat   = np.full((n_ts, len(syms)), -1, dtype=np.int64)
+    close_mat = np.full((n_ts, len(syms)), np.nan)
+    cand_mat  = np.zeros((n_ts, len(syms)), dtype=bool)
+    for c, sym in enumerate(syms):
+        sa = arrays[sym]
+        row_mat[sa.rows, c]   = np.arange(len(sa.rows))
+        close_mat[sa.rows, c] = sa.close
+        cand_mat[sa.rows, c]  = sa.candidate
+    cand_t, cand_c = np.nonzero(cand_mat)                  # 시각 → 종목 순서 (symbol_dfs 순)
+    cand_bounds    = np.searchsorted(cand_t, np.arange(n_ts + 1))
+
+    cash = initial_cash
+    open_pos: Dict[str, _Pos] = {}
+    all_trades: List[BacktestTrade] = []
+    # 봉별 현금 + 체결 이벤트 (봉, 종목 열, 수량 변화) — 자산 곡선은 끝나고 행렬로
+    cash_history: List[float] = []
+    events: List[tuple] = []
+    traded = 0.0
+    ind_states: Dict[str, IndicatorState] = {}
+    # 다음 봉 체결 대기 진입 주문 {symbol: (수량, 체결 공통 행, 종목 행, 열)}
+    pending: Dict[str, Tuple[int, int, int, int]] = {}
+
+    t0 = int(ts_index.searchsorted(pd.Timestamp(trade_from))) if trade_from is not None else 0
+    for t in range(t0, n_ts):
+        ts = all_ts[t]
+        # ── 대기 주문 체결 (이 봉 시가 도착) ──────────────────────
+        if fill_model is not None:
+            for sym in list(open_pos):
+                pos = open_pos[sym]
+                if pos.sched is None or pos.nxt >= len(pos.sched[0]) or pos.sched[0][pos.nxt] != t:
+                    continue
+                n, px = int(pos.sched[1][pos.nxt]), float(pos.sched[2][pos.nxt])
+                pos.nxt      += 1
+                pos.sold     += n
+                pos.proceeds += px * n
+                cash         += px * n
+                traded       += px * n
+                events.append((t - t0, pos.col, -n))
+                if pos.held == 0:
+                    all_trades.append(_close_trade(pos, ts, px, pos.reason))
+                    del open_pos[sym]
+            for sym in list(pending):
+                qty, row, idx, c = pending[sym]
+                if row != t:
+                    continue
+                del pending[sym]
+                sa = arrays[sym]
+                n, px = _fill_entry(fill_model, sa.df, idx, qty, cash)
+                if n <= 0:
+                    continue
+                cash   -= px * n
+                traded += px * n
+                events.append((t - t0, c, n))
+                trade = BacktestTrade(
+                    symbol=sym, strategy="momentum",
+                    entry_ts=ts, entry_price=px, qty=n,
+                )
+                # 체결 봉 종가부터 청산 검사 → 신호 다음 봉부터 청산 주문
+                k, reason = _find_exit(sa, idx - 1, px, risk_cfg)
+                sched = None
+                if k >= 0:
+                    rows, q, xpx = _exit_schedule(fill_model, sa, k + 1, n)
+                    sched = (sa.rows[rows], q, xpx)
+                open_pos[sym] = _Pos(trade, -1, reason, c, sched)
+
+        # ── 청산 (진입 시 확정한 청산 봉) ─────────────────────────
+        for sym in [s for s, p in open_pos.items() if p.exit_row == t]:
+            pos = open_pos.pop(sym)
+            last = float(close_mat[t, pos.col])
+            tr = pos.trade
+            tr.exit_ts, tr.exit_price, tr.exit_reason = ts, last, pos.reason
+            cash   += last * tr.qty
+            traded += last * tr.qty
+            events.append((t - t0, pos.col, -tr.qty))
+            all_trades.append(tr)
+
+        # ── 진입 (후보 봉만 momentum_entry 확인) ──────────────────
+        if len(open_pos) + len(pending) < max_positions:
+            for c in cand_c[cand_bounds[t]:cand_bounds[t + 1]]:
+                sym = syms[c]
+                if sym in open_pos or sym in pending:
+                    continue
+                sa  = arrays[sym]
+                idx = int(row_mat[t, c])
+                if not _confirm_entry(sa, idx, mom_cfg):
+                    continue
+
+                price = float(sa.close[idx])
+                st = ind_states.setdefault(sym, IndicatorState())
+                st.extend(sa.df.iloc[len(st): idx + 1])
+                atr = _last_valid(st, "atr_14")
+                equity = cash + sum(
+                    p.held * close_mat[t, p.col]
+                    for p in open_pos.values()
+                    if row_mat[t, p.col] >= 0
+                )
+                qty = atr_position_size(atr, equity, risk_per_trade_pct, price, atr_multiplier)
+                if qty == 0:
+                    qty = budget_cap_size(equity * risk_per_trade_pct * 10, price)
+                if qty <= 0 or price * qty > cash:
+                    continue
+
+                if fill_model is not None:
+                    if idx + 1 >= len(sa.rows):
+                        continue            # 다음 봉 없음 — 체결 불가, 슬롯을 잡지 않고 주문 폐기
+                    pending[sym] = (qty, int(sa.rows[idx + 1]), idx + 1, int(c))
+                else:
+                    trade = BacktestTrade(
+                        symbol=sym, strategy="momentum",
+                        entry_ts=ts, entry_price=price, qty=qty,
+                    )
+                    cash   -= price * qty
+                    traded += price * qty
+                    events.append((t - t0, int(c), qty))
+                    k, reason = _find_exit(sa, idx, price, risk_cfg)
+                    open_pos[sym] = _Pos(trade, int(sa.rows[k]) if k >= 0 else -1, reason, int(c))
+
+                if len(open_pos) + len(pending) >= max_positions:
+                    break
+
+        cash_history.append(cash)
+
+    # ── 미청산 포지션 강제 종료 (종목 마지막 봉) ──────────────────
+    for sym, pos in open_pos.items():
+        sa = arrays[sym]
+        reason = pos.reason if pos.sched is not None else "end_of_data"
+        traded += float(sa.close[-1]) * pos.held
+        all_trades.append(_close_trade(pos, sa.df.index[-1], float(sa.close[-1]), reason))
+
+    # ── 자산 평가 (보유 수량 행렬 × 종가 행렬) ──────────────────
+    rows, cols, dq = zip(*events) if events else ((), (), ())
+    holdings = holdings_value(position_matrix(n_ts - t0, len(syms), rows, cols, dq), close_mat[t0:])
+    return summarize(all_trades, np.asarray(cash_history) + holdings, all_ts[t0:],
+                     holdings=holdings, traded=traded, symbol_dfs=symbol_dfs)
@@ -0,0 +1,404 @@
+# backtest/walkforward.py
+"""
+워크포워드 최적화 — 롤링 학습/검증 구간마다 그리드 재최적화 → 표본 외(OOS) 자산 곡선.
+
+사용법:
+  # B3: 학습 15일 → 검증 5일, 손절 × 거래량 스파이크 재최적화
+  python -m backtest.walkforward --bucket squeeze --offline \\
+      --grid squeeze.scalp_sl_pct=0.03,0.05,0.08 \\
+      --grid momentum_rules.vol_spike_ratio=1.5,2,3
+
+  # B2: 학습 120일 → 검증 30일 (기본값), 그리드 파일
+  python -m backtest.walkforward --bucket etf_swing --grid-file sweeps/etf.yaml
+
+구조:
+  - 폴드 경계는 고정 달력 격자(_EPOCH + k × test_days) 위에 놓는다
+    → 데이터 기간을 늘려도 기존 폴드 경계가 그대로라 새 폴드만 계산
+  - 폴드 = 학습 [test_start - train_days, test_start) + 검증 [test_start, test_start + test_days)
+    각 구간 앞 warmup 봉은 지표 워밍업 전용 (run_backtest_vectorized trade_from)
+  - 학습 구간에서 전 조합 백테스트 → objective 최고 조합 (거래 min_trades 이상 우선)
+    → 그 조합으로 검증 구간 백테스트
+  - 폴드 단위로 프로세스 풀 병렬 (봉 데이터는 sweep 과 같은 SharedMemory 블록)
+  - 폴드 결과는 cache_dir/<키>.json — 키 = 버킷·그리드·설정·폴드 경계·구간 봉 데이터 해시
+    + 엔진 소스 해시 (백테스트 엔진·전략 모듈이 바뀌면 이전 결과를 재사용하지 않음)
+  - OOS 곡선: 폴드별 검증 곡선을 직전 폴드 말 자산 비율로 이어 붙임 (복리)
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import importlib
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from backtest.engine import summarize
+from backtest.run import DEFAULT_SYMBOLS, bucket_window, fetch_data, load_config
+from backtest.sweep import (
+    _W, _init_worker, backtest_combo, check_grid, expand_grid, pack_bars, parse_grid, result_metrics,
+    run_combo,
+)
+
+_EPOCH        = pd.Timestamp("2000-01-03", tz="UTC")   # 폴드 격자 기준 (월요일)
+WARMUP_BARS   = 100
+DEFAULT_CACHE = Path(__file__).resolve().parent.parent / "results" / "walkforward_cache"
+
+# 폴드 결과를 좌우하는 모듈 — 소스가 바뀌면 캐시 키가 바뀐다
+_ENGINE_MODULES = (
+    "backtest.walkforward", "backtest.sweep", "backtest.run", "backtest.engine",
+    "backtest.vector_engine", "backtest.metrics", "trader.fill_model",
+    "strategy.entries", "strategy.exits", "strategy.indicator_state",
+    "strategy.signals", "strategy.sizing",
+)
+
+# 버킷별 기본 (train_days, test_days)
+FOLD_DAYS = {"squeeze": (15, 5), "etf_swing": (120, 30), "value_long": (180, 60)}
+
+OBJECTIVES = ("sharpe", "sortino", "profit_factor", "total_pnl", "max_drawdown_pct")
+
+
+@dataclass(frozen=True)
+class Fold:
+    train_start: pd.Timestamp
+    test_start:  pd.Timestamp
+    test_end:    pd.Timestamp
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 폴드
+# ─────────────────────────────────────────────────────────────────────
+
+def make_folds(start: pd.Timestamp, end: pd.Timestamp, train_days: int, test_days: int) -> List[Fold]:
+    """[start, end] 안에 학습·검증이 모두 들어가는 폴드 (격자 정렬, 검증 구간끼리 겹치지 않음)."""
+    start = pd.Timestamp(start).tz_convert("UTC").normalize()
+    end   = pd.Timestamp(end).tz_convert("UTC")
+    train, step = pd.Timedelta(days=train_days), pd.Timedelta(days=test_days)
+
+    k = math.ceil((start + train - _EPOCH) / step)
+    folds: List[Fold] = []
+    while True:
+        test_start = _EPOCH + k * step
+        if test_start + step > end:
+            return folds
+        folds.append(Fold(test_start - train, test_start, test_start + step))
+        k += 1
+
+
+def _slice(dfs: Dict[str, pd.DataFrame], lo: pd.Timestamp, hi: pd.Timestamp, warmup: int) -> Dict[str, pd.DataFrame]:
+    """[lo, hi) 봉 + lo 이전 warmup 봉 (종목별). 구간 안 봉이 없는 종목은 제외."""
+    out: Dict[str, pd.DataFrame] = {}
+    for sym, df in dfs.items():
+        idx = df.index
+        a = int(idx.searchsorted(_at(idx, lo)))
+        b = int(idx.searchsorted(_at(idx, hi)))
+        if b > a:
+            out[sym] = df.iloc[max(0, a - warmup):b]
+    return out
+
+
+def _at(idx: pd.DatetimeIndex, ts: pd.Timestamp) -> pd.Timestamp:
+    return ts.tz_convert(None) if idx.tz is None else ts
+
+
+def _data_hash(dfs: Dict[str, pd.DataFrame]) -> str:
+    h = hashlib.sha1()
+    for sym in sorted(dfs):
+        df = dfs[sym]
+        h.update(sym.encode())
+        h.update(pd.DatetimeIndex(df.index).as_unit("ns").asi8.tobytes())
+        h.update(np.ascontiguousarray(df[["open", "high", "low", "close", "volume"]].to_numpy(float)).tobytes())
+    return h.hexdigest()
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 폴드 실행
+# ─────────────────────────────────────────────────────────────────────
+
+def pick_best(rows: List[dict], objective: str, min_trades: int) -> int:
+    """objective 최고 행 인덱스 — 거래 min_trades 이상 행 우선, 동률이면 앞 조합."""
+    def score(i: int) -> Tuple[bool, float]:
+        v = rows[i][objective]
+        return rows[i]["trades"] >= min_trades, (-math.inf if v is None or math.isnan(v) else v)
+    return max(range(len(rows)), key=lambda i: (*score(i), -i))
+
+
+def run_fold(
+    fold:     Fold,
+    combos:   List[Dict[str, Any]],
+    dfs:      Dict[str, pd.DataFrame],
+    base_cfg: dict,
+    opts:     dict,
+) -> dict:
+    """학습 구간 전 조합 → 최고 조합으로 검증 구간 백테스트 → 폴드 결과 (JSON 직렬화 가능)."""
+    warmup = opts["warmup"]
+    train  = _slice(dfs, fold.train_start, fold.test_start, warmup)
+    test   = _slice(dfs, fold.test_start, fold.test_end, warmup)
+
+    rows = [run_combo(p, train, base_cfg, {**opts, "trade_from": fold.train_start}) for p in combos]
+    best = pick_best(rows, opts["objective"], opts["min_trades"])
+    res  = backtest_combo(combos[best], test, base_cfg, {**opts, "trade_from": fold.test_start})
+    eq   = res["equity_curve"]
+    return {
+        "train_start": fold.train_start.isoformat(),
+        "test_start":  fold.test_start.isoformat(),
+        "test_end":    fold.test_end.isoformat(),
+        "params":      combos[best],
+        "train":       {k: v for k, v in rows[best].items() if k not in combos[best]},
+        "test":        result_metrics(res),
+        "equity":      [[pd.Timestamp(ts).isoformat(), float(v)] for ts, v in eq.items()],
+    }
+
+
+def _fold_worker(fold: Fold) -> dict:
+    return run_fold(fold, _W["opts"]["combos"], _W["dfs"], _W["cfg"], _W["opts"])
+
+
+@lru_cache(maxsize=1)
+def engine_hash() -> str:
+    """_ENGINE_MODULES 소스 파일 해시 (프로세스당 1회)."""
+    h = hashlib.sha1()
+    for name in _ENGINE_MODULES:
+        h.update(name.encode())
+        h.update(Path(importlib.import_module(name).__file__).read_bytes())
+    return h.hexdigest()
+
+
+def fold_key(fold: Fold, combos: List[Dict[str, Any]], base_cfg: dict, opts: dict, data_hash: str) -> str:
+    payload = {
+        "fold":   [fold.train_start.isoformat(), fold.test_start.isoformat(), fold.test_end.isoformat()],
+        "combos": combos,
+        "cfg":    base_cfg,
+        "opts":   {k: v for k, v in opts.items() if k != "combos"},
+        "data":   data_hash,
+        "engine": engine_hash(),
+    }
+    return hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode()).hexdigest()
+
+
+def _load_cached(cache_dir: Path, key: str) -> Optional[dict]:
+    path = cache_dir / f"{key}.json"
+    if not path.exists():
+        return None
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached(cache_dir: Path, key: str, result: dict) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    tmp = cache_dir / f".{key}.tmp"
+    with open(tmp, "w") as f:
+        json.dump(result, f)
+    os.replace(tmp, cache_dir / f"{key}.json")
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 워크포워드
+# ─────────────────────────────────────────────────────────────────────
+
+def stitch_equity(curves: List[pd.Series], cash: float) -> pd.Series:
+    """폴드별 검증 곡선(각각 cash 에서 시작) → 직전 말 자산 비율로 이어 붙인 OOS 곡선."""
+    parts: List[pd.Series] = []
+    base = cash
+    for curve in curves:
+        if curve.empty:
+            continue
+        scaled = curve * (base / cash)
+        parts.append(scaled)
+        base = float(scaled.iloc[-1])
+    return pd.concat(parts) if parts else pd.Series(dtype=float)
+
+
+def _curve(result: dict) -> pd.Series:
+    if not result["equity"]:
+        return pd.Series(dtype=float)
+    ts, vals = zip(*result["equity"])
+    return pd.Series(vals, index=pd.to_datetime(list(ts), utc=True), dtype=float)
+
+
+def walk_forward(
+    dfs:        Dict[str, pd.DataFrame],
+    combos:     List[Dict[str, Any]],
+    base_cfg:   dict,
+    bucket:     str,
+    train_days: int,
+    test_days:  int,
+    cash:       float = 14_800.0,
+    objective:  str = "sharpe",
+    min_trades: int = 5,
+    warmup:     int = WARMUP_BARS,
+    workers:    Optional[int] = None,
+    cache_dir:  Optional[str] = None,
+    fills:      bool = False,
+) -> dict:
+    """
+    워크포워드 실행 → {"folds": 폴드 표, "equity_curve": OOS 곡선, "oos": OOS 요약,
+                      "computed": 새로 계산한 폴드 수, "cached": 캐시 적중 폴드 수}.
+
+    cache_dir=None 이면 DEFAULT_CACHE. workers=1 이면 풀 없이 순차 실행.
+    fills=True 면 체결 모델 적용 (폴드 캐시 키에 포함).
+    """
+    for p in combos:
+        check_grid(p, bucket, fills)
+    dfs = {s: df for s, df in dfs.items() if df is not None and not df.empty}
+    if not dfs:
+        raise ValueError("봉 데이터 없음")
+    start = min(df.index[0] for df in dfs.values())
+    end   = max(df.index[-1] for df in dfs.values())
+    start = start if start.tzinfo else start.tz_localize("UTC")
+    end   = end if end.tzinfo else end.tz_localize("UTC")
+    folds = make_folds(start, end, train_days, test_days)
+
+    opts  = {"bucket": bucket, "cash": cash, "objective": objective,
+             "min_trades": min_trades, "warmup": warmup, "fills": fills}
+    cache = Path(cache_dir) if cache_dir else DEFAULT_CACHE
+
+    results: Dict[Fold, dict] = {}
+    todo: List[Tuple[Fold, str]] = []
+    for fold in folds:
+        window = _slice(dfs, fold.train_start, fold.test_end, warmup)
+        key = fold_key(fold, combos, base_cfg, opts, _data_hash(window))
+        hit = _load_cached(cache, key)
+        if hit is not None:
+            results[fold] = hit
+        else:
+            todo.append((fold, key))
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(todo) <= 1:
+        fresh = [run_fold(f, combos, dfs, base_cfg, opts) for f, _ in todo]
+    else:
+        shm, layout, total = pack_bars(dfs)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(todo)),
+                initializer=_init_worker,
+                initargs=(shm.name, layout, total, base_cfg, {**opts, "combos": combos}),
+            ) as pool:
+                fresh = list(pool.map(_fold_worker, [f for f, _ in todo]))
+        finally:
+            shm.close()
+            shm.unlink()
+    for (fold, key), res in zip(todo, fresh):
+        _save_cached(cache, key, res)
+        results[fold] = res
+
+    ordered = [results[f] for f in folds]
+    table = pd.DataFrame([
+        {"train_start": r["train_start"][:10], "test_start": r["test_start"][:10],
+         "test_end": r["test_end"][:10], **r["params"],
+         **{f"train_{k}": v for k, v in r["train"].items()},
+         **{f"test_{k}": v for k, v in r["test"].items()}}
+        for r in ordered
+    ])
+    equity = stitch_equity([_curve(r) for r in ordered], cash)
+    stats  = summarize([], list(equity.to_numpy()), list(equity.index))
+    oos = {
+        "folds":            len(ordered),
+        "trades":           int(sum(r["test"]["trades"] for r in ordered)),
+        "return_pct":       (float(equity.iloc[-1]) / cash - 1.0) * 100.0 if len(equity) else 0.0,
+        "max_drawdown_pct": stats["max_drawdown_pct"],
+        "sharpe":           stats["sharpe_approx"],
+        "sortino":          stats["sortino"],
+    }
+    return {"folds": table, "equity_curve": equity, "oos": oos,
+            "computed": len(todo), "cached": len(folds) - len(todo)}
+
+
+# ─────────────────────────────────────────────────────────────────────
+# CLI
+# ─────────────────────────────────────────────────────────────────────
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="워크포워드 최적화 / 표본 외 검증")
+    parser.add_argument("--bucket",     default="squeeze", choices=list(FOLD_DAYS))
+    parser.add_argument("--grid",       action="append", default=[],
+                        help="섹션.키=값,값,... (반복 지정)")
+    parser.add_argument("--grid-file",  default=None,
+                        help="YAML 그리드 파일 ({섹션.키: [값, ...]})")
+    parser.add_argument("--symbols",    nargs="+", default=None)
+    parser.add_argument("--days",       type=int, default=None)
+    parser.add_argument("--train-days", type=int, default=None, help="학습 구간 (달력일)")
+    parser.add_argument("--test-days",  type=int, default=None, help="검증 구간 = 폴드 간격 (달력일)")
+    parser.add_argument("--objective",  default="sharpe", choices=list(OBJECTIVES))
+    parser.add_argument("--min-trades", type=int, default=5,
+                        help="학습 구간 최소 거래 수 (미달 조합은 후순위)")
+    parser.add_argument("--cash",       type=float, default=14_800.0)
+    parser.add_argument("--config",     default="config.yaml")
+    parser.add_argument("--workers",    type=int, default=None,
+                        help="프로세스 수 (기본: 전체 코어)")
+    parser.add_argument("--offline",    action="store_true",
+                        help="네트워크 없이 로컬 봉 저장소만 사용")
+    parser.add_argument("--store",      default=None, help="봉 저장소 경로 (기본: storage/bars)")
+    parser.add_argument("--end",        default=None, help="기간 종료일 YYYY-MM-DD")
+    parser.add_argument("--fills",      action="store_true",
+                        help="체결 모델 적용 (config fills — 다음 봉 시가 · IOC 진입 · 참여율 상한)")
+    parser.add_argument("--cache-dir",  default=None, help="폴드 캐시 경로 (기본: results/walkforward_cache)")
+    parser.add_argument("--out",        default="results/walkforward.csv", help="폴드 표 CSV 경로")
+    args = parser.parse_args()
+
+    grid = {}
+    if args.grid_file:
+        with open(args.grid_file, "r") as f:
+            grid.update({k: list(v) for k, v in (yaml.safe_load(f) or {}).items()})
+    grid.update(parse_grid(args.grid))
+    if not grid:
+        parser.error("--grid 또는 --grid-file 필요")
+    try:
+        check_grid(grid, args.bucket, args.fills)
+    except ValueError as exc:
+        parser.error(str(exc))
+    combos = expand_grid(grid)
+
+    train_days, test_days = FOLD_DAYS[args.bucket]
+    train_days = args.train_days or train_days
+    test_days  = args.test_days or test_days
+
+    days, interval = bucket_window(args.bucket, args.days, args.offline)
+    symbols = args.symbols or DEFAULT_SYMBOLS[args.bucket]
+    dfs = fetch_data(symbols, days=days, interval=interval,
+                     offline=args.offline, store_dir=args.store, end=args.end)
+    if not dfs:
+        print("ERROR: 데이터를 가져올 수 없습니다.")
+        sys.exit(1)
+
+    print(f"\n워크포워드: {args.bucket} / 학습 {train_days}일 → 검증 {test_days}일 / "
+          f"{len(combos)}조합 / {len(dfs)}종목")
+    t0 = time.perf_counter()
+    wf = walk_forward(dfs, combos, load_config(args.config), args.bucket, train_days, test_days,
+                      cash=args.cash, objective=args.objective, min_trades=args.min_trades,
+                      workers=args.workers, cache_dir=args.cache_dir, fills=args.fills)
+    elapsed = time.perf_counter() - t0
+
+    table = wf["folds"]
+    Path(args.out).parent.mkdir(parents=True, exist_ok=True)
+    table.to_csv(args.out, index=False, encoding="utf-8-sig")
+    if not wf["equity_curve"].empty:
+        wf["equity_curve"].rename("equity").to_csv(
+            Path(args.out).with_suffix(".equity.csv"), encoding="utf-8-sig")
+
+    oos = wf["oos"]
+    print(table.to_string(index=False))
+    print(f"\nOOS: {oos['folds']}폴드 / 거래 {oos['trades']} / 수익률 {oos['return_pct']:+.2f}% / "
+          f"MDD {oos['max_drawdown_pct']:.2f}% / Sharpe {oos['sharpe']:.2f} / Sortino {oos['sortino']:.2f}")
+    print(f"폴드 {wf['computed']}개 계산 · {wf['cached']}개 캐시 / {elapsed:.1f}초 → "
+          f"{os.path.abspath(args.out)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -111,11 +111,11 @@ class MarketRegimeAnalyzer:
         신뢰도 스캔 → 모드 결정 (병렬 처리).
 
         df_fetcher:      async callable(symbol) -> pd.DataFrame | None
-                         미제공 시 Alpaca 직접 조회 (세마포어 10 적용).
+                         미제공 시 Alpaca 배치 조회 (fetch_bars_many — 종목 묶음당 1요청).
         stream_update_fn: callable(syms) — 뉴스 발굴 신규 종목을 WebSocket에 동적 추가.
         호출 시각: 9:40 ET — 장 개시 10분 후 실제 1분봉 기반 alpha 계산 가능.
         """
-        from data.alpaca_bars import fetch_bars
+        from data.alpaca_bars import fetch_bars_many
 
         # ── 뉴스 기반 신규 종목 발굴 및 스캔 리스트 확장 ──────────────
         try:
@@ -139,13 +139,18 @@ class MarketRegimeAnalyzer:
         except Exception as exc:
             logging.debug("[MarketRegimeAnalyzer] 뉴스 유니버스 실패 (무시): %s", exc)
 
+        targets = scan_symbols[:SCAN_MAX_SYMBOLS]
+        # df_fetcher 미제공 → 전 종목 1분봉을 배치로 선조회 (종목당 요청 → 묶음당 요청)
+        prefetched: dict = {}
+        if df_fetcher is None:
+            prefetched = await asyncio.to_thread(
+                fetch_bars_many, targets, "1Min",
+                PREMARKET_BAR_LIMIT, PREMARKET_EXTENDED,
+            )
+
         async def _scan_one(sym: str):
             try:
-                df = await df_fetcher(sym) if df_fetcher else \
-                     await asyncio.to_thread(
-                         fetch_bars, sym, "1Min",
-                         PREMARKET_BAR_LIMIT, PREMARKET_EXTENDED,
-                     )
+                df = await df_fetcher(sym) if df_fetcher else prefetched.get(sym)
                 if df is None or df.empty:
                     return None
                 sc = await asyncio.to_thread(self._scanner.score, sym, df)
@@ -161,9 +166,9 @@ class MarketRegimeAnalyzer:
                 logging.debug("[MarketRegimeAnalyzer] %s 스캔 실패: %s", sym, exc)
                 return None
 
-        # 세마포어(10)로 자동 throttle되므로 gather로 병렬 실행
+        # df_fetcher 경로는 세마포어(10)로 자동 throttle되므로 gather로 병렬 실행
         raw = await asyncio.gather(
-            *[_scan_one(s) for s in scan_symbols[:SCAN_MAX_SYMBOLS]],
+            *[_scan_one(s) for s in targets],
             return_exceptions=False,
         )
         scores: Dict[str, ConfidenceScore] = {}
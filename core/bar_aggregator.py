@@ -0,0 +1,226 @@
+# core/bar_aggregator.py
+"""
+스트림 봉 집계기 — WebSocket 1분봉으로 종목별 1분/5분 OHLCV 링버퍼 유지.
+
+Bucket3Stream 이 수신한 1분봉을 그대로 쌓고, 5분 구간으로 롤업한다.
+on_bar / ConfidenceScanner / gap_and_go_squeeze_entry 가 여기서 봉을 읽으면
+WebSocket 틱마다 REST 로 5분봉 60개를 재조회할 필요가 없다.
+
+  - 1분봉: 수신 즉시 append
+  - 5분봉: 구간 마지막 1분봉(분 % 5 == 4) 수신 시 또는 다음 구간 첫 봉 수신 시 확정
+  - 진행 중 5분봉: include_partial=True 로 마지막 행에 포함 가능
+  - 시드: 스트림 시작/종목 추가 시 당일 봉을 배치 REST(fetch_bars_many) 1회로 채움
+  - ET 날짜가 바뀌면 종목 버퍼 초기화 (당일 봉만 유지)
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import zoneinfo
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import pandas as pd
+
+from data.bar_buffer import BarBuffer, _to_ns
+
+ET = zoneinfo.ZoneInfo("America/New_York")
+
+_FIVE_MIN_NS = 5 * 60 * 1_000_000_000
+_BAR_SPAN     = {"1Min": pd.Timedelta(minutes=1), "5Min": pd.Timedelta(minutes=5)}
+
+# seeder(symbols, timeframe, limit) -> {symbol: timestamp 인덱스 DataFrame}
+Seeder = Callable[[List[str], str, int], Dict[str, pd.DataFrame]]
+
+
+def _default_seeder(symbols: List[str], timeframe: str, limit: int) -> Dict[str, pd.DataFrame]:
+    from data.alpaca_bars import fetch_bars_many
+    return fetch_bars_many(symbols, timeframe, limit)
+
+
+def _no_fetch(*_args):
+    return None
+
+
+class StreamBarAggregator:
+    """종목별 1분/5분 링버퍼 (스레드 안전 — 스트림 핸들러 + to_thread 시드 동시 접근)."""
+
+    def __init__(
+        self,
+        maxlen_1m: int = 390,
+        maxlen_5m: int = 200,
+        seeder:    Optional[Seeder] = None,
+    ) -> None:
+        self._maxlen_1m = maxlen_1m
+        self._maxlen_5m = maxlen_5m
+        self._seeder    = seeder or _default_seeder
+        self._buf_1m: Dict[str, BarBuffer] = {}
+        self._buf_5m: Dict[str, BarBuffer] = {}
+        self._partial: Dict[str, list] = {}      # symbol → [bucket_ns, o, h, l, c, v]
+        self._day:     Dict[str, object] = {}    # symbol → 마지막 수신 봉의 ET 날짜
+        self._seeded:  Set[str] = set()
+        self._lock = threading.RLock()
+
+    # ── 내부 ──────────────────────────────────────────────────────────
+
+    def _buffers(self, sym: str):
+        b1 = self._buf_1m.get(sym)
+        if b1 is None:
+            b1 = self._buf_1m[sym] = BarBuffer(sym, "1Min", self._maxlen_1m, _no_fetch)
+            self._buf_5m[sym] = BarBuffer(sym, "5Min", self._maxlen_5m, _no_fetch)
+        return b1, self._buf_5m[sym]
+
+    def _reset(self, sym: str) -> None:
+        b1, b5 = self._buffers(sym)
+        b1.clear()
+        b5.clear()
+        self._partial.pop(sym, None)
+        self._seeded.discard(sym)
+
+    def _flush_partial(self, sym: str) -> None:
+        p = self._partial.pop(sym, None)
+        if p:
+            self._buf_5m[sym].append(pd.Timestamp(p[0], tz="UTC"), *p[1:])
+
+    # ── 수신 ──────────────────────────────────────────────────────────
+
+    def on_bar(self, symbol: str, bar) -> None:
+        """스트림 1분봉 수신 (Alpaca Bar 또는 동일 속성 객체)."""
+        sym = symbol.upper()
+        ts  = getattr(bar, "timestamp", None)
+        if ts is None:
+            return
+        ts_ns = _to_ns(ts)
+        o = float(getattr(bar, "open",   0) or 0)
+        h = float(getattr(bar, "high",   0) or 0)
+        lo = float(getattr(bar, "low",   0) or 0)
+        c = float(getattr(bar, "close",  0) or 0)
+        v = float(getattr(bar, "volume", 0) or 0)
+        if c <= 0:
+            return
+
+        day = pd.Timestamp(ts_ns, tz="UTC").tz_convert(ET).date()
+        with self._lock:
+            if self._day.get(sym) not in (None, day):
+                self._reset(sym)
+            self._day[sym] = day
+
+            b1, _ = self._buffers(sym)
+            b1.append(pd.Timestamp(ts_ns, tz="UTC"), o, h, lo, c, v)
+
+            bucket = ts_ns - ts_ns % _FIVE_MIN_NS
+            p = self._partial.get(sym)
+            if p is not None and p[0] != bucket:
+                self._flush_partial(sym)
+                p = None
+            if p is None:
+                self._partial[sym] = [bucket, o, h, lo, c, v]
+            else:
+                p[2] = max(p[2], h)
+                p[3] = min(p[3], lo)
+                p[4] = c
+                p[5] += v
+            # 구간 마지막 1분봉 → 즉시 확정
+            if (ts_ns - bucket) // 60_000_000_000 == 4:
+                self._flush_partial(sym)
+
+    # ── 시드 ──────────────────────────────────────────────────────────
+
+    def is_seeded(self, symbol: str) -> bool:
+        with self._lock:
+            return symbol.upper() in self._seeded
+
+    def seed(self, symbols: Iterable[str], now: Optional[pd.Timestamp] = None) -> int:
+        """
+        미시드 종목의 당일 1분/5분봉을 배치 REST로 채움 → 시드된 종목 수.
+
+        스트림으로 이미 받은 봉은 유지하고, 그 이전 구간만 REST 결과로 메운다.
+        REST 행 중 아직 마감 전인 봉과, 스트림이 집계 중인 5분 구간 시작 이후 봉은 버린다
+        (스트림 쪽이 확정하므로 중복 · 덮어쓰기 방지).
+        """
+        now = pd.Timestamp.now(tz="UTC") if now is None else pd.Timestamp(now)
+        with self._lock:
+            pending = [s.upper() for s in symbols if s and s.upper() not in self._seeded]
+        if not pending:
+            return 0
+        try:
+            got_1m = self._seeder(pending, "1Min", self._maxlen_1m)
+            got_5m = self._seeder(pending, "5Min", self._maxlen_5m)
+        except Exception as exc:
+            logging.debug("[BarAgg] 시드 실패: %s", exc)
+            return 0
+
+        with self._lock:
+            for sym in pending:
+                b1, b5 = self._buffers(sym)
+                p = self._partial.get(sym)
+                partial_start = pd.Timestamp(p[0], tz="UTC") if p else None
+                for tf, buf, fresh in (("1Min", b1, got_1m.get(sym)), ("5Min", b5, got_5m.get(sym))):
+                    if fresh is None or fresh.empty:
+                        continue
+                    fresh = fresh[fresh.index + _BAR_SPAN[tf] <= now]
+                    live = buf.view()
+                    cuts = [t for t in (live.index[0] if len(live) else None, partial_start)
+                            if t is not None]
+                    if cuts:
+                        fresh = fresh[fresh.index < min(cuts)]
+                    buf.clear()
+                    buf.extend(fresh)
+                    buf.extend(live)
+                self._seeded.add(sym)
+        logging.info("[BarAgg] 시드 완료 %d종목 (1분 %d / 5분 %d)",
+                     len(pending), len(got_1m), len(got_5m))
+        return len(pending)
+
+    # ── 조회 ──────────────────────────────────────────────────────────
+
+    def bars(
+        self,
+        symbol:          str,
+        timeframe:       str,
+        limit:           int,
+        include_partial: bool = False,
+    ) -> Optional[pd.DataFrame]:
+        """
+        최근 limit봉 (timestamp 인덱스) — 미시드(당일 앞부분 누락) 또는 데이터 없으면 None.
+
+        include_partial: 5분봉에 진행 중 구간(확정 전)을 마지막 행으로 포함.
+        """
+        sym = symbol.upper()
+        with self._lock:
+            if sym not in self._buf_1m or sym not in self._seeded:
+                return None
+            if timeframe == "1Min":
+                df = self._buf_1m[sym].view(limit)
+                return df if len(df) else None
+            if timeframe != "5Min":
+                return None
+            df = self._buf_5m[sym].view()
+            p  = self._partial.get(sym) if include_partial else None
+        if p is not None:
+            row = pd.DataFrame(
+                [p[1:]], columns=["open", "high", "low", "close", "volume"],
+                index=pd.DatetimeIndex([pd.Timestamp(p[0], tz="UTC")], name="timestamp"),
+            )
+            df = pd.concat([df, row]) if len(df) else row
+        if not len(df):
+            return None
+        return df.iloc[-limit:] if limit < len(df) else df
+
+    def last_price(self, symbol: str) -> float:
+        """마지막 수신 1분봉 종가 (없으면 0.0)."""
+        df = self.bars(symbol, "1Min", 1)
+        return float(df["close"].iloc[-1]) if df is not None else 0.0
+
+    def drop(self, symbol: str) -> None:
+        sym = symbol.upper()
+        with self._lock:
+            self._buf_1m.pop(sym, None)
+            self._buf_5m.pop(sym, None)
+            self._partial.pop(sym, None)
+            self._day.pop(sym, None)
+            self._seeded.discard(sym)
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._buf_1m)
+
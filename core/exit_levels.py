@@ -0,0 +1,109 @@
+# core/exit_levels.py
+"""
+보유 종목 청산 레벨 — 스트림 틱(체결/호가)마다 O(1) 비교로 즉시 청산 판단.
+
+30초 _exit_cycle 이 ATR·손절 설정으로 레벨을 무장(arm)해 두면,
+Bucket3Stream / PollingStream 핸들러가 가격을 넘길 때마다 check() 로 교차 여부만 본다.
+
+레벨 (peak 는 틱 최고가로 메모리 내 갱신 → 트레일링 레벨도 함께 상승):
+  hard  stop_loss      : effective_stop_price(entry, stop_pct, peak, atr, atr_mult) 이하
+  hard  breakeven_trap : 고점 수익 +10% 이후 진입가 미만
+  soft  trailing_stop  : ExitStrategyEngine 가변 ATR 트레일링 이하
+                         → 즉시 청산이 아니라 해당 종목 재평가 (개미 털기 방어 유지)
+
+30초 루프는 그대로 두고 백스톱으로 동작한다.
+"""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from strategy.exit_strategy import check_breakeven_trap, update_trailing_stop
+from strategy.exits import effective_stop_price
+
+HARD = "hard"
+SOFT = "soft"
+
+
+@dataclass
+class ExitLevels:
+    entry:     float
+    peak:      float
+    atr:       float
+    stop_pct:  float
+    atr_mult:  float
+    qty:       int
+    strategy:  str
+    stop:      float = 0.0   # hard stop_loss
+    trail:     float = 0.0   # soft trailing_stop
+
+    def recompute(self) -> None:
+        peak_pct   = (self.peak - self.entry) / self.entry if self.entry > 0 else 0.0
+        self.stop  = effective_stop_price(self.entry, self.stop_pct, self.peak, self.atr, self.atr_mult)
+        self.trail = update_trailing_stop(self.entry, self.peak, self.atr, peak_pct)
+
+
+class ExitLevelBook:
+    """symbol → ExitLevels (스레드 안전)."""
+
+    def __init__(self) -> None:
+        self._levels: Dict[str, ExitLevels] = {}
+        self._lock = threading.Lock()
+
+    def arm(
+        self,
+        symbol:   str,
+        entry:    float,
+        peak:     float,
+        atr:      float,
+        stop_pct: float,
+        atr_mult: float,
+        qty:      int,
+        strategy: str = "squeeze",
+    ) -> ExitLevels:
+        """레벨 (재)계산 — 메모리 peak 가 더 높으면 유지."""
+        with self._lock:
+            prev = self._levels.get(symbol)
+            lv = ExitLevels(
+                entry=entry, peak=max(peak, prev.peak if prev else 0.0), atr=atr,
+                stop_pct=stop_pct, atr_mult=atr_mult, qty=qty, strategy=strategy,
+            )
+            lv.recompute()
+            self._levels[symbol] = lv
+            return lv
+
+    def disarm(self, symbol: str) -> None:
+        with self._lock:
+            self._levels.pop(symbol, None)
+
+    def get(self, symbol: str) -> Optional[ExitLevels]:
+        with self._lock:
+            return self._levels.get(symbol)
+
+    def check(self, symbol: str, price: float) -> Optional[Tuple[str, str, ExitLevels]]:
+        """
+        가격 교차 검사 → (HARD|SOFT, reason, levels) 또는 None.
+
+        신고가면 peak·레벨을 올리고 None. hard 레벨 교차 시 재발동 방지를 위해 해제.
+        """
+        if price <= 0:
+            return None
+        with self._lock:
+            lv = self._levels.get(symbol)
+            if lv is None:
+                return None
+            if price > lv.peak:
+                lv.peak = price
+                lv.recompute()
+                return None
+            peak_pct = (lv.peak - lv.entry) / lv.entry if lv.entry > 0 else 0.0
+            if check_breakeven_trap(lv.entry, price, peak_pct):
+                del self._levels[symbol]
+                return HARD, "breakeven_trap", lv
+            if price <= lv.stop:
+                del self._levels[symbol]
+                return HARD, "stop_loss", lv
+            if price <= lv.trail:
+                return SOFT, "trailing_stop", lv
+        return None
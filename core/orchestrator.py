@@ -18,9 +18,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import time
 import pandas as pd
 from datetime import datetime, date as _date, timezone
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.kill_switch    import KillSwitch
 from core.bucket_capital import BucketCapitalManager
@@ -40,6 +41,12 @@ from core.StrategyManager        import StrategyManager
 from core.AccountManager         import AccountManager
 from strategy.news_analyzer      import NewsAnalyzer
 from storage.db import PositionDB
+from storage.position_book import PositionBook
+from data.bar_buffer import BarBufferStore
+from core.bar_aggregator import StreamBarAggregator
+from core.price_snapshot import PriceSnapshot
+from core.exit_levels import ExitLevelBook, HARD
+from strategy.indicator_state import IndicatorStore
 import os
 import storage.db_manager as dbm
 
@@ -48,6 +55,11 @@ PANIC_HEDGE_ETFS = ["SQQQ", "SDS"]
 # VIX 변화율 선제 차단 임계치 (전일 대비 20% 이상 급등)
 VIX_ROC_THRESHOLD = 0.20
 
+# 청산 루프 주기 — 사이클 소요가 절반을 넘으면 경고
+_EXIT_INTERVAL_SEC = 30
+# 틱 기반 손절·트레일링 레벨 이탈 시 종목 재평가 최소 간격 (개미 털기 대기 중 틱 폭주 방지)
+_LEVEL_REEVAL_SEC = 5.0
+
 # 지정가 청산 슬리피지 (토스 시장가 슬리피지 방지)
 _EXIT_LIMIT_SLIP = 0.003   # 일반 청산: 현재가 -0.3%
 _STOP_LIMIT_SLIP = 0.005   # 손절/긴급: 현재가 -0.5%
@@ -57,6 +69,15 @@ _PAPER_SLIP_BUY  = 0.001
 _PAPER_SLIP_SELL = 0.001
 
 
+def _log_seed_result(task: asyncio.Task) -> None:
+    """1분봉 집계기 시드 태스크 완료 콜백 — 예외가 조용히 묻히지 않게 로깅."""
+    if task.cancelled():
+        return
+    exc = task.exception()
+    if exc is not None:
+        logging.warning("[B3] 1분봉 집계기 시드 실패: %s", exc, exc_info=exc)
+
+
 class Orchestrator:
     def __init__(
         self,
@@ -70,20 +91,28 @@ class Orchestrator:
     ):
         self.broker         = broker
         self.data_client    = data_client
-        self.db             = db
+        # 핫패스 조회는 메모리, 쓰기는 writer 스레드가 순서대로 DB 영속화
+        self.db             = db if isinstance(db, PositionBook) else PositionBook(db)
         self.cfg            = cfg
         self.kill_switch    = kill_switch
+        if self._is_sim():
+            # PaperSimBroker 잔고는 메모리 — 재시작 시 DB 보유분으로 복원 (청산 주문 거부 방지)
+            for p in self.db.list_open_positions():
+                broker.positions[p["symbol"]] = int(p.get("qty", 0))
         self.bucket_capital = bucket_capital
         self.notifier       = notifier
 
         self._prev_vix: float     = 0.0
         self._prev_regime: str    = "bull"
         self._stream: Optional[Bucket3Stream] = None
+        self._seed_task: Optional[asyncio.Task] = None   # 1분봉 집계기 REST 시드 (B3 시작 시)
         self._hedge_active: bool  = False  # Panic 헤지 포지션 보유 중 여부
 
         # ── 저수준 엔진 (하위 호환 유지) ─────────────────────────────
         self.exit_engine   = ExitStrategyEngine(notify=self._notify)
-        self.conf_scanner  = ConfidenceScanner()
+        # WebSocket 1분봉 → 1분/5분 링버퍼 (on_bar 진입 판단은 REST 없이 여기서 읽음)
+        self.bar_agg       = StreamBarAggregator()
+        self.conf_scanner  = ConfidenceScanner(bar_source=self.bar_agg.bars)
         self.regime_engine = RegimeEngine(notify=self._notify)
         self.b2_alloc      = B2AllocationEngine(notify=self._notify)
 
@@ -118,6 +147,29 @@ class Orchestrator:
         # B3 일간 갭/RVOL 캐시: symbol → (gap_pct, rvol, date_str)
         # on_bar()는 gap_pct=0/rvol=0 기본값이라 항상 진입 실패 → 여기서 실제 값 계산
         self._b3_daily_cache: Dict[str, tuple] = {}
+        # 분봉 롤링 버퍼: exit 사이클 / on_bar 는 새로 마감된 봉만 증분 조회
+        self.bar_buffers = BarBufferStore(
+            maxlen=int(cfg.get("engine", {}).get("bar_buffer_maxlen", 200))
+        )
+        # (종목, 타임프레임)별 증분 지표 상태 — compute_indicators 전체 재계산 대체
+        self.indicators = IndicatorStore()
+        # 청산 사이클: 종목별 평가 동시 실행 수 + 종목별 주문 직렬화 락 + 소요 시간 지표
+        self._exit_concurrency = int(cfg.get("engine", {}).get("exit_concurrency", 8))
+        self._order_locks: Dict[str, asyncio.Lock] = {}
+        # 평가 중인 종목 — 30초 사이클과 틱 재평가가 같은 종목을 동시에 평가하지 않음
+        self._evaluating: set = set()
+        self.exit_cycle_stats: Dict[str, float] = {
+            "last_sec": 0.0, "max_sec": 0.0, "cycles": 0, "slow": 0, "positions": 0,
+        }
+        # 틱 기반 청산: 보유 종목 손절/트레일링 레벨을 메모리에 두고 스트림 가격마다 비교
+        self._event_exits   = bool(cfg.get("squeeze", {}).get("event_exits", True))
+        self.exit_levels    = ExitLevelBook()
+        self._level_eval_at: Dict[str, float] = {}
+        # 사이클 공유 최신가 스냅샷 — 종목별 단건 조회 대신 배치 1회 (오래된 값은 거부)
+        self.prices = PriceSnapshot(
+            self._fetch_prices,
+            max_age=float(cfg.get("engine", {}).get("price_max_age_sec", 15)),
+        )
 
     # ──────────────────────────────────────────────────────────────────
     # 공통 유틸
@@ -217,6 +269,24 @@ class Orchestrator:
         except Exception:
             return 0.0
 
+    def _fetch_prices(self, symbols: List[str]) -> Dict[str, float]:
+        """복수 종목 최신가 1요청 — Toss get_prices / Alpaca 최신 체결 배치."""
+        if self._is_toss():
+            return self.broker.get_prices(symbols)
+        from alpaca.data.requests import StockLatestTradeRequest  # type: ignore
+        resp = self.data_client.get_stock_latest_trade(
+            StockLatestTradeRequest(symbol_or_symbols=symbols)
+        )
+        return {sym: float(trade.price) for sym, trade in resp.items()}
+
+    def _snapshot_last(self, symbol: str) -> float:
+        """사이클 스냅샷 가격 우선, 없거나 오래됐으면 단건 조회 (결과는 스냅샷에 반영)."""
+        last = self.prices.get(symbol)
+        if last <= 0:
+            last = self._fetch_last(symbol)
+            self.prices.put(symbol, last)
+        return last
+
     def _fetch_open_price(self, symbol: str) -> float:
         """당일 시가 조회 — Daily 봉 Open 기준 (프리마켓 폭락 반영, 1분봉 아님).
 
@@ -260,14 +330,24 @@ class Orchestrator:
                     return None
                 return pd.DataFrame(candles)[["open", "high", "low", "close", "volume"]]
 
-            # Alpaca: 세마포어·싱글턴이 적용된 공용 클라이언트 사용 (DataFrame or 버그 회피)
-            from data.alpaca_bars import fetch_bars as _ab_fetch
-            return _ab_fetch(symbol, timeframe, limit)
+            # Alpaca: 공용 봉 캐시 경유 (세마포어·싱글턴 클라이언트 + 봉 경계 TTL)
+            from data.alpaca_bars import get_bars
+            return get_bars(symbol, timeframe, limit)
 
         except Exception as exc:
             logging.debug("[orchestrator] bars 조회 실패 %s/%s: %s", symbol, timeframe, exc)
             return None
 
+    def _fetch_rolling(self, symbol: str, timeframe: str, limit: int):
+        """분봉 증분 버퍼 경유 조회 (Toss는 전체 재조회 _fetch_bars 유지)."""
+        if self._is_toss():
+            return self._fetch_bars(symbol, timeframe, limit)
+        try:
+            return self.bar_buffers.bars(symbol, timeframe, limit)
+        except Exception as exc:
+            logging.debug("[orchestrator] 롤링 버퍼 조회 실패 %s/%s: %s", symbol, timeframe, exc)
+            return None
+
     def _calc_qty(self, price: float, budget: float) -> int:
         from strategy.sizing import budget_cap_size
         return budget_cap_size(budget, price)
@@ -283,17 +363,53 @@ class Orchestrator:
         except Exception:
             return 0.0
 
+    def _is_sim(self) -> bool:
+        return hasattr(self.broker, "set_quote")    # PaperSimBroker 판별 (자체 시세 없음)
+
+    def _submit(self, sym: str, qty: int, side: str, last: float, **order) -> Tuple[int, float]:
+        """
+        주문 제출 → (체결 수량, 체결가). 거부(ok False)면 (0, 0.0).
+
+        PaperSimBroker 는 제출 직전 가격 경로의 최신가를 먹여 체결시키고,
+        체결 수량 · 가격을 돌려주지 않는 실브로커는 요청 수량 · last 로 간주한다.
+        """
+        if self._is_sim() and last > 0:
+            self.broker.set_price(sym, last)
+        resp = self.broker.submit_order(symbol=sym, qty=qty, side=side, **order)
+        if not isinstance(resp, dict):
+            return qty, last
+        if not resp.get("ok", True):
+            logging.warning("[ORDER] %s %s %d주 거부: %s", sym, side, qty, resp.get("reason", ""))
+            return 0, 0.0
+        filled = int(resp.get("qty", qty))
+        if filled < qty:
+            logging.warning("[ORDER] %s %s 부분 체결 %d/%d주", sym, side, filled, qty)
+        return filled, float(resp.get("price") or last)
+
+    async def _book_entry(
+        self, sym: str, strategy: str, price: float, qty: int, sector: str, reason: str,
+    ) -> None:
+        """
+        코루틴 경로의 진입 기록 — open_position 은 커밋 완료까지 기다리므로 스레드에서 실행.
+
+        이벤트 루프는 SQLite 커밋(fsync) 동안에도 틱 · 호가 처리를 계속한다.
+        """
+        await asyncio.to_thread(self.db.open_position, sym, strategy, price, qty, sector)
+        await asyncio.to_thread(self.db.record_trade, sym, "buy", qty, price, strategy, reason)
+
     def _do_partial_exit(
         self, sym: str, qty: int, price: float,
         new_stage: int, sell_ratio: float, strategy: str,
     ) -> None:
         """분할 청산 — 잔량 중 sell_ratio 비율만큼 매도."""
         sell_qty = max(1, int(qty * sell_ratio))
-        remain   = qty - sell_qty
         try:
             slip_p   = _PAPER_SLIP_SELL if self._is_paper() else _EXIT_LIMIT_SLIP
             limit_px = round(price * (1 - slip_p), 4)
-            self.broker.submit_order(symbol=sym, qty=sell_qty, side="sell", type="limit", price=limit_px)
+            sell_qty, price = self._submit(sym, sell_qty, "sell", price, type="limit", price=limit_px)
+            if sell_qty <= 0:
+                return
+            remain = qty - sell_qty
             self.db.update_partial_stage(sym, new_stage, remain)
             self.db.record_trade(sym, "sell", sell_qty, price, strategy,
                                  f"partial_exit_stage{new_stage}")
@@ -319,7 +435,15 @@ class Orchestrator:
             else:
                 slip = _STOP_LIMIT_SLIP if urgent else _EXIT_LIMIT_SLIP
             limit_px = round(price * (1 - slip), 4)
-            self.broker.submit_order(symbol=sym, qty=qty, side="sell", type="limit", price=limit_px)
+            filled, price = self._submit(sym, qty, "sell", price, type="limit", price=limit_px)
+            if filled <= 0:
+                return
+            if filled < qty:
+                # 부분 체결 — 체결분만 기록, 잔량은 보유 유지 (다음 사이클에 재청산)
+                self.db.update_partial_stage(sym, int((pos or {}).get("partial_stage", 0)), qty - filled)
+                self.db.record_trade(sym, "sell", filled, price, strategy, f"{reason}_partial")
+                self._notify(f"⚠️ [{strategy.upper()}] {sym} 청산 부분 체결 {filled}/{qty}주 @ ${price:.2f}")
+                return
             self.db.close_position(sym)
             self.db.record_trade(sym, "sell", qty, price, strategy, reason)
 
@@ -357,6 +481,10 @@ class Orchestrator:
             self._3min_checked.discard(sym)
             # 신뢰도 블랙리스트도 해제 (다음 진입 기회 허용)
             self.conf_scanner.blacklist.clear(sym)
+            # 보유 중에만 쓰던 증분 지표 상태 / 틱 청산 레벨 해제
+            self.indicators.drop(sym)
+            self.exit_levels.disarm(sym)
+            self._level_eval_at.pop(sym, None)
 
             # 텔레그램: 매도 사유 + 최종 수익률 포함
             mode_label = "PAPER" if self._is_paper() else "LIVE"
@@ -374,165 +502,315 @@ class Orchestrator:
     # ──────────────────────────────────────────────────────────────────
 
     async def run_exit_loop(self) -> None:
-        logging.info("[EXIT] 청산 루프 시작 (30초 주기)")
+        logging.info("[EXIT] 청산 루프 시작 (%d초 주기)", _EXIT_INTERVAL_SEC)
         while True:
             try:
                 await self._exit_cycle()
             except Exception as exc:
                 logging.error("[EXIT] 예외: %s", exc)
-            await asyncio.sleep(30)
+            await asyncio.sleep(_EXIT_INTERVAL_SEC)
 
     async def _exit_cycle(self) -> None:
-        positions = await asyncio.to_thread(self.db.list_open_positions)
+        """
+        보유 포지션 청산 판단 1회 — 종목별 평가를 동시 실행.
+
+        조회(현재가·ATR·분봉·엔진 판단)는 세마포어로 동시 수를 제한해 병렬 처리하고,
+        주문 제출은 _exit_order / _partial_exit_order 의 종목별 락으로 직렬화한다.
+        사이클 소요 시간은 exit_cycle_stats 에 기록 (주기 절반 초과 시 경고).
+        """
+        positions = self.db.list_open_positions()
         if not positions:
             return
 
-        now = datetime.now(timezone.utc)
-        for pos in positions:
-            sym           = pos["symbol"]
-            entry         = float(pos["entry_price"])
-            peak          = float(pos.get("peak_price") or entry)
-            strategy      = pos.get("strategy", "")
-            qty           = int(pos.get("qty", 0))
-            partial_stage = int(pos.get("partial_stage") or 0)
+        started = time.monotonic()
+        now     = datetime.now(timezone.utc)
+        limit   = asyncio.Semaphore(self._exit_concurrency)
+        # 보유 종목 최신가 배치 1회 — _exit_one 들이 공유
+        await asyncio.to_thread(self.prices.refresh, [p["symbol"] for p in positions])
+
+        async def _guarded(pos: dict) -> None:
+            async with limit:
+                try:
+                    await self._evaluate(pos, now)
+                except Exception as exc:
+                    logging.error("[EXIT] %s 평가 실패: %s", pos.get("symbol"), exc)
+
+        await asyncio.gather(*(_guarded(p) for p in positions))
+        self._record_exit_cycle(time.monotonic() - started, len(positions))
+
+    def _record_exit_cycle(self, elapsed: float, n_positions: int) -> None:
+        st = self.exit_cycle_stats
+        st["last_sec"]  = elapsed
+        st["max_sec"]   = max(st["max_sec"], elapsed)
+        st["cycles"]   += 1
+        st["positions"] = n_positions
+        if elapsed > _EXIT_INTERVAL_SEC * 0.5:
+            st["slow"] += 1
+            logging.warning("[EXIT] 청산 사이클 지연 %.1fs (%d종목, 주기 %ds)",
+                            elapsed, n_positions, _EXIT_INTERVAL_SEC)
+        else:
+            logging.debug("[EXIT] 청산 사이클 %.2fs (%d종목)", elapsed, n_positions)
+
+    def _order_lock(self, sym: str) -> asyncio.Lock:
+        lock = self._order_locks.get(sym)
+        if lock is None:
+            lock = self._order_locks[sym] = asyncio.Lock()
+        return lock
+
+    async def _exit_order(self, sym: str, qty: int, price: float, reason: str, strategy: str) -> bool:
+        """
+        전량 청산 주문 — 종목별 락 안에서 포지션 잔존을 재확인 후 제출.
+
+        같은 종목의 청산 경로(사이클·호가 이탈·헤지)가 겹쳐도 두 번 매도하지 않는다.
+        실제 제출했으면 True.
+        """
+        async with self._order_lock(sym):
+            pos = self.db.get_open_position(sym)
+            if not pos:
+                return False
+            qty = min(qty, int(pos.get("qty", qty)))
             if qty <= 0:
-                continue
+                return False
+            await asyncio.to_thread(self._do_exit, sym, qty, price, reason, strategy)
+            return True
 
-            last = await asyncio.to_thread(self._fetch_last, sym)
-            if last <= 0:
-                continue
+    async def _partial_exit_order(
+        self, sym: str, qty: int, price: float,
+        new_stage: int, sell_ratio: float, strategy: str,
+        stage: Optional[int] = None,
+    ) -> bool:
+        """
+        분할 청산 주문 — _exit_order 와 같은 종목별 락·잔량 재확인.
 
-            # peak 갱신
-            if last > peak:
-                await asyncio.to_thread(self.db.update_peak, sym, last)
-                peak = last
+        stage: 판단 근거가 된 partial_stage. 락 안에서 다시 읽은 값과 다르면
+        다른 경로가 이미 분할 청산한 것이므로 제출하지 않는다.
+        """
+        async with self._order_lock(sym):
+            pos = self.db.get_open_position(sym)
+            if not pos:
+                return False
+            if stage is not None and int(pos.get("partial_stage") or 0) != stage:
+                return False
+            qty = min(qty, int(pos.get("qty", qty)))
+            if qty <= 0:
+                return False
+            await asyncio.to_thread(
+                self._do_partial_exit, sym, qty, price, new_stage, sell_ratio, strategy
+            )
+            return True
 
-            atr_now = 0.0   # squeeze 블록에서 갱신; 다른 전략은 _check_exit_reason 내부에서 조회
+    async def _evaluate(self, pos: dict, now: datetime) -> bool:
+        """
+        _exit_one 진입점 (30초 사이클 · 틱 재평가 공용) — 종목당 동시 평가 1건.
 
-            # ── 3분 룰: 진입 후 3분 이내 수익 미달 → 절반 매도 ─────
-            if strategy == "squeeze" and sym not in self._3min_checked:
-                entry_ts_str = pos.get("entry_ts", "")
-                if entry_ts_str:
-                    try:
-                        from datetime import datetime, timezone
-                        entry_dt  = datetime.fromisoformat(entry_ts_str.replace("Z", "+00:00"))
-                        hold_mins = (now - entry_dt).total_seconds() / 60.0
-                        if 3.0 <= hold_mins <= 8.0:   # 3~8분 사이에 한 번만 판정
-                            self._3min_checked.add(sym)
-                            pnl_pct = (last - entry) / entry if entry > 0 else 0.0
-                            if pnl_pct <= 0.0:
-                                sell_qty = max(1, qty // 2)
-                                await asyncio.to_thread(
-                                    self._do_partial_exit, sym, qty, last,
-                                    partial_stage + 5, 0.5, strategy
-                                )
-                                qty = qty - sell_qty
-                                self._notify(
-                                    f"⚠️ [3분룰] {sym} 진입 {hold_mins:.1f}분 경과 수익 미달 "
-                                    f"({pnl_pct*100:+.1f}%) — 절반 매도"
-                                )
-                                logging.info("[EXIT][3분룰] %s hold=%.1f분 pnl=%.1f%% → 절반 매도",
-                                             sym, hold_mins, pnl_pct * 100)
-                                if qty <= 0 and self._stream:
-                                    self._stream.release(sym)
-                                    continue
-                    except Exception as _e:
-                        logging.debug("[EXIT][3분룰] %s ts 파싱 오류: %s", sym, _e)
-
-            # ── 분할 청산 (B3 squeeze 전용) ──────────────────────────
-            # partial_exits_enabled: false → 기계적 % 분할 비활성화
-            # 대신 _check_exit_reason 내 분배(distribution) 감지 시 50% 부분 청산
-            squeeze_cfg = self.cfg.get("squeeze", {})
-            if strategy == "squeeze" and squeeze_cfg.get("partial_exits_enabled", True):
-                new_stage, sell_ratio = partial_exit_check(entry, last, partial_stage)
-                if sell_ratio > 0:
-                    await asyncio.to_thread(
-                        self._do_partial_exit, sym, qty, last, new_stage, sell_ratio, strategy
-                    )
-                    qty = max(1, qty - int(qty * sell_ratio))
-                    partial_stage = new_stage
+        이미 평가 중인 종목은 건너뛴다 (False). 분할 청산 중복과
+        ExitStrategyEngine 종목별 상태(개미 털기 대기)의 동시 수정을 막는다.
+        """
+        sym = pos["symbol"]
+        if sym in self._evaluating:
+            return False
+        self._evaluating.add(sym)
+        try:
+            await self._exit_one(pos, now)
+        finally:
+            self._evaluating.discard(sym)
+        return True
 
-            # ── B2 방어 모드: 주봉 20주 MA 이탈 시 청산 ─────────────────
-            if strategy == "etf_swing" and self.b2_alloc.current_mode == B2AllocMode.CASH:
-                await asyncio.to_thread(self._do_exit, sym, qty, last, "b2_cash_protection", strategy)
-                continue
+    async def _exit_one(self, pos: dict, now: datetime) -> None:
+        """포지션 1개 청산 판단 (_evaluate 경유 — 종목별 동시 실행)."""
+        sym           = pos["symbol"]
+        entry         = float(pos["entry_price"])
+        peak          = float(pos.get("peak_price") or entry)
+        strategy      = pos.get("strategy", "")
+        qty           = int(pos.get("qty", 0))
+        partial_stage = int(pos.get("partial_stage") or 0)
+        if qty <= 0:
+            return
 
-            if strategy == "etf_swing":
-                from strategy.b2_allocation import B2AllocMode as _B2M
-                if self.b2_alloc.current_mode == _B2M.DEFENSE_INDEX:
-                    # 인트라데이 손절: -8% 하드 스탑 (주봉 청산만 있어 손실 무제한 방치 버그 수정)
-                    defense_sl_pct = self.cfg.get("etf_swing", {}).get("long_sl_pct", 0.08)
-                    if entry > 0 and last <= entry * (1.0 - defense_sl_pct):
-                        stop_reason = (
-                            f"DEFENSE_INDEX 손절 -{defense_sl_pct*100:.0f}% "
-                            f"(진입 ${entry:.2f} → 현재 ${last:.2f})"
-                        )
-                        await asyncio.to_thread(self._do_exit, sym, qty, last, stop_reason, strategy)
-                        logging.info("[B2][DEFENSE] %s 손절 청산: %s", sym, stop_reason)
-                        continue
-                    wk_exit, wk_reason = await asyncio.to_thread(
-                        self.b2_alloc.check_weekly_exit, sym
+        last = await asyncio.to_thread(self._snapshot_last, sym)
+        if last <= 0:
+            return
+
+        # peak 갱신
+        if last > peak:
+            self.db.update_peak(sym, last)
+            peak = last
+
+        atr_now = 0.0   # squeeze 블록에서 갱신; 다른 전략은 _check_exit_reason 내부에서 조회
+
+        # ── 3분 룰: 진입 후 3분 이내 수익 미달 → 절반 매도 ─────
+        if strategy == "squeeze" and sym not in self._3min_checked:
+            entry_ts_str = pos.get("entry_ts", "")
+            if entry_ts_str:
+                try:
+                    entry_dt  = datetime.fromisoformat(entry_ts_str.replace("Z", "+00:00"))
+                    hold_mins = (now - entry_dt).total_seconds() / 60.0
+                    if 3.0 <= hold_mins <= 8.0:   # 3~8분 사이에 한 번만 판정
+                        self._3min_checked.add(sym)
+                        pnl_pct = (last - entry) / entry if entry > 0 else 0.0
+                        if pnl_pct <= 0.0 and await self._partial_exit_order(
+                            sym, qty, last, partial_stage + 5, 0.5, strategy, stage=partial_stage,
+                        ):
+                            qty = qty - max(1, qty // 2)
+                            partial_stage += 5
+                            self._notify(
+                                f"⚠️ [3분룰] {sym} 진입 {hold_mins:.1f}분 경과 수익 미달 "
+                                f"({pnl_pct*100:+.1f}%) — 절반 매도"
+                            )
+                            logging.info("[EXIT][3분룰] %s hold=%.1f분 pnl=%.1f%% → 절반 매도",
+                                         sym, hold_mins, pnl_pct * 100)
+                            if qty <= 0 and self._stream:
+                                self._stream.release(sym)
+                                return
+                except Exception as _e:
+                    logging.debug("[EXIT][3분룰] %s ts 파싱 오류: %s", sym, _e)
+
+        # ── 분할 청산 (B3 squeeze 전용) ──────────────────────────
+        # partial_exits_enabled: false → 기계적 % 분할 비활성화
+        # 대신 _check_exit_reason 내 분배(distribution) 감지 시 50% 부분 청산
+        squeeze_cfg = self.cfg.get("squeeze", {})
+        if strategy == "squeeze" and squeeze_cfg.get("partial_exits_enabled", True):
+            new_stage, sell_ratio = partial_exit_check(entry, last, partial_stage)
+            if sell_ratio > 0 and await self._partial_exit_order(
+                sym, qty, last, new_stage, sell_ratio, strategy, stage=partial_stage,
+            ):
+                qty = max(1, qty - int(qty * sell_ratio))
+                partial_stage = new_stage
+
+        # ── B2 방어 모드: 주봉 20주 MA 이탈 시 청산 ─────────────────
+        if strategy == "etf_swing" and self.b2_alloc.current_mode == B2AllocMode.CASH:
+            await self._exit_order(sym, qty, last, "b2_cash_protection", strategy)
+            return
+
+        if strategy == "etf_swing":
+            from strategy.b2_allocation import B2AllocMode as _B2M
+            if self.b2_alloc.current_mode == _B2M.DEFENSE_INDEX:
+                # 인트라데이 손절: -8% 하드 스탑 (주봉 청산만 있어 손실 무제한 방치 버그 수정)
+                defense_sl_pct = self.cfg.get("etf_swing", {}).get("long_sl_pct", 0.08)
+                if entry > 0 and last <= entry * (1.0 - defense_sl_pct):
+                    stop_reason = (
+                        f"DEFENSE_INDEX 손절 -{defense_sl_pct*100:.0f}% "
+                        f"(진입 ${entry:.2f} → 현재 ${last:.2f})"
                     )
-                    if wk_exit:
-                        await asyncio.to_thread(self._do_exit, sym, qty, last, wk_reason, strategy)
-                        continue
-
-            # ── ExitStrategyEngine: B3 고도화 청산 (가변 ATR + 개미 털기 방어) ─
-            # hard_stop / stop_loss / distribution 은 _check_exit_reason 에서 처리.
-            # 이 엔진은 trailing_stop 판단을 대체하며 breakeven_trap / orderflow 도 추가.
-            if strategy == "squeeze":
-                atr_now = await asyncio.to_thread(self._fetch_atr, sym)
-                df_flow = await asyncio.to_thread(self._fetch_bars, sym, "5Min", 100)
-                peak_pnl_pct = (peak - entry) / entry if entry > 0 else 0.0
-
-                # 거래량 정보 추출
-                cur_vol, avg_vol_20 = 0.0, 0.0
-                if df_flow is not None and not df_flow.empty:
-                    cur_vol = float(df_flow.iloc[-1].get("volume", 0) or 0)
-                    from strategy.signals import compute_indicators
-                    if "vol_ma20" not in df_flow.columns:
-                        df_flow = compute_indicators(df_flow)
-                    avg_vol_20 = float(df_flow.iloc[-1].get("vol_ma20", 0) or 0)
-
-                signal = await asyncio.to_thread(
-                    self.exit_engine.assess,
-                    sym, entry, last, peak, atr_now, df_flow,
-                    cur_vol, avg_vol_20, peak_pnl_pct,
+                    await self._exit_order(sym, qty, last, stop_reason, strategy)
+                    logging.info("[B2][DEFENSE] %s 손절 청산: %s", sym, stop_reason)
+                    return
+                wk_exit, wk_reason = await asyncio.to_thread(
+                    self.b2_alloc.check_weekly_exit, sym
                 )
+                if wk_exit:
+                    await self._exit_order(sym, qty, last, wk_reason, strategy)
+                    return
 
-                if signal.decision == ExitDecision.SELL:
-                    await asyncio.to_thread(self._do_exit, sym, qty, last, signal.reason, strategy)
-                    if self._stream:
-                        self._stream.release(sym)
-                    continue   # 청산 완료 → 이하 _check_exit_reason 스킵
-
-                if signal.decision == ExitDecision.SHAKEOUT_WAIT:
-                    continue   # 이번 사이클 스킵 (대기 중)
-                # HOLD → _check_exit_reason 로 폴스루
-
-            cfg_b = self.cfg.get(strategy, self.cfg.get("risk", {}))
-            # squeeze는 위에서 atr_now를 이미 조회했으므로 재사용 (중복 API 호출 방지)
-            _atr_hint = atr_now if strategy == "squeeze" else None
-            reason = await asyncio.to_thread(
-                self._check_exit_reason, sym, entry, last, peak, cfg_b, strategy, now, _atr_hint
+        # ── ExitStrategyEngine: B3 고도화 청산 (가변 ATR + 개미 털기 방어) ─
+        # hard_stop / stop_loss / distribution 은 _check_exit_reason 에서 처리.
+        # 이 엔진은 trailing_stop 판단을 대체하며 breakeven_trap / orderflow 도 추가.
+        if strategy == "squeeze":
+            atr_now = await asyncio.to_thread(self._fetch_atr, sym)
+            self._arm_exit_levels(sym, entry, peak, atr_now, qty, strategy)
+            df_flow = await asyncio.to_thread(self._fetch_rolling, sym, "5Min", 100)
+            peak_pnl_pct = (peak - entry) / entry if entry > 0 else 0.0
+
+            # 거래량 정보 추출
+            cur_vol, avg_vol_20 = 0.0, 0.0
+            if df_flow is not None and not df_flow.empty:
+                cur_vol = float(df_flow.iloc[-1].get("volume", 0) or 0)
+                # 증분 지표 상태 — 새로 마감된 5분봉만 반영 (전체 재계산 없음)
+                ind = self.indicators.update(sym, "5Min", df_flow)
+                avg_vol_20 = float(ind.get("vol_ma20", 0) or 0)
+
+            signal = await asyncio.to_thread(
+                self.exit_engine.assess,
+                sym, entry, last, peak, atr_now, df_flow,
+                cur_vol, avg_vol_20, peak_pnl_pct,
             )
-            if reason:
-                # 분배 감지 → 부분 청산 후 포지션 유지 (전량 청산 아님)
-                if reason.startswith("distribution_partial:"):
-                    dist_ratio = float(reason.split(":")[1])
-                    sell_qty = max(1, int(qty * dist_ratio))
-                    await asyncio.to_thread(
-                        self._do_partial_exit, sym, qty, last,
-                        partial_stage + 10,  # 분배 청산은 stage 10+으로 구분
-                        dist_ratio, strategy
-                    )
-                    qty -= sell_qty
-                    if qty <= 0 and self._stream and strategy == "squeeze":
-                        self._stream.release(sym)
-                else:
-                    await asyncio.to_thread(self._do_exit, sym, qty, last, reason, strategy)
-                    if self._stream and strategy == "squeeze":
-                        self._stream.release(sym)
+
+            if signal.decision == ExitDecision.SELL:
+                await self._exit_order(sym, qty, last, signal.reason, strategy)
+                if self._stream:
+                    self._stream.release(sym)
+                return   # 청산 완료 → 이하 _check_exit_reason 스킵
+
+            if signal.decision == ExitDecision.SHAKEOUT_WAIT:
+                return   # 이번 사이클 스킵 (대기 중)
+            # HOLD → _check_exit_reason 로 폴스루
+
+        cfg_b = self.cfg.get(strategy, self.cfg.get("risk", {}))
+        # squeeze는 위에서 atr_now를 이미 조회했으므로 재사용 (중복 API 호출 방지)
+        _atr_hint = atr_now if strategy == "squeeze" else None
+        reason = await asyncio.to_thread(
+            self._check_exit_reason, sym, entry, last, peak, cfg_b, strategy, now, _atr_hint
+        )
+        if reason:
+            # 분배 감지 → 부분 청산 후 포지션 유지 (전량 청산 아님)
+            if reason.startswith("distribution_partial:"):
+                dist_ratio = float(reason.split(":")[1])
+                sent = await self._partial_exit_order(
+                    sym, qty, last,
+                    partial_stage + 10,  # 분배 청산은 stage 10+으로 구분
+                    dist_ratio, strategy, stage=partial_stage,
+                )
+                if sent:
+                    qty -= max(1, int(qty * dist_ratio))
+                if qty <= 0 and self._stream and strategy == "squeeze":
+                    self._stream.release(sym)
+            else:
+                await self._exit_order(sym, qty, last, reason, strategy)
+                if self._stream and strategy == "squeeze":
+                    self._stream.release(sym)
+
+    def _arm_exit_levels(
+        self, sym: str, entry: float, peak: float, atr: float, qty: int, strategy: str,
+    ) -> None:
+        """틱 청산 레벨 (재)무장 — 손절 설정은 _check_exit_reason 과 동일 키 사용."""
+        if not self._event_exits:
+            return
+        cfg_b = self.cfg.get(strategy, self.cfg.get("risk", {}))
+        self.exit_levels.arm(
+            sym, entry, peak, atr,
+            stop_pct=float(cfg_b.get("stop_loss_pct", 0.05)),
+            atr_mult=float(cfg_b.get("atr_multiplier", 2.0)),
+            qty=qty, strategy=strategy,
+        )
+
+    async def on_price(self, symbol: str, price: float) -> None:
+        """
+        스트림 체결가/매수호가 틱 → 메모리 청산 레벨 교차 즉시 대응 (30초 루프는 백스톱).
+
+        본절 트랩: 바로 청산 주문 (사이클의 ExitStrategyEngine 도 대기 없이 매도).
+        손절 · ATR 트레일링: 해당 종목만 즉시 재평가 — 사이클과 같은 개미 털기 판정
+        (저거래량 이탈은 대기)을 거친 뒤 _check_exit_reason 이 손절을 낸다.
+        재평가는 종목당 _LEVEL_REEVAL_SEC 에 1회, 사이클이 평가 중이면 건너뛴다.
+        """
+        if not self._event_exits:
+            return
+        hit = self.exit_levels.check(symbol, price)
+        if hit is None:
+            return
+        kind, reason, lv = hit
+        self.prices.put(symbol, price)
+
+        if kind == HARD and reason != "stop_loss":
+            logging.warning("[EXIT][틱] %s %s 레벨 이탈 @ $%.2f (손절 $%.2f)",
+                            symbol, reason, price, lv.stop)
+            sent = await self._exit_order(symbol, lv.qty, price, reason, lv.strategy)
+            if sent and self._stream:
+                self._stream.release(symbol)
+            return
+
+        now_m = time.monotonic()
+        pos   = self.db.get_open_position(symbol)
+        if (not pos or symbol in self._evaluating
+                or now_m - self._level_eval_at.get(symbol, 0.0) < _LEVEL_REEVAL_SEC):
+            if pos and kind == HARD:
+                # 교차로 해제된 손절 레벨 복원 — 다음 틱에서 다시 판정
+                self.exit_levels.arm(symbol, lv.entry, lv.peak, lv.atr, lv.stop_pct,
+                                     lv.atr_mult, lv.qty, lv.strategy)
+            return
+        self._level_eval_at[symbol] = now_m
+        logging.info("[EXIT][틱] %s %s 레벨 이탈 @ $%.2f (손절 $%.2f · 트레일링 $%.2f) → 즉시 재평가",
+                     symbol, reason, price, lv.stop, lv.trail)
+        await self._evaluate(pos, datetime.now(timezone.utc))
 
     def _check_exit_reason(
         self, sym, entry, last, peak, cfg, strategy, now,
@@ -569,7 +847,7 @@ class Orchestrator:
             pnl_pct = (last - entry) / entry if entry > 0 else 0.0
             dist_ratio = float(cfg.get("distribution_exit_ratio", 0.50))
             if pnl_pct >= 0.15:  # 최소 +15% 이상 수익 구간에서만 분배 감지
-                df_recent = self._fetch_bars(sym, "5Min", 20)
+                df_recent = self._fetch_rolling(sym, "5Min", 20)
                 if df_recent is not None and not df_recent.empty:
                     from strategy.squeeze import is_distribution_detected
                     distributing, dist_reason = is_distribution_detected(df_recent, lookback_bars=5)
@@ -599,6 +877,7 @@ class Orchestrator:
         logging.info("[MONITOR] 모니터 루프 시작 (60초 주기)")
         tick = 0
         _journal_done_date: str = ""  # 하루 한 번만 생성
+        _reference_done_date: str = ""  # float · 공매도 참조 데이터 일일 갱신
         while True:
             try:
                 # ── 장 상태 heartbeat (60초마다) ──────────────────────
@@ -616,8 +895,14 @@ class Orchestrator:
                 elif _now_et > _close:
                     logging.info("[MONITOR] 장 마감 — 다음 개장 대기")
                 else:
-                    logging.info("[MONITOR] 장중 (ET %s) | 킬스위치=%s",
-                                 _now_et.strftime("%H:%M"), self.kill_switch.is_killed)
+                    from data.alpaca_bars import bar_cache_stats
+                    _bc = bar_cache_stats()
+                    _ec = self.exit_cycle_stats
+                    logging.info("[MONITOR] 장중 (ET %s) | 킬스위치=%s | 봉캐시 %d건 적중률 %.0f%% "
+                                 "| 청산사이클 %.2fs (최대 %.2fs, 지연 %d회)",
+                                 _now_et.strftime("%H:%M"), self.kill_switch.is_killed,
+                                 _bc["entries"], _bc["hit_rate"] * 100,
+                                 _ec["last_sec"], _ec["max_sec"], _ec["slow"])
 
                 # 텔레그램 수동 모드 변경 감지 — DB vs 런타임 불일치 시 즉시 적용
                 _db_mode_str = dbm.get_system_state("CURRENT_MODE")
@@ -653,6 +938,18 @@ class Orchestrator:
                     except Exception as je:
                         logging.warning("[MONITOR] 일지 생성 실패: %s", je)
 
+                # 장 마감 후 참조 데이터(float · 공매도) 일괄 갱신 — 다음 장전 스캔은 디스크 값 사용
+                if ((now_et.hour, now_et.minute) >= (16, 5)
+                        and _reference_done_date != today
+                        and now_et.weekday() < 5):
+                    _reference_done_date = today
+                    try:
+                        from data.reference import refresh_universe
+                        n = await asyncio.to_thread(refresh_universe)
+                        logging.info("[MONITOR] 참조 데이터 갱신 완료: %d종목", n)
+                    except Exception as re_:
+                        logging.warning("[MONITOR] 참조 데이터 갱신 실패: %s", re_)
+
             except Exception as exc:
                 logging.error("[MONITOR] 예외: %s", exc)
             await asyncio.sleep(60)
@@ -707,7 +1004,12 @@ class Orchestrator:
         if self._hedge_active:
             return
 
-        positions = await asyncio.to_thread(self.db.list_open_positions)
+        positions = self.db.list_open_positions()
+        # B3 청산 대상 + 헤지 ETF 최신가 배치 1회
+        await asyncio.to_thread(
+            self.prices.refresh,
+            [p["symbol"] for p in positions if p["strategy"] == "squeeze"] + PANIC_HEDGE_ETFS,
+        )
 
         # B3 전량 청산
         for pos in positions:
@@ -715,18 +1017,17 @@ class Orchestrator:
                 continue
             sym  = pos["symbol"]
             qty  = int(pos.get("qty", 0))
-            last = await asyncio.to_thread(self._fetch_last, sym)
+            last = await asyncio.to_thread(self._snapshot_last, sym)
             if qty > 0 and last > 0:
-                await asyncio.to_thread(self._do_exit, sym, qty, last, "panic_hedge_b3_exit", "squeeze")
-                if self._stream:
+                if await self._exit_order(sym, qty, last, "panic_hedge_b3_exit", "squeeze") and self._stream:
                     self._stream.release(sym)
 
         # B2 인버스 ETF 헤지 추가
         b2_budget = self.bucket_capital.allocated("etf_swing") * 0.30  # B2 예산의 30%를 헤지에 사용
         for hedge_sym in PANIC_HEDGE_ETFS:
-            if await asyncio.to_thread(self.db.get_open_position, hedge_sym):
+            if self.db.get_open_position(hedge_sym):
                 continue
-            last = await asyncio.to_thread(self._fetch_last, hedge_sym)
+            last = await asyncio.to_thread(self._snapshot_last, hedge_sym)
             if last <= 0:
                 continue
             qty = self._calc_qty(last, b2_budget / len(PANIC_HEDGE_ETFS))
@@ -735,13 +1036,14 @@ class Orchestrator:
             try:
                 ask = self._fetch_ask(hedge_sym)
                 buy_px = round(ask * 1.002, 4) if ask > 0 else None
-                self.broker.submit_order(
-                    symbol=hedge_sym, qty=qty, side="buy",
+                qty, last = self._submit(
+                    hedge_sym, qty, "buy", last,
                     type="limit" if buy_px else "market",
                     price=buy_px, tif="IOC",
                 )
-                await asyncio.to_thread(self.db.open_position, hedge_sym, "etf_swing", last, qty, "InverseETF")
-                await asyncio.to_thread(self.db.record_trade, hedge_sym, "buy", qty, last, "etf_swing", "panic_hedge")
+                if qty <= 0:
+                    continue
+                await self._book_entry(hedge_sym, "etf_swing", last, qty, "InverseETF", "panic_hedge")
                 self._notify(f"🛡️ Panic 헤지: {hedge_sym} {qty}주 @ ${last:.2f}")
             except Exception as exc:
                 logging.error("[MONITOR] 헤지 주문 실패 %s: %s", hedge_sym, exc)
@@ -779,8 +1081,7 @@ class Orchestrator:
         cfg_b1  = self.cfg.get("value_long", {})
         max_pos = int(cfg_b1.get("max_positions", 8))
 
-        positions = self.db.list_open_positions()
-        b1_count  = sum(1 for p in positions if p["strategy"] == "value_long")
+        b1_count  = self.db.count_open("value_long")
         if b1_count >= max_pos:
             logging.info("[B1] 최대 포지션 도달 (%d/%d) — 스캔 스킵", b1_count, max_pos)
             return
@@ -825,11 +1126,13 @@ class Orchestrator:
                 else:
                     ask = self._fetch_ask(sym)
                     buy_px = round(ask * 1.002, 4) if ask > 0 else None
-                self.broker.submit_order(
-                    symbol=sym, qty=qty, side="buy",
+                qty, last = self._submit(
+                    sym, qty, "buy", last,
                     type="limit" if buy_px else "market",
                     price=buy_px, tif="IOC",
                 )
+                if qty <= 0:
+                    continue
                 self.db.open_position(sym, "value_long", last, qty, getattr(fs, "sector", ""))
                 self.db.record_trade(sym, "buy", qty, last, "value_long", reason)
                 try:
@@ -899,6 +1202,11 @@ class Orchestrator:
         logging.info("[B2] 리밸런싱 → 모드: %s | 목표 종목: %s | 예산: $%.0f",
                      target.mode.name, target.symbols or "없음", budget)
 
+        # 보유 B2 포지션 + 목표 종목 최신가 배치 1회 (사이클 내 공유)
+        b2_held = [p["symbol"] for p in self.db.list_open_positions()
+                   if p.get("strategy") == "etf_swing"]
+        self.prices.refresh(b2_held + list(target.symbols))
+
         # ── CASH 모드: 모든 B2 포지션 청산 ─────────────────────────
         if target.mode == B2AllocMode.CASH:
             positions = self.db.list_open_positions()
@@ -907,7 +1215,7 @@ class Orchestrator:
                     continue
                 sym  = pos["symbol"]
                 qty  = int(pos.get("qty", 0))
-                last = self._fetch_last(sym)
+                last = self._snapshot_last(sym)
                 if last > 0 and qty > 0:
                     self._do_exit(sym, qty, last, "b2_cash_protection", "etf_swing")
             return
@@ -920,7 +1228,7 @@ class Orchestrator:
             sym = pos["symbol"]
             if sym not in target.symbols:
                 qty  = int(pos.get("qty", 0))
-                last = self._fetch_last(sym)
+                last = self._snapshot_last(sym)
                 if last > 0 and qty > 0:
                     self._do_exit(sym, qty, last, "b2_rebalance_exit", "etf_swing")
 
@@ -939,7 +1247,7 @@ class Orchestrator:
                 logging.info("[B2-Alloc] %s 진입 조건 미충족: %s", sym, reason)
                 continue
 
-            last = self._fetch_last(sym)
+            last = self._snapshot_last(sym)
             if last <= 0:
                 continue
 
@@ -954,11 +1262,13 @@ class Orchestrator:
                 else:
                     ask    = self._fetch_ask(sym)
                     buy_px = round(ask * 1.002, 4) if ask > 0 else None
-                self.broker.submit_order(
-                    symbol=sym, qty=qty, side="buy",
+                qty, last = self._submit(
+                    sym, qty, "buy", last,
                     type="limit" if buy_px else "market",
                     price=buy_px, tif="IOC",
                 )
+                if qty <= 0:
+                    continue
                 self.db.open_position(sym, "etf_swing", last, qty, "")
                 self.db.record_trade(sym, "buy", qty, last, "etf_swing", reason)
                 try:
@@ -993,8 +1303,7 @@ class Orchestrator:
         cfg_b2  = self.cfg.get("etf_swing", {})
         max_pos = int(cfg_b2.get("max_positions", 4))
 
-        positions = self.db.list_open_positions()
-        b2_count  = sum(1 for p in positions if p["strategy"] == "etf_swing")
+        b2_count  = self.db.count_open("etf_swing")
         if b2_count >= max_pos:
             return
 
@@ -1028,11 +1337,13 @@ class Orchestrator:
                 else:
                     ask = self._fetch_ask(sym)
                     buy_px = round(ask * 1.002, 4) if ask > 0 else None
-                self.broker.submit_order(
-                    symbol=sym, qty=qty, side="buy",
+                qty, last = self._submit(
+                    sym, qty, "buy", last,
                     type="limit" if buy_px else "market",
                     price=buy_px, tif="IOC",
                 )
+                if qty <= 0:
+                    continue
                 self.db.open_position(sym, "etf_swing", last, qty, "ETF")
                 self.db.record_trade(sym, "buy", qty, last, "etf_swing", reason)
                 try:
@@ -1062,16 +1373,15 @@ class Orchestrator:
         if is_high_volatility(vix or 0):
             return
 
-        if await asyncio.to_thread(self.db.get_open_position, symbol):
+        if self.db.get_open_position(symbol):
             return
 
         cfg_b3  = self.cfg.get("squeeze", {})
         max_pos = int(cfg_b3.get("max_positions", 3))
-        positions = await asyncio.to_thread(self.db.list_open_positions)
-        if sum(1 for p in positions if p["strategy"] == "squeeze") >= max_pos:
+        if self.db.count_open("squeeze") >= max_pos:
             return
 
-        df = await asyncio.to_thread(self._fetch_bars, symbol, "5Min", 60)
+        df = await self._stream_bars(symbol, "5Min", 60)
         if df is None or df.empty:
             return
 
@@ -1124,7 +1434,10 @@ class Orchestrator:
             logging.info("[B3] %s 신뢰도 %d점 미달 (70점 기준) — 진입 차단", symbol, conf.total)
             return
 
-        last = await asyncio.to_thread(self._fetch_last, symbol)
+        # 방금 수신한 1분봉 종가 우선 (REST 최신가 조회 생략), 없으면 REST
+        last = self.bar_agg.last_price(symbol) or close_val
+        if last <= 0:
+            last = await asyncio.to_thread(self._fetch_last, symbol)
         if last <= 0:
             return
 
@@ -1159,13 +1472,14 @@ class Orchestrator:
             else:
                 ask = self._fetch_ask(symbol)
                 buy_px = round(ask * 1.002, 4) if ask > 0 else None
-            self.broker.submit_order(
-                symbol=symbol, qty=qty, side="buy",
+            qty, last = self._submit(
+                symbol, qty, "buy", last,
                 type="limit" if buy_px else "market",
                 price=buy_px, tif="IOC",
             )
-            await asyncio.to_thread(self.db.open_position, symbol, "squeeze", last, qty, "")
-            await asyncio.to_thread(self.db.record_trade, symbol, "buy", qty, last, "squeeze", reason)
+            if qty <= 0:
+                return
+            await self._book_entry(symbol, "squeeze", last, qty, "", reason)
             try:
                 dbm.save_trade(
                     symbol=symbol, buy_price=last, sell_price=None,
@@ -1175,6 +1489,8 @@ class Orchestrator:
                 pass
             if self._stream:
                 self._stream.hold([symbol])
+            # ATR 은 첫 청산 사이클에서 반영 — 그 전까지 고정 손절 레벨로 틱 감시
+            self._arm_exit_levels(symbol, last, last, 0.0, qty, "squeeze")
             mode_label = "PAPER" if self._is_paper() else "LIVE"
             self._notify(
                 f"📈 [B3/{mode_label}] {symbol} 매수 {qty}주 @ ${last:.2f}\n"
@@ -1184,12 +1500,27 @@ class Orchestrator:
         except Exception as exc:
             logging.error("[B3] %s 주문 실패: %s", symbol, exc)
 
+    async def _stream_bars(self, symbol: str, timeframe: str, limit: int):
+        """
+        스트림 집계 봉 우선 조회 — 미시드 종목은 배치 REST 1회로 시드 후 재사용.
+
+        Alpaca 스트림이 아니거나(Toss 폴링) 집계 봉이 없으면 _fetch_rolling 폴백.
+        진행 중 5분 구간을 포함해 틱 시점의 최신 가격을 반영한다.
+        """
+        if isinstance(self._stream, Bucket3Stream):
+            if not self.bar_agg.is_seeded(symbol):
+                await asyncio.to_thread(self.bar_agg.seed, [symbol])
+            df = self.bar_agg.bars(symbol, timeframe, limit, include_partial=True)
+            if df is not None and not df.empty:
+                return df
+        return await asyncio.to_thread(self._fetch_rolling, symbol, timeframe, limit)
+
     async def on_quote(self, symbol: str, bid: float, ask: float) -> None:
         """호가 수신 → Bid-Ask Spread 탈출 감지."""
         if not bid_ask_spread_exit(bid, ask):
             return
 
-        pos = await asyncio.to_thread(self.db.get_open_position, symbol)
+        pos = self.db.get_open_position(symbol)
         if not pos:
             return
 
@@ -1199,20 +1530,30 @@ class Orchestrator:
 
         mid = (bid + ask) / 2
         spread_pct = (ask - bid) / mid * 100
-        await asyncio.to_thread(
-            self._do_exit, symbol, qty, mid,
-            f"spread_exit({spread_pct:.1f}%)", "squeeze"
+        sent = await self._exit_order(
+            symbol, qty, mid, f"spread_exit({spread_pct:.1f}%)", "squeeze"
         )
-        if self._stream:
+        if sent and self._stream:
             self._stream.release(symbol)
 
     async def run_bucket3_stream(self, scan_symbols: List[str]) -> None:
         """버킷 3 스트림 시작 (Toss PollingStream 또는 Alpaca WebSocket)."""
         # main.py에서 미리 PollingStream을 주입한 경우 덮어쓰지 않음
         if self._stream is None:
-            self._stream = Bucket3Stream(on_bar=self.on_bar, on_quote=self.on_quote)
+            self._stream = Bucket3Stream(
+                on_bar=self.on_bar, on_quote=self.on_quote, on_price=self.on_price,
+            )
         self._stream.watch(scan_symbols)
 
+        # Alpaca WebSocket: 1분봉 집계기 연결 + QQQ(신뢰도 Alpha 기준) 집계 전용 구독
+        if isinstance(self._stream, Bucket3Stream):
+            self._stream.aggregator = self.bar_agg
+            self._stream.track(["QQQ"])
+            self._seed_task = asyncio.create_task(
+                asyncio.to_thread(self.bar_agg.seed, list(scan_symbols) + ["QQQ"])
+            )
+            self._seed_task.add_done_callback(_log_seed_result)
+
         # 보유 포지션도 즉시 등록
         positions = self.db.list_open_positions()
         held = [p["symbol"] for p in positions if p["strategy"] == "squeeze"]
@@ -1220,4 +1561,10 @@ class Orchestrator:
             self._stream.hold(held)
 
         logging.info("[B3] WebSocket 스트림 시작 — %d 종목 감시", len(scan_symbols))
-        await self._stream.run()
+        try:
+            await self._stream.run()
+        finally:
+            # 스트림 종료 시 진행 중인 시드 정리 (스레드는 끝까지 돌지만 결과는 버림)
+            if self._seed_task is not None and not self._seed_task.done():
+                self._seed_task.cancel()
+                await asyncio.gather(self._seed_task, return_exceptions=True)
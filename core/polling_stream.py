@@ -6,6 +6,7 @@ Alpaca StockDataStream 대비 차이:
   - 1초 간격 REST 폴링 (WebSocket 없음)
   - on_bar  : 1분봉이 확정될 때마다 콜백 (분 변경 감지)
   - on_quote: 1초마다 호가(bid/ask) 콜백 → spread exit 감지
+  - on_price: 1초마다 보유 종목 현재가 콜백 → 손절/트레일링 레벨 즉시 비교 (선택)
 
 폴링 대상:
   _watch : 진입 후보 (bar 이벤트만)
@@ -27,10 +28,12 @@ class PollingStream:
         broker,                          # TossInvestBroker
         on_bar:   Callable,              # async def on_bar(symbol, bar)
         on_quote: Callable,              # async def on_quote(symbol, bid, ask)
+        on_price: Optional[Callable] = None,  # async def on_price(symbol, price)
     ):
         self._broker   = broker
         self._on_bar   = on_bar
         self._on_quote = on_quote
+        self._on_price = on_price
         self._watch: Set[str] = set()   # 진입 후보 심볼
         self._hold:  Set[str] = set()   # 보유 포지션 심볼
         self._running = False
@@ -111,6 +114,13 @@ class PollingStream:
                 except Exception as exc:
                     logging.warning("[Polling] on_bar(%s) 오류: %s", sym, exc)
 
+            # ── price 이벤트: 보유 포지션 청산 레벨 비교 ─────────
+            if sym in self._hold and self._on_price is not None:
+                try:
+                    await self._on_price(sym, price)
+                except Exception as exc:
+                    logging.warning("[Polling] on_price(%s) 오류: %s", sym, exc)
+
             # ── quote 이벤트: 보유 포지션만 (spread exit 감지) ──
             if sym in self._hold:
                 try:
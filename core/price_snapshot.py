@@ -0,0 +1,83 @@
+# core/price_snapshot.py
+"""
+최신가 스냅샷 — 한 사이클에서 필요한 종목 현재가를 배치 1회로 조회해 공유.
+
+_exit_cycle / _apply_panic_hedge / _b2_alloc_cycle 이 종목마다 최신 체결가를
+따로 요청하던 것을, 사이클 시작 시 refresh(symbols) 1회(묶음당 요청 1건)로 대체한다.
+
+  - fetcher(symbols) -> {symbol: price}  (Alpaca 최신 체결 / Toss get_prices)
+  - get(symbol): 스냅샷 가격. max_age 초과(오래된 값)·미조회·0 이하면 0.0 → 호출부 단건 폴백
+  - age(symbol): 해당 종목 가격을 조회한 뒤 경과 초 (없으면 inf)
+"""
+from __future__ import annotations
+
+import logging
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# fetcher(symbols) -> {symbol: price}
+PriceFetcher = Callable[[List[str]], Dict[str, float]]
+
+_BATCH_SYMBOLS = 200   # Toss get_prices 최대 200종목 — Alpaca 도 같은 묶음으로
+
+
+class PriceSnapshot:
+    """종목별 (가격, 조회 시각) 스냅샷 (스레드 안전 — 이벤트 루프 + to_thread 동시 접근)."""
+
+    def __init__(
+        self,
+        fetcher: PriceFetcher,
+        max_age: float = 15.0,
+        clock:   Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetcher = fetcher
+        self._max_age = max_age
+        self._clock   = clock
+        self._prices: Dict[str, Tuple[float, float]] = {}   # symbol → (price, taken_at)
+        self._lock    = threading.Lock()
+        self.requests = 0   # 배치 요청 수 (묶음 단위)
+
+    def refresh(self, symbols: Iterable[str]) -> Dict[str, float]:
+        """symbols 최신가를 묶음당 1요청으로 조회해 스냅샷 갱신. 조회된 {symbol: price} 반환."""
+        syms = list(dict.fromkeys(s for s in symbols if s))
+        got: Dict[str, float] = {}
+        for i in range(0, len(syms), _BATCH_SYMBOLS):
+            chunk = syms[i:i + _BATCH_SYMBOLS]
+            try:
+                self.requests += 1
+                got.update(self._fetcher(chunk) or {})
+            except Exception as exc:
+                logging.debug("[PriceSnapshot] 배치 조회 실패 (%d종목): %s", len(chunk), exc)
+        now = self._clock()
+        with self._lock:
+            for sym, px in got.items():
+                if px and px > 0:
+                    self._prices[sym] = (float(px), now)
+        return got
+
+    def get(self, symbol: str, max_age: Optional[float] = None) -> float:
+        """스냅샷 가격. 오래됐거나(max_age 초과) 없으면 0.0."""
+        limit = self._max_age if max_age is None else max_age
+        with self._lock:
+            item = self._prices.get(symbol)
+        if item is None or self._clock() - item[1] > limit:
+            return 0.0
+        return item[0]
+
+    def age(self, symbol: str) -> float:
+        """마지막 조회 후 경과 초. 조회 이력이 없으면 inf."""
+        with self._lock:
+            item = self._prices.get(symbol)
+        return self._clock() - item[1] if item else math.inf
+
+    def put(self, symbol: str, price: float) -> None:
+        """단건 조회 결과 등 외부에서 얻은 최신가 반영."""
+        if price and price > 0:
+            with self._lock:
+                self._prices[symbol] = (float(price), self._clock())
+
+    def drop(self, symbol: str) -> None:
+        with self._lock:
+            self._prices.pop(symbol, None)
@@ -15,7 +15,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import time
-from datetime import date as _date
+from datetime import date as _date, datetime
 from enum import Enum
 from typing import Callable, List, Optional
 
@@ -171,7 +171,6 @@ class RegimeEngine:
         매일 9:20 ET에 프리마켓 스캔을 실행하는 무한 루프.
         main.py의 asyncio.gather에 태스크로 추가.
         """
-        from datetime import datetime
         logging.info("[RegimeEngine] 프리마켓 루프 시작 (매일 9:20 ET 스캔)")
 
         while True:
@@ -5,17 +5,20 @@
 구독 채널:
   Bars   (1분봉) : Gap&Go + TTM Squeeze 진입 신호 감지
   Quotes (호가)  : 보유 포지션 Bid-Ask Spread 실시간 감시 (Level2 대용)
+  Trades (체결)  : 보유 포지션 체결가 → 손절/트레일링 레벨 즉시 비교 (on_price 연결 시)
 
 이벤트 흐름:
-  bar_handler   → watch_symbols 목록 종목만 처리 → 진입 신호 콜백
-  quote_handler → hold_symbols 목록 종목만 처리 → Spread 탈출 콜백
+  bar_handler   → (aggregator 연결 시) 전 구독 종목 1분봉 집계 → 1분/5분 링버퍼
+                → watch_symbols 목록 종목만 처리 → 진입 신호 콜백
+  quote_handler → hold_symbols 목록 종목만 처리 → Spread 탈출 콜백 (+ bid 로 on_price)
+  trade_handler → hold_symbols 목록 종목만 처리 → on_price(체결가)
 """
 from __future__ import annotations
 
 import asyncio
 import logging
 import os
-from typing import Callable, Set
+from typing import Callable, Optional, Set
 
 
 # Spread 탈출 임계치 — Bid-Ask 스프레드 >= 1.5% 면 즉시 탈출
@@ -27,14 +30,20 @@ class Bucket3Stream:
         self,
         on_bar:   Callable,   # async (symbol: str, bar) -> None
         on_quote: Callable,   # async (symbol: str, bid: float, ask: float) -> None
+        on_price: Optional[Callable] = None,   # async (symbol: str, price: float) -> None
     ):
         self._on_bar      = on_bar
         self._on_quote    = on_quote
+        self._on_price    = on_price
         self._stream      = None
         self._watch: Set[str] = set()   # 진입 감시 종목 (후보)
         self._hold:  Set[str] = set()   # 보유 포지션 (Spread 감시)
+        self._track: Set[str] = set()   # 집계 전용 (진입 콜백 없음, 예: QQQ 기준값)
         self._bar_handler   = None      # run() 에서 세팅 — 동적 구독용 재사용
         self._quote_handler = None
+        self._trade_handler = None
+        # StreamBarAggregator — 연결 시 수신 1분봉을 링버퍼에 적재 (REST 재조회 대체)
+        self.aggregator: Optional[object] = None
 
     # ── 종목 등록/해제 ────────────────────────────────────────────────
 
@@ -44,8 +53,18 @@ class Bucket3Stream:
         logging.debug("[WS] watch 추가: %s", symbols)
 
     def hold(self, symbols: list[str]) -> None:
-        """보유 포지션 등록 — quote spread 감시 대상."""
+        """보유 포지션 등록 — quote spread 감시 + (on_price 연결 시) 체결 구독."""
+        new = [s for s in symbols if s not in self._hold]
         self._hold.update(symbols)
+        if new and self._stream is not None and self._trade_handler is not None:
+            try:
+                self._stream.subscribe_trades(self._trade_handler, *new)
+            except Exception as exc:
+                logging.warning("[WS] 체결 구독 실패 (%s): %s", new, exc)
+
+    def track(self, symbols: list[str]) -> None:
+        """집계 전용 종목 등록 — bar 구독만, 진입 콜백 없음."""
+        self._track.update(s.upper() for s in symbols)
 
     def release(self, symbol: str) -> None:
         """포지션 청산 후 감시 해제."""
@@ -96,10 +115,15 @@ class Bucket3Stream:
             await asyncio.sleep(30)
 
         self._stream = StockDataStream(api_key, secret)
-        all_syms = list(self._watch | self._hold)
+        all_syms = list(self._watch | self._hold | self._track)
 
         async def _bar_handler(bar):
             sym = getattr(bar, "symbol", "")
+            if self.aggregator is not None:
+                try:
+                    self.aggregator.on_bar(sym, bar)
+                except Exception as exc:
+                    logging.debug("[WS] 봉 집계 실패 (%s): %s", sym, exc)
             if sym in self._watch:
                 try:
                     await self._on_bar(sym, bar)
@@ -117,6 +141,12 @@ class Bucket3Stream:
                     await self._on_quote(sym, bid, ask)
                 except Exception as exc:
                     logging.error("[WS] quote_handler 예외 (%s): %s", sym, exc)
+                await self._emit_price(sym, bid)
+
+        async def _trade_handler(trade):
+            sym = getattr(trade, "symbol", "")
+            if sym in self._hold:
+                await self._emit_price(sym, float(getattr(trade, "price", 0) or 0))
 
         # add_symbols()에서 재사용할 수 있도록 인스턴스에 저장
         self._bar_handler   = _bar_handler
@@ -124,12 +154,25 @@ class Bucket3Stream:
 
         self._stream.subscribe_bars(_bar_handler, *all_syms)
         self._stream.subscribe_quotes(_quote_handler, *all_syms)
+        if self._on_price is not None:
+            self._trade_handler = _trade_handler
+            if self._hold:
+                self._stream.subscribe_trades(_trade_handler, *self._hold)
 
         logging.info("[WS] 스트림 시작 — 진입감시: %d, Spread감시: %d", len(self._watch), len(self._hold))
         # stream.run()은 내부에서 asyncio.run()을 호출 → 이미 실행 중인 이벤트 루프와 충돌.
         # _run_forever()는 run()이 래핑하는 순수 async 메서드이므로 직접 await 가능.
         await self._stream._run_forever()
 
+    async def _emit_price(self, sym: str, price: float) -> None:
+        """보유 종목 틱 가격 → on_price (청산 레벨 비교)."""
+        if self._on_price is None or price <= 0:
+            return
+        try:
+            await self._on_price(sym, price)
+        except Exception as exc:
+            logging.error("[WS] price 콜백 예외 (%s): %s", sym, exc)
+
     async def stop(self) -> None:
         if self._stream:
             await self._stream.stop()
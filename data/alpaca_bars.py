@@ -10,22 +10,35 @@ yfinance 대체 모듈 (지수/펀더멘털 데이터 제외).
     from data.alpaca_bars import fetch_bars
     df = fetch_bars("NVDA", "1Day", 60)   # 일봉 60개
     df = fetch_bars("QQQ",  "1Min", 390)  # 1분봉 1거래일
+
+    # 다종목 배치 조회 — 요청당 최대 BATCH_SYMBOLS 종목 (data.tier)
+    dfs = fetch_bars_many(["NVDA", "AMD", "TSLA"], "1Min", 390)
+
+    # 공용 캐시 경유 — 다음 봉 경계까지 같은 (symbol, timeframe) 재조회 없음
+    df = get_bars("NVDA", "5Min", 100)
 """
 from __future__ import annotations
 
 import logging
 import os
 import threading
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
 
 import pandas as pd
 
 _CLIENT      = None
 _CLIENT_LOCK = threading.Lock()
 # 세마포어 크기 = tier.py 에서 결정 (free: 10, unlimited: 50)
-from data.tier import SEMAPHORE_SIZE as _SEM_SIZE
+from data.tier import SEMAPHORE_SIZE as _SEM_SIZE, BATCH_SYMBOLS as _BATCH_SYMBOLS
 _SEMAPHORE   = threading.Semaphore(_SEM_SIZE)
 
+_OHLCV = ("open", "high", "low", "close", "volume")
+
+# 봉 1개당 거래시간(분) — 일·주봉 배치 조회 시 start 시각 산출용
+_BAR_MINUTES = {"1Day": 390, "1Week": 1950}
+
 
 def _get_client():
     """싱글턴 StockHistoricalDataClient — 이중 확인 잠금으로 스레드 안전 초기화."""
@@ -42,6 +55,151 @@ def _get_client():
     return _CLIENT
 
 
+def _timeframe(timeframe: str):
+    """문자열 timeframe → alpaca TimeFrame (미지원 값은 일봉)."""
+    from alpaca.data.timeframe import TimeFrame, TimeFrameUnit  # type: ignore
+
+    tf_map = {
+        "1Min":  TimeFrame(1, TimeFrameUnit.Minute),
+        "5Min":  TimeFrame(5, TimeFrameUnit.Minute),
+        "1Day":  TimeFrame(1, TimeFrameUnit.Day),
+        "1Week": TimeFrame(1, TimeFrameUnit.Week),
+    }
+    return tf_map.get(timeframe, TimeFrame(1, TimeFrameUnit.Day))
+
+
+def _default_start(timeframe: str, limit: int, now: Optional[datetime] = None) -> datetime:
+    """
+    배치 조회 기본 시작 시각 (UTC).
+
+    다종목 요청의 limit은 종목 합산 개수라 한 종목이 독식할 수 있으므로,
+    배치 조회는 limit 대신 시간 창(start)으로 범위를 제한하고 종목별 tail(limit)을 취한다.
+      장중 봉(1Min/5Min): 당일 00:00 ET — fetch_bars(start 미지정)의 Alpaca 기본 창과 동일
+      일·주봉:            limit개 거래일(주) + 휴장 여유 10일
+    """
+    import zoneinfo
+
+    now = now or datetime.now(timezone.utc)
+    if timeframe in ("1Min", "5Min"):
+        et = now.astimezone(zoneinfo.ZoneInfo("America/New_York"))
+        return et.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(timezone.utc)
+    days = _BAR_MINUTES.get(timeframe, 390) / 390 * max(int(limit), 1)
+    return now - timedelta(days=days * 7 / 5 + 10)
+
+
+def _split_multi(bars: pd.DataFrame, limit: int) -> Dict[str, pd.DataFrame]:
+    """(symbol, timestamp) MultiIndex DataFrame → 종목별 OHLCV DataFrame (timestamp 인덱스)."""
+    bars = bars.copy()
+    bars.columns = [str(c).lower() for c in bars.columns]
+    needed = [c for c in _OHLCV if c in bars.columns]
+    if not needed:
+        return {}
+    out: Dict[str, pd.DataFrame] = {}
+    for sym, grp in bars[needed].groupby(level=0, sort=False):
+        frame = grp.droplevel(0).sort_index().tail(limit)
+        if not frame.empty:
+            out[str(sym)] = frame
+    return out
+
+
+def _fetch_chunk(
+    chunk:          List[str],
+    timeframe:      str,
+    limit:          int,
+    extended_hours: bool,
+    start:          datetime,
+    raise_errors:   bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """종목 묶음 1회 요청 — 실패 시 로그 후 빈 dict (다른 묶음 결과는 유지), raise_errors 면 예외 전파."""
+    try:
+        from alpaca.data.requests import StockBarsRequest   # type: ignore
+
+        req = StockBarsRequest(
+            symbol_or_symbols=list(chunk),
+            timeframe=_timeframe(timeframe),
+            start=start,
+            extended_hours=extended_hours if extended_hours else None,
+        )
+        with _SEMAPHORE:
+            resp = _get_client().get_stock_bars(req)
+
+        bars = getattr(resp, "df", None)
+        if bars is None or bars.empty or not isinstance(bars.index, pd.MultiIndex):
+            return {}
+        return _split_multi(bars, limit)
+    except Exception as exc:
+        logging.warning("[alpaca_bars] 배치 %d종목/%s/%d 실패: %s", len(chunk), timeframe, limit, exc)
+        if raise_errors:
+            raise
+        return {}
+
+
+def fetch_bars_many(
+    symbols:        List[str],
+    timeframe:      str  = "1Day",
+    limit:          int  = 60,
+    extended_hours: bool = False,
+    start:          Optional[datetime] = None,
+    raise_errors:   bool = False,
+) -> Dict[str, pd.DataFrame]:
+    """
+    다종목 OHLCV 배치 조회 — 종목당 1요청 대신 BATCH_SYMBOLS 종목씩 묶어 요청.
+
+    묶음들은 공용 세마포어(tier.SEMAPHORE_SIZE) 안에서 병렬 전송되므로
+    50종목 스캔이 종목 수만큼이 아니라 묶음 수만큼의 요청으로 끝난다.
+
+    Args:
+        symbols:        종목 코드 리스트 (중복은 제거)
+        timeframe:      "1Min" | "5Min" | "1Day" | "1Week"
+        limit:          종목별 최대 봉 수
+        extended_hours: 프리마켓/시간외 봉 포함 여부 (ALPACA_PLAN=unlimited 필요)
+        start:          조회 시작 시각 (None → _default_start, 다일 장중봉은 명시 필요)
+        raise_errors:   True 면 묶음 요청 실패를 예외로 전파 (BarStore.sync — 실패를 "신규 없음"과 구분)
+
+    Returns:
+        {symbol: DataFrame(columns=[open, high, low, close, volume], index=timestamp)}
+        데이터가 없거나 실패한 종목은 결과에서 제외.
+        단일 종목 fetch_bars 와 달리 UTC timestamp 인덱스를 유지한다
+        (BarStore · 1분봉 집계기 시드가 시각으로 병합하므로).
+    """
+    uniq   = list(dict.fromkeys(s for s in symbols if s))
+    if not uniq:
+        return {}
+    chunks = [uniq[i:i + _BATCH_SYMBOLS] for i in range(0, len(uniq), _BATCH_SYMBOLS)]
+    start  = start or _default_start(timeframe, limit)
+
+    result: Dict[str, pd.DataFrame] = {}
+    if len(chunks) == 1:
+        result.update(_fetch_chunk(chunks[0], timeframe, limit, extended_hours, start, raise_errors))
+    else:
+        with ThreadPoolExecutor(max_workers=min(len(chunks), _SEM_SIZE)) as pool:
+            futures = [
+                pool.submit(_fetch_chunk, c, timeframe, limit, extended_hours, start, raise_errors)
+                for c in chunks
+            ]
+            for fut in futures:
+                result.update(fut.result())
+
+    logging.debug("[alpaca_bars] 배치 조회 %d/%d종목 (%d요청) %s/%d",
+                  len(result), len(uniq), len(chunks), timeframe, limit)
+    return result
+
+
+def fetch_bars_since(
+    symbol:    str,
+    timeframe: str,
+    start:     datetime,
+    limit:     int = 1000,
+) -> Optional[pd.DataFrame]:
+    """
+    start(포함) 이후 봉만 조회 — 증분 버퍼(data.bar_buffer) 갱신용.
+
+    Returns:
+        timestamp 인덱스 OHLCV DataFrame (최대 limit봉), 없거나 실패 시 None.
+    """
+    return _fetch_chunk([symbol], timeframe, limit, False, start).get(symbol)
+
+
 def fetch_bars(
     symbol:         str,
     timeframe:      str  = "1Day",   # "1Min" | "5Min" | "1Day" | "1Week"
@@ -58,20 +216,14 @@ def fetch_bars(
         extended_hours: 프리마켓/시간외 봉 포함 여부 (ALPACA_PLAN=unlimited 필요)
 
     Returns:
-        columns=[open, high, low, close, volume] DataFrame,
-        실패 시 None (호출부에서 graceful 처리).
+        columns=[open, high, low, close, volume] DataFrame (RangeIndex — 시각 정보 없음,
+        위치 기반 iloc 접근용), 실패 시 None (호출부에서 graceful 처리).
+        시각이 필요하면 timestamp 인덱스를 주는 fetch_bars_many / fetch_bars_since 를 쓴다.
     """
     try:
         from alpaca.data.requests  import StockBarsRequest   # type: ignore
-        from alpaca.data.timeframe import TimeFrame, TimeFrameUnit  # type: ignore
-
-        tf_map = {
-            "1Min":  TimeFrame(1, TimeFrameUnit.Minute),
-            "5Min":  TimeFrame(5, TimeFrameUnit.Minute),
-            "1Day":  TimeFrame(1, TimeFrameUnit.Day),
-            "1Week": TimeFrame(1, TimeFrameUnit.Week),
-        }
-        tf  = tf_map.get(timeframe, TimeFrame(1, TimeFrameUnit.Day))
+
+        tf  = _timeframe(timeframe)
         req = StockBarsRequest(
             symbol_or_symbols=symbol,
             timeframe=tf,
@@ -109,3 +261,200 @@ def fetch_bars(
     except Exception as exc:
         logging.debug("[alpaca_bars] %s/%s/%d 실패: %s", symbol, timeframe, limit, exc)
         return None
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 공용 봉 캐시 — (symbol, timeframe) 키, 봉 경계 기준 만료
+#
+# 동일 사이클에서 _fetch_bars / _fetch_atr / B2 일봉 / QQQ 기준값 / B4 가
+# 같은 봉을 각자 조회하던 중복 호출을 프로세스 내 1회로 합친다.
+#   장중 봉: 다음 봉 마감(+발행 지연)까지 유효
+#   일·주봉: 다음 장 개장(09:30 ET) 또는 마감(16:00 ET)까지 유효
+# ─────────────────────────────────────────────────────────────────────
+
+_INTRADAY_MINUTES    = {"1Min": 1, "5Min": 5}
+_BAR_SETTLE_SEC      = 5                  # 봉 마감 후 API 반영 지연 여유
+_BAR_CACHE_MAX_BYTES = 64 * 1024 * 1024   # LRU 메모리 상한 (64MB)
+
+
+def bar_expiry(timeframe: str, now: Optional[datetime] = None) -> datetime:
+    """
+    timeframe 봉 캐시 만료 시각 (UTC).
+
+    장중 봉은 다음 봉 마감 시각, 일·주봉은 다음 세션 경계(평일 09:30 / 16:00 ET).
+    경계 직후 _BAR_SETTLE_SEC 이내 조회분은 방금 마감된 봉이 빠져 있을 수 있어
+    settle 시점에 바로 만료시킨다.
+    """
+    import zoneinfo
+
+    now    = now or datetime.now(timezone.utc)
+    settle = timedelta(seconds=_BAR_SETTLE_SEC)
+
+    minutes = _INTRADAY_MINUTES.get(timeframe)
+    if minutes:
+        step  = minutes * 60
+        ts    = now.timestamp()
+        floor = ts - ts % step
+        nxt   = floor + _BAR_SETTLE_SEC if ts - floor < _BAR_SETTLE_SEC else floor + step + _BAR_SETTLE_SEC
+        return datetime.fromtimestamp(nxt, tz=timezone.utc)
+
+    et  = zoneinfo.ZoneInfo("America/New_York")
+    now_et = now.astimezone(et)
+    day = now_et.replace(hour=0, minute=0, second=0, microsecond=0)
+    for _ in range(8):
+        if day.weekday() < 5:
+            for hh, mm in ((9, 30), (16, 0)):
+                edge = day.replace(hour=hh, minute=mm) + settle
+                if edge > now_et:
+                    return edge.astimezone(timezone.utc)
+        day = (day + timedelta(days=1)).replace(hour=0, minute=0)
+    return now + timedelta(days=1)
+
+
+class _CacheEntry:
+    __slots__ = ("df", "limit", "expires_at", "nbytes")
+
+    def __init__(self, df: pd.DataFrame, limit: int, expires_at: float) -> None:
+        self.df         = df
+        self.limit      = limit
+        self.expires_at = expires_at
+        self.nbytes     = int(df.memory_usage(index=True).sum())
+
+
+class BarCache:
+    """
+    프로세스 내 OHLCV 봉 캐시 (스레드 안전).
+
+    - 키: (symbol, timeframe) — 더 큰 limit으로 조회한 프레임을 보관하고 tail(limit) 제공
+    - 만료: bar_expiry() 봉 경계 기준
+    - LRU: 전체 프레임 메모리가 max_bytes 초과 시 오래된 항목부터 제거
+    - 요청 병합: 같은 키 동시 호출은 선행 조회 1건을 기다려 결과 공유
+    """
+
+    def __init__(self, max_bytes: int = _BAR_CACHE_MAX_BYTES) -> None:
+        from collections import OrderedDict
+
+        self._max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[tuple, threading.Event] = {}
+        self._lock  = threading.Lock()
+        self._bytes = 0
+        self.hits       = 0
+        self.misses     = 0
+        self.coalesced  = 0
+        self.evictions  = 0
+
+    def _lookup(self, key: tuple, limit: int, now: float) -> Optional[pd.DataFrame]:
+        """유효 항목이면 tail(limit) 사본 반환 (락 보유 상태에서 호출)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= now:
+            self._drop(key)
+            return None
+        if entry.limit < limit:
+            return None
+        self._entries.move_to_end(key)
+        return entry.df.tail(limit).copy()
+
+    def _drop(self, key: tuple) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.nbytes
+
+    def _store(self, key: tuple, df: pd.DataFrame, limit: int, expires_at: float) -> None:
+        self._drop(key)
+        entry = _CacheEntry(df, limit, expires_at)
+        self._entries[key] = entry
+        self._bytes += entry.nbytes
+        while self._bytes > self._max_bytes and len(self._entries) > 1:
+            old_key, _ = next(iter(self._entries.items()))
+            self._drop(old_key)
+            self.evictions += 1
+
+    def get(
+        self,
+        symbol:    str,
+        timeframe: str,
+        limit:     int,
+        fetcher=None,   # callable(symbol, timeframe, limit) -> DataFrame | None
+    ) -> Optional[pd.DataFrame]:
+        """캐시 조회 → 미스 시 fetcher(기본 fetch_bars) 1회 호출 후 저장."""
+        fetcher = fetcher or fetch_bars
+        key     = (symbol.upper(), timeframe)
+
+        while True:
+            with self._lock:
+                now = datetime.now(timezone.utc).timestamp()
+                df  = self._lookup(key, limit, now)
+                if df is not None:
+                    self.hits += 1
+                    return df
+                waiter = self._inflight.get(key)
+                if waiter is None:
+                    self.misses += 1
+                    done = threading.Event()
+                    self._inflight[key] = done
+                    break
+                self.coalesced += 1
+            # 선행 조회 완료 대기 후 재확인 (limit 부족·실패 시 직접 조회로 진행)
+            waiter.wait()
+
+        try:
+            fresh = fetcher(symbol, timeframe, limit)
+            if fresh is not None and not fresh.empty:
+                expires = bar_expiry(timeframe).timestamp()
+                with self._lock:
+                    self._store(key, fresh, limit, expires)
+            return fresh.tail(limit).copy() if fresh is not None else None
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            done.set()
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """symbol 지정 시 해당 종목 전 timeframe, 미지정 시 전체 비움."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                self._bytes = 0
+                return
+            for key in [k for k in self._entries if k[0] == symbol.upper()]:
+                self._drop(key)
+
+    def stats(self) -> Dict[str, float]:
+        """적중률/항목 수/메모리 (로그·텔레그램용)."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries":   len(self._entries),
+                "bytes":     self._bytes,
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_rate":  round(self.hits / total, 3) if total else 0.0,
+            }
+
+
+_BAR_CACHE = BarCache()
+
+
+def get_bars(
+    symbol:         str,
+    timeframe:      str  = "1Day",
+    limit:          int  = 60,
+    extended_hours: bool = False,
+) -> Optional[pd.DataFrame]:
+    """
+    캐시 경유 fetch_bars — 같은 봉 경계 안의 반복 조회는 API를 호출하지 않음.
+
+    extended_hours 조회는 창이 달라 캐시를 거치지 않는다.
+    """
+    if extended_hours:
+        return fetch_bars(symbol, timeframe, limit, extended_hours)
+    return _BAR_CACHE.get(symbol, timeframe, limit)
+
+
+def bar_cache_stats() -> Dict[str, float]:
+    return _BAR_CACHE.stats()
@@ -0,0 +1,224 @@
+# data/bar_buffer.py
+"""
+종목별 롤링 OHLCV 버퍼 — 마지막 타임스탬프 이후 봉만 증분 조회해 이어붙인다.
+
+30초 exit 사이클 / on_bar 마다 5분봉 60~100개를 통째로 재조회하던 것을
+"새로 마감된 봉만" 조회로 바꿔 데이터 API 부하와 DataFrame 생성 비용을 줄인다.
+
+  - 저장: 컬럼별 NumPy 배열 (용량 2×maxlen, 가득 차면 최근 maxlen개로 압축)
+  - 갱신: 다음 봉 마감(alpaca_bars.bar_expiry) 전에는 API 호출 없음
+  - 장중 봉: ET 날짜가 바뀌면 버퍼 초기화 (fetch_bars 당일 창과 동일 의미)
+  - 반환: 쓰기 금지 배열 기반 DataFrame (append 전까지 같은 객체 재사용)
+
+사용:
+    from data.bar_buffer import BarBufferStore
+    store = BarBufferStore(maxlen=200)
+    df = store.bars("NVDA", "5Min", 100)
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime, timezone
+from typing import Callable, Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_COLS = ("open", "high", "low", "close", "volume")
+_INTRADAY = ("1Min", "5Min")
+
+DEFAULT_MAXLEN = 200
+
+# fetcher(symbol, timeframe, start, limit) -> timestamp 인덱스 DataFrame | None
+Fetcher = Callable[[str, str, datetime, int], Optional[pd.DataFrame]]
+
+
+def _to_ns(ts) -> int:
+    """datetime/Timestamp → UTC epoch ns (naive는 UTC로 간주)."""
+    t = pd.Timestamp(ts)
+    t = t.tz_localize("UTC") if t.tzinfo is None else t.tz_convert("UTC")
+    return int(t.value)
+
+
+def _default_fetcher(symbol: str, timeframe: str, start: datetime, limit: int):
+    from data.alpaca_bars import fetch_bars_since
+    return fetch_bars_since(symbol, timeframe, start, limit)
+
+
+class BarBuffer:
+    """단일 (symbol, timeframe) 롤링 버퍼 (스레드 안전)."""
+
+    def __init__(
+        self,
+        symbol:    str,
+        timeframe: str,
+        maxlen:    int = DEFAULT_MAXLEN,
+        fetcher:   Optional[Fetcher] = None,
+    ) -> None:
+        self.symbol    = symbol.upper()
+        self.timeframe = timeframe
+        self.maxlen    = max(int(maxlen), 1)
+        self._fetcher  = fetcher or _default_fetcher
+        self._cap      = self.maxlen * 2
+        self._ts       = np.empty(self._cap, dtype="int64")     # UTC epoch ns
+        self._data     = {c: np.empty(self._cap, dtype="float64") for c in _COLS}
+        self._n        = 0          # 배열 내 유효 끝 위치
+        self._start    = 0          # 배열 내 유효 시작 위치
+        self._next_sync: float = 0.0
+        self._frame: Optional[pd.DataFrame] = None
+        self._lock     = threading.Lock()
+        self._sync_lock = threading.Lock()   # 동시 sync → 조회 1회로 직렬화
+
+    # ── 상태 ──────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return self._n - self._start
+
+    @property
+    def last_ts(self) -> Optional[pd.Timestamp]:
+        if len(self) == 0:
+            return None
+        return pd.Timestamp(int(self._ts[self._n - 1]), tz="UTC")
+
+    def clear(self) -> None:
+        with self._lock:
+            self._n = self._start = 0
+            self._next_sync = 0.0
+            self._frame = None
+
+    # ── 쓰기 ──────────────────────────────────────────────────────────
+
+    def _compact(self) -> None:
+        keep = min(len(self), self.maxlen)
+        src  = self._n - keep
+        self._ts[:keep] = self._ts[src:self._n]
+        for arr in self._data.values():
+            arr[:keep] = arr[src:self._n]
+        self._start, self._n = 0, keep
+
+    def _append_row(self, ts_ns: int, row: Tuple[float, ...]) -> None:
+        # 같은/과거 타임스탬프 → 마지막 봉 갱신 또는 무시 (중복 수신 방어)
+        if len(self) and ts_ns <= self._ts[self._n - 1]:
+            if ts_ns == self._ts[self._n - 1]:
+                for c, v in zip(_COLS, row):
+                    self._data[c][self._n - 1] = v
+            return
+        if self._n == self._cap:
+            self._compact()
+        self._ts[self._n] = ts_ns
+        for c, v in zip(_COLS, row):
+            self._data[c][self._n] = v
+        self._n += 1
+        if len(self) > self.maxlen:
+            self._start = self._n - self.maxlen
+
+    def append(self, ts, open_: float, high: float, low: float, close: float, volume: float) -> None:
+        """봉 1개 추가 (스트림 집계기 등 외부 공급용)."""
+        with self._lock:
+            self._append_row(_to_ns(ts), (open_, high, low, close, volume))
+            self._frame = None
+
+    def extend(self, df: pd.DataFrame) -> int:
+        """timestamp 인덱스 DataFrame 이어붙이기 → 추가된 봉 수."""
+        if df is None or df.empty:
+            return 0
+        idx = pd.DatetimeIndex(df.index)
+        idx = idx.tz_localize("UTC") if idx.tz is None else idx.tz_convert("UTC")
+        ts_ns = idx.as_unit("ns").asi8
+        cols  = [df[c].to_numpy(dtype="float64") for c in _COLS]
+        with self._lock:
+            before_last = int(self._ts[self._n - 1]) if len(self) else None
+            for i in range(len(ts_ns)):
+                self._append_row(int(ts_ns[i]), tuple(col[i] for col in cols))
+            self._frame = None
+        if before_last is None:
+            return len(ts_ns)
+        return int((ts_ns > before_last).sum())
+
+    # ── 동기화 ────────────────────────────────────────────────────────
+
+    def _session_start(self, now: datetime) -> datetime:
+        import zoneinfo
+        et = now.astimezone(zoneinfo.ZoneInfo("America/New_York"))
+        return et.replace(hour=0, minute=0, second=0, microsecond=0).astimezone(timezone.utc)
+
+    def sync(self, now: Optional[datetime] = None, force: bool = False) -> int:
+        """
+        마지막 봉 이후만 조회해 이어붙임 → 추가된 봉 수.
+
+        다음 봉 마감 전이면 API를 호출하지 않는다 (force=True로 무시).
+        """
+        from data.alpaca_bars import _default_start, bar_expiry
+
+        now = now or datetime.now(timezone.utc)
+        with self._sync_lock:
+            if not force and now.timestamp() < self._next_sync:
+                return 0
+
+            last = self.last_ts
+            if self.timeframe in _INTRADAY and last is not None and last < self._session_start(now):
+                self.clear()
+                last = None
+
+            if last is not None:
+                start = last.to_pydatetime()
+            else:
+                start = _default_start(self.timeframe, self.maxlen, now)
+            try:
+                fresh = self._fetcher(self.symbol, self.timeframe, start, self.maxlen)
+            except Exception as exc:
+                logging.debug("[bar_buffer] %s/%s 증분 조회 실패: %s", self.symbol, self.timeframe, exc)
+                return 0
+            self._next_sync = bar_expiry(self.timeframe, now).timestamp()
+            return self.extend(fresh) if fresh is not None else 0
+
+    # ── 읽기 ──────────────────────────────────────────────────────────
+
+    def view(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """최근 limit봉 읽기 전용 DataFrame (timestamp 인덱스)."""
+        with self._lock:
+            if self._frame is None:
+                sl = slice(self._start, self._n)
+                ts = self._ts[sl].copy()
+                data = {}
+                for c in _COLS:
+                    v = self._data[c][sl].copy()
+                    v.flags.writeable = False
+                    data[c] = v
+                self._frame = pd.DataFrame(data, index=pd.to_datetime(ts, utc=True), copy=False)
+                self._frame.index.name = "timestamp"
+            frame = self._frame
+        if limit is not None and limit < len(frame):
+            return frame.iloc[-limit:]
+        return frame
+
+
+class BarBufferStore:
+    """(symbol, timeframe) → BarBuffer 레지스트리."""
+
+    def __init__(self, maxlen: int = DEFAULT_MAXLEN, fetcher: Optional[Fetcher] = None) -> None:
+        self.maxlen   = maxlen
+        self._fetcher = fetcher
+        self._buffers: Dict[Tuple[str, str], BarBuffer] = {}
+        self._lock    = threading.Lock()
+
+    def get(self, symbol: str, timeframe: str) -> BarBuffer:
+        key = (symbol.upper(), timeframe)
+        with self._lock:
+            buf = self._buffers.get(key)
+            if buf is None:
+                buf = BarBuffer(symbol, timeframe, self.maxlen, self._fetcher)
+                self._buffers[key] = buf
+            return buf
+
+    def bars(self, symbol: str, timeframe: str, limit: int) -> Optional[pd.DataFrame]:
+        """증분 동기화 후 최근 limit봉 (버퍼가 비어 있으면 None)."""
+        buf = self.get(symbol, timeframe)
+        buf.sync()
+        return buf.view(limit) if len(buf) else None
+
+    def drop(self, symbol: str) -> None:
+        with self._lock:
+            for key in [k for k in self._buffers if k[0] == symbol.upper()]:
+                del self._buffers[key]
@@ -0,0 +1,322 @@
+# data/bar_store.py
+"""
+로컬 Parquet 봉 저장소 — 백테스트·스캐너가 매 실행마다 Alpaca 에서 재다운로드하지 않도록.
+
+레이아웃 (종목 × 타임프레임 × 월 파티션, UTC 기준):
+    <root>/<timeframe>/<symbol>/<YYYY-MM>.parquet
+    컬럼: timestamp(ns, UTC) · open · high · low · close · volume (float64)
+
+  - sync()         : 종목별 마지막 저장 봉 이후만 조회 → 해당 월 파티션에 병합 (증분)
+                     repair=True 면 감지된 누락 구간 시작점부터 다시 받아 메움
+  - gaps()         : 누락 구간 감지 (하루짜리 평일 공백은 휴장일로 간주)
+  - read()         : timestamp 인덱스 OHLCV DataFrame (fetch_bars_many 결과와 같은 형식)
+  - read_columns() : 파티션을 memory-map 으로 열어 컬럼별 NumPy 배열 (Arrow 버퍼를 복사 없이 노출)
+
+파티션 쓰기는 임시 파일 → os.replace 로 교체하므로 중단돼도 기존 파일은 온전하다.
+백테스트 --offline 모드는 read() 만 사용해 네트워크 없이 재현 가능하게 돈다.
+
+사용:
+    from data.bar_store import BarStore
+    store = BarStore()
+    store.sync(["NVDA", "AMD"], "5Min", start=datetime(2024, 1, 1, tzinfo=timezone.utc))
+    df   = store.read("NVDA", "5Min", start="2024-03-01")
+    cols = store.read_columns("NVDA", "5Min")     # {"timestamp": ..., "close": ...}
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+_COLS = ("open", "high", "low", "close", "volume")
+_STEP = {
+    "1Min":  timedelta(minutes=1),
+    "5Min":  timedelta(minutes=5),
+    "1Day":  timedelta(days=1),
+    "1Week": timedelta(weeks=1),
+}
+_INTRADAY = ("1Min", "5Min")
+_INTRADAY_MAX_GAP = timedelta(minutes=30)   # 장중 연속 봉 간격이 이보다 크면 누락 (저유동성 여유)
+
+DEFAULT_ROOT = Path(__file__).resolve().parent.parent / "storage" / "bars"
+
+_SCHEMA = pa.schema(
+    [("timestamp", pa.timestamp("ns", tz="UTC"))] + [(c, pa.float64()) for c in _COLS]
+)
+
+# fetcher(symbols, timeframe, start) -> {symbol: timestamp 인덱스 OHLCV DataFrame}
+Fetcher = Callable[[List[str], str, datetime], Dict[str, pd.DataFrame]]
+
+Gap = Tuple[pd.Timestamp, pd.Timestamp]
+
+
+def _default_fetcher(symbols: List[str], timeframe: str, start: datetime) -> Dict[str, pd.DataFrame]:
+    from data.alpaca_bars import fetch_bars_many
+    return fetch_bars_many(symbols, timeframe, limit=10_000_000, start=start, raise_errors=True)
+
+
+def _utc(ts) -> pd.Timestamp:
+    t = pd.Timestamp(ts)
+    return t.tz_localize("UTC") if t.tzinfo is None else t.tz_convert("UTC")
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """임의 OHLCV DataFrame → UTC 인덱스 · float64 컬럼 · 중복 제거 · 오름차순."""
+    out = df.copy()
+    out.columns = [str(c).lower() for c in out.columns]
+    out = out[list(_COLS)].astype("float64")
+    idx = pd.DatetimeIndex(out.index)
+    out.index = (idx.tz_localize("UTC") if idx.tz is None else idx.tz_convert("UTC")).as_unit("ns")
+    out.index.name = "timestamp"
+    out = out[~out.index.duplicated(keep="last")]
+    return out.sort_index()
+
+
+def _missing_weekday_runs(days: Sequence[pd.Timestamp], lo: pd.Timestamp, hi: pd.Timestamp) -> List[Gap]:
+    """lo~hi 사이 평일 중 days 에 없는 날의 연속 구간 — 길이 1(휴장일 추정)은 제외."""
+    have = {d.normalize() for d in days}
+    runs: List[List[pd.Timestamp]] = []
+    for d in pd.bdate_range(lo.normalize(), hi.normalize(), tz="UTC"):
+        if d in have:
+            continue
+        if runs and runs[-1][-1] + pd.offsets.BDay(1) == d:
+            runs[-1].append(d)
+        else:
+            runs.append([d])
+    return [(r[0], r[-1] + pd.Timedelta(days=1)) for r in runs if len(r) >= 2]
+
+
+class BarStore:
+    """종목·타임프레임·월 단위 Parquet 파티션 저장소 (쓰기는 종목 단위로 직렬화)."""
+
+    def __init__(self, root: Path | str = DEFAULT_ROOT, fetcher: Optional[Fetcher] = None) -> None:
+        self.root     = Path(root)
+        self._fetcher = fetcher or _default_fetcher
+        self._locks: Dict[Tuple[str, str], threading.Lock] = defaultdict(threading.Lock)
+
+    # ── 경로 ─────────────────────────────────────────────────────
+
+    def _dir(self, symbol: str, timeframe: str) -> Path:
+        return self.root / timeframe / symbol.upper()
+
+    def partitions(self, symbol: str, timeframe: str) -> List[Path]:
+        """월 파티션 파일 (오름차순)."""
+        d = self._dir(symbol, timeframe)
+        return sorted(d.glob("*.parquet")) if d.is_dir() else []
+
+    def symbols(self, timeframe: str) -> List[str]:
+        d = self.root / timeframe
+        return sorted(p.name for p in d.iterdir() if p.is_dir()) if d.is_dir() else []
+
+    def _select(self, symbol: str, timeframe: str, start, end) -> List[Path]:
+        """start~end 와 겹치는 월 파티션만 (파일명 YYYY-MM 비교)."""
+        lo = _utc(start).strftime("%Y-%m") if start is not None else ""
+        hi = _utc(end).strftime("%Y-%m")   if end   is not None else "9999-99"
+        return [p for p in self.partitions(symbol, timeframe) if lo <= p.stem <= hi]
+
+    # ── 쓰기 ─────────────────────────────────────────────────────
+
+    def write(self, symbol: str, timeframe: str, df: pd.DataFrame) -> int:
+        """
+        봉 병합 저장 — 같은 timestamp 는 새 값으로 덮어씀.
+
+        Returns: 새로 추가된 봉 수 (덮어쓴 봉 제외)
+        """
+        if df is None or df.empty:
+            return 0
+        new = _normalize(df)
+        added = 0
+        d = self._dir(symbol, timeframe)
+        with self._locks[(symbol.upper(), timeframe)]:
+            d.mkdir(parents=True, exist_ok=True)
+            for month, part in new.groupby(new.index.strftime("%Y-%m")):
+                path = d / f"{month}.parquet"
+                if path.exists():
+                    old = self._read_table([path]).to_pandas().set_index("timestamp")
+                    merged = pd.concat([old, part])
+                    merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+                    added += len(merged) - len(old)
+                else:
+                    merged = part
+                    added += len(part)
+                table = pa.Table.from_pandas(merged.reset_index(), schema=_SCHEMA, preserve_index=False)
+                tmp = path.with_suffix(".parquet.tmp")
+                pq.write_table(table, tmp)
+                os.replace(tmp, path)
+        return added
+
+    def sync(
+        self,
+        symbols:   Sequence[str],
+        timeframe: str,
+        start:     datetime,
+        repair:    bool = False,
+    ) -> Dict[str, int]:
+        """
+        증분 동기화 — 저장된 종목은 마지막 봉부터, 처음 보는 종목은 start 부터 조회.
+
+        마지막 봉은 저장 당시 진행 중(미완성)이었을 수 있으므로 다시 받아 덮어쓴다 (write 는 timestamp 기준 덮어쓰기).
+        시작 시각이 같은 종목끼리 묶어 fetcher 1회로 요청 (fetch_bars_many 배치).
+        repair=True 면 start 이후 누락 구간이 있을 때 가장 이른 누락 시작점부터 다시 받는다.
+
+        조회 실패한 묶음은 로그 후 나머지 묶음을 마저 동기화하고, 끝에 RuntimeError 로 알린다.
+
+        Returns: {symbol: 새로 추가된 봉 수}
+        """
+        start = _utc(start)
+        step  = _STEP.get(timeframe, _STEP["1Day"])
+        groups: Dict[pd.Timestamp, List[str]] = defaultdict(list)
+        for sym in dict.fromkeys(s.upper() for s in symbols if s):
+            first = self.first_timestamp(sym, timeframe)
+            last  = self.last_timestamp(sym, timeframe)
+            if last is None or last < start or first > start + step:
+                since = start               # 처음 보는 종목 · 기간 밖 · 과거 이력 확장
+            else:
+                since = last
+            if repair and last is not None:
+                holes = self.gaps(sym, timeframe, start=start)
+                if holes:
+                    since = min(since, holes[0][0])
+            groups[since].append(sym)
+
+        added:  Dict[str, int] = {}
+        failed: List[str] = []
+        error:  Optional[Exception] = None
+        for since, syms in sorted(groups.items()):
+            try:
+                fetched = self._fetcher(syms, timeframe, since.to_pydatetime())
+            except Exception as exc:
+                logging.error("[BarStore] %s %d종목 조회 실패 (since %s): %s",
+                              timeframe, len(syms), since, exc)
+                failed += syms
+                error = error or exc
+                continue
+            for sym in syms:
+                added[sym] = self.write(sym, timeframe, fetched.get(sym))
+        logging.info("[BarStore] %s 동기화 %d종목 / 신규 %d봉",
+                     timeframe, len(added), sum(added.values()))
+        if error is not None:
+            raise RuntimeError(f"{timeframe} 동기화 실패 {len(failed)}종목: {', '.join(failed[:10])}") from error
+        return added
+
+    # ── 읽기 ─────────────────────────────────────────────────────
+
+    @staticmethod
+    def _read_table(paths: List[Path]) -> pa.Table:
+        tables = [pq.read_table(pa.memory_map(str(p), "r"), schema=_SCHEMA) for p in paths]
+        return pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+
+    def _filtered(self, symbol: str, timeframe: str, start, end) -> Optional[pa.Table]:
+        paths = self._select(symbol, timeframe, start, end)
+        if not paths:
+            return None
+        table = self._read_table(paths)
+        ts = table.column("timestamp")
+        mask = None
+        if start is not None:
+            mask = pc.greater_equal(ts, pa.scalar(_utc(start), type=ts.type))
+        if end is not None:
+            upper = pc.less_equal(ts, pa.scalar(_utc(end), type=ts.type))
+            mask = upper if mask is None else pc.and_(mask, upper)
+        return table if mask is None else table.filter(mask)
+
+    def read(
+        self,
+        symbol:    str,
+        timeframe: str,
+        start=None,
+        end=None,
+    ) -> pd.DataFrame:
+        """start~end(포함) 봉 → timestamp 인덱스 OHLCV DataFrame (없으면 빈 DataFrame)."""
+        table = self._filtered(symbol, timeframe, start, end)
+        if table is None or table.num_rows == 0:
+            return pd.DataFrame(columns=list(_COLS))
+        return table.to_pandas().set_index("timestamp")
+
+    def read_columns(
+        self,
+        symbol:    str,
+        timeframe: str,
+        start=None,
+        end=None,
+    ) -> Dict[str, np.ndarray]:
+        """
+        컬럼별 NumPy 배열 — timestamp 는 datetime64[ns] (UTC 값, tz 없음).
+
+        파일은 memory_map 으로 열어 필요한 파티션만 디코드하고, 청크가 하나인 컬럼은
+        Arrow 버퍼를 복사 없이 가리키는 읽기 전용 배열로 돌려준다 (DataFrame 생성 비용 없음).
+        """
+        table = self._filtered(symbol, timeframe, start, end)
+        if table is None:
+            return {"timestamp": np.empty(0, dtype="datetime64[ns]"),
+                    **{c: np.empty(0) for c in _COLS}}
+        table = table.combine_chunks()
+        out: Dict[str, np.ndarray] = {}
+        for name in table.column_names:
+            col = table.column(name)
+            if name == "timestamp":
+                col = col.cast(pa.timestamp("ns"))
+            out[name] = col.to_numpy()
+        return out
+
+    def _edge(self, symbol: str, timeframe: str, last: bool) -> Optional[pd.Timestamp]:
+        parts = self.partitions(symbol, timeframe)
+        if not parts:
+            return None
+        path = parts[-1] if last else parts[0]
+        ts = pq.read_table(pa.memory_map(str(path), "r"), columns=["timestamp"]).column(0)
+        if len(ts) == 0:
+            return None
+        return _utc((pc.max(ts) if last else pc.min(ts)).as_py())
+
+    def first_timestamp(self, symbol: str, timeframe: str) -> Optional[pd.Timestamp]:
+        """저장된 첫 봉 시각 (없으면 None) — 첫 파티션의 timestamp 컬럼만 읽음."""
+        return self._edge(symbol, timeframe, last=False)
+
+    def last_timestamp(self, symbol: str, timeframe: str) -> Optional[pd.Timestamp]:
+        """저장된 마지막 봉 시각 (없으면 None) — 마지막 파티션의 timestamp 컬럼만 읽음."""
+        return self._edge(symbol, timeframe, last=True)
+
+    # ── 누락 감지 ─────────────────────────────────────────────────
+
+    def gaps(
+        self,
+        symbol:    str,
+        timeframe: str,
+        start=None,
+        end=None,
+    ) -> List[Gap]:
+        """
+        누락 구간 [(시작, 끝), ...] — 저장 범위(또는 start~end) 안에서.
+
+          - 평일이 2일 이상 연속으로 비면 누락 (하루짜리는 휴장일로 간주)
+          - 장중 봉: 같은 날 연속 봉 간격이 30분을 넘으면 누락
+        """
+        cols = self.read_columns(symbol, timeframe, start, end)
+        ts = pd.DatetimeIndex(cols["timestamp"]).tz_localize("UTC") if len(cols["timestamp"]) else None
+        if ts is None:
+            return []
+        lo = _utc(start) if start is not None else ts[0]
+        hi = _utc(end)   if end   is not None else ts[-1]
+
+        if timeframe == "1Week":
+            limit = _STEP["1Week"] + timedelta(days=3)
+            return [(a, b) for a, b in zip(ts[:-1], ts[1:]) if b - a > limit]
+
+        out = _missing_weekday_runs(list(ts.normalize().unique()), lo, hi)
+        if timeframe in _INTRADAY:
+            diffs = ts[1:] - ts[:-1]
+            same_day = ts[1:].normalize() == ts[:-1].normalize()
+            for i in np.flatnonzero(same_day & (diffs > _INTRADAY_MAX_GAP)):
+                out.append((ts[i], ts[i + 1]))
+        return sorted(out)
@@ -0,0 +1,47 @@
+# data/rate_limit.py
+"""
+데이터 소스별 요청 속도 제한 — 스레드 안전 토큰 버킷.
+
+스캐너처럼 여러 스레드가 같은 외부 소스(yfinance info · news 등)를 동시에 두드릴 때,
+동시 실행 수(스레드 풀 크기)와 별개로 초당 요청 수를 소스 단위로 묶는다.
+
+    limiter = RateLimiter(rate=4.0, burst=4)
+    with limiter:
+        info = yf.Ticker(sym).info
+"""
+from __future__ import annotations
+
+import threading
+import time
+
+
+class RateLimiter:
+    """초당 rate 회, 최대 burst 회까지 연속 허용 — 토큰이 없으면 채워질 때까지 대기."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0:
+            raise ValueError("rate must be > 0")
+        self.rate   = float(rate)
+        self.burst  = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._last   = time.monotonic()
+        self._lock   = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+                self._last = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                wait = (1.0 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def __enter__(self) -> "RateLimiter":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        return None
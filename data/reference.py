@@ -0,0 +1,248 @@
+# data/reference.py
+"""
+종목 참조 데이터 저장소 — float · 공매도 · 시총 (하루 한 번 바뀌는 값).
+
+스캐너가 장전 스캔 중 yf.Ticker(symbol).info 를 종목마다 실시간 호출하던 것을
+장 마감 후 일괄 갱신(refresh) → 디스크 저장 → 메모리 dict O(1) 조회로 바꾼다.
+
+  - refresh()   : 유니버스 전체를 스레드 풀 + RateLimiter 로 병렬 조회 후 저장
+  - put()       : 호출부가 이미 받은 info 로 저장값 갱신 (같은 종목 중복 조회 방지)
+  - get()       : 메모리 조회. 오래된(stale) 값은 즉시 반환하고 백그라운드 갱신만 예약,
+                  값이 아예 없을 때만 timeout 초까지 기다린다 (느린 공급자가 스캔을 막지 않음)
+  - 저장 형식   : <root>/reference.parquet (임시 파일 → os.replace 로 교체)
+
+필드 이름은 yfinance info 키와 같아 기존 info dict 자리에 그대로 쓸 수 있다.
+
+사용:
+    from data.reference import get_store
+    ref = get_store().get("GME")          # {"floatShares": ..., "shortPercentOfFloat": ..., ...}
+
+    python -m data.reference              # 저장된 종목 + 워치리스트 일괄 갱신 (cron / 장 마감 후)
+    python -m data.reference GME AMC      # 지정 종목만
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import math
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from data.rate_limit import RateLimiter
+
+FIELDS = ("floatShares", "shortPercentOfFloat", "shortRatio", "marketCap")
+
+_ROOT          = Path(__file__).resolve().parent.parent
+DEFAULT_PATH   = _ROOT / "storage" / "reference" / "reference.parquet"
+WATCHLISTS     = ("watchlists/symbols.txt", "watchlists/value_symbols.txt", "watchlists/etf_symbols.txt")
+REFRESH_TTL    = 20 * 3600      # 이보다 오래되면 stale — 조회 시 백그라운드 갱신
+MISS_TIMEOUT   = 2.0            # 값이 없는 종목의 첫 조회 최대 대기 (초)
+REFRESH_WORKERS = 8
+
+# fetcher(symbol) -> {FIELDS 키: 값} (실패 시 예외 또는 빈 dict)
+Fetcher = Callable[[str], dict]
+
+
+def _yf_fetcher(symbol: str) -> dict:
+    import yfinance as yf
+    return yf.Ticker(symbol).info or {}
+
+
+def _clean(info: dict) -> Dict[str, float]:
+    out: Dict[str, float] = {}
+    for k in FIELDS:
+        try:
+            v = float(info.get(k))
+        except (TypeError, ValueError):
+            continue
+        if math.isfinite(v):
+            out[k] = v
+    return out
+
+
+class ReferenceStore:
+    """float · 공매도 참조 데이터 — 디스크 영속 + 메모리 조회 + stale 폴백."""
+
+    def __init__(
+        self,
+        path:    Path | str = DEFAULT_PATH,
+        fetcher: Optional[Fetcher] = None,
+        ttl:     float = REFRESH_TTL,
+        timeout: float = MISS_TIMEOUT,
+        limiter: Optional[RateLimiter] = None,
+        workers: int = REFRESH_WORKERS,
+    ):
+        self.path     = Path(path)
+        self.ttl      = ttl
+        self.timeout  = timeout
+        self._fetcher = fetcher or _yf_fetcher
+        self._limiter = limiter or RateLimiter(rate=4.0, burst=4)
+        self._data:   Dict[str, Dict[str, float]] = {}
+        self._stamp:  Dict[str, float] = {}      # 종목별 갱신 시각 (epoch)
+        self._lock    = threading.Lock()
+        self._inflight: Dict[str, threading.Event] = {}
+        self._pool    = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="reference")
+        self.load()
+
+    # ── 영속 ─────────────────────────────────────────────────────────
+
+    def load(self) -> int:
+        if not self.path.exists():
+            return 0
+        try:
+            df = pd.read_parquet(self.path)
+        except Exception as exc:
+            logging.warning("[reference] %s 읽기 실패: %s", self.path, exc)
+            return 0
+        with self._lock:
+            for row in df.to_dict("records"):
+                sym = row.pop("symbol")
+                self._stamp[sym] = float(row.pop("updated"))
+                self._data[sym]  = {k: v for k, v in row.items() if k in FIELDS and pd.notna(v)}
+        return len(df)
+
+    def save(self) -> None:
+        with self._lock:
+            rows = [{"symbol": s, "updated": self._stamp[s], **{k: d.get(k) for k in FIELDS}}
+                    for s, d in self._data.items()]
+        df = pd.DataFrame(rows, columns=["symbol", "updated", *FIELDS])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, self.path)
+
+    # ── 조회 ─────────────────────────────────────────────────────────
+
+    def symbols(self) -> List[str]:
+        with self._lock:
+            return list(self._data)
+
+    def age(self, symbol: str) -> float:
+        """마지막 갱신 후 경과 초 (없으면 inf)."""
+        ts = self._stamp.get(symbol)
+        return time.time() - ts if ts is not None else math.inf
+
+    def get(self, symbol: str, timeout: Optional[float] = None) -> Dict[str, float]:
+        """
+        참조 값 dict 사본 (없으면 빈 dict).
+        stale 이면 저장값을 즉시 반환하고 백그라운드 갱신을 예약한다.
+        저장값이 없으면 조회를 띄우고 timeout 초까지만 기다린다.
+        """
+        data = self._data.get(symbol)
+        if data is not None:
+            if self.age(symbol) > self.ttl:
+                self._schedule(symbol)
+            return dict(data)
+        done = self._schedule(symbol)
+        done.wait(self.timeout if timeout is None else timeout)
+        return dict(self._data.get(symbol, {}))
+
+    # ── 갱신 ─────────────────────────────────────────────────────────
+
+    def put(self, symbol: str, info: dict) -> Dict[str, float]:
+        """
+        이미 받은 info(yfinance info 등)로 저장값 갱신 — 조회 없이 반영 후 저장값 사본 반환.
+        빈 응답은 기존 값을 덮지 않는다 (_fetch 와 같은 규칙).
+        """
+        clean = _clean(info)
+        with self._lock:
+            if clean or not self._data.get(symbol):
+                self._data[symbol]  = clean
+                self._stamp[symbol] = time.time()
+            return dict(self._data[symbol])
+
+    def _schedule(self, symbol: str) -> threading.Event:
+        """종목당 동시 조회 1건 — 진행 중이면 그 완료 이벤트를 공유."""
+        with self._lock:
+            ev = self._inflight.get(symbol)
+            if ev is not None:
+                return ev
+            ev = self._inflight[symbol] = threading.Event()
+        try:
+            self._pool.submit(self._fetch, symbol, ev)
+        except RuntimeError:       # 인터프리터 종료 중
+            self._inflight.pop(symbol, None)
+            ev.set()
+        return ev
+
+    def _fetch(self, symbol: str, ev: threading.Event) -> bool:
+        try:
+            with self._limiter:
+                info = _clean(self._fetcher(symbol))
+            # 빈 응답은 기존 값을 덮지 않음 — 값이 원래 없던 종목(ETF 등)만 빈 dict 로 기록
+            had = bool(self._data.get(symbol))
+            self.put(symbol, info)
+            return bool(info) or not had
+        except Exception as exc:
+            logging.debug("[reference] %s 조회 실패 (기존 값 유지): %s", symbol, exc)
+            return False
+        finally:
+            with self._lock:
+                self._inflight.pop(symbol, None)
+            ev.set()
+
+    def refresh(self, symbols: Iterable[str]) -> int:
+        """종목들을 병렬 갱신 후 디스크 저장 — 성공 종목 수 (실패 종목은 기존 값 유지)."""
+        uniq = list(dict.fromkeys(s for s in symbols if s))
+        t0   = time.time()
+        events = [self._schedule(s) for s in uniq]
+        for ev in events:
+            ev.wait()
+        ok = sum(1 for s in uniq if self._stamp.get(s, 0.0) >= t0)
+        self.save()
+        logging.info("[reference] 갱신 %d/%d종목 → %s", ok, len(uniq), self.path)
+        return ok
+
+
+_STORE: Optional[ReferenceStore] = None
+_STORE_LOCK = threading.Lock()
+
+
+def get_store() -> ReferenceStore:
+    """프로세스 공용 저장소 (첫 호출 시 디스크 로드)."""
+    global _STORE
+    with _STORE_LOCK:
+        if _STORE is None:
+            _STORE = ReferenceStore()
+        return _STORE
+
+
+def _watchlist_symbols(paths: Iterable[str] = WATCHLISTS) -> List[str]:
+    out: List[str] = []
+    for p in paths:
+        try:
+            with open(_ROOT / p, encoding="utf-8") as f:
+                out += [ln.strip() for ln in f if ln.strip() and not ln.startswith("#")]
+        except FileNotFoundError:
+            continue
+    return out
+
+
+def refresh_universe(extra: Iterable[str] = (), store: Optional[ReferenceStore] = None) -> int:
+    """저장된 종목 + 워치리스트 + extra 일괄 갱신 (장 마감 후 하루 한 번)."""
+    store = store or get_store()
+    return store.refresh([*store.symbols(), *_watchlist_symbols(), *extra])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="float · 공매도 참조 데이터 갱신")
+    parser.add_argument("symbols", nargs="*", help="지정 종목만 갱신 (기본: 저장 종목 + 워치리스트)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    store = get_store()
+    n = store.refresh(args.symbols) if args.symbols else refresh_universe(store=store)
+    print(f"갱신 {n}종목 → {store.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,14 @@ Alpaca 플랜 티어 설정 — 단일 진실의 원천.
 
 [무료(free) 플랜 — 기본값, 페이퍼 트레이딩 테스트용]
   - API 동시 요청: 세마포어 10 (200 req/min 상한)
+  - 배치 조회: 요청당 100종목
   - 프리마켓 봉 데이터: 없음 (9:30 ET 이전 1분봉 미제공)
   - 스캔 시각: 9:40 AM ET (장 개시 10분 후)
   - 데이터 소스: Alpaca 일반 bars + 뉴스 API + yfinance + EDGAR(무료)
 
 [유료(unlimited) 플랜 — $9/월, 실전 전환 시]
   - API 동시 요청: 세마포어 50 (10,000 req/min 상한)
+  - 배치 조회: 요청당 200종목
   - 프리마켓 봉 데이터: 있음 (4:00 AM~9:30 AM ET 1분봉)
   - 스캔 시각: 8:00 AM ET (장 열리기 1.5시간 전)
   - WebSocket 종목 수: 100개+ (무료: 30개)
@@ -44,6 +46,10 @@ SCAN_MINUTE: int = 0  if PREMARKET_BARS_ENABLED else 40
 # ── API 동시 요청 수 ──────────────────────────────────────────────────
 SEMAPHORE_SIZE: int = 50 if HIGH_RATE_LIMIT else 10
 
+# ── 다종목 배치 조회 (fetch_bars_many) ───────────────────────────────
+# 요청 1회당 묶을 종목 수 — 요청 수 = ceil(종목수 / BATCH_SYMBOLS)
+BATCH_SYMBOLS: int = 200 if HIGH_RATE_LIMIT else 100
+
 # ── 봉 조회 파라미터 ──────────────────────────────────────────────────
 BAR_LIMIT_INTRADAY: int = 120 if PREMARKET_BARS_ENABLED else 390
 # unlimited: 4:00~8:00 = 240분 중 최근 120봉 (4시간 프리마켓)
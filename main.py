@@ -31,6 +31,7 @@ from core.kill_switch    import KillSwitch
 from core.bucket_capital import BucketCapitalManager
 from core.orchestrator   import Orchestrator
 from storage.db          import PositionDB
+from storage.sqlite_writer import get_writer
 from utils.logging       import setup_logging
 
 
@@ -71,11 +72,12 @@ def _init_alpaca(mode: str):
     return broker, data_client, equity, "PAPER" if is_paper else "LIVE"
 
 
-def _init_toss(mode: str):
-    """토스증권 브로커 초기화 (MODE=paper → PaperSimBroker)."""
+def _init_toss(mode: str, fills_cfg: dict | None = None):
+    """토스증권 브로커 초기화 (MODE=paper → PaperSimBroker, 체결은 config fills 모델)."""
     if mode == "paper":
+        from trader.fill_model import FillModel
         from trader.paper import PaperSimBroker
-        broker = PaperSimBroker()
+        broker = PaperSimBroker(fill_model=FillModel.from_cfg(fills_cfg))
         equity = float(os.getenv("TOSS_PAPER_EQUITY", "14800"))
         logging.warning("[Toss] MODE=paper → PaperSimBroker (실제 주문 없음, 샌드박스 미지원)")
         return broker, None, equity, "PAPER(Toss)"
@@ -113,12 +115,13 @@ async def main() -> None:
 
     # ── 브로커 초기화 ─────────────────────────────────────────────────
     if broker_type == "toss":
-        broker, data_client, equity, label = _init_toss(mode)
+        broker, data_client, equity, label = _init_toss(mode, cfg.get("fills"))
     else:
         broker, data_client, equity, label = _init_alpaca(mode)
 
     # ── 인프라 초기화 ─────────────────────────────────────────────────
-    db          = PositionDB(cfg["storage"]["db_path"])
+    # 쓰기는 단일 writer 스레드가 그룹 커밋 (이벤트 루프는 fsync 대기 없음)
+    db          = PositionDB(cfg["storage"]["db_path"], writer=get_writer())
 
     # 사계절 엔진 DB 초기화 (storage/db/trading_data.db)
     from storage import db_manager as _dbm
@@ -163,6 +166,7 @@ async def main() -> None:
                 broker   = stream_broker,
                 on_bar   = orch.on_bar,
                 on_quote = orch.on_quote,
+                on_price = orch.on_price,
             )
             logging.info("[Toss] B3 스트림 → 1초 폴링 (live)")
         else:
@@ -233,7 +237,11 @@ async def main() -> None:
         from core.session_watchdog import run_session_watchdog
         notifier = getattr(orch, "notifier", None)
         tasks.append(run_session_watchdog(broker, kill_switch, notifier))
-    await asyncio.gather(*tasks)
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # 메모리 포지션 북의 대기 중 DB 쓰기 커밋
+        orch.db.close()
 
 
 if __name__ == "__main__":
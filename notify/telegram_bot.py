@@ -128,6 +128,7 @@ try:
 except Exception:
     USE_PAPER_SIM = True
 
+from trader.fill_model import FillModel
 from trader.paper import PaperSimBroker
 from alpaca.data.historical import StockHistoricalDataClient
 
@@ -222,14 +223,14 @@ def tg_get_updates(bot_token: str, offset: Optional[int]) -> dict:
 
 # ── 트레이딩 헬퍼 ─────────────────────────────────────────────────────
 
-def build_clients():
+def build_clients(cfg: Optional[Dict] = None):
     load_mode_env()
     api_key = os.getenv("ALPACA_API_KEY")
     secret  = os.getenv("ALPACA_SECRET_KEY")
     paper   = os.getenv("ALPACA_PAPER", "true").lower() == "true"
     if USE_PAPER_SIM or not api_key or not secret:
         logging.info("[WARN] Using PaperSimBroker (no live orders).")
-        return PaperSimBroker(), None
+        return PaperSimBroker(fill_model=FillModel.from_cfg((cfg or {}).get("fills"))), None
     return AlpacaBroker(api_key, secret, paper=paper), StockHistoricalDataClient(api_key, secret)
 
 
@@ -378,7 +379,7 @@ def main():
         with open("config.yaml", "r") as f:
             cfg = yaml.safe_load(f) or {}
 
-    broker, data_client = build_clients()
+    broker, data_client = build_clients(cfg)
 
     # DB 초기화
     db_path = cfg.get("storage", {}).get("db_path", "storage/trade.db")
@@ -813,7 +814,12 @@ def main():
                 days = int(rest[0]) if rest and rest[0].isdigit() else 30
                 try:
                     from storage.journal import format_stats_message
-                    msg = format_stats_message(db, days=days)
+                    try:
+                        acct   = broker.get_account()
+                        equity = acct.get("equity", acct.get("portfolio_value", 0)) or 14_800.0
+                    except Exception:
+                        equity = 14_800.0
+                    msg = format_stats_message(db, days=days, equity=equity)
                     tg_send(bot_token, chat_id, msg)
                 except Exception as e:
                     tg_send(bot_token, chat_id, f"통계 조회 오류: {e}")
@@ -834,6 +840,9 @@ def main():
                     continue
                 try:
                     resp = broker.submit_market_order(sym, qty, side)
+                    if isinstance(resp, dict) and not resp.get("ok", True):
+                        tg_send(bot_token, chat_id, f"주문 실패: {resp.get('reason', resp)}")
+                        continue
                     if isinstance(resp, dict):
                         body     = json.dumps(resp, ensure_ascii=False, default=str)
                         order_id = resp.get("id") or resp.get("client_order_id")
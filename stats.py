@@ -23,6 +23,8 @@ except ImportError:
     sys.exit(1)
 
 
+from storage.db import query_rollup
+
 DB_PATH = "storage/trade.db"
 
 STRATEGY_LABEL = {
@@ -77,6 +79,23 @@ def bucket_report(df: pd.DataFrame, label: str) -> dict:
     }
 
 
+def bucket_report_from_rollup(r: dict, label: str) -> dict:
+    """롤업 집계 1행(query_rollup) → bucket_report 와 같은 형식 (원본 거래 미조회)."""
+    return {
+        "label":       label,
+        "trades":      r["total"],
+        "win_rate":    round(r["win_rate"], 1),
+        "avg_win_pct": round(r["avg_win_pct"], 2),
+        "avg_loss_pct":round(r["avg_loss_pct"], 2),
+        "profit_factor": round(r["profit_factor"], 2),
+        "expectancy":  round(r["total_pnl"] / r["total"], 2),
+        "total_pnl":   round(r["total_pnl"], 2),
+        "max_win":     round(r["best_pct"], 2)  if r["wins"]   > 0 else 0,
+        "max_loss":    round(r["worst_pct"], 2) if r["losses"] > 0 else 0,
+        "avg_hold_min":round(r["avg_hold_min"], 0),
+    }
+
+
 # ── 보고서 출력 ───────────────────────────────────────────────────────
 
 def print_bucket(r: dict) -> None:
@@ -117,6 +136,13 @@ def print_daily(df: pd.DataFrame) -> None:
         .rename(columns={"sum": "pnl", "count": "trades"})
         .sort_index()
     )
+    print_daily_table(daily)
+
+
+def print_daily_table(daily: pd.DataFrame) -> None:
+    """일자 인덱스 + pnl / trades 컬럼."""
+    if daily.empty:
+        return
     pos_days = (daily["pnl"] > 0).sum()
     neg_days = (daily["pnl"] < 0).sum()
     day_win  = pos_days / len(daily) * 100 if len(daily) > 0 else 0
@@ -172,6 +198,12 @@ def main():
         "SELECT name FROM sqlite_master WHERE type='table'"
     ).fetchall()]
 
+    # 롤업 테이블이 있으면 (일자×전략×사유) 집계만 읽음 — CSV 저장은 원본 거래 필요
+    if "closed_trades_rollup" in tables and not args.csv:
+        report_from_rollup(conn, args)
+        conn.close()
+        return
+
     if "closed_trades" in tables:
         df = pd.read_sql("SELECT * FROM closed_trades ORDER BY exit_ts", conn)
     elif "trades" in tables:
@@ -196,13 +228,7 @@ def main():
     if args.bucket and "strategy" in df.columns:
         df = df[df["strategy"] == args.bucket]
 
-    print(f"\n{'='*52}")
-    print(f"  승률 분석 리포트")
-    if args.days:
-        print(f"  기간: 최근 {args.days}일")
-    if args.bucket:
-        print(f"  버킷: {STRATEGY_LABEL.get(args.bucket, args.bucket)}")
-    print(f"{'='*52}")
+    print_header(args)
 
     if "strategy" in df.columns:
         for strat, label in STRATEGY_LABEL.items():
@@ -236,6 +262,46 @@ def main():
         print(f"\n  CSV 저장: {args.csv}")
 
 
+def print_header(args) -> None:
+    print(f"\n{'='*52}")
+    print(f"  승률 분석 리포트")
+    if args.days:
+        print(f"  기간: 최근 {args.days}일")
+    if args.bucket:
+        print(f"  버킷: {STRATEGY_LABEL.get(args.bucket, args.bucket)}")
+    print(f"{'='*52}")
+
+
+def report_from_rollup(conn, args) -> None:
+    """closed_trades_rollup 기반 리포트 — 거래 수와 무관하게 O(일수) 행만 조회."""
+    cutoff = None
+    if args.days:
+        cutoff = (pd.Timestamp.now() - pd.Timedelta(days=args.days)).strftime("%Y-%m-%d")
+
+    total = query_rollup(conn, cutoff, by=(), strategy=args.bucket)
+    if not total:
+        print("\n거래 데이터 없음 — 페이퍼 트레이딩 후 다시 실행하세요.")
+        return
+    by_strat = {r["strategy"]: r for r in query_rollup(conn, cutoff, by=("strategy",), strategy=args.bucket)}
+    daily    = query_rollup(conn, cutoff, by=("date",), strategy=args.bucket)
+
+    print_header(args)
+    for strat, label in STRATEGY_LABEL.items():
+        if strat in by_strat:
+            print_bucket(bucket_report_from_rollup(by_strat[strat], label))
+
+    t = total[0]
+    print(f"\n  {'─'*48}")
+    print(f"  전체 {t['total']}건  승률 {t['win_rate']:.1f}%  PF {t['profit_factor']:.2f}  누적 ${t['total_pnl']:+,.2f}")
+    print(f"\n  {verdict(t['total'], t['win_rate'], t['profit_factor'])}")
+    print(f"{'='*52}")
+
+    print_daily_table(
+        pd.DataFrame(daily).set_index("date")[["total_pnl", "total"]]
+        .rename(columns={"total_pnl": "pnl", "total": "trades"})
+    )
+
+
 def _build_from_trades(conn) -> pd.DataFrame:
     """trades 테이블에서 buy/sell 쌍을 매칭해 closed_trades 구조로 변환."""
     rows = pd.read_sql(
@@ -1,8 +1,11 @@
 # storage/db.py
 import sqlite3
+from concurrent.futures import Future
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
+
+from storage.sqlite_writer import SQLiteWriter
 
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS positions (
@@ -83,12 +86,169 @@ CREATE TABLE IF NOT EXISTS weekly_analysis (
     ai_analysis     TEXT DEFAULT '',
     created_at      TEXT NOT NULL
 );
+
+-- 청산 거래 롤업 (record_closed_trade 가 같은 트랜잭션에서 증분 갱신)
+-- 리포트는 closed_trades 원본 대신 (일자, 전략, 청산사유) 당 1행만 읽는다.
+CREATE TABLE IF NOT EXISTS closed_trades_rollup (
+    date            TEXT NOT NULL,     -- YYYY-MM-DD (ET 기준)
+    strategy        TEXT NOT NULL,
+    exit_reason     TEXT NOT NULL DEFAULT '',
+    cnt             INTEGER DEFAULT 0,
+    wins            INTEGER DEFAULT 0,    -- pnl > 0
+    losses          INTEGER DEFAULT 0,    -- pnl <= 0
+    gross_profit    REAL DEFAULT 0.0,     -- Σ pnl (수익 거래, $)
+    gross_loss      REAL DEFAULT 0.0,     -- Σ |pnl| (손실 거래, $)
+    sum_pnl         REAL DEFAULT 0.0,
+    sum_ret         REAL DEFAULT 0.0,     -- Σ pnl_pct (%)
+    sum_ret_sq      REAL DEFAULT 0.0,     -- Σ pnl_pct² (표준편차용)
+    sum_win_ret     REAL DEFAULT 0.0,
+    sum_loss_ret    REAL DEFAULT 0.0,
+    sum_hold        REAL DEFAULT 0.0,     -- Σ hold_minutes
+    best_ret        REAL DEFAULT 0.0,     -- max pnl_pct
+    worst_ret       REAL DEFAULT 0.0,     -- min pnl_pct
+    max_adverse_pct REAL DEFAULT 0.0,     -- 최대 역행폭 (MAE, %, ≤ 0)
+    PRIMARY KEY (date, strategy, exit_reason)
+);
+"""
+
+# 롤업 1건 증분 (신규 키면 INSERT, 기존 키면 누적)
+_ROLLUP_UPSERT = """
+INSERT INTO closed_trades_rollup
+    (date, strategy, exit_reason, cnt, wins, losses, gross_profit, gross_loss,
+     sum_pnl, sum_ret, sum_ret_sq, sum_win_ret, sum_loss_ret, sum_hold,
+     best_ret, worst_ret, max_adverse_pct)
+VALUES (?, ?, ?, 1, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(date, strategy, exit_reason) DO UPDATE SET
+    cnt             = cnt + 1,
+    wins            = wins + excluded.wins,
+    losses          = losses + excluded.losses,
+    gross_profit    = gross_profit + excluded.gross_profit,
+    gross_loss      = gross_loss + excluded.gross_loss,
+    sum_pnl         = sum_pnl + excluded.sum_pnl,
+    sum_ret         = sum_ret + excluded.sum_ret,
+    sum_ret_sq      = sum_ret_sq + excluded.sum_ret_sq,
+    sum_win_ret     = sum_win_ret + excluded.sum_win_ret,
+    sum_loss_ret    = sum_loss_ret + excluded.sum_loss_ret,
+    sum_hold        = sum_hold + excluded.sum_hold,
+    best_ret        = MAX(best_ret, excluded.best_ret),
+    worst_ret       = MIN(worst_ret, excluded.worst_ret),
+    max_adverse_pct = MIN(max_adverse_pct, excluded.max_adverse_pct)
+"""
+
+# 롤업 도입 전 closed_trades 로 1회 채우기 (MAE 미기록분은 실현 손실률로 대체)
+_ROLLUP_BACKFILL = """
+INSERT INTO closed_trades_rollup
+    (date, strategy, exit_reason, cnt, wins, losses, gross_profit, gross_loss,
+     sum_pnl, sum_ret, sum_ret_sq, sum_win_ret, sum_loss_ret, sum_hold,
+     best_ret, worst_ret, max_adverse_pct)
+SELECT date, strategy, COALESCE(exit_reason, ''), COUNT(*),
+       SUM(pnl > 0), SUM(pnl <= 0),
+       SUM(CASE WHEN pnl > 0 THEN pnl ELSE 0 END),
+       SUM(CASE WHEN pnl <= 0 THEN -pnl ELSE 0 END),
+       SUM(pnl), SUM(pnl_pct), SUM(pnl_pct * pnl_pct),
+       SUM(CASE WHEN pnl > 0 THEN pnl_pct ELSE 0 END),
+       SUM(CASE WHEN pnl <= 0 THEN pnl_pct ELSE 0 END),
+       SUM(hold_minutes), MAX(pnl_pct), MIN(pnl_pct), MIN(MIN(pnl_pct, 0))
+FROM closed_trades
+GROUP BY date, strategy, COALESCE(exit_reason, '')
 """
 
+_ROLLUP_KEYS = ("date", "strategy", "exit_reason")
+
+
+def query_rollup(
+    conn: sqlite3.Connection,
+    from_date: Optional[str] = None,
+    to_date:   Optional[str] = None,
+    by:        Tuple[str, ...] = ("strategy",),
+    strategy:  Optional[str] = None,
+) -> List[Dict]:
+    """
+    롤업 테이블 집계 — by 키(date/strategy/exit_reason, 빈 튜플이면 전체 1행)별 파생 지표.
+
+    반환 키: by 키 + total, wins, losses, win_rate(%), total_pnl, gross_profit, gross_loss,
+            profit_factor, avg_pnl_pct, avg_win_pct, avg_loss_pct, std_pnl_pct, avg_hold_min,
+            best_pct, worst_pct, max_adverse_pct
+    PositionDB 외에 stats.py / analyzer 처럼 sqlite 연결만 있는 곳에서도 쓴다.
+    """
+    if any(k not in _ROLLUP_KEYS for k in by):
+        raise ValueError(f"롤업 그룹 키 오류: {by}")
+    where, params = [], []
+    if from_date:
+        where.append("date >= ?")
+        params.append(from_date)
+    if to_date:
+        where.append("date <= ?")
+        params.append(to_date)
+    if strategy:
+        where.append("strategy = ?")
+        params.append(strategy)
+    cols  = ", ".join(by)
+    sql = f"""SELECT {cols + ", " if by else ""}
+                     SUM(cnt) AS total, SUM(wins) AS wins, SUM(losses) AS losses,
+                     SUM(gross_profit) AS gross_profit, SUM(gross_loss) AS gross_loss,
+                     SUM(sum_pnl) AS sum_pnl, SUM(sum_ret) AS sum_ret, SUM(sum_ret_sq) AS sum_ret_sq,
+                     SUM(sum_win_ret) AS sum_win_ret, SUM(sum_loss_ret) AS sum_loss_ret,
+                     SUM(sum_hold) AS sum_hold, MAX(best_ret) AS best_ret,
+                     MIN(worst_ret) AS worst_ret, MIN(max_adverse_pct) AS max_adverse_pct
+              FROM closed_trades_rollup
+              {"WHERE " + " AND ".join(where) if where else ""}
+              {"GROUP BY " + cols + " ORDER BY " + cols if by else ""}"""
+    out = []
+    for r in conn.execute(sql, params).fetchall():
+        n = r["total"] or 0
+        if n == 0:
+            continue
+        w, l = r["wins"], r["losses"]
+        mean = r["sum_ret"] / n
+        row  = {k: r[k] for k in by}
+        row.update({
+            "total":           n,
+            "wins":            w,
+            "losses":          l,
+            "win_rate":        w / n * 100,
+            "total_pnl":       r["sum_pnl"],
+            "gross_profit":    r["gross_profit"],
+            "gross_loss":      r["gross_loss"],
+            "profit_factor":   r["gross_profit"] / r["gross_loss"] if r["gross_loss"] > 0 else float("inf"),
+            "avg_pnl_pct":     mean,
+            "avg_win_pct":     r["sum_win_ret"] / w if w else 0.0,
+            "avg_loss_pct":    r["sum_loss_ret"] / l if l else 0.0,
+            "std_pnl_pct":     max(r["sum_ret_sq"] / n - mean * mean, 0.0) ** 0.5,
+            "avg_hold_min":    r["sum_hold"] / n,
+            "best_pct":        r["best_ret"],
+            "worst_pct":       r["worst_ret"],
+            "max_adverse_pct": r["max_adverse_pct"],
+        })
+        out.append(row)
+    return out
+
+# 분석 조회용 보조 인덱스 (_migrate 에서 생성 — idempotent)
+#   date+exit_ts          : get_closed_trades(date) / get_closed_trades_range / analyzer 기간 조회
+#   exit_ts               : 최근 N건 (ORDER BY exit_ts DESC LIMIT) / stats.py 전체 정렬
+#   trades symbol+ts / ts : get_trades(symbol) / 최근 체결 / stats.py 종목·시간 정렬
+_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_closed_date_exit ON closed_trades(date, exit_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_closed_exit_ts ON closed_trades(exit_ts)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_symbol_ts ON trades(symbol, ts)",
+    "CREATE INDEX IF NOT EXISTS idx_trades_ts ON trades(ts)",
+)
+# 전략·청산사유 통계가 closed_trades_rollup 으로 옮겨가며 쓰이지 않게 된 커버링 인덱스 (쓰기 비용만 발생)
+_DROPPED_INDEXES = ("idx_closed_date_strategy", "idx_closed_date_reason")
+
 
 class PositionDB:
-    def __init__(self, path: str = "storage/trade.db"):
+    def __init__(self, path: str = "storage/trade.db", writer: Optional[SQLiteWriter] = None):
+        """
+        writer 지정 시 쓰기는 SQLiteWriter 큐로 넘겨 그룹 커밋 (호출 스레드는 fsync 대기 없음).
+        open/close_position · record_closed_trade 는 durable — 대기 중 쓰기와 함께 즉시 커밋하고
+        커밋 완료(실패 시 예외)까지 기다린 뒤 반환한다. wait=False 면 기다리지 않고 커밋 Future 를
+        돌려준다 (락 밖에서 fut.result() · 코루틴에서 await asyncio.wrap_future(fut)).
+        읽기는 대기 중 쓰기를 flush 한 뒤 실행한다. writer 없으면 기존처럼 호출마다 commit.
+        """
         Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._path   = path
+        self._writer = writer
         self._conn = sqlite3.connect(path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
         self._conn.execute("PRAGMA journal_mode=WAL;")
@@ -97,7 +257,7 @@ class PositionDB:
         self._migrate()
 
     def _migrate(self) -> None:
-        """기존 DB에 신규 컬럼 추가 (idempotent)."""
+        """기존 DB에 신규 컬럼·인덱스 추가 (idempotent)."""
         migrations = [
             "ALTER TABLE positions ADD COLUMN partial_stage INTEGER DEFAULT 0",
         ]
@@ -107,6 +267,56 @@ class PositionDB:
                 self._conn.commit()
             except Exception:
                 pass  # 이미 존재하는 컬럼이면 무시
+        for sql in _INDEXES:
+            self._conn.execute(sql)
+        for name in _DROPPED_INDEXES:
+            self._conn.execute(f"DROP INDEX IF EXISTS {name}")
+        # 롤업 도입 전 DB: 기존 청산 기록으로 1회 백필
+        if self._conn.execute("SELECT 1 FROM closed_trades_rollup LIMIT 1").fetchone() is None:
+            self._conn.execute(_ROLLUP_BACKFILL)
+        self._conn.commit()
+
+    def _write(
+        self, sql: str, params: tuple, durable: bool = False, wait: bool = True,
+    ) -> Optional[Future]:
+        """writer 사용 시 커밋 Future (writer 없으면 동기 커밋 후 None)."""
+        if self._writer is not None:
+            fut = self._writer.submit(self._path, sql, params, durable=durable)
+            if durable and wait:
+                fut.result()    # 주문 관련 쓰기: 커밋 확인 전 성공 보고 금지 (실패 시 예외 전파)
+            return fut
+        self._conn.execute(sql, params)
+        self._conn.commit()
+        return None
+
+    def _write_many(
+        self, statements: List[Tuple[str, tuple]], durable: bool = False, wait: bool = True,
+    ) -> Optional[Future]:
+        """여러 문장을 한 트랜잭션으로 (전부 반영되거나 전부 안 되거나)."""
+        if self._writer is not None:
+            fut = self._writer.submit_many(self._path, statements, durable=durable)
+            if durable and wait:
+                fut.result()
+            return fut
+        with self._conn:
+            for sql, params in statements:
+                self._conn.execute(sql, params)
+        return None
+
+    def _query(self, sql: str, params: tuple = ()) -> sqlite3.Cursor:
+        if self._writer is not None:
+            self._writer.flush()
+        return self._conn.execute(sql, params)
+
+    def flush(self) -> None:
+        """대기 중인 쓰기 커밋까지 대기 (writer 미사용 시 no-op)."""
+        if self._writer is not None:
+            self._writer.flush()
+
+    def close(self) -> None:
+        """남은 쓰기 커밋 후 연결 종료 (공유 writer 는 만든 쪽이 닫는다)."""
+        self.flush()
+        self._conn.close()
 
     # ── 포지션 관리 ────────────────────────────────────────────────
 
@@ -117,53 +327,53 @@ class PositionDB:
         entry_price: float,
         qty: int,
         sector: str = "",
-    ) -> None:
-        ts = datetime.now(timezone.utc).isoformat()
-        self._conn.execute(
+        entry_ts: Optional[str] = None,
+        wait: bool = True,
+    ) -> Optional[Future]:
+        ts = entry_ts or datetime.now(timezone.utc).isoformat()
+        return self._write(
             """INSERT OR REPLACE INTO positions
                (symbol, strategy, entry_price, entry_ts, peak_price, qty, sector, status)
                VALUES (?, ?, ?, ?, ?, ?, ?, 'open')""",
             (symbol, strategy, entry_price, ts, entry_price, qty, sector),
+            durable=True, wait=wait,
         )
-        self._conn.commit()
 
     def update_partial_stage(self, symbol: str, stage: int, new_qty: int) -> None:
         """분할 청산 단계 + 잔여 수량 업데이트."""
-        self._conn.execute(
+        self._write(
             "UPDATE positions SET partial_stage = ?, qty = ? WHERE symbol = ? AND status = 'open'",
             (stage, new_qty, symbol),
         )
-        self._conn.commit()
 
     def update_peak(self, symbol: str, new_peak: float) -> None:
-        self._conn.execute(
+        self._write(
             "UPDATE positions SET peak_price = ? WHERE symbol = ? AND status = 'open' AND ? > peak_price",
             (new_peak, symbol, new_peak),
         )
-        self._conn.commit()
 
-    def close_position(self, symbol: str) -> None:
-        self._conn.execute(
+    def close_position(self, symbol: str, wait: bool = True) -> Optional[Future]:
+        return self._write(
             "UPDATE positions SET status = 'closed' WHERE symbol = ?",
             (symbol,),
+            durable=True, wait=wait,
         )
-        self._conn.commit()
 
     def get_open_position(self, symbol: str) -> Optional[Dict]:
-        row = self._conn.execute(
+        row = self._query(
             "SELECT * FROM positions WHERE symbol = ? AND status = 'open'",
             (symbol,),
         ).fetchone()
         return dict(row) if row else None
 
     def list_open_positions(self) -> List[Dict]:
-        rows = self._conn.execute(
+        rows = self._query(
             "SELECT * FROM positions WHERE status = 'open'"
         ).fetchall()
         return [dict(r) for r in rows]
 
     def count_open_by_sector(self) -> Dict[str, int]:
-        rows = self._conn.execute(
+        rows = self._query(
             "SELECT sector, COUNT(*) as cnt FROM positions WHERE status = 'open' GROUP BY sector"
         ).fetchall()
         return {r["sector"]: r["cnt"] for r in rows if r["sector"]}
@@ -180,20 +390,19 @@ class PositionDB:
         reason: str = "",
     ) -> None:
         ts = datetime.now(timezone.utc).isoformat()
-        self._conn.execute(
+        self._write(
             "INSERT INTO trades (symbol, side, qty, price, strategy, reason, ts) VALUES (?, ?, ?, ?, ?, ?, ?)",
             (symbol, side, qty, price, strategy, reason, ts),
         )
-        self._conn.commit()
 
     def get_trades(self, symbol: Optional[str] = None, limit: int = 100) -> List[Dict]:
         if symbol:
-            rows = self._conn.execute(
+            rows = self._query(
                 "SELECT * FROM trades WHERE symbol = ? ORDER BY ts DESC LIMIT ?",
                 (symbol, limit),
             ).fetchall()
         else:
-            rows = self._conn.execute(
+            rows = self._query(
                 "SELECT * FROM trades ORDER BY ts DESC LIMIT ?", (limit,)
             ).fetchall()
         return [dict(r) for r in rows]
@@ -211,8 +420,14 @@ class PositionDB:
         exit_ts:      str,
         exit_reason:  str = "",
         sector:       str = "",
-    ) -> None:
-        """매수-매도 쌍이 완성됐을 때 청산 기록 저장."""
+        mae_pct:      Optional[float] = None,
+        wait:         bool = True,
+    ) -> Optional[Future]:
+        """
+        매수-매도 쌍이 완성됐을 때 청산 기록 저장 + 롤업 증분 (같은 트랜잭션).
+
+        mae_pct: 보유 중 최대 역행폭(%) — 미지정이면 실현 손실률(min(pnl_pct, 0))로 대체.
+        """
         import json as _json
         from datetime import datetime, timezone, timedelta
 
@@ -235,31 +450,37 @@ class PositionDB:
         except Exception:
             date_str = exit_ts[:10]
 
-        self._conn.execute(
-            """INSERT INTO closed_trades
-               (symbol, strategy, sector, entry_price, exit_price, qty,
-                entry_ts, exit_ts, hold_minutes, pnl, pnl_pct, exit_reason, date)
-               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-            (symbol, strategy, sector, entry_price, exit_price, qty,
-             entry_ts, exit_ts, hold_minutes, pnl, pnl_pct, exit_reason, date_str),
-        )
-        self._conn.commit()
+        win = pnl > 0
+        mae = min(pnl_pct, 0.0) if mae_pct is None else min(mae_pct, pnl_pct, 0.0)
+        return self._write_many([
+            ("""INSERT INTO closed_trades
+                (symbol, strategy, sector, entry_price, exit_price, qty,
+                 entry_ts, exit_ts, hold_minutes, pnl, pnl_pct, exit_reason, date)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+             (symbol, strategy, sector, entry_price, exit_price, qty,
+              entry_ts, exit_ts, hold_minutes, pnl, pnl_pct, exit_reason, date_str)),
+            (_ROLLUP_UPSERT,
+             (date_str, strategy, exit_reason or "", int(win), int(not win),
+              pnl if win else 0.0, 0.0 if win else -pnl, pnl, pnl_pct, pnl_pct * pnl_pct,
+              pnl_pct if win else 0.0, 0.0 if win else pnl_pct, hold_minutes,
+              pnl_pct, pnl_pct, mae)),
+        ], durable=True, wait=wait)
 
     def get_closed_trades(self, date_str: Optional[str] = None, limit: int = 200) -> List[Dict]:
         """날짜별 또는 전체 청산 거래 조회."""
         if date_str:
-            rows = self._conn.execute(
+            rows = self._query(
                 "SELECT * FROM closed_trades WHERE date = ? ORDER BY exit_ts DESC",
                 (date_str,),
             ).fetchall()
         else:
-            rows = self._conn.execute(
+            rows = self._query(
                 "SELECT * FROM closed_trades ORDER BY exit_ts DESC LIMIT ?", (limit,)
             ).fetchall()
         return [dict(r) for r in rows]
 
     def get_closed_trades_range(self, from_date: str, to_date: str) -> List[Dict]:
-        rows = self._conn.execute(
+        rows = self._query(
             "SELECT * FROM closed_trades WHERE date BETWEEN ? AND ? ORDER BY exit_ts",
             (from_date, to_date),
         ).fetchall()
@@ -284,7 +505,7 @@ class PositionDB:
         ai_analysis: str,
     ) -> None:
         ts = datetime.now(timezone.utc).isoformat()
-        self._conn.execute(
+        self._write(
             """INSERT INTO daily_journal
                (date, trades_cnt, win_cnt, lose_cnt, realized_pnl,
                 win_rate, avg_win_pct, avg_loss_pct, profit_factor,
@@ -302,16 +523,15 @@ class PositionDB:
              win_rate, avg_win_pct, avg_loss_pct, profit_factor,
              best_trade, worst_trade, bucket_stats, ai_analysis, ts),
         )
-        self._conn.commit()
 
     def get_daily_journal(self, date: str) -> Optional[Dict]:
-        row = self._conn.execute(
+        row = self._query(
             "SELECT * FROM daily_journal WHERE date = ?", (date,)
         ).fetchone()
         return dict(row) if row else None
 
     def get_recent_journals(self, days: int = 30) -> List[Dict]:
-        rows = self._conn.execute(
+        rows = self._query(
             "SELECT * FROM daily_journal ORDER BY date DESC LIMIT ?", (days,)
         ).fetchall()
         return [dict(r) for r in rows]
@@ -330,7 +550,7 @@ class PositionDB:
         ai_analysis: str,
     ) -> None:
         ts = datetime.now(timezone.utc).isoformat()
-        self._conn.execute(
+        self._write(
             """INSERT INTO weekly_analysis
                (week_start, total_trades, win_rate, total_pnl,
                 max_drawdown_pct, best_strategy, worst_setup, ai_analysis, created_at)
@@ -343,26 +563,36 @@ class PositionDB:
             (week_start, total_trades, win_rate, total_pnl,
              max_drawdown_pct, best_strategy, worst_setup, ai_analysis, ts),
         )
-        self._conn.commit()
 
     def get_weekly_analysis(self, week_start: str) -> Optional[Dict]:
-        row = self._conn.execute(
+        row = self._query(
             "SELECT * FROM weekly_analysis WHERE week_start = ?", (week_start,)
         ).fetchone()
         return dict(row) if row else None
 
     # ── 통계 조회 ────────────────────────────────────────────────
 
+    def get_rollup(
+        self,
+        from_date: Optional[str] = None,
+        to_date:   Optional[str] = None,
+        by:        Tuple[str, ...] = ("strategy",),
+        strategy:  Optional[str] = None,
+    ) -> List[Dict]:
+        """롤업 기반 기간 집계 (query_rollup 참고) — O(일수 × 그룹) 행만 읽음."""
+        self.flush()
+        return query_rollup(self._conn, from_date, to_date, by, strategy)
+
     def get_strategy_stats(self, days: int = 30) -> List[Dict]:
-        """전략별 승률/수익률 집계 (최근 N일)."""
-        rows = self._conn.execute(
+        """전략별 승률/수익률 집계 (최근 N일, 롤업 기반)."""
+        rows = self._query(
             """SELECT strategy,
-                      COUNT(*) as total,
-                      SUM(CASE WHEN pnl > 0 THEN 1 ELSE 0 END) as wins,
-                      ROUND(AVG(pnl_pct), 2) as avg_pnl_pct,
-                      ROUND(SUM(pnl), 2) as total_pnl,
-                      ROUND(AVG(hold_minutes), 0) as avg_hold_min
-               FROM closed_trades
+                      SUM(cnt) as total,
+                      SUM(wins) as wins,
+                      ROUND(SUM(sum_ret) / SUM(cnt), 2) as avg_pnl_pct,
+                      ROUND(SUM(sum_pnl), 2) as total_pnl,
+                      ROUND(SUM(sum_hold) / SUM(cnt), 0) as avg_hold_min
+               FROM closed_trades_rollup
                WHERE date >= date('now', ?)
                GROUP BY strategy
                ORDER BY total_pnl DESC""",
@@ -371,13 +601,13 @@ class PositionDB:
         return [dict(r) for r in rows]
 
     def get_exit_reason_stats(self, days: int = 30) -> List[Dict]:
-        """청산 사유별 통계."""
-        rows = self._conn.execute(
+        """청산 사유별 통계 (롤업 기반)."""
+        rows = self._query(
             """SELECT exit_reason,
-                      COUNT(*) as cnt,
-                      ROUND(AVG(pnl_pct), 2) as avg_pnl_pct,
-                      ROUND(SUM(pnl), 2) as total_pnl
-               FROM closed_trades
+                      SUM(cnt) as cnt,
+                      ROUND(SUM(sum_ret) / SUM(cnt), 2) as avg_pnl_pct,
+                      ROUND(SUM(sum_pnl), 2) as total_pnl
+               FROM closed_trades_rollup
                WHERE date >= date('now', ?)
                GROUP BY exit_reason
                ORDER BY cnt DESC""",
@@ -388,11 +618,10 @@ class PositionDB:
     # ── 일일 PnL ────────────────────────────────────────────────
 
     def upsert_daily_pnl(self, date_str: str, realized: float, unrealized: float) -> None:
-        self._conn.execute(
+        self._write(
             """INSERT INTO daily_pnl (date, realized, unrealized)
                VALUES (?, ?, ?)
                ON CONFLICT(date) DO UPDATE SET realized = excluded.realized,
                                                unrealized = excluded.unrealized""",
             (date_str, realized, unrealized),
         )
-        self._conn.commit()
@@ -11,8 +11,12 @@ DB 파일 경로: <project_root>/storage/db/trading_data.db
 import os
 import sqlite3
 import logging
+import threading
+from concurrent.futures import Future
 from typing import Dict, List, Optional
 
+from storage.sqlite_writer import flush_default, get_writer
+
 # ── 경로 설정 ─────────────────────────────────────────────────────────
 _THIS_DIR = os.path.dirname(os.path.abspath(__file__))          # = .../storage/
 DB_PATH   = os.path.join(_THIS_DIR, "db", "trading_data.db")   # = .../storage/db/trading_data.db
@@ -79,6 +83,39 @@ CREATE TABLE IF NOT EXISTS b4_cooldown (
 """
 
 
+# ── 연결 풀 (스레드별 1개 재사용) ─────────────────────────────────────
+# 호출마다 connect/close 하던 것을 스레드당 연결 1개로 재사용 — sqlite3 의 연결별
+# statement 캐시(cached_statements)가 유지돼 같은 SQL 은 재컴파일 없이 실행된다.
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL;",
+    "PRAGMA synchronous=NORMAL;",     # WAL 에서 안전 — 커밋마다 fsync 안 함
+    "PRAGMA busy_timeout=5000;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA cache_size=-8000;",       # 8MB 페이지 캐시
+)
+_local = threading.local()
+
+# system_state 읽기 캐시 — DB_PATH → {key: value} (_system_states 참고)
+_state_lock = threading.Lock()
+_state_cache: Dict[str, Dict[str, str]] = {}
+
+
+def _conn() -> sqlite3.Connection:
+    """현재 스레드의 DB_PATH 연결 (최초 호출 시 생성 + pragma 적용)."""
+    pool = getattr(_local, "conns", None)
+    if pool is None:
+        pool = _local.conns = {}
+    conn = pool.get(DB_PATH)
+    if conn is None:
+        conn = sqlite3.connect(DB_PATH, timeout=5.0, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        pool[DB_PATH] = conn
+    return conn
+
+
 # ── 초기화 ────────────────────────────────────────────────────────────
 
 def init_db() -> None:
@@ -86,12 +123,19 @@ def init_db() -> None:
     DB 파일 생성 + 테이블/인덱스 초기화.
     애플리케이션 시작 시 1회 호출.
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.executescript(_DDL)
-        conn.commit()
+    conn = _conn()
+    conn.executescript(_DDL)
+    conn.commit()
     logging.info("[db_manager] 초기화 완료: %s", DB_PATH)
 
 
+# ── 비동기 쓰기 (SQLiteWriter 그룹 커밋) ──────────────────────────────
+
+def _write(sql: str, params: tuple) -> Future:
+    """append-only 로그 쓰기 — 공용 writer 큐로 넘기고 즉시 반환 (fsync 대기 없음)."""
+    return get_writer().submit(DB_PATH, sql, params)
+
+
 # ── 매매 기록 ─────────────────────────────────────────────────────────
 
 def save_trade(
@@ -101,9 +145,9 @@ def save_trade(
     quantity:   float,
     mode:       str,
     result:     Optional[float],
-) -> int:
+) -> Future:
     """
-    매매 결과 저장.
+    매매 결과 저장 (writer 큐 경유 — 호출 스레드는 커밋을 기다리지 않음).
 
     Args:
         symbol:     종목 코드
@@ -114,18 +158,15 @@ def save_trade(
         result:     수익률 (0.05 = +5%, -0.03 = -3%, 미청산이면 None)
 
     Returns:
-        생성된 row id
+        커밋 후 생성된 row id 로 resolve 되는 Future
     """
     sql = """
         INSERT INTO trades (symbol, buy_price, sell_price, quantity, mode, result)
         VALUES (?, ?, ?, ?, ?, ?)
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        cur = conn.execute(sql, (symbol, buy_price, sell_price, quantity, mode, result))
-        conn.commit()
-    row_id = cur.lastrowid
+    fut = _write(sql, (symbol, buy_price, sell_price, quantity, mode, result))
     logging.debug("[db_manager] save_trade: %s mode=%s result=%s", symbol, mode, result)
-    return row_id
+    return fut
 
 
 def get_trades_today() -> List[Dict]:
@@ -136,9 +177,8 @@ def get_trades_today() -> List[Dict]:
         WHERE DATE(timestamp) = DATE('now')
         ORDER BY timestamp DESC
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute(sql).fetchall()
+    flush_default()
+    rows = _conn().execute(sql).fetchall()
     return [dict(r) for r in rows]
 
 
@@ -150,9 +190,8 @@ def get_trades(days: int = 30) -> List[Dict]:
         WHERE timestamp >= DATETIME('now', ?)
         ORDER BY timestamp DESC
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        rows = conn.execute(sql, (f"-{days} days",)).fetchall()
+    flush_default()
+    rows = _conn().execute(sql, (f"-{days} days",)).fetchall()
     return [dict(r) for r in rows]
 
 
@@ -163,9 +202,9 @@ def save_market_log(
     nasdaq_ma20:   Optional[float],
     regime:        str,
     scanner_score: Optional[int] = None,
-) -> int:
+) -> Future:
     """
-    일별 시장 상태 기록.
+    일별 시장 상태 기록 (writer 큐 경유 — 커밋 후 row id 로 resolve 되는 Future 반환).
 
     Args:
         date:          날짜 문자열 (예: '2026-06-16')
@@ -177,19 +216,16 @@ def save_market_log(
         INSERT INTO market_log (date, nasdaq_ma20, regime, scanner_score)
         VALUES (?, ?, ?, ?)
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        cur = conn.execute(sql, (date, nasdaq_ma20, regime, scanner_score))
-        conn.commit()
+    fut = _write(sql, (date, nasdaq_ma20, regime, scanner_score))
     logging.debug("[db_manager] save_market_log: %s regime=%s score=%s", date, regime, scanner_score)
-    return cur.lastrowid
+    return fut
 
 
 def get_latest_market_log() -> Optional[Dict]:
     """가장 최근 시장 상태 로그 반환."""
     sql = "SELECT * FROM market_log ORDER BY timestamp DESC LIMIT 1"
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
-        row = conn.execute(sql).fetchone()
+    flush_default()
+    row = _conn().execute(sql).fetchone()
     return dict(row) if row else None
 
 
@@ -206,9 +242,12 @@ def update_system_state(key: str, value: str) -> None:
     기존 키면 덮어씀 (UPSERT).
     """
     sql = "INSERT OR REPLACE INTO system_state (key, value) VALUES (?, ?)"
-    with sqlite3.connect(DB_PATH) as conn:
+    with _conn() as conn:
         conn.execute(sql, (key, value))
-        conn.commit()
+    # 자기 연결의 커밋은 data_version 을 바꾸지 않으므로 이 스레드 캐시 기준을 직접 무효화
+    with _state_lock:
+        _state_cache.pop(DB_PATH, None)
+    getattr(_local, "state_ver", {}).pop(DB_PATH, None)
     logging.debug("[db_manager] system_state[%s] = %s", key, value)
 
 
@@ -220,18 +259,37 @@ def get_system_state(key: str, default: Optional[str] = None) -> Optional[str]:
         mode  = get_system_state('CURRENT_MODE', 'B3_AGGRESSIVE')
         group = get_system_state('ACTIVE_GROUP', 'A')
     """
-    sql = "SELECT value FROM system_state WHERE key = ?"
-    with sqlite3.connect(DB_PATH) as conn:
-        row = conn.execute(sql, (key,)).fetchone()
-    return row[0] if row else default
+    return _system_states().get(key, default)
 
 
 def get_all_system_states() -> Dict[str, str]:
     """모든 시스템 상태 키-값 딕셔너리 반환."""
-    sql = "SELECT key, value FROM system_state"
-    with sqlite3.connect(DB_PATH) as conn:
-        rows = conn.execute(sql).fetchall()
-    return {r[0]: r[1] for r in rows}
+    return dict(_system_states())
+
+
+def _system_states() -> Dict[str, str]:
+    """
+    system_state 전체 캐시 — 변경이 없으면 테이블을 읽지 않는다.
+
+    PRAGMA data_version 은 다른 연결(텔레그램 봇 프로세스 등)이 커밋하면 값이 바뀐다
+    (WAL 공유 메모리 조회 — 테이블 페이지 미접근). 바뀌었을 때만 재적재하고,
+    같은 프로세스의 update_system_state 는 캐시를 비워 다음 읽기에서 재적재.
+    """
+    conn = _conn()
+    ver  = conn.execute("PRAGMA data_version").fetchone()[0]
+    seen = getattr(_local, "state_ver", None)
+    if seen is None:
+        seen = _local.state_ver = {}
+    with _state_lock:
+        cached = _state_cache.get(DB_PATH)
+        if cached is not None and seen.get(DB_PATH) == ver:
+            return cached
+    rows = conn.execute("SELECT key, value FROM system_state").fetchall()
+    fresh = {r[0]: r[1] for r in rows}
+    with _state_lock:
+        _state_cache[DB_PATH] = fresh
+    seen[DB_PATH] = ver
+    return fresh
 
 
 # ── B4 스나이퍼 모드 (옵션 버전) ─────────────────────────────────────
@@ -262,10 +320,9 @@ def save_b4_trade(
         (symbol, buy_price, sell_price, qty, result_pct, exit_reason, trade_date)
         VALUES (?, ?, ?, ?, ?, ?, ?)
     """
-    with sqlite3.connect(DB_PATH) as conn:
+    with _conn() as conn:
         cur = conn.execute(sql, (symbol, buy_price, sell_price, qty,
                                  result_pct, exit_reason, trade_date))
-        conn.commit()
     logging.debug("[db_manager] save_b4_trade: %s result=%.2f%% qty=%d",
                   symbol, result_pct * 100, qty)
     return cur.lastrowid
@@ -284,8 +341,7 @@ def get_b4_consecutive_loss_days() -> int:
         ORDER BY trade_date DESC
         LIMIT 10
     """
-    with sqlite3.connect(DB_PATH) as conn:
-        rows = conn.execute(sql).fetchall()
+    rows = _conn().execute(sql).fetchall()
 
     consecutive = 0
     for _, daily_pnl in rows:
@@ -299,8 +355,7 @@ def get_b4_consecutive_loss_days() -> int:
 def is_b4_cooldown_active() -> bool:
     """현재 B4 쿨다운 상태 여부 (end_date >= 오늘이면 활성)."""
     sql = "SELECT COUNT(*) FROM b4_cooldown WHERE end_date >= DATE('now')"
-    with sqlite3.connect(DB_PATH) as conn:
-        count = conn.execute(sql).fetchone()[0]
+    count = _conn().execute(sql).fetchone()[0]
     return count > 0
 
 
@@ -310,9 +365,8 @@ def set_b4_cooldown(reason: str = "", trading_days: int = 2) -> None:
     today = date.today()
     end   = _next_n_trading_days(today, trading_days)
     sql   = "INSERT INTO b4_cooldown (start_date, end_date, reason) VALUES (?, ?, ?)"
-    with sqlite3.connect(DB_PATH) as conn:
+    with _conn() as conn:
         conn.execute(sql, (str(today), str(end), reason))
-        conn.commit()
     logging.warning("[db_manager] B4 쿨다운: %s ~ %s | %s", today, end, reason)
 
 
@@ -29,9 +29,11 @@ from storage.db import PositionDB
 # 통계 계산
 # ─────────────────────────────────────────────────────────────────────
 
-def _calc_stats(trades: List[Dict]) -> Dict:
-    """closed_trades 리스트에서 핵심 통계 산출."""
-    if not trades:
+def _calc_stats(summary: Optional[Dict], trades: List[Dict]) -> Dict:
+    """
+    핵심 통계 — 집계는 롤업 요약(db.get_rollup(by=()) 1행), 최고/최저 거래만 원본 trades 에서.
+    """
+    if not summary:
         return {
             "trades_cnt": 0, "win_cnt": 0, "lose_cnt": 0,
             "realized_pnl": 0.0, "win_rate": 0.0,
@@ -39,42 +41,40 @@ def _calc_stats(trades: List[Dict]) -> Dict:
             "profit_factor": 0.0, "best_trade": {}, "worst_trade": {},
         }
 
-    wins  = [t for t in trades if t["pnl"] > 0]
-    loses = [t for t in trades if t["pnl"] <= 0]
-
-    gross_win  = sum(t["pnl"] for t in wins)
-    gross_loss = abs(sum(t["pnl"] for t in loses))
-
-    best  = max(trades, key=lambda t: t["pnl_pct"])
-    worst = min(trades, key=lambda t: t["pnl_pct"])
-
-    return {
-        "trades_cnt":    len(trades),
-        "win_cnt":       len(wins),
-        "lose_cnt":      len(loses),
-        "realized_pnl":  round(sum(t["pnl"] for t in trades), 2),
-        "win_rate":      round(len(wins) / len(trades) * 100, 1) if trades else 0.0,
-        "avg_win_pct":   round(sum(t["pnl_pct"] for t in wins)  / len(wins)  if wins  else 0.0, 2),
-        "avg_loss_pct":  round(sum(t["pnl_pct"] for t in loses) / len(loses) if loses else 0.0, 2),
-        "profit_factor": round(gross_win / gross_loss if gross_loss > 0 else 0.0, 2),
-        "best_trade":    {"symbol": best["symbol"],  "pnl_pct": best["pnl_pct"],  "strategy": best["strategy"],  "reason": best["exit_reason"]},
-        "worst_trade":   {"symbol": worst["symbol"], "pnl_pct": worst["pnl_pct"], "strategy": worst["strategy"], "reason": worst["exit_reason"]},
+    gross_loss = summary["gross_loss"]
+    stats = {
+        "trades_cnt":    summary["total"],
+        "win_cnt":       summary["wins"],
+        "lose_cnt":      summary["losses"],
+        "realized_pnl":  round(summary["total_pnl"], 2),
+        "win_rate":      round(summary["win_rate"], 1),
+        "avg_win_pct":   round(summary["avg_win_pct"], 2),
+        "avg_loss_pct":  round(summary["avg_loss_pct"], 2),
+        "profit_factor": round(summary["gross_profit"] / gross_loss if gross_loss > 0 else 0.0, 2),
+        "best_trade":    {},
+        "worst_trade":   {},
     }
+    if trades:
+        best  = max(trades, key=lambda t: t["pnl_pct"])
+        worst = min(trades, key=lambda t: t["pnl_pct"])
+        stats["best_trade"]  = {"symbol": best["symbol"],  "pnl_pct": best["pnl_pct"],  "strategy": best["strategy"],  "reason": best["exit_reason"]}
+        stats["worst_trade"] = {"symbol": worst["symbol"], "pnl_pct": worst["pnl_pct"], "strategy": worst["strategy"], "reason": worst["exit_reason"]}
+    return stats
 
 
-def _bucket_stats(trades: List[Dict]) -> Dict:
-    """버킷별 통계."""
+def _bucket_stats(rows: List[Dict]) -> Dict:
+    """버킷별 통계 (db.get_rollup(by=("strategy",)) 행)."""
+    by_strategy = {r["strategy"]: r for r in rows}
     result = {}
     for strategy in ("value_long", "etf_swing", "squeeze"):
-        subset = [t for t in trades if t["strategy"] == strategy]
-        if not subset:
+        r = by_strategy.get(strategy)
+        if not r:
             continue
-        wins = [t for t in subset if t["pnl"] > 0]
         result[strategy] = {
-            "cnt":      len(subset),
-            "win_rate": round(len(wins) / len(subset) * 100, 1),
-            "pnl":      round(sum(t["pnl"] for t in subset), 2),
-            "avg_hold": round(sum(t["hold_minutes"] for t in subset) / len(subset), 0),
+            "cnt":      r["total"],
+            "win_rate": round(r["win_rate"], 1),
+            "pnl":      round(r["total_pnl"], 2),
+            "avg_hold": round(r["avg_hold_min"], 0),
         }
     return result
 
@@ -227,9 +227,10 @@ def generate_and_save(
     if date is None:
         date = datetime.now(ZoneInfo("America/New_York")).strftime("%Y-%m-%d")
 
-    trades = db.get_closed_trades(date_str=date)
-    stats  = _calc_stats(trades)
-    bucket = _bucket_stats(trades)
+    trades  = db.get_closed_trades(date_str=date)
+    summary = db.get_rollup(date, date, by=())
+    stats   = _calc_stats(summary[0] if summary else None, trades)
+    bucket  = _bucket_stats(db.get_rollup(date, date, by=("strategy",)))
 
     # Gemini Pro 분석
     ai_text = ""
@@ -303,7 +304,8 @@ def generate_weekly(
     journals   = db.get_recent_journals(days=7)
     journals   = [j for j in journals if week_start <= j["date"] <= week_end]
 
-    stats = _calc_stats(all_trades)
+    summary = db.get_rollup(week_start, week_end, by=())
+    stats   = _calc_stats(summary[0] if summary else None, all_trades)
 
     # 최대 낙폭 계산
     cumulative, peak, max_dd = 0.0, 0.0, 0.0
@@ -316,7 +318,7 @@ def generate_weekly(
             max_dd = dd
 
     # 최고 전략
-    bucket  = _bucket_stats(all_trades)
+    bucket  = _bucket_stats(db.get_rollup(week_start, week_end, by=("strategy",)))
     best_bkt = max(bucket, key=lambda b: bucket[b]["pnl"]) if bucket else ""
 
     # Gemini Pro 주간 분석
@@ -430,7 +432,16 @@ def _format_weekly_message(
 # 빠른 통계 요약 (텔레그램 /stats 용)
 # ─────────────────────────────────────────────────────────────────────
 
-def format_stats_message(db: PositionDB, days: int = 30) -> str:
+def format_stats_message(
+    db:       PositionDB,
+    days:     int = 30,
+    equity:   Optional[float] = None,
+    mc_paths: int = 20_000,
+) -> str:
+    """
+    누계 통계 메시지. equity 지정 시 기간 청산 거래로 버킷별 몬테카를로 요약을 덧붙인다
+    (버킷 시작 자본 = equity × 기본 비중).
+    """
     strat_stats  = db.get_strategy_stats(days=days)
     reason_stats = db.get_exit_reason_stats(days=days)
     journals     = db.get_recent_journals(days=days)
@@ -448,7 +459,7 @@ def format_stats_message(db: PositionDB, days: int = 30) -> str:
     for s in strat_stats:
         wr = round(s["wins"] / s["total"] * 100, 1) if s["total"] else 0
         lines.append(
-            f"  {s['strategy']:<12}: {s['total']}건  승률{wr}%  손익${s['total_pnl']:+.2f}  평균보유{s['avg_hold']:.0f}분"
+            f"  {s['strategy']:<12}: {s['total']}건  승률{wr}%  손익${s['total_pnl']:+.2f}  평균보유{s['avg_hold_min']:.0f}분"
         )
 
     if reason_stats:
@@ -459,4 +470,18 @@ def format_stats_message(db: PositionDB, days: int = 30) -> str:
                 f"  {r['exit_reason']:<16}: {r['cnt']}건  평균{r['avg_pnl_pct']:+.1f}%  합계${r['total_pnl']:+.2f}"
             )
 
+    if equity and mc_paths:
+        from backtest.montecarlo import bucket_bootstrap, format_lines
+
+        today  = datetime.now(timezone.utc).date()
+        trades = db.get_closed_trades_range(str(today - timedelta(days=days)), str(today))
+        pnls: Dict[str, List[float]] = {}
+        for t in trades:
+            pnls.setdefault(t.get("strategy") or "unknown", []).append(t.get("pnl") or 0.0)
+        mc = bucket_bootstrap(pnls, equity, paths=mc_paths)
+        if mc:
+            lines.append("")
+            lines.append(f"🎲 몬테카를로 ({mc_paths:,}경로, 파산=버킷 자본 -50%)")
+            lines.extend(format_lines(mc))
+
     return "\n".join(lines)
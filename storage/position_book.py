@@ -0,0 +1,119 @@
+# storage/position_book.py
+"""
+메모리 포지션 북 — PositionDB 앞단 write-through 캐시 (핫패스 SQLite 조회 제거).
+
+on_bar / on_quote / 청산 루프가 1분봉·호가마다 get_open_position / list_open_positions 를
+to_thread 로 SQLite 에 물어보던 것을 메모리 dict 조회로 대체한다.
+
+  - 시작 시 PositionDB 의 open 포지션을 1회 적재
+  - 읽기: O(1) dict 조회, 락 없음 (행은 교체만 하고 제자리 수정하지 않음 → 이벤트 루프 안전)
+  - 쓰기: 메모리 즉시 반영 → PositionDB 의 SQLiteWriter 큐로 넘겨 FIFO 그룹 커밋
+          (포지션·체결·청산 기록이 발행 순서 그대로 커밋 → 크래시 시에도 DB 는 항상 순서의 접두부)
+          open/close_position 은 커밋 완료까지 기다리되 쓰기 락 밖에서 기다린다
+          (이벤트 루프에서는 asyncio.to_thread 로 호출)
+  - 전략별 보유 수 증분 유지 → max_positions 체크가 전체 행을 훑지 않음
+  - 그 외 PositionDB 메서드(통계·일지 조회 등)는 그대로 위임 (PositionDB 가 읽기 전 flush)
+"""
+from __future__ import annotations
+
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from storage.db import PositionDB
+
+
+def _wait(fut: Optional[Future]) -> None:
+    """durable 쓰기 커밋 대기 (실패 시 예외 전파) — 큐 적재는 락 안, 대기는 락 밖."""
+    if fut is not None:
+        fut.result()
+
+
+class PositionBook:
+    """symbol → open 포지션 행 (PositionDB 와 같은 인터페이스)."""
+
+    def __init__(self, db: PositionDB) -> None:
+        self.db = db
+        self._open: Dict[str, Dict] = {p["symbol"]: p for p in db.list_open_positions()}
+        self._by_strategy: Counter = Counter(p["strategy"] for p in self._open.values())
+        self._wlock  = threading.Lock()   # 쓰기끼리만 직렬화 (메모리 갱신 + 큐 적재 순서 일치)
+        logging.info("[PositionBook] open 포지션 %d건 적재", len(self._open))
+
+    # ── 읽기 (메모리) ─────────────────────────────────────────────
+
+    def get_open_position(self, symbol: str) -> Optional[Dict]:
+        row = self._open.get(symbol)
+        return dict(row) if row else None
+
+    def list_open_positions(self) -> List[Dict]:
+        return [dict(r) for r in list(self._open.values())]
+
+    def count_open(self, strategy: Optional[str] = None) -> int:
+        """전략별(또는 전체) 보유 수."""
+        return len(self._open) if strategy is None else self._by_strategy.get(strategy, 0)
+
+    def count_open_by_sector(self) -> Dict[str, int]:
+        counts = Counter(r.get("sector") for r in list(self._open.values()))
+        return {s: n for s, n in counts.items() if s}
+
+    # ── 쓰기 (메모리 즉시 + 비동기 영속화) ────────────────────────
+
+    def open_position(
+        self,
+        symbol: str,
+        strategy: str,
+        entry_price: float,
+        qty: int,
+        sector: str = "",
+    ) -> None:
+        ts = datetime.now(timezone.utc).isoformat()
+        with self._wlock:
+            prev = self._open.get(symbol)
+            if prev:
+                self._by_strategy[prev["strategy"]] -= 1
+            self._open[symbol] = {
+                "symbol": symbol, "strategy": strategy, "entry_price": entry_price,
+                "entry_ts": ts, "peak_price": entry_price, "qty": qty, "sector": sector,
+                "status": "open", "partial_stage": 0,
+            }
+            self._by_strategy[strategy] += 1
+            fut = self.db.open_position(symbol, strategy, entry_price, qty, sector, entry_ts=ts, wait=False)
+        _wait(fut)
+
+    def update_partial_stage(self, symbol: str, stage: int, new_qty: int) -> None:
+        with self._wlock:
+            row = self._open.get(symbol)
+            if row:
+                self._open[symbol] = {**row, "partial_stage": stage, "qty": new_qty}
+            self.db.update_partial_stage(symbol, stage, new_qty)
+
+    def update_peak(self, symbol: str, new_peak: float) -> None:
+        with self._wlock:
+            row = self._open.get(symbol)
+            if not row or new_peak <= float(row["peak_price"]):
+                return
+            self._open[symbol] = {**row, "peak_price": new_peak}
+            self.db.update_peak(symbol, new_peak)
+
+    def close_position(self, symbol: str) -> None:
+        with self._wlock:
+            row = self._open.pop(symbol, None)
+            if row:
+                self._by_strategy[row["strategy"]] -= 1
+            fut = self.db.close_position(symbol, wait=False)
+        _wait(fut)
+
+    def __getattr__(self, name: str) -> Any:
+        # record_trade · 통계/일지 조회 등 — PositionDB 가 writer 큐 순서·읽기 전 flush 보장
+        return getattr(self.db, name)
+
+    def flush(self) -> None:
+        """대기 중인 쓰기가 모두 커밋될 때까지 대기."""
+        self.db.flush()
+
+    def close(self) -> None:
+        """종료 전 남은 쓰기 커밋."""
+        self.db.flush()
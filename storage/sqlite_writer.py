@@ -0,0 +1,177 @@
+# storage/sqlite_writer.py
+"""
+SQLite 단일 writer 스레드 — 쓰기 의도를 큐로 받아 그룹 커밋.
+
+PositionDB(update_peak / record_trade / update_partial_stage ...) 와 db_manager(save_trade /
+save_market_log) 가 호출마다 commit(fsync) 하던 것을, 전용 스레드가 DB 파일별 연결을 소유하고
+flush_ms 마다 또는 batch_rows 건이 쌓이면 한 트랜잭션으로 커밋한다.
+
+  - submit(path, sql, params)              : 즉시 반환 (Future — 커밋 후 lastrowid 로 resolve)
+  - submit(..., durable=True)              : 대기 중 쓰기와 함께 즉시 커밋 (open/close_position 등)
+  - submit_many(path, [(sql, params), ...]) : 여러 문장을 all-or-nothing 으로 (같은 트랜잭션 보장)
+  - flush()                                : 대기 중 쓰기 커밋까지 대기 (읽기 직전 read-your-writes)
+
+큐 순서대로 실행·커밋하므로 크래시 후에도 DB 에는 발행 순서의 접두부만 남는다.
+호출 스레드(이벤트 루프 포함)는 fsync 를 기다리지 않는다.
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional, Sequence, Tuple
+
+_FLUSH = object()   # 배리어: 대기 중 쓰기 커밋 후 resolve
+
+
+class SQLiteWriter:
+    """DB 파일별 연결을 소유하는 단일 writer 스레드."""
+
+    def __init__(self, flush_ms: float = 50.0, batch_rows: int = 200) -> None:
+        self._flush_sec  = flush_ms / 1000.0
+        self._batch_rows = batch_rows
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue()
+        self.commits = 0   # 커밋 트랜잭션 수 (그룹 커밋 효과 확인용)
+        self._thread = threading.Thread(target=self._run, name="SQLiteWriter", daemon=True)
+        self._thread.start()
+
+    # ── 호출부 API ────────────────────────────────────────────────
+
+    def submit(
+        self, path: str, sql: str, params: Sequence = (), durable: bool = False,
+    ) -> Future:
+        return self.submit_many(path, [(sql, params)], durable=durable)
+
+    def submit_many(
+        self, path: str, statements: Sequence[Tuple[str, Sequence]], durable: bool = False,
+    ) -> Future:
+        """문장 묶음 — 하나라도 실패하면 묶음 전체를 되돌린다. 마지막 문장의 lastrowid 로 resolve."""
+        fut: Future = Future()
+        if not self._thread.is_alive():
+            fut.set_exception(RuntimeError("SQLiteWriter 종료됨"))
+            return fut
+        stmts = [(sql, tuple(params)) for sql, params in statements]
+        self._queue.put((path, stmts, durable, fut))
+        return fut
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """지금까지 submit 된 쓰기가 모두 커밋될 때까지 대기."""
+        if not self._thread.is_alive() or threading.current_thread() is self._thread:
+            return
+        fut: Future = Future()
+        self._queue.put((None, _FLUSH, True, fut))
+        fut.result(timeout)
+
+    def close(self) -> None:
+        """남은 쓰기 커밋 후 스레드·연결 종료."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+    # ── writer 스레드 ─────────────────────────────────────────────
+
+    def _run(self) -> None:
+        conns: Dict[str, sqlite3.Connection] = {}
+        pending: List[Tuple[Future, Optional[int]]] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if pending else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._commit(conns, pending)
+                continue
+            if item is None:
+                self._commit(conns, pending)
+                for conn in conns.values():
+                    conn.close()
+                return
+
+            path, stmts, durable, fut = item
+            if stmts is _FLUSH:
+                pending.append((fut, None))
+            else:
+                conn = conns.get(path)
+                if conn is None:
+                    conn = conns[path] = self._connect(path)
+                self._execute(conn, stmts, fut, pending)
+            if len(pending) == 1:
+                deadline = time.monotonic() + self._flush_sec
+            if durable or len(pending) >= self._batch_rows:
+                self._commit(conns, pending)
+
+    @staticmethod
+    def _execute(conn: sqlite3.Connection, stmts: list, fut: Future, pending: list) -> None:
+        """열린 그룹 트랜잭션 안에서 savepoint 로 묶음 실행 — 실패 시 이 묶음만 되돌림."""
+        sql = stmts[0][0]
+        try:
+            if len(stmts) == 1:
+                cur = conn.execute(*stmts[0])
+            else:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN")
+                conn.execute("SAVEPOINT batch")
+                try:
+                    for sql, params in stmts:
+                        cur = conn.execute(sql, params)
+                except Exception:
+                    conn.execute("ROLLBACK TO batch")
+                    raise
+                finally:
+                    conn.execute("RELEASE batch")
+            pending.append((fut, cur.lastrowid))
+        except Exception as exc:
+            logging.error("[SQLiteWriter] 실행 실패 (%s): %s", sql.split()[0:3], exc)
+            fut.set_exception(exc)
+
+    def _commit(self, conns: Dict[str, sqlite3.Connection], pending: list) -> None:
+        if not pending:
+            return
+        error: Optional[Exception] = None
+        for path, conn in conns.items():
+            if not conn.in_transaction:
+                continue
+            try:
+                conn.commit()
+                self.commits += 1
+            except Exception as exc:
+                logging.error("[SQLiteWriter] 커밋 실패 (%s): %s", path, exc)
+                conn.rollback()
+                error = exc
+        for fut, rowid in pending:
+            if error is not None:
+                fut.set_exception(error)
+            else:
+                fut.set_result(rowid)
+        pending.clear()
+
+    @staticmethod
+    def _connect(path: str) -> sqlite3.Connection:
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA busy_timeout=5000;")
+        return conn
+
+
+_default: Optional[SQLiteWriter] = None
+_default_lock = threading.Lock()
+
+
+def get_writer() -> SQLiteWriter:
+    """프로세스 공용 writer (최초 호출 시 시작, 종료 시 남은 쓰기 커밋)."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SQLiteWriter()
+            atexit.register(_default.close)
+        return _default
+
+
+def flush_default() -> None:
+    """공용 writer 가 떠 있으면 대기 중 쓰기 커밋까지 대기."""
+    if _default is not None:
+        _default.flush()
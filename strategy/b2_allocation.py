@@ -77,14 +77,14 @@ class AllocationTarget:
 # ── 데이터 유틸 ──────────────────────────────────────────────────────
 
 def _fetch_daily(symbol: str, period: str = "60d") -> Optional[pd.DataFrame]:
-    from data.alpaca_bars import fetch_bars
+    from data.alpaca_bars import get_bars
     limit = int(period.rstrip("d")) if period.endswith("d") else 60
-    return fetch_bars(symbol, "1Day", limit)
+    return get_bars(symbol, "1Day", limit)
 
 
 def _fetch_weekly(symbol: str) -> Optional[pd.DataFrame]:
-    from data.alpaca_bars import fetch_bars
-    return fetch_bars(symbol, "1Week", 104)  # 2년 × 52주
+    from data.alpaca_bars import get_bars
+    return get_bars(symbol, "1Week", 104)  # 2년 × 52주
 
 
 def _ma20(df: pd.DataFrame) -> float:
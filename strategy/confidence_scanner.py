@@ -13,7 +13,7 @@
   < 70점: 진입 금지 (블랙리스트 등록)
 
 장 시작 전 Finviz 필터 → 장 중 Alpaca 실시간 점수 갱신.
-QQQ 기준값은 1분 캐시로 API 호출 최소화.
+QQQ 기준값은 스트림 집계 봉(bar_source) 우선, 없으면 1분 캐시 + 공용 봉 캐시로 API 호출 최소화.
 """
 from __future__ import annotations
 
@@ -170,7 +170,18 @@ class _QQQCache:
         self._ts:       float = 0.0
         self._date:     _date = _date.min
 
-    def get(self) -> float:
+    def get(self, bar_source=None) -> float:
+        """bar_source(symbol, timeframe, limit) 가 QQQ 당일 1분봉을 주면 REST 없이 계산."""
+        if bar_source is not None:
+            try:
+                df = bar_source("QQQ", "1Min", 390)
+                if df is not None and len(df) >= 2:
+                    open_px = float(df["close"].iloc[0])
+                    last_px = float(df["close"].iloc[-1])
+                    if open_px > 0:
+                        return (last_px - open_px) / open_px * 100
+            except Exception as exc:
+                logging.debug("[ConfidenceScanner] QQQ 스트림 봉 조회 실패: %s", exc)
         today = _date.today()
         if today != self._date or time.monotonic() - self._ts > _QQQ_CACHE_SECONDS:
             self._refresh(today)
@@ -178,8 +189,8 @@ class _QQQCache:
 
     def _refresh(self, today: _date) -> None:
         try:
-            from data.alpaca_bars import fetch_bars
-            df = fetch_bars("QQQ", "1Min", 390)
+            from data.alpaca_bars import get_bars
+            df = get_bars("QQQ", "1Min", 390)
             if df is not None and len(df) >= 2:
                 open_px  = float(df["close"].iloc[0])
                 last_px  = float(df["close"].iloc[-1])
@@ -228,8 +239,10 @@ class ConfidenceScanner:
     70점 미만은 자동 블랙리스트 등록.
     """
 
-    def __init__(self) -> None:
+    def __init__(self, bar_source=None) -> None:
         self.blacklist = ConfidenceBlacklist()
+        # callable(symbol, timeframe, limit) -> DataFrame | None — 스트림 집계 봉 (QQQ 기준값)
+        self.bar_source = bar_source
 
     def score(
         self,
@@ -271,7 +284,7 @@ class ConfidenceScanner:
         # ── Alpha 점수 (40점) — 나스닥(QQQ) 대비 상대 강도 ─────────
         open_px = float(df.iloc[0].get("open", price) or price)
         sym_ret = (price - open_px) / open_px * 100 if open_px > 0 else 0.0
-        qqq_ret = _qqq_cache.get()
+        qqq_ret = _qqq_cache.get(self.bar_source)
         alpha   = sym_ret - qqq_ret
         result.alpha       = round(alpha, 2)
         result.alpha_score = _tiered(alpha, _ALPHA_TIERS)
@@ -25,6 +25,7 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Callable, Dict, Optional
 
+import numpy as np
 import pandas as pd
 
 
@@ -203,37 +204,31 @@ def detect_blowoff_top(df: pd.DataFrame) -> tuple[bool, str]:
 
     try:
         recent = df.tail(5)
-        last   = recent.iloc[-1]
-        prev3  = recent.iloc[-4:-1]
-
-        hi   = float(last.get("high",  0) or 0)
-        lo   = float(last.get("low",   0) or 0)
-        op   = float(last.get("open",  0) or 0)
-        cl   = float(last.get("close", 0) or 0)
-        vol  = float(last.get("volume",0) or 0)
-
-        if hi <= lo or cl <= 0:
+        op, hi, lo, cl, vol = (
+            recent[c].to_numpy(dtype=float) if c in recent.columns else np.zeros(len(recent))
+            for c in ("open", "high", "low", "close", "volume")
+        )
+        if hi[-1] <= lo[-1] or cl[-1] <= 0 or "volume" not in recent.columns:
             return False, ""
 
         # 조건 1: 연속 상승 (최근 3봉 중 2봉 이상이 상승봉)
-        rising = sum(
-            1 for _, r in prev3.iterrows()
-            if float(r.get("close", 0) or 0) > float(r.get("open", 0) or 0)
-        )
-        cond1 = rising >= 2
+        rising = int(np.count_nonzero(cl[-4:-1] > op[-4:-1]))
+        cond1  = rising >= 2
 
-        # 조건 2: 거래량 폭발
-        avg_vol3 = float(prev3["volume"].mean() or 1)
-        cond2 = avg_vol3 > 0 and vol > avg_vol3 * 2.5
+        # 조건 2: 거래량 폭발 (직전 3봉 평균, 결측 제외)
+        prev_vol = vol[-4:-1][~np.isnan(vol[-4:-1])]
+        avg_vol3 = float((prev_vol.mean() if prev_vol.size else np.nan) or 1)
+        last_vol = float(vol[-1])
+        cond2 = avg_vol3 > 0 and last_vol > avg_vol3 * 2.5
 
         # 조건 3: 위꼬리 (close가 bar 중간값 이하) 또는 하락봉
-        midpoint = (hi + lo) / 2
-        cond3 = cl < midpoint or cl < op
+        midpoint = (hi[-1] + lo[-1]) / 2
+        cond3 = bool(cl[-1] < midpoint or cl[-1] < op[-1])
 
         conditions_met = sum([cond1, cond2, cond3])
         if conditions_met >= 2:
             reason = (
-                f"Blow-off top — 연속상승:{cond1} 거래량폭발:{cond2}({vol/avg_vol3:.1f}x) "
+                f"Blow-off top — 연속상승:{cond1} 거래량폭발:{cond2}({last_vol/avg_vol3:.1f}x) "
                 f"위꼬리/하락:{cond3} → 물량 분배 시작"
             )
             return True, reason
@@ -0,0 +1,448 @@
+# strategy/indicator_state.py
+"""
+증분 기술적 지표 엔진 — (종목, 타임프레임)별 상태를 유지하며 새 봉마다 O(1) 갱신.
+
+strategy.signals.compute_indicators 는 호출마다 전체 프레임을 다시 계산하고
+DataFrame을 여러 번 복사한다. IndicatorState 는 EMA / Wilder / 롤링 윈도 값을
+상태로 들고 있다가 봉 1개가 추가될 때 해당 항만 갱신한다.
+
+일치성:
+  - EWM 은 pandas ewm(adjust / ignore_na=False) 재귀식을 그대로 재현
+  - 롤링 합은 Kahan 보정, 롤링 분산은 Welford 갱신 (pandas rolling 과 동일 방식)
+  - 선형회귀 종단값은 고정 가중치 내적 (np.polyfit 과 수학적으로 동일)
+  → compute_indicators 마지막 행과 부동소수점 허용오차 내 일치.
+
+출력 키는 compute_indicators 컬럼명과 동일 (rsi_14, macd, atr_14, squeeze_mom, vol_ma20 …).
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_NAN = float("nan")
+
+
+def _isnan(x: float) -> bool:
+    return x != x
+
+
+# ─────────────────────────────────────────────────────────────────────
+# 구성 요소 — EWM / 롤링 평균·분산 / 롤링 최대·최소 / 선형회귀
+# ─────────────────────────────────────────────────────────────────────
+class _EWM:
+    """pandas Series.ewm(...).mean() 의 한 스텝 (ignore_na=False)."""
+
+    __slots__ = ("_factor", "_new_wt", "_adjust", "_minp",
+                 "_weighted", "_old_wt", "_nobs", "_started")
+
+    def __init__(self, alpha: float, adjust: bool = True, min_periods: int = 0) -> None:
+        self._factor   = 1.0 - alpha
+        self._new_wt   = 1.0 if adjust else alpha
+        self._adjust   = adjust
+        self._minp     = max(min_periods, 1)
+        self._weighted = _NAN
+        self._old_wt   = 1.0
+        self._nobs     = 0
+        self._started  = False
+
+    def update(self, x: float) -> float:
+        obs = not _isnan(x)
+        if not self._started:
+            self._started  = True
+            self._weighted = x
+            self._old_wt   = 1.0
+            self._nobs     = int(obs)
+        else:
+            self._nobs += int(obs)
+            if not _isnan(self._weighted):
+                self._old_wt *= self._factor
+                if obs:
+                    if self._weighted != x:
+                        self._weighted = (
+                            (self._old_wt * self._weighted + self._new_wt * x)
+                            / (self._old_wt + self._new_wt)
+                        )
+                    if self._adjust:
+                        self._old_wt += self._new_wt
+                    else:
+                        self._old_wt = 1.0
+            elif obs:
+                self._weighted = x
+        return self._weighted if self._nobs >= self._minp else _NAN
+
+    def copy(self) -> "_EWM":
+        new = _EWM.__new__(_EWM)
+        for name in _EWM.__slots__:
+            setattr(new, name, getattr(self, name))
+        return new
+
+
+class _Rolling:
+    """고정 윈도 롤링 평균 (+ 선택적 모분산 ddof=0). 윈도 내 NaN 이 있으면 NaN."""
+
+    __slots__ = ("_n", "_var", "_win", "_nobs", "_sum", "_comp", "_mean", "_ssqdm")
+
+    def __init__(self, n: int, var: bool = False) -> None:
+        self._n     = n
+        self._var   = var
+        self._win: deque = deque()
+        self._nobs  = 0
+        self._sum   = 0.0
+        self._comp  = 0.0
+        self._mean  = 0.0   # Welford 평균 (분산 계산용)
+        self._ssqdm = 0.0
+
+    def _add(self, x: float) -> None:
+        self._nobs += 1
+        y = x - self._comp
+        t = self._sum + y
+        self._comp = (t - self._sum) - y
+        self._sum  = t
+        if self._var:
+            delta = x - self._mean
+            self._mean  += delta / self._nobs
+            self._ssqdm += ((self._nobs - 1) * delta * delta) / self._nobs
+
+    def _remove(self, x: float) -> None:
+        self._nobs -= 1
+        y = -x - self._comp
+        t = self._sum + y
+        self._comp = (t - self._sum) - y
+        self._sum  = t
+        if self._var:
+            if self._nobs:
+                delta = x - self._mean
+                self._mean  -= delta / self._nobs
+                self._ssqdm -= ((self._nobs + 1) * delta * delta) / self._nobs
+            else:
+                self._mean = self._ssqdm = 0.0
+
+    def update(self, x: float) -> None:
+        if not _isnan(x):
+            self._add(x)
+        self._win.append(x)
+        if len(self._win) > self._n:
+            old = self._win.popleft()
+            if not _isnan(old):
+                self._remove(old)
+
+    @property
+    def mean(self) -> float:
+        return self._sum / self._nobs if self._nobs >= self._n else _NAN
+
+    @property
+    def std(self) -> float:
+        if self._nobs < self._n:
+            return _NAN
+        if self._nobs == 1:
+            return 0.0
+        return math.sqrt(max(self._ssqdm / self._nobs, 0.0))
+
+    def copy(self) -> "_Rolling":
+        new = _Rolling.__new__(_Rolling)
+        for name in _Rolling.__slots__:
+            setattr(new, name, getattr(self, name))
+        new._win = deque(self._win)
+        return new
+
+
+class _RollingExtreme:
+    """고정 윈도 롤링 최대/최소 — 단조 deque, 봉당 분할상환 O(1)."""
+
+    __slots__ = ("_n", "_sign", "_dq", "_flags", "_nobs", "_i")
+
+    def __init__(self, n: int, is_max: bool) -> None:
+        self._n     = n
+        self._sign  = 1.0 if is_max else -1.0
+        self._dq: deque    = deque()   # (idx, sign*value) 단조 감소
+        self._flags: deque = deque()   # 윈도 내 관측 여부
+        self._nobs  = 0
+        self._i     = -1
+
+    def update(self, x: float) -> None:
+        self._i += 1
+        obs = not _isnan(x)
+        self._flags.append(obs)
+        self._nobs += int(obs)
+        if len(self._flags) > self._n:
+            self._nobs -= int(self._flags.popleft())
+        while self._dq and self._dq[0][0] <= self._i - self._n:
+            self._dq.popleft()
+        if obs:
+            v = self._sign * x
+            while self._dq and self._dq[-1][1] <= v:
+                self._dq.pop()
+            self._dq.append((self._i, v))
+
+    @property
+    def value(self) -> float:
+        if self._nobs < self._n or not self._dq:
+            return _NAN
+        return self._sign * self._dq[0][1]
+
+    def copy(self) -> "_RollingExtreme":
+        new = _RollingExtreme.__new__(_RollingExtreme)
+        for name in _RollingExtreme.__slots__:
+            setattr(new, name, getattr(self, name))
+        new._dq    = deque(self._dq)
+        new._flags = deque(self._flags)
+        return new
+
+
+def _linreg_weights(period: int) -> Tuple[float, ...]:
+    """윈도 y 에 대한 최소제곱 직선의 종단값(x=period-1) 가중치."""
+    x     = np.arange(period, dtype=float)
+    x_bar = x.mean()
+    sxx   = float(((x - x_bar) ** 2).sum())
+    return tuple(1.0 / period + (xi - x_bar) * (period - 1 - x_bar) / sxx for xi in x)
+
+
+# ─────────────────────────────────────────────────────────────────────
+# IndicatorState
+# ─────────────────────────────────────────────────────────────────────
+class IndicatorState:
+    """
+    compute_indicators 의 증분 버전. update() 1회 = 봉 1개 = O(1).
+
+    사용:
+        st = IndicatorState.from_frame(df)       # 초기 이력 적재 (1회 O(n))
+        vals = st.update(high, low, close, volume, ts)   # 새 봉
+        vals["atr_14"], vals["vol_ma20"] ...
+    """
+
+    RSI_PERIOD = 14
+    ATR_PERIOD = 14
+    BB_PERIOD  = 20
+    BB_STD     = 2.0
+    KC_PERIOD  = 20
+    KC_MULT    = 1.5
+    MOM_PERIOD = 14
+    SMA_PERIODS = (10, 20, 50, 200)
+
+    def __init__(self) -> None:
+        rsi_a = 1.0 / self.RSI_PERIOD
+        self._gain  = _EWM(rsi_a, adjust=True, min_periods=self.RSI_PERIOD)
+        self._loss  = _EWM(rsi_a, adjust=True, min_periods=self.RSI_PERIOD)
+        self._ema12 = _EWM(2.0 / 13.0, adjust=False)
+        self._ema26 = _EWM(2.0 / 27.0, adjust=False)
+        self._sig9  = _EWM(2.0 / 10.0, adjust=False)
+        self._atr   = _EWM(1.0 / self.ATR_PERIOD, adjust=True, min_periods=self.ATR_PERIOD)
+        # Keltner: EMA(20, adjust=False) ± 1.5 × ATR(20)
+        self._kc_ema = _EWM(2.0 / (self.KC_PERIOD + 1.0), adjust=False)
+        self._kc_atr = _EWM(1.0 / self.KC_PERIOD, adjust=True, min_periods=self.KC_PERIOD)
+        self._bb     = _Rolling(self.BB_PERIOD, var=True)
+        self._smas   = {n: _Rolling(n) for n in self.SMA_PERIODS if n != self.BB_PERIOD}
+        self._sma14  = _Rolling(self.MOM_PERIOD)
+        self._vol    = _Rolling(20)
+        self._hh     = _RollingExtreme(self.MOM_PERIOD, is_max=True)
+        self._ll     = _RollingExtreme(self.MOM_PERIOD, is_max=False)
+        self._deltas: deque = deque(maxlen=self.MOM_PERIOD)
+        self._weights = _linreg_weights(self.MOM_PERIOD)
+
+        self._prev_close = _NAN
+        self._prev_on    = False
+        self._prev_mom   = _NAN
+        self._count      = 0
+        self.last_ts: Optional[int] = None     # 마지막 반영 봉 (ns epoch)
+        self.values: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    # ── 갱신 ─────────────────────────────────────────────────────────
+
+    def update(
+        self,
+        high:   float,
+        low:    float,
+        close:  float,
+        volume: float = _NAN,
+        ts=None,
+    ) -> Dict[str, float]:
+        """봉 1개 반영 후 최신 지표 dict 반환 (compute_indicators 마지막 행과 동일 키)."""
+        high, low, close, volume = float(high), float(low), float(close), float(volume)
+        pc = self._prev_close
+
+        # RSI (Wilder, com=13)
+        delta = close - pc
+        gain  = _NAN if _isnan(delta) else max(delta, 0.0)
+        loss  = _NAN if _isnan(delta) else max(-delta, 0.0)
+        avg_gain = self._gain.update(gain)
+        avg_loss = self._loss.update(loss)
+        rsi = (_NAN if _isnan(avg_gain) or _isnan(avg_loss) or avg_loss == 0.0
+               else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
+
+        # MACD 12/26/9
+        macd = self._ema12.update(close) - self._ema26.update(close)
+        sig  = self._sig9.update(macd)
+
+        # True Range — 결측 항 제외 최대값 (첫 봉은 high-low)
+        parts = [v for v in (high - low, abs(high - pc), abs(low - pc)) if not _isnan(v)]
+        tr    = max(parts) if parts else _NAN
+        atr   = self._atr.update(tr)
+
+        # Bollinger 20 / 2σ
+        self._bb.update(close)
+        bb_mid = self._bb.mean
+        bb_sd  = self._bb.std
+        bb_upper = bb_mid + self.BB_STD * bb_sd
+        bb_lower = bb_mid - self.BB_STD * bb_sd
+
+        # Keltner 20 / 1.5 ATR
+        kc_mid   = self._kc_ema.update(close)
+        kc_atr   = self._kc_atr.update(tr)
+        kc_upper = kc_mid + self.KC_MULT * kc_atr
+        kc_lower = kc_mid - self.KC_MULT * kc_atr
+
+        # TTM 스퀴즈
+        squeeze_on  = bool(bb_upper < kc_upper and bb_lower > kc_lower)
+        squeeze_off = self._prev_on and not squeeze_on
+        self._hh.update(high)
+        self._ll.update(low)
+        self._sma14.update(close)
+        midpoint = (self._hh.value + self._ll.value) / 2
+        self._deltas.append(close - (midpoint + self._sma14.mean) / 2)
+        mom = _NAN
+        if len(self._deltas) == self.MOM_PERIOD:
+            mom = math.fsum(w * y for w, y in zip(self._weights, self._deltas))
+        squeeze_rising = bool(mom > self._prev_mom)
+
+        # SMA / 거래량 평균
+        smas = {}
+        for n in self.SMA_PERIODS:
+            if n == self.BB_PERIOD:
+                smas[n] = bb_mid
+            else:
+                self._smas[n].update(close)
+                smas[n] = self._smas[n].mean
+        self._vol.update(volume)
+
+        self._prev_close = close
+        self._prev_on    = squeeze_on
+        self._prev_mom   = mom
+        self._count     += 1
+        if ts is not None:
+            self.last_ts = pd.Timestamp(ts).value
+
+        self.values = {
+            "rsi_14":         rsi,
+            "macd":           macd,
+            "macd_signal":    sig,
+            "macd_hist":      macd - sig,
+            "atr_14":         atr,
+            "squeeze_on":     squeeze_on,
+            "squeeze_off":    squeeze_off,
+            "squeeze_mom":    mom,
+            "squeeze_rising": squeeze_rising,
+            "bb_upper":       bb_upper,
+            "bb_mid":         bb_mid,
+            "bb_lower":       bb_lower,
+            "sma_10":         smas[10],
+            "sma_20":         smas[20],
+            "sma_50":         smas[50],
+            "sma_200":        smas[200],
+            "vol_ma20":       self._vol.mean,
+        }
+        return self.values
+
+    def extend(self, df: pd.DataFrame) -> int:
+        """프레임 행을 순서대로 반영. 반영한 봉 수 반환."""
+        if df is None or df.empty:
+            return 0
+        volume = df["volume"].to_numpy(float) if "volume" in df.columns else np.full(len(df), np.nan)
+        is_ts  = isinstance(df.index, pd.DatetimeIndex)
+        for ts, h, l, c, v in zip(
+            df.index, df["high"].to_numpy(float), df["low"].to_numpy(float),
+            df["close"].to_numpy(float), volume,
+        ):
+            self.update(h, l, c, v, ts if is_ts else None)
+        return len(df)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> "IndicatorState":
+        st = cls()
+        st.extend(df)
+        return st
+
+    def copy(self) -> "IndicatorState":
+        """독립 사본 — 진행 중(미확정) 봉을 상태 변경 없이 시험 반영할 때 사용."""
+        new = IndicatorState.__new__(IndicatorState)
+        new.__dict__.update(self.__dict__)
+        for name in ("_gain", "_loss", "_ema12", "_ema26", "_sig9", "_atr",
+                     "_kc_ema", "_kc_atr", "_bb", "_sma14", "_vol", "_hh", "_ll"):
+            setattr(new, name, getattr(self, name).copy())
+        new._smas   = {n: r.copy() for n, r in self._smas.items()}
+        new._deltas = self._deltas.copy()
+        new.values  = dict(self.values)
+        return new
+
+
+# ─────────────────────────────────────────────────────────────────────
+# IndicatorStore — (symbol, timeframe) → IndicatorState
+# ─────────────────────────────────────────────────────────────────────
+class IndicatorStore:
+    """
+    호출부가 넘기는 최근 봉 프레임과 상태를 맞춰 새로 마감된 봉만 반영.
+
+    - 상태의 마지막 봉이 프레임에 있으면 그 이후 행만 update
+    - 없으면 (세션 리셋·공백·비시계열 인덱스) 프레임으로 재구성
+    - partial_last=True: 마지막 행은 진행 중 봉으로 보고 사본에만 반영 (상태 불변)
+    """
+
+    def __init__(self) -> None:
+        self._states: Dict[Tuple[str, str], IndicatorState] = {}
+        self._lock = threading.Lock()
+
+    def update(
+        self,
+        symbol:       str,
+        timeframe:    str,
+        df:           Optional[pd.DataFrame],
+        partial_last: bool = True,
+    ) -> Dict[str, float]:
+        """df 반영 후 마지막 행 기준 지표 dict. df 가 비면 {}."""
+        if df is None or df.empty:
+            return {}
+        closed = df.iloc[:-1] if partial_last else df
+        if not isinstance(df.index, pd.DatetimeIndex):
+            # 타임스탬프 없이는 이어 붙일 위치를 알 수 없음 → 캐시 없이 일괄 계산
+            return IndicatorState.from_frame(df).values
+
+        key = (symbol, timeframe)
+        with self._lock:
+            st = self._states.get(key)
+            new_rows = closed
+            if st is not None and st.last_ts is not None:
+                idx = closed.index.as_unit("ns").asi8
+                pos = int(np.searchsorted(idx, st.last_ts))
+                if pos < len(idx) and idx[pos] == st.last_ts:
+                    new_rows = closed.iloc[pos + 1:]
+                else:
+                    st = None   # 이어지지 않음 (세션 리셋·공백·역행) → 재구성
+            if st is None:
+                st = IndicatorState()
+                new_rows = closed
+            st.extend(new_rows)
+            self._states[key] = st
+
+            if partial_last:
+                tail = df.iloc[-1]
+                return st.copy().update(
+                    tail["high"], tail["low"], tail["close"],
+                    tail["volume"] if "volume" in df.columns else _NAN,
+                )
+            return dict(st.values)
+
+    def get(self, symbol: str, timeframe: str) -> Optional[IndicatorState]:
+        with self._lock:
+            return self._states.get((symbol, timeframe))
+
+    def drop(self, symbol: str) -> None:
+        with self._lock:
+            for key in [k for k in self._states if k[0] == symbol]:
+                del self._states[key]
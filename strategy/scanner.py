@@ -12,6 +12,12 @@
   가격대   : $1~$20 (소형주 급등 주력 구간)
   ATR      : $0.50+ (움직임이 있어야 수익 가능)
 
+스캔 흐름 (scan_gap_candidates / iter_gap_candidates):
+  1. 60일 일봉 배치 조회 (fetch_bars_many) → 갭 · RVOL · ATR 필터 (네트워크 없음)
+  2. 통과 종목만 스레드 풀에서 참조 데이터(float · 숏 — data.reference 저장소, 장 마감 후 갱신)
+     → 뉴스 조회 — 네트워크 조회는 소스별 RateLimiter 로 초당 요청 제한
+  3. 자격을 갖춘 후보는 완료 순서대로 즉시 반환 (가장 느린 종목을 기다리지 않음)
+
 진입 타이밍:
   프리마켓  : 7:00~9:30 ET — 후보 종목 선별
   장 시작   : 9:30~10:00 ET — 첫 5분봉 확인 후 진입
@@ -21,14 +27,22 @@ from __future__ import annotations
 
 import logging
 import os
-import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 import pandas as pd
 import yfinance as yf
 
+from data.rate_limit import RateLimiter
+from data.reference import get_store
+
+# 소스별 요청 속도 (yfinance 는 종목 단건 HTTP — 과도한 동시 요청 시 429)
+SCAN_WORKERS   = 8
+_NEWS_LIMITER  = RateLimiter(rate=4.0, burst=4)   # yf.Ticker.news
+_NEWS_BONUS    = 5.0
+
 # 스캐너 기준 상수 (config.yaml으로 오버라이드 가능)
 DEFAULT_CRITERIA = {
     # ── 갭업 조건 ──────────────────────────────────────────────────
@@ -93,7 +107,8 @@ def _check_news_catalyst(symbol: str) -> tuple[bool, str]:
     Returns: (has_news, catalyst_type)
     """
     try:
-        news = yf.Ticker(symbol).news or []
+        with _NEWS_LIMITER:
+            news = yf.Ticker(symbol).news or []
         if not news:
             return False, ""
         title = (news[0].get("title") or "").lower()
@@ -152,81 +167,87 @@ def get_dynamic_universe(top_n: int = 50) -> List[str]:
     return result
 
 
-def _fetch_gap_data(symbol: str) -> Optional[GapCandidate]:
+def _fetch_info(symbol: str) -> dict:
+    """float · 숏 · 시총 참조 데이터 (저장소 조회 — 없으면 잠깐 조회 후 빈 dict)."""
+    try:
+        return get_store().get(symbol)
+    except Exception:
+        return {}
+
+
+def _gap_from_bars(symbol: str, hist: Optional[pd.DataFrame]) -> Optional[GapCandidate]:
     """
-    종목 갭업 정보 수집.
-    60일 일봉으로 진짜 20일 평균 거래량 계산.
+    일봉만으로 갭 · RVOL · ATR 계산 (네트워크 없음).
+    60일 일봉으로 진짜 20일 평균 거래량 계산. premarket_price 는 당일 봉 종가(= 조회 시점 최근 체결가).
     """
-    try:
-        from data.alpaca_bars import fetch_bars
+    if hist is None or len(hist) < 2:
+        return None
 
-        # ── 가격 데이터 (60일치 — 20일 RVOL 계산용) ─────────────
-        hist = fetch_bars(symbol, "1Day", 60)
-        if hist is None or len(hist) < 2:
-            return None
+    prev_close = float(hist["close"].iloc[-2])
+    today_open = float(hist["open"].iloc[-1])
+    today_last = float(hist["close"].iloc[-1])
+    today_vol  = float(hist["volume"].iloc[-1])
 
-        prev_close = float(hist["close"].iloc[-2])
-        today_open = float(hist["open"].iloc[-1])
-        today_vol  = float(hist["volume"].iloc[-1])
+    if prev_close <= 0:
+        return None
 
-        if prev_close <= 0:
-            return None
+    gap_pct = (today_open - prev_close) / prev_close * 100
 
-        gap_pct = (today_open - prev_close) / prev_close * 100
+    # 진짜 20일 평균 거래량 (min_periods=5 로 데이터 부족 시 최소 5일)
+    avg_vol_20 = float(
+        hist["volume"].rolling(20, min_periods=5).mean().iloc[-1]
+    )
 
-        # 진짜 20일 평균 거래량 (min_periods=5 로 데이터 부족 시 최소 5일)
-        avg_vol_20 = float(
-            hist["volume"].rolling(20, min_periods=5).mean().iloc[-1]
-        )
+    # ATR 14일 (True Range 기반)
+    if len(hist) >= 14:
+        high  = hist["high"]
+        low   = hist["low"]
+        close = hist["close"].shift(1)
+        tr    = pd.concat([
+            high - low,
+            (high - close).abs(),
+            (low  - close).abs(),
+        ], axis=1).max(axis=1)
+        atr = float(tr.rolling(14, min_periods=5).mean().iloc[-1])
+    else:
+        atr = float((hist["high"] - hist["low"]).mean())
 
-        # ── ticker.info (fundamentals — yfinance 유지) ───────────
-        info = {}
-        try:
-            info = yf.Ticker(symbol).info or {}
-        except Exception:
-            pass
-
-        float_shares  = _safe(info.get("floatShares"))
-        short_pct     = _safe(info.get("shortPercentOfFloat", 0.0)) * 100
-        short_ratio   = _safe(info.get("shortRatio"))
-        market_cap    = _safe(info.get("marketCap", 0.0)) / 1e6
-        current_price = _safe(
-            info.get("currentPrice") or info.get("regularMarketPrice") or today_open
-        )
+    rvol = today_vol / avg_vol_20 if avg_vol_20 > 0 else 0.0
 
-        # ATR 14일 (True Range 기반)
-        if len(hist) >= 14:
-            high  = hist["high"]
-            low   = hist["low"]
-            close = hist["close"].shift(1)
-            tr    = pd.concat([
-                high - low,
-                (high - close).abs(),
-                (low  - close).abs(),
-            ], axis=1).max(axis=1)
-            atr = float(tr.rolling(14, min_periods=5).mean().iloc[-1])
-        else:
-            atr = float((hist["high"] - hist["low"]).mean())
-
-        rvol = today_vol / avg_vol_20 if avg_vol_20 > 0 else 0.0
-
-        # ── 뉴스 카탈리스트 확인 ─────────────────────────────────
-        has_news, catalyst = _check_news_catalyst(symbol)
-
-        c = GapCandidate(
-            symbol          = symbol,
-            gap_pct         = round(gap_pct, 1),
-            prev_close      = round(prev_close, 2),
-            premarket_price = round(current_price, 2),
-            rvol            = round(rvol, 1),
-            float_shares    = float_shares,
-            short_pct       = round(short_pct, 1),
-            days_to_cover   = round(short_ratio, 1),
-            atr             = round(atr, 2),
-            market_cap_m    = round(market_cap, 1),
-            has_news        = has_news,
-            catalyst_type   = catalyst,
-        )
+    return GapCandidate(
+        symbol          = symbol,
+        gap_pct         = round(gap_pct, 1),
+        prev_close      = round(prev_close, 2),
+        premarket_price = round(today_last, 2),
+        rvol            = round(rvol, 1),
+        atr             = round(atr, 2),
+    )
+
+
+def _apply_info(c: GapCandidate, info: dict) -> GapCandidate:
+    """참조 데이터(float · 숏 · 시총)를 후보에 반영 — 현재가는 _gap_from_bars 의 봉 가격 그대로."""
+    c.float_shares    = _safe(info.get("floatShares"))
+    c.short_pct       = round(_safe(info.get("shortPercentOfFloat", 0.0)) * 100, 1)
+    c.days_to_cover   = round(_safe(info.get("shortRatio")), 1)
+    c.market_cap_m    = round(_safe(info.get("marketCap", 0.0)) / 1e6, 1)
+    return c
+
+
+def _fetch_gap_data(symbol: str, hist: Optional[pd.DataFrame] = None) -> Optional[GapCandidate]:
+    """
+    종목 갭업 정보 수집 (일봉 + 펀더멘털 + 뉴스, 단건).
+    hist: 배치 선조회한 일봉 (None이면 종목 단건 조회)
+    """
+    try:
+        from data.alpaca_bars import fetch_bars
+
+        if hist is None:
+            hist = fetch_bars(symbol, "1Day", 60)
+        c = _gap_from_bars(symbol, hist)
+        if c is None:
+            return None
+        _apply_info(c, _fetch_info(symbol))
+        c.has_news, c.catalyst_type = _check_news_catalyst(symbol)
         return c
     except Exception as exc:
         logging.debug("[scanner] %s 데이터 수집 실패: %s", symbol, exc)
@@ -316,74 +337,136 @@ def _score_candidate(c: GapCandidate, criteria: dict) -> float:
     return round(min(score, 100), 1)
 
 
-def _check_basic_filters(c: GapCandidate, criteria: dict) -> tuple[bool, str]:
-    """기본 필터 — 이걸 통과 못 하면 후보 제외."""
+def _check_bar_filters(c: GapCandidate, criteria: dict) -> tuple[bool, str]:
+    """일봉만으로 판단 가능한 필터 (갭 · ATR · RVOL) — 펀더멘털/뉴스 조회 전 선별."""
     if c.gap_pct < criteria.get("min_gap_pct_soft", 4.0):
         return False, f"갭업 부족 ({c.gap_pct:.1f}% < {criteria['min_gap_pct_soft']}%)"
     if c.atr < criteria.get("min_atr", 0.5):
         return False, f"ATR 부족 (${c.atr:.2f})"
+    if c.rvol < 2.0:
+        return False, f"RVOL 부족 ({c.rvol:.1f}x)"
+    return True, ""
+
+
+def _check_basic_filters(c: GapCandidate, criteria: dict) -> tuple[bool, str]:
+    """기본 필터 — 이걸 통과 못 하면 후보 제외."""
+    ok, reason = _check_bar_filters(c, criteria)
+    if not ok:
+        return False, reason
     if c.premarket_price < criteria.get("min_price", 1.0):
         return False, f"가격 부족 (${c.premarket_price:.2f})"
     if c.premarket_price > criteria.get("max_price", 50.0):
         return False, f"가격 초과 (${c.premarket_price:.2f})"
-    if c.rvol < 2.0:
-        return False, f"RVOL 부족 ({c.rvol:.1f}x)"
     return True, ""
 
 
-def scan_gap_candidates(
+def _evaluate(c: GapCandidate, crit: dict, min_score: float) -> Optional[GapCandidate]:
+    """
+    일봉 필터 통과 후보 → 펀더멘털 · 뉴스 반영 후 점수 (자격 미달이면 None).
+    뉴스 보너스를 더해도 min_score 에 못 미치면 뉴스 조회를 생략한다.
+    """
+    sym = c.symbol
+    try:
+        _apply_info(c, _fetch_info(sym))
+        ok, reason = _check_basic_filters(c, crit)
+        if not ok:
+            logging.debug("[scanner] %s 제외: %s", sym, reason)
+            return None
+
+        c.score = _score_candidate(c, crit)
+        if c.score + _NEWS_BONUS < min_score:
+            return None
+
+        c.has_news, c.catalyst_type = _check_news_catalyst(sym)
+        # 뉴스 카탈리스트 보너스 (+5점)
+        if c.has_news:
+            c.score = min(c.score + _NEWS_BONUS, 100.0)
+            c.notes.append(f"뉴스 카탈리스트: {c.catalyst_type}")
+        return c if c.score >= min_score else None
+    except Exception as exc:
+        logging.debug("[scanner] %s 데이터 수집 실패: %s", sym, exc)
+        return None
+
+
+def iter_gap_candidates(
     symbols:         List[str],
     criteria:        Optional[dict] = None,
     min_score:       float = 40.0,
-    use_dynamic:     bool  = True,   # yfinance Screener로 동적 유니버스 추가
-    dynamic_top_n:   int   = 50,     # 동적 후보 최대 수
-) -> List[GapCandidate]:
+    use_dynamic:     bool  = True,
+    dynamic_top_n:   int   = 50,
+    max_workers:     int   = SCAN_WORKERS,
+) -> Iterator[GapCandidate]:
     """
-    종목 리스트에서 갭업 급등 후보 스캔.
-    use_dynamic=True 이면 yfinance day_gainers/most_actives를 symbols에 추가.
+    갭업 후보 스트리밍 스캔 — 자격을 갖춘 후보를 완료 순서대로 yield.
 
-    Returns:
-        점수 내림차순 GapCandidate 리스트
+    일봉은 배치 1회로 받아 갭 · ATR · RVOL 로 먼저 거르고, 통과 종목만
+    스레드 풀(max_workers)에서 펀더멘털 · 뉴스를 조회한다 (소스별 RateLimiter 적용).
+    소비 측이 중간에 멈추면 대기 중인 조회는 취소된다.
     """
     crit = {**DEFAULT_CRITERIA, **(criteria or {})}
 
     # 정적 watchlist + 동적 유니버스 합산
-    all_symbols = list(symbols)
+    all_symbols = list(dict.fromkeys(symbols))
     if use_dynamic:
         dynamic = get_dynamic_universe(top_n=dynamic_top_n)
         # 중복 없이 추가
         existing = set(all_symbols)
         all_symbols += [s for s in dynamic if s not in existing]
 
-    results = []
+    # 60일 일봉 배치 선조회 — 종목당 요청 대신 묶음당 1요청
+    from data.alpaca_bars import fetch_bars_many
+    daily = fetch_bars_many(all_symbols, "1Day", 60)
+
+    pending: List[GapCandidate] = []
     for sym in all_symbols:
-        c = _fetch_gap_data(sym)
+        c = _gap_from_bars(sym, daily.get(sym))
         if c is None:
             continue
-
-        ok, reason = _check_basic_filters(c, crit)
+        ok, reason = _check_bar_filters(c, crit)
         if not ok:
             logging.debug("[scanner] %s 제외: %s", sym, reason)
             continue
+        pending.append(c)
 
-        c.score = _score_candidate(c, crit)
+    if not pending:
+        return
 
-        # 뉴스 카탈리스트 보너스 (+5점)
-        if c.has_news:
-            bonus = 5.0
-            c.score = min(c.score + bonus, 100.0)
-            c.notes.append(f"뉴스 카탈리스트: {c.catalyst_type}")
-
-        if c.score >= min_score:
-            results.append(c)
+    pool = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))),
+                              thread_name_prefix="gap-scan")
+    try:
+        futures = [pool.submit(_evaluate, c, crit, min_score) for c in pending]
+        for fut in as_completed(futures):
+            c = fut.result()
+            if c is None:
+                continue
             logging.info(
                 "[scanner] 후보: %s 갭=%+.0f%% RVOL=%.0fx Float=%.1fM 점수=%.0f%s",
-                sym, c.gap_pct, c.rvol, c.float_shares / 1e6, c.score,
+                c.symbol, c.gap_pct, c.rvol, c.float_shares / 1e6, c.score,
                 f" [{c.catalyst_type}]" if c.has_news else "",
             )
+            yield c
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
 
-        time.sleep(0.1)
 
+def scan_gap_candidates(
+    symbols:         List[str],
+    criteria:        Optional[dict] = None,
+    min_score:       float = 40.0,
+    use_dynamic:     bool  = True,   # yfinance Screener로 동적 유니버스 추가
+    dynamic_top_n:   int   = 50,     # 동적 후보 최대 수
+    max_workers:     int   = SCAN_WORKERS,
+) -> List[GapCandidate]:
+    """
+    종목 리스트에서 갭업 급등 후보 스캔 (iter_gap_candidates 전체 수집).
+    use_dynamic=True 이면 yfinance day_gainers/most_actives를 symbols에 추가.
+
+    Returns:
+        점수 내림차순 GapCandidate 리스트
+    """
+    results = list(iter_gap_candidates(
+        symbols, criteria, min_score, use_dynamic, dynamic_top_n, max_workers,
+    ))
     results.sort(key=lambda x: x.score, reverse=True)
     return results
 
@@ -604,7 +687,7 @@ def scan_short_squeeze(
     results = []
     for sym in symbols:
         try:
-            info = yf.Ticker(sym).info or {}
+            info = _fetch_info(sym)
             sp   = _safe(info.get("shortPercentOfFloat", 0.0)) * 100
             dtc  = _safe(info.get("shortRatio", 0.0))
             fl   = _safe(info.get("floatShares", 0.0))
@@ -635,7 +718,6 @@ def scan_short_squeeze(
                 "market_cap_m":  round(cap / 1e6, 1),
                 "score":         round(score, 0),
             })
-            time.sleep(0.1)
         except Exception as exc:
             logging.debug("[scanner] %s 숏스캔 실패: %s", sym, exc)
 
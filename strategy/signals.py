@@ -92,17 +92,25 @@ def compute_keltner_channel(
 # 선형 회귀 (Linear Regression) — 스퀴즈 모멘텀 방향 판단용
 # ─────────────────────────────────────────────────────────────────────
 def _linreg_series(series: pd.Series, period: int) -> pd.Series:
-    """각 바의 선형 회귀 종단값 시리즈. 스퀴즈 모멘텀 내부 사용."""
-    result = series * np.nan
-    arr    = series.values.astype(float)
-    x      = np.arange(period, dtype=float)
-    for i in range(period - 1, len(arr)):
-        y = arr[i - period + 1 : i + 1]
-        if np.isnan(y).any():
-            continue
-        slope, intercept = np.polyfit(x, y, 1)
-        result.iloc[i]   = intercept + slope * (period - 1)
-    return result
+    """
+    각 바의 선형 회귀 종단값 시리즈. 스퀴즈 모멘텀 내부 사용.
+
+    윈도마다 polyfit 대신 닫힌 해: x = 0..period-1 에 대해 롤링 Σy, Σx·y 로
+    slope = (nΣxy − ΣxΣy) / (nΣx² − (Σx)²), 종단값 = ȳ + slope·(x_end − x̄).
+    NaN 이 포함된 윈도는 합이 NaN 이 되어 그대로 NaN.
+    """
+    arr = series.to_numpy(dtype=float)
+    out = np.full(len(arr), np.nan)
+    if period > 0 and len(arr) >= period:
+        x    = np.arange(period, dtype=float)
+        win  = np.lib.stride_tricks.sliding_window_view(arr, period)
+        s_y  = win.sum(axis=1)
+        s_xy = win @ x
+        s_x  = x.sum()
+        s_xx = (x * x).sum()
+        slope = (period * s_xy - s_x * s_y) / (period * s_xx - s_x * s_x)
+        out[period - 1:] = (s_y - slope * s_x) / period + slope * (period - 1)
+    return pd.Series(out, index=series.index, name=series.name)
 
 
 # ─────────────────────────────────────────────────────────────────────
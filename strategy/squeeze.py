@@ -180,55 +180,46 @@ def is_trailing_stop_hit(current_price: float, dynamic_stop: float) -> tuple[boo
 # 매수량이 압도하는 동안 → 보유
 # 매도량이 매수량을 1.5배 이상 압도 → 분배(distribution) 시작 → 청산 준비
 # ─────────────────────────────────────────────────────────────────────
-def analyze_order_flow(df: pd.DataFrame, lookback_bars: int = 10) -> dict:
-    """
-    최근 N봉의 오더플로우 강도 분석.
+_FLOW_COLS = ("open", "high", "low", "close", "volume")
 
-    분석 방법:
-      - 봉 마감가 > 시가: 매수 주도 봉 → buy_vol += volume
-      - 봉 마감가 < 시가: 매도 주도 봉 → sell_vol += volume
-      - 봉 마감가 == 시가: 균형 봉 → 거래량 반씩 배분
 
-    Returns:
-        {
-          'buy_vol':  float,   # 매수 주도 거래량
-          'sell_vol': float,   # 매도 주도 거래량
-          'ratio':    float,   # buy_vol / sell_vol (>1 = 매수 우위)
-          'signal':   str,     # 'bullish'/'bearish'/'neutral'
-          'strength': float,   # 0~1, 신호 강도
-        }
-    """
-    if df.empty or len(df) < 2:
-        return {"buy_vol": 0, "sell_vol": 0, "ratio": 1.0, "signal": "neutral", "strength": 0.0}
+def _tail_arrays(df: pd.DataFrame, n: int) -> tuple:
+    """df 마지막 n행의 (open, high, low, close, volume) float 배열. 없는 컬럼은 0."""
+    tail = df.tail(n)
+    return tuple(
+        tail[c].to_numpy(dtype=float) if c in tail.columns else np.zeros(len(tail))
+        for c in _FLOW_COLS
+    )
 
-    recent = df.tail(lookback_bars).copy()
 
-    buy_vol  = 0.0
-    sell_vol = 0.0
+def order_flow_split(
+    op: np.ndarray, hi: np.ndarray, lo: np.ndarray, cl: np.ndarray, vol: np.ndarray,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    봉별 (매수 거래량, 매도 거래량) 추정 — 마지막 축 기준 벡터 연산.
 
-    for _, row in recent.iterrows():
-        vol   = float(row.get("volume", 0) or 0)
-        op    = float(row.get("open",  0) or 0)
-        cl    = float(row.get("close", 0) or 0)
-        hi    = float(row.get("high",  0) or 0)
-        lo    = float(row.get("low",   0) or 0)
+    클로즈 위치 비율로 매수/매도 추정 (Wyckoff 방식):
+      buy = vol × (close-low)/range,  sell = vol × (high-close)/range
+      range == 0 → 반반, volume 또는 open 이 0 인 봉은 제외(0).
+    1차원(한 종목) / 2차원(종목 × 봉) 모두 지원.
+    """
+    rng  = hi - lo
+    flat = rng == 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        buy  = np.where(flat, vol * 0.5, vol * ((cl - lo) / rng))
+        sell = np.where(flat, vol * 0.5, vol * ((hi - cl) / rng))
+    skip = (vol == 0) | (op == 0)
+    return np.where(skip, 0.0, buy), np.where(skip, 0.0, sell)
 
-        if vol == 0 or op == 0:
-            continue
 
-        candle_range = hi - lo
-        if candle_range == 0:
-            buy_vol  += vol * 0.5
-            sell_vol += vol * 0.5
-            continue
+def _seq_total(x: np.ndarray) -> np.ndarray:
+    """마지막 축 순차 합계 — 봉 순서대로 더하던 기존 루프와 동일한 반올림 결과."""
+    if x.shape[-1] == 0:
+        return np.zeros(x.shape[:-1])
+    return np.cumsum(x, axis=-1)[..., -1]
 
-        # 클로즈 위치 비율로 매수/매도 추정 (Wyckoff 방식)
-        # 고점에 가까울수록 매수 주도, 저점에 가까울수록 매도 주도
-        buy_ratio  = (cl - lo) / candle_range
-        sell_ratio = (hi - cl) / candle_range
-        buy_vol  += vol * buy_ratio
-        sell_vol += vol * sell_ratio
 
+def _flow_result(buy_vol: float, sell_vol: float) -> dict:
     total = buy_vol + sell_vol
     if total == 0:
         return {"buy_vol": 0, "sell_vol": 0, "ratio": 1.0, "signal": "neutral", "strength": 0.0}
@@ -252,6 +243,74 @@ def analyze_order_flow(df: pd.DataFrame, lookback_bars: int = 10) -> dict:
     }
 
 
+def analyze_order_flow(df: pd.DataFrame, lookback_bars: int = 10) -> dict:
+    """
+    최근 N봉의 오더플로우 강도 분석.
+
+    분석 방법 (order_flow_split):
+      - 클로즈가 고점에 가까울수록 매수 주도 → buy_vol 비중 증가
+      - 클로즈가 저점에 가까울수록 매도 주도 → sell_vol 비중 증가
+      - 고가 == 저가: 균형 봉 → 거래량 반씩 배분
+
+    Returns:
+        {
+          'buy_vol':  float,   # 매수 주도 거래량
+          'sell_vol': float,   # 매도 주도 거래량
+          'ratio':    float,   # buy_vol / sell_vol (>1 = 매수 우위)
+          'signal':   str,     # 'bullish'/'bearish'/'neutral'
+          'strength': float,   # 0~1, 신호 강도
+        }
+    """
+    if df.empty or len(df) < 2:
+        return _flow_result(0.0, 0.0)
+
+    buy, sell = order_flow_split(*_tail_arrays(df, lookback_bars))
+    return _flow_result(float(_seq_total(buy)), float(_seq_total(sell)))
+
+
+def analyze_order_flow_batch(symbol_dfs: dict, lookback_bars: int = 10) -> dict:
+    """
+    여러 종목의 오더플로우를 한 번에 분석 — {symbol: analyze_order_flow 와 동일 dict}.
+
+    각 종목의 최근 N봉을 (종목 × 봉) 행렬로 쌓아 한 번의 벡터 연산으로 계산.
+    N봉보다 짧은 종목은 앞쪽을 거래량 0 봉으로 채움 (집계에서 제외되는 봉).
+    """
+    out:  dict = {}
+    rows: list = []
+    syms: list = []
+    for sym, df in symbol_dfs.items():
+        if df is None or df.empty or len(df) < 2:
+            out[sym] = _flow_result(0.0, 0.0)
+            continue
+        syms.append(sym)
+        rows.append(_tail_arrays(df, lookback_bars))
+    if not syms:
+        return out
+
+    width = max(len(r[0]) for r in rows)
+    mat   = np.zeros((len(_FLOW_COLS), len(syms), width))
+    for i, arrs in enumerate(rows):
+        n = len(arrs[0])
+        for k, arr in enumerate(arrs):
+            mat[k, i, width - n:] = arr
+
+    buy, sell = order_flow_split(*mat)
+    for sym, b, s in zip(syms, _seq_total(buy), _seq_total(sell)):
+        out[sym] = _flow_result(float(b), float(s))
+    return out
+
+
+def _last_vol_ma(df: pd.DataFrame, period: int = 20) -> float:
+    """vol_ma20 최신값 — 이미 있으면 그대로, 없으면 마지막 period 봉 평균 (부족 시 NaN)."""
+    if "vol_ma20" in df.columns:
+        return float(df["vol_ma20"].iloc[-1])
+    if "volume" not in df.columns:
+        return 1.0
+    if len(df) < period:
+        return float("nan")
+    return float(df["volume"].iloc[-period:].to_numpy(dtype=float).mean())
+
+
 def is_distribution_detected(df: pd.DataFrame, lookback_bars: int = 5) -> tuple[bool, str]:
     """
     분배(distribution) 패턴 감지 — 고점에서 매도 세력이 매수 압도 시작.
@@ -267,17 +326,15 @@ def is_distribution_detected(df: pd.DataFrame, lookback_bars: int = 5) -> tuple[
     if flow["signal"] != "bearish":
         return False, ""
 
-    # 거래량 증가 확인 (현재 vol > 20일 평균)
-    if "vol_ma20" not in df.columns:
-        df = compute_indicators(df)
-    last   = df.iloc[-1]
-    vol    = float(last.get("volume", 0) or 0)
-    vol_ma = float(last.get("vol_ma20", 1) or 1)
+    # 거래량 증가 확인 (현재 vol > 20봉 평균) — 전체 지표 재계산 없이 마지막 20봉만
+    op, hi, lo, cl, vol_arr = _tail_arrays(df, 5)
+    vol    = float(vol_arr[-1] or 0)
+    vol_ma = float(_last_vol_ma(df) or 1)
     vol_surge = vol > vol_ma * 1.3
 
-    # 가격 정체/하락 확인 (최근 3봉 고점 대비 현재가)
-    recent_high = float(df.tail(5)["high"].max())
-    current     = float(last.get("close", 0) or recent_high)
+    # 가격 정체/하락 확인 (최근 5봉 고점 대비 현재가)
+    recent_high = float(np.nanmax(hi)) if not np.isnan(hi).all() else float("nan")
+    current     = float(cl[-1] or recent_high)
     price_stall = current < recent_high * 0.97  # 최근 고점 대비 -3% 이상 밀림
 
     if flow["ratio"] < 0.67 and vol_surge and price_stall:
@@ -584,7 +641,8 @@ def scan_squeeze_candidates(
     Returns:
         [(symbol, squeeze_mom), ...] — 모멘텀 강도 내림차순
     """
-    candidates = []
+    # 1차: 스퀴즈 조건 필터 → 2차: 통과 종목 오더플로우를 한 번에 배치 분석
+    passed: dict = {}
     for sym, df in symbol_dfs.items():
         try:
             if df is None or df.empty:
@@ -598,16 +656,23 @@ def scan_squeeze_candidates(
             sq_rise = bool(last.get("squeeze_rising", False))
 
             if (sq_on or sq_off) and sq_mom > 0 and sq_rise:
-                # 오더플로우 사전 확인 (매도 우위면 후보 제외)
-                flow = analyze_order_flow(df, lookback_bars=5)
-                if flow["signal"] == "bearish":
-                    logging.debug("[squeeze] %s 매도 우위 — 후보 제외", sym)
-                    continue
-                candidates.append((sym, sq_mom))
-                logging.info("[squeeze] 후보: %s mom=%.4f flow=%.2fx fired=%s",
-                             sym, sq_mom, flow["ratio"], sq_off)
+                passed[sym] = (df, sq_mom, sq_off)
         except Exception as exc:
             logging.debug("[squeeze] %s 스캔 실패: %s", sym, exc)
 
+    flows = analyze_order_flow_batch(
+        {sym: df for sym, (df, _, _) in passed.items()}, lookback_bars=5
+    )
+    candidates = []
+    for sym, (_, sq_mom, sq_off) in passed.items():
+        # 오더플로우 사전 확인 (매도 우위면 후보 제외)
+        flow = flows[sym]
+        if flow["signal"] == "bearish":
+            logging.debug("[squeeze] %s 매도 우위 — 후보 제외", sym)
+            continue
+        candidates.append((sym, sq_mom))
+        logging.info("[squeeze] 후보: %s mom=%.4f flow=%.2fx fired=%s",
+                     sym, sq_mom, flow["ratio"], sq_off)
+
     candidates.sort(key=lambda x: x[1], reverse=True)
     return candidates
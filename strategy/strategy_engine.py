@@ -373,7 +373,7 @@ async def run_b4_sniper_mode(
     import time as _time_mod
     import zoneinfo
     from datetime import datetime, date as _date_cls, timedelta as _td
-    from data.alpaca_bars import fetch_bars
+    from data.alpaca_bars import get_bars   # 공용 봉 캐시 경유
 
     ET      = zoneinfo.ZoneInfo("America/New_York")
     _notify = notify or (lambda _: None)
@@ -424,7 +424,7 @@ async def run_b4_sniper_mode(
         for sym in _B4_OPT_UNIVERSE:
             try:
                 df = await asyncio.wait_for(
-                    asyncio.to_thread(fetch_bars, sym, "5Min", 20 * 78),
+                    asyncio.to_thread(get_bars, sym, "5Min", 20 * 78),
                     timeout=_FETCH_TIMEOUT,
                 )
                 if df is not None and not df.empty:
@@ -441,7 +441,7 @@ async def run_b4_sniper_mode(
     async def _spot_price(underlying: str) -> float:
         try:
             df = await asyncio.wait_for(
-                asyncio.to_thread(fetch_bars, underlying, "1Min", 2),
+                asyncio.to_thread(get_bars, underlying, "1Min", 2),
                 timeout=_FETCH_TIMEOUT,
             )
             if df is not None and not df.empty:
@@ -456,7 +456,7 @@ async def run_b4_sniper_mode(
     async def _cur_5min_vol(underlying: str) -> float:
         try:
             df = await asyncio.wait_for(
-                asyncio.to_thread(fetch_bars, underlying, "5Min", 2),
+                asyncio.to_thread(get_bars, underlying, "5Min", 2),
                 timeout=_FETCH_TIMEOUT,
             )
             if df is not None and not df.empty:
@@ -0,0 +1,77 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pandas as pd
+import pytest
+
+import data.alpaca_bars as ab
+
+
+def _multi_df(symbols, n=5):
+    idx = pd.date_range("2024-01-02 14:30", periods=n, freq="1min", tz="UTC")
+    frames = []
+    for k, sym in enumerate(symbols):
+        base = 10.0 * (k + 1)
+        frames.append(pd.DataFrame({
+            "symbol":    sym,
+            "timestamp": idx,
+            "open":      [base + i for i in range(n)],
+            "high":      [base + i + 0.5 for i in range(n)],
+            "low":       [base + i - 0.5 for i in range(n)],
+            "close":     [base + i + 0.2 for i in range(n)],
+            "volume":    [1000 + i for i in range(n)],
+            "vwap":      [base + i for i in range(n)],
+        }))
+    return pd.concat(frames).set_index(["symbol", "timestamp"])
+
+
+def _fake_client():
+    client = MagicMock()
+
+    def _get_stock_bars(req):
+        syms = req.symbol_or_symbols
+        return SimpleNamespace(df=_multi_df([syms] if isinstance(syms, str) else syms))
+
+    client.get_stock_bars.side_effect = _get_stock_bars
+    return client
+
+
+def test_fetch_bars_many_splits_per_symbol(monkeypatch):
+    client = _fake_client()
+    monkeypatch.setattr(ab, "_get_client", lambda: client)
+    out = ab.fetch_bars_many(["AAA", "BBB", "AAA"], "1Min", 3)
+    assert set(out) == {"AAA", "BBB"}
+    assert client.get_stock_bars.call_count == 1
+    assert list(out["AAA"].columns) == ["open", "high", "low", "close", "volume"]
+    assert len(out["BBB"]) == 3
+    assert out["BBB"]["open"].iloc[-1] == 24.0   # tail(limit) = 마지막 3봉
+
+
+def test_fetch_bars_many_chunks_by_batch_size(monkeypatch):
+    client = _fake_client()
+    monkeypatch.setattr(ab, "_get_client", lambda: client)
+    monkeypatch.setattr(ab, "_BATCH_SYMBOLS", 2)
+    out = ab.fetch_bars_many(["A", "B", "C", "D", "E"], "1Day", 5)
+    assert client.get_stock_bars.call_count == 3
+    assert set(out) == {"A", "B", "C", "D", "E"}
+
+
+def test_fetch_bars_many_failed_chunk_is_skipped(monkeypatch):
+    client = MagicMock()
+    client.get_stock_bars.side_effect = RuntimeError("429")
+    monkeypatch.setattr(ab, "_get_client", lambda: client)
+    assert ab.fetch_bars_many(["A", "B"], "1Day", 5) == {}
+    with pytest.raises(RuntimeError):
+        ab.fetch_bars_many(["A", "B"], "1Day", 5, raise_errors=True)
+
+
+def test_single_and_batch_fetch_shapes(monkeypatch):
+    # fetch_bars: RangeIndex / fetch_bars_many: timestamp 인덱스 — 두 형식 차이 고정
+    client = _fake_client()
+    monkeypatch.setattr(ab, "_get_client", lambda: client)
+    one  = ab.fetch_bars("AAA", "1Min", 5)
+    many = ab.fetch_bars_many(["AAA"], "1Min", 5)["AAA"]
+    assert list(one.columns) == list(many.columns) == ["open", "high", "low", "close", "volume"]
+    assert isinstance(one.index, pd.RangeIndex)
+    assert isinstance(many.index, pd.DatetimeIndex) and str(many.index.tz) == "UTC"
+    assert one["close"].tolist() == many["close"].tolist()
@@ -0,0 +1,103 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pandas as pd
+
+from core.bar_aggregator import StreamBarAggregator
+
+_T0 = datetime(2024, 3, 5, 14, 30, tzinfo=timezone.utc)   # 09:30 ET
+
+
+def _bar(i, price=None, vol=100, day=0):
+    p = price if price is not None else 10.0 + i
+    return SimpleNamespace(
+        symbol="NVDA", timestamp=_T0 + timedelta(days=day, minutes=i),
+        open=p, high=p + 0.5, low=p - 0.5, close=p + 0.1, volume=vol,
+    )
+
+
+def _agg(seed=None):
+    agg = StreamBarAggregator(seeder=lambda syms, tf, n: dict(seed or {}))
+    agg.seed(["NVDA"])
+    return agg
+
+
+def test_rolls_up_five_one_minute_bars():
+    agg = _agg()
+    for i in range(5):
+        agg.on_bar("NVDA", _bar(i))
+    df = agg.bars("NVDA", "5Min", 10)
+    assert len(df) == 1
+    row = df.iloc[0]
+    assert row["open"] == 10.0
+    assert row["high"] == 14.5
+    assert row["low"] == 9.5
+    assert row["close"] == 14.1
+    assert row["volume"] == 500
+
+
+def test_partial_bucket_only_with_include_partial():
+    agg = _agg()
+    for i in range(7):
+        agg.on_bar("NVDA", _bar(i))
+    assert len(agg.bars("NVDA", "5Min", 10)) == 1
+    df = agg.bars("NVDA", "5Min", 10, include_partial=True)
+    assert len(df) == 2
+    assert df["volume"].iloc[-1] == 200
+    assert agg.last_price("NVDA") == 16.1
+
+
+def test_missing_last_minute_closes_bucket_on_next_bucket():
+    agg = _agg()
+    for i in (0, 1, 2, 5):
+        agg.on_bar("NVDA", _bar(i))
+    df = agg.bars("NVDA", "5Min", 10)
+    assert len(df) == 1 and df["close"].iloc[0] == 12.1
+
+
+def test_seed_fills_history_before_live_bars():
+    idx = pd.date_range(_T0 - timedelta(minutes=10), periods=2, freq="5min", tz="UTC")
+    hist = pd.DataFrame({"open": [1.0, 2.0], "high": [1.5, 2.5], "low": [0.5, 1.5],
+                         "close": [1.2, 2.2], "volume": [10.0, 20.0]}, index=idx)
+    agg = StreamBarAggregator(seeder=lambda syms, tf, n: {"NVDA": hist} if tf == "5Min" else {})
+    for i in range(5):
+        agg.on_bar("NVDA", _bar(i))
+    assert agg.bars("NVDA", "5Min", 10) is None      # 미시드 → None
+    agg.seed(["NVDA"])
+    df = agg.bars("NVDA", "5Min", 10)
+    assert list(df["open"]) == [1.0, 2.0, 10.0]
+
+
+def test_new_session_resets_buffers():
+    agg = _agg()
+    for i in range(5):
+        agg.on_bar("NVDA", _bar(i))
+    agg.on_bar("NVDA", _bar(0, price=50.0, day=1))
+    assert agg.bars("NVDA", "1Min", 10) is None       # 새 세션 → 재시드 필요
+    agg.seed(["NVDA"])
+    assert len(agg.bars("NVDA", "1Min", 10)) == 1
+
+
+def test_seed_skips_rest_rows_for_bucket_being_built():
+    # REST 5분봉에 스트림이 집계 중인 09:30 구간(진행 중)이 포함된 경우
+    idx = pd.date_range(_T0 - timedelta(minutes=5), periods=2, freq="5min", tz="UTC")
+    hist = pd.DataFrame({"open": [1.0, 99.0], "high": [1.5, 99.5], "low": [0.5, 98.5],
+                         "close": [1.2, 99.2], "volume": [10.0, 7.0]}, index=idx)
+    agg = StreamBarAggregator(seeder=lambda syms, tf, n: {"NVDA": hist} if tf == "5Min" else {})
+    for i in range(3):
+        agg.on_bar("NVDA", _bar(i))
+    agg.seed(["NVDA"], now=_T0 + timedelta(minutes=10))
+    for i in range(3, 5):
+        agg.on_bar("NVDA", _bar(i))
+    df = agg.bars("NVDA", "5Min", 10)
+    assert list(df["open"]) == [1.0, 10.0]
+    assert df["volume"].iloc[-1] == 500
+
+
+def test_seed_drops_unfinished_rest_bar():
+    idx = pd.date_range(_T0, periods=2, freq="5min", tz="UTC")
+    hist = pd.DataFrame({"open": [1.0, 2.0], "high": [1.5, 2.5], "low": [0.5, 1.5],
+                         "close": [1.2, 2.2], "volume": [10.0, 20.0]}, index=idx)
+    agg = StreamBarAggregator(seeder=lambda syms, tf, n: {"NVDA": hist} if tf == "5Min" else {})
+    agg.seed(["NVDA"], now=_T0 + timedelta(minutes=7))     # 09:35 구간은 아직 진행 중
+    assert list(agg.bars("NVDA", "5Min", 10)["open"]) == [1.0]
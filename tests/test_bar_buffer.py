@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+import pytest
+
+from data.bar_buffer import BarBuffer, BarBufferStore
+
+_T0 = datetime(2024, 3, 5, 14, 30, tzinfo=timezone.utc)   # 09:30 ET
+
+
+def _frame(start, n, base=100.0):
+    idx = pd.date_range(start, periods=n, freq="5min", tz="UTC")
+    return pd.DataFrame({
+        "open":   [base + i for i in range(n)],
+        "high":   [base + i + 1 for i in range(n)],
+        "low":    [base + i - 1 for i in range(n)],
+        "close":  [base + i + 0.5 for i in range(n)],
+        "volume": [1000.0] * n,
+    }, index=idx)
+
+
+class _Feed:
+    """전체 봉 시계열에서 start 이후만 돌려주는 가짜 API."""
+
+    def __init__(self, full):
+        self.full  = full
+        self.calls = []
+
+    def __call__(self, symbol, timeframe, start, limit):
+        self.calls.append(start)
+        return self.full[self.full.index >= pd.Timestamp(start)].tail(limit)
+
+
+def test_incremental_sync_fetches_only_newer_bars():
+    full = _frame(_T0, 30)
+    feed = _Feed(full.iloc[:20])
+    buf  = BarBuffer("NVDA", "5Min", maxlen=100, fetcher=feed)
+    assert buf.sync(now=_T0 + timedelta(minutes=101)) == 20
+
+    feed.full = full
+    added = buf.sync(now=_T0 + timedelta(minutes=151))
+    assert added == 10
+    assert feed.calls[-1] == buf.view().index[19].to_pydatetime()
+    pd.testing.assert_frame_equal(buf.view(), full, check_freq=False, check_names=False,
+                                  check_index_type=False)
+
+
+def test_sync_skipped_before_next_bar_close():
+    feed = _Feed(_frame(_T0, 5))
+    buf  = BarBuffer("NVDA", "5Min", fetcher=feed)
+    now  = _T0 + timedelta(minutes=26)
+    buf.sync(now=now)
+    buf.sync(now=now + timedelta(seconds=30))
+    assert len(feed.calls) == 1
+
+
+def test_trims_to_maxlen():
+    buf = BarBuffer("AMD", "5Min", maxlen=10, fetcher=lambda *a: None)
+    for i in range(35):
+        buf.append(_T0 + timedelta(minutes=5 * i), i, i + 1, i - 1, i, 100)
+    v = buf.view()
+    assert len(v) == 10
+    assert list(v["open"]) == [float(i) for i in range(25, 35)]
+
+
+def test_view_is_read_only():
+    buf = BarBuffer("AMD", "5Min", fetcher=lambda *a: None)
+    buf.extend(_frame(_T0, 5))
+    arr = buf.view()["close"].to_numpy()
+    with pytest.raises(ValueError):
+        arr[0] = 0.0
+
+
+def test_duplicate_last_bar_is_updated_not_appended():
+    buf = BarBuffer("AMD", "5Min", fetcher=lambda *a: None)
+    buf.extend(_frame(_T0, 3))
+    buf.append(_T0 + timedelta(minutes=10), 1, 2, 0.5, 1.5, 999)
+    assert len(buf) == 3
+    assert buf.view()["volume"].iloc[-1] == 999
+
+
+def test_new_session_resets_intraday_buffer():
+    feed = _Feed(_frame(_T0, 10))
+    buf  = BarBuffer("NVDA", "5Min", fetcher=feed)
+    buf.sync(now=_T0 + timedelta(minutes=60))
+    feed.full = _frame(_T0 + timedelta(days=1), 4, base=200.0)
+    buf.sync(now=_T0 + timedelta(days=1, minutes=25))
+    assert len(buf) == 4
+    assert buf.view()["open"].iloc[0] == 200.0
+
+
+def test_store_returns_none_when_empty():
+    store = BarBufferStore(fetcher=lambda *a: None)
+    assert store.bars("ZZZ", "5Min", 20) is None
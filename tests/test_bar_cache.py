@@ -0,0 +1,100 @@
+import threading
+import time
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from data.alpaca_bars import BarCache, bar_expiry
+
+
+def _bars(n):
+    return pd.DataFrame({
+        "open":   [1.0 * i for i in range(n)],
+        "high":   [1.0 * i + 1 for i in range(n)],
+        "low":    [1.0 * i - 1 for i in range(n)],
+        "close":  [1.0 * i for i in range(n)],
+        "volume": [100] * n,
+    })
+
+
+class _Fetcher:
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def __call__(self, symbol, timeframe, limit):
+        self.calls += 1
+        time.sleep(self.delay)
+        return _bars(limit)
+
+
+def test_expiry_5min_next_close():
+    now = datetime(2024, 3, 5, 15, 2, 30, tzinfo=timezone.utc)
+    assert bar_expiry("5Min", now) == datetime(2024, 3, 5, 15, 5, 5, tzinfo=timezone.utc)
+
+
+def test_expiry_5min_inside_settle_window():
+    now = datetime(2024, 3, 5, 15, 5, 2, tzinfo=timezone.utc)
+    assert bar_expiry("5Min", now) == datetime(2024, 3, 5, 15, 5, 5, tzinfo=timezone.utc)
+
+
+def test_expiry_daily_premarket_until_open():
+    now = datetime(2024, 3, 5, 13, 0, tzinfo=timezone.utc)    # 08:00 ET (화)
+    exp = bar_expiry("1Day", now)
+    assert exp == datetime(2024, 3, 5, 14, 30, 5, tzinfo=timezone.utc)
+
+
+def test_expiry_daily_friday_close_rolls_to_monday():
+    now = datetime(2024, 3, 8, 22, 0, tzinfo=timezone.utc)    # 금 17:00 ET
+    exp = bar_expiry("1Day", now)
+    assert exp == datetime(2024, 3, 11, 13, 30, 5, tzinfo=timezone.utc)  # 월 09:30 EDT
+
+
+def test_hit_serves_smaller_limit_from_larger_fetch():
+    cache, f = BarCache(), _Fetcher()
+    assert len(cache.get("NVDA", "1Day", 60, f)) == 60
+    df = cache.get("nvda", "1Day", 20, f)
+    assert len(df) == 20 and df["close"].iloc[-1] == 59.0
+    assert f.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_larger_limit_refetches():
+    cache, f = BarCache(), _Fetcher()
+    cache.get("NVDA", "1Day", 20, f)
+    cache.get("NVDA", "1Day", 60, f)
+    assert f.calls == 2
+
+
+def test_lru_evicts_oldest_over_memory_cap():
+    one = int(_bars(50).memory_usage(index=True).sum())
+    cache, f = BarCache(max_bytes=one * 2), _Fetcher()
+    for sym in ("A", "B", "C"):
+        cache.get(sym, "1Day", 50, f)
+    st = cache.stats()
+    assert st["entries"] == 2 and st["evictions"] == 1
+    cache.get("A", "1Day", 50, f)
+    assert f.calls == 4
+
+
+def test_concurrent_callers_coalesce():
+    cache, f = BarCache(), _Fetcher(delay=0.2)
+    out = []
+    threads = [
+        threading.Thread(target=lambda: out.append(cache.get("AMD", "5Min", 10, f)))
+        for _ in range(5)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert f.calls == 1
+    assert len(out) == 5 and all(len(df) == 10 for df in out)
+
+
+def test_failed_fetch_not_cached():
+    cache = BarCache()
+    assert cache.get("X", "1Day", 10, lambda *a: None) is None
+    f = _Fetcher()
+    cache.get("X", "1Day", 10, f)
+    assert f.calls == 1
@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from data.bar_store import BarStore
+
+
+def _bars(start, periods, freq="1D"):
+    idx = pd.date_range(start, periods=periods, freq=freq, tz="UTC")
+    px = np.arange(periods, dtype=float) + 100
+    return pd.DataFrame({"open": px, "high": px + 1, "low": px - 1, "close": px, "volume": 1000.0}, index=idx)
+
+
+class _Fetcher:
+    """전체 이력을 들고 있다가 start 이후만 돌려주는 가짜 API."""
+
+    def __init__(self, history):
+        self.history = history
+        self.calls = []
+
+    def __call__(self, symbols, timeframe, start):
+        self.calls.append((tuple(symbols), pd.Timestamp(start)))
+        return {s: self.history[s][self.history[s].index >= start] for s in symbols if s in self.history}
+
+
+def test_write_partitions_by_month_and_reads_back(tmp_path):
+    store = BarStore(tmp_path)
+    df = _bars("2024-01-20", 30)
+    assert store.write("nvda", "1Day", df) == 30
+    assert [p.stem for p in store.partitions("NVDA", "1Day")] == ["2024-01", "2024-02"]
+    df.index = df.index.as_unit("ns")
+    pd.testing.assert_frame_equal(store.read("NVDA", "1Day"), df, check_freq=False, check_names=False)
+
+    sub = store.read("NVDA", "1Day", start="2024-02-01", end="2024-02-05")
+    assert list(sub.index.day) == [1, 2, 3, 4, 5]
+
+
+def test_write_merges_and_overwrites_duplicates(tmp_path):
+    store = BarStore(tmp_path)
+    store.write("AMD", "1Day", _bars("2024-01-01", 10))
+    newer = _bars("2024-01-08", 5)
+    newer["close"] += 50
+    assert store.write("AMD", "1Day", newer) == 2
+    out = store.read("AMD", "1Day")
+    assert len(out) == 12
+    assert out.loc["2024-01-08", "close"].item() == 150.0
+
+
+def test_read_columns_matches_read(tmp_path):
+    store = BarStore(tmp_path)
+    store.write("TSLA", "5Min", _bars("2024-03-28 14:30", 2000, "5min"))
+    cols = store.read_columns("TSLA", "5Min", start="2024-03-30")
+    df = store.read("TSLA", "5Min", start="2024-03-30")
+    np.testing.assert_array_equal(cols["close"], df["close"].to_numpy())
+    np.testing.assert_array_equal(cols["timestamp"], df.index.tz_localize(None).to_numpy())
+
+
+def test_sync_is_incremental(tmp_path):
+    fetcher = _Fetcher({"SPY": _bars("2024-01-01", 40), "QQQ": _bars("2024-01-01", 40)})
+    store = BarStore(tmp_path, fetcher=fetcher)
+    assert store.sync(["SPY", "QQQ"], "1Day", start=pd.Timestamp("2024-01-01", tz="UTC")) == {"SPY": 40, "QQQ": 40}
+    assert len(fetcher.calls) == 1   # 같은 시작 시각 → 한 번에 배치 요청
+
+    fetcher.history = {s: _bars("2024-01-01", 45) for s in ("SPY", "QQQ")}
+    assert store.sync(["SPY", "QQQ"], "1Day", start=pd.Timestamp("2024-01-01", tz="UTC")) == {"SPY": 5, "QQQ": 5}
+    assert fetcher.calls[-1][1] == pd.Timestamp("2024-02-09", tz="UTC")   # 마지막 봉부터 재조회
+    assert len(store.read("SPY", "1Day")) == 45
+
+
+def test_gaps_and_repair(tmp_path):
+    full = _bars("2024-01-01", 60, "B")
+    holey = full.drop(full.index[10:14])            # 평일 4일 연속 누락
+    holey = holey.drop(holey.index[30])             # 하루짜리 → 휴장일로 간주
+    fetcher = _Fetcher({"IWM": holey})
+    store = BarStore(tmp_path, fetcher=fetcher)
+    start = pd.Timestamp("2024-01-01", tz="UTC")
+    store.sync(["IWM"], "1Day", start=start)
+
+    gaps = store.gaps("IWM", "1Day")
+    assert gaps == [(full.index[10], full.index[13] + pd.Timedelta(days=1))]
+
+    fetcher.history = {"IWM": full}
+    store.sync(["IWM"], "1Day", start=start, repair=True)
+    assert store.gaps("IWM", "1Day") == []
+    assert len(store.read("IWM", "1Day")) == 60
+
+
+def test_intraday_gap(tmp_path):
+    store = BarStore(tmp_path)
+    df = _bars("2024-03-05 14:30", 60, "5min")
+    store.write("MARA", "5Min", df.drop(df.index[20:30]))
+    assert store.gaps("MARA", "5Min") == [(df.index[19], df.index[30])]
+
+
+def test_sync_refreshes_forming_last_bar_and_surfaces_errors(tmp_path):
+    partial = _bars("2024-01-01", 10)
+    partial.iloc[-1, partial.columns.get_loc("volume")] = 10.0      # 저장 당시 진행 중인 마지막 봉
+    fetcher = _Fetcher({"SPY": partial})
+    store = BarStore(tmp_path, fetcher=fetcher)
+    start = pd.Timestamp("2024-01-01", tz="UTC")
+    store.sync(["SPY"], "1Day", start=start)
+
+    fetcher.history = {"SPY": _bars("2024-01-01", 12)}
+    assert store.sync(["SPY"], "1Day", start=start) == {"SPY": 2}
+    assert store.read("SPY", "1Day")["volume"].iloc[9] == 1000.0
+
+    def _down(symbols, timeframe, since):
+        raise ConnectionError("503")
+
+    store._fetcher = _down
+    with pytest.raises(RuntimeError, match="SPY"):
+        store.sync(["SPY"], "1Day", start=start)
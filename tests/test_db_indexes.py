@@ -0,0 +1,75 @@
+import sqlite3
+
+import pytest
+
+from storage.db import PositionDB
+
+_ANALYZER_SQL = """
+    SELECT symbol, strategy, sector,
+           entry_price, exit_price, qty,
+           hold_minutes, pnl, pnl_pct, exit_reason, date
+    FROM closed_trades
+    WHERE date >= date('now', '-30 days')
+    ORDER BY date DESC
+"""
+
+
+@pytest.fixture
+def db(tmp_path):
+    db = PositionDB(str(tmp_path / "trade.db"))
+    for i in range(50):
+        db.record_closed_trade(
+            f"S{i % 7}", ("squeeze", "etf_swing")[i % 2], 10.0, 10.0 + (i % 5 - 2),
+            10, f"2024-01-{i % 28 + 1:02d}T15:00:00+00:00", f"2024-01-{i % 28 + 1:02d}T16:00:00+00:00",
+            exit_reason=("stop_loss", "trailing_stop", "eod")[i % 3],
+        )
+        db.record_trade(f"S{i % 7}", "buy", 10, 10.0, "squeeze", "")
+    db._conn.execute("ANALYZE")
+    return db
+
+
+def _plan(conn: sqlite3.Connection, sql: str) -> list:
+    return [row[-1] for row in conn.execute("EXPLAIN QUERY PLAN " + sql)]
+
+
+def _captured(db: PositionDB, calls) -> list:
+    sqls: list = []
+    db._conn.set_trace_callback(sqls.append)
+    for fn in calls:
+        fn()
+    db._conn.set_trace_callback(None)
+    return [s for s in sqls if s.lstrip().upper().startswith("SELECT")]
+
+
+def test_analytics_queries_use_indexes(db):
+    sqls = _captured(db, [
+        lambda: db.get_closed_trades("2024-01-05"),
+        lambda: db.get_closed_trades(limit=20),
+        lambda: db.get_closed_trades_range("2024-01-01", "2024-01-07"),
+        lambda: db.get_strategy_stats(days=30),
+        lambda: db.get_exit_reason_stats(days=30),
+        lambda: db.get_trades("S1"),
+        lambda: db.get_trades(limit=10),
+    ]) + [_ANALYZER_SQL, "SELECT * FROM closed_trades ORDER BY exit_ts",
+          "SELECT * FROM trades ORDER BY symbol, ts"]
+    assert len(sqls) == 10
+    for sql in sqls:
+        for detail in _plan(db._conn, sql):
+            if "closed_trades" in detail or "trades" in detail:
+                assert "INDEX" in detail, (sql, detail)
+
+
+def test_stats_queries_read_rollup_by_primary_key(db):
+    for fn in (lambda: db.get_strategy_stats(days=30), lambda: db.get_exit_reason_stats(days=30)):
+        (sql,) = _captured(db, [fn])
+        plan = _plan(db._conn, sql)
+        assert any("closed_trades_rollup" in d and "INDEX" in d for d in plan), plan
+
+
+def test_migration_is_idempotent(tmp_path):
+    path = str(tmp_path / "trade.db")
+    PositionDB(path)
+    db = PositionDB(path)
+    names = {r[0] for r in db._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    assert {"idx_closed_date_exit", "idx_trades_symbol_ts"} <= names
+    assert not names & {"idx_closed_date_strategy", "idx_closed_date_reason"}
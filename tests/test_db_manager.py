@@ -0,0 +1,50 @@
+import sqlite3
+import threading
+
+import pytest
+
+import storage.db_manager as dbm
+
+
+@pytest.fixture
+def state_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(dbm, "DB_PATH", str(tmp_path / "trading_data.db"))
+    dbm.init_db()
+    return dbm.DB_PATH
+
+
+def test_connection_is_reused_per_thread(state_db):
+    assert dbm._conn() is dbm._conn()
+    other = []
+    t = threading.Thread(target=lambda: other.append(dbm._conn()))
+    t.start(); t.join()
+    assert other[0] is not dbm._conn()
+    assert dbm._conn().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_system_state_reads_are_cached_until_changed(state_db):
+    dbm.update_system_state("B4_ENABLED", "on")
+    assert dbm.get_system_state("B4_ENABLED") == "on"
+
+    cached = dbm._state_cache[state_db]
+    assert dbm.get_system_state("B4_CAPITAL", "0.30") == "0.30"
+    assert dbm._state_cache[state_db] is cached        # 변경 없으면 재적재 없음
+
+    dbm.update_system_state("B4_ENABLED", "off")        # 같은 프로세스 쓰기
+    assert dbm.get_system_state("B4_ENABLED") == "off"
+
+
+def test_external_writer_invalidates_cache(state_db):
+    dbm.update_system_state("CURRENT_MODE", "B3_AGGRESSIVE")
+    assert dbm.get_system_state("CURRENT_MODE") == "B3_AGGRESSIVE"
+
+    # 다른 프로세스(텔레그램 봇)가 직접 커밋한 경우
+    with sqlite3.connect(state_db) as ext:
+        ext.execute("INSERT OR REPLACE INTO system_state (key, value) VALUES ('CURRENT_MODE', 'B2_DEFENSIVE')")
+    assert dbm.get_system_state("CURRENT_MODE") == "B2_DEFENSIVE"
+
+
+def test_b4_cooldown_uses_pooled_connection(state_db):
+    assert dbm.is_b4_cooldown_active() is False
+    dbm.set_b4_cooldown("test", trading_days=2)
+    assert dbm.is_b4_cooldown_active() is True
@@ -0,0 +1,214 @@
+import asyncio
+import time
+
+from core.orchestrator import Orchestrator
+from core.price_snapshot import PriceSnapshot
+
+
+class _DB:
+    def __init__(self, positions):
+        self.rows = {p["symbol"]: dict(p) for p in positions}
+
+    def list_open_positions(self):
+        return list(self.rows.values())
+
+    def get_open_position(self, symbol):
+        return self.rows.get(symbol)
+
+
+def _orch(positions, concurrency=8):
+    o = Orchestrator.__new__(Orchestrator)
+    o.db = _DB(positions)
+    o._exit_concurrency = concurrency
+    o._order_locks = {}
+    o._evaluating = set()
+    o.exit_cycle_stats = {"last_sec": 0.0, "max_sec": 0.0, "cycles": 0, "slow": 0, "positions": 0}
+    o.fetched = []
+    o.prices = PriceSnapshot(lambda syms: o.fetched.append(list(syms)) or {s: 1.0 for s in syms})
+    return o
+
+
+def test_positions_are_evaluated_concurrently_and_timed():
+    o = _orch([{"symbol": f"S{i}", "qty": 10} for i in range(6)], concurrency=6)
+
+    async def slow_eval(pos, now):
+        await asyncio.sleep(0.1)
+
+    o._exit_one = slow_eval
+    t0 = time.monotonic()
+    asyncio.run(o._exit_cycle())
+    assert time.monotonic() - t0 < 0.4          # 순차면 0.6초
+    assert o.exit_cycle_stats["cycles"] == 1
+    assert o.exit_cycle_stats["positions"] == 6
+    assert 0.1 <= o.exit_cycle_stats["last_sec"] < 0.4
+    assert o.fetched == [[f"S{i}" for i in range(6)]]   # 최신가는 사이클당 배치 1회
+
+
+def test_one_symbol_failure_does_not_stop_cycle():
+    o = _orch([{"symbol": "BAD", "qty": 1}, {"symbol": "OK", "qty": 1}])
+    seen = []
+
+    async def evaluate(pos, now):
+        if pos["symbol"] == "BAD":
+            raise RuntimeError("boom")
+        seen.append(pos["symbol"])
+
+    o._exit_one = evaluate
+    asyncio.run(o._exit_cycle())
+    assert seen == ["OK"]
+
+
+def test_concurrent_exits_on_one_symbol_submit_once():
+    o = _orch([{"symbol": "NVDA", "qty": 10}])
+    sells = []
+
+    def do_exit(sym, qty, price, reason, strategy):
+        time.sleep(0.05)
+        sells.append((sym, qty, reason))
+        o.db.rows.pop(sym)
+
+    o._do_exit = do_exit
+
+    async def both():
+        return await asyncio.gather(
+            o._exit_order("NVDA", 10, 100.0, "trailing_stop", "squeeze"),
+            o._exit_order("NVDA", 10, 100.0, "spread_exit(2.0%)", "squeeze"),
+        )
+
+    assert sorted(asyncio.run(both())) == [False, True]
+    assert sells == [("NVDA", 10, "trailing_stop")]
+
+
+def test_cycle_and_tick_do_not_evaluate_one_symbol_twice():
+    o = _orch([{"symbol": "NVDA", "qty": 10}])
+    calls = []
+
+    async def slow_eval(pos, now):
+        calls.append(pos["symbol"])
+        await asyncio.sleep(0.05)
+
+    o._exit_one = slow_eval
+
+    async def both():
+        pos = o.db.get_open_position("NVDA")
+        return await asyncio.gather(o._evaluate(pos, None), o._evaluate(pos, None))
+
+    assert sorted(asyncio.run(both())) == [False, True]
+    assert calls == ["NVDA"] and o._evaluating == set()
+
+
+def test_partial_exit_rejects_stale_stage():
+    o = _orch([{"symbol": "NVDA", "qty": 10, "partial_stage": 1}])
+    sent = []
+    o._do_partial_exit = lambda sym, qty, price, stage, ratio, strat: sent.append((sym, stage))
+
+    # 다른 경로가 이미 stage 1 로 올린 뒤 stage 0 기준 판단은 제출하지 않음
+    assert not asyncio.run(o._partial_exit_order("NVDA", 10, 100.0, 1, 0.3, "squeeze", stage=0))
+    assert asyncio.run(o._partial_exit_order("NVDA", 10, 100.0, 2, 0.3, "squeeze", stage=1))
+    assert sent == [("NVDA", 2)]
+
+
+class _Broker:
+    def __init__(self, filled):
+        self.filled, self.orders = filled, []
+
+    def submit_order(self, symbol, qty, side, **kw):
+        self.orders.append((symbol, qty, side))
+        if not self.filled:
+            return {"ok": False, "reason": "not marketable"}
+        return {"ok": True, "symbol": symbol, "qty": min(qty, self.filled), "side": side, "price": 99.0}
+
+
+def test_sim_broker_gets_price_and_rejections_book_nothing():
+    from trader.paper import PaperSimBroker
+
+    o = _orch([])
+    o.broker = PaperSimBroker(cash=10_000.0)
+    assert o._submit("NVDA", 10, "buy", 100.0, type="limit", price=100.1, tif="IOC")[0] == 10
+    assert o._submit("NVDA", 5, "buy", 100.0, type="limit", price=90.0, tif="IOC") == (0, 0.0)
+    assert o.broker.positions == {"NVDA": 10}
+
+
+def test_partial_fill_books_filled_qty_only():
+    o = _orch([{"symbol": "NVDA", "qty": 10, "partial_stage": 1, "entry_price": 90.0}])
+    o.broker, stages, trades = _Broker(filled=4), [], []
+    o.db.update_partial_stage = lambda sym, stage, qty: stages.append((sym, stage, qty))
+    o.db.record_trade = lambda sym, side, qty, px, strat, reason: trades.append((side, qty, px, reason))
+    o.db.close_position = lambda sym: stages.append((sym, "closed"))
+    o._notify = lambda msg: None
+    o._do_exit("NVDA", 10, 100.0, "stop_loss", "squeeze")
+    assert stages == [("NVDA", 1, 6)] and trades == [("sell", 4, 99.0, "stop_loss_partial")]
+
+    o.broker = _Broker(filled=0)
+    o._do_exit("NVDA", 6, 100.0, "stop_loss", "squeeze")
+    assert len(stages) == 1 and len(trades) == 1
+
+
+def test_durable_entry_write_does_not_block_loop(tmp_path):
+    from storage.db import PositionDB
+    from storage.position_book import PositionBook
+    from tests.test_position_book import _GatedWriter
+
+    writer = _GatedWriter()
+    o = _orch([])
+    o.db = PositionBook(PositionDB(str(tmp_path / "trade.db"), writer=writer))
+    ticks = []
+
+    async def run():
+        entry = asyncio.create_task(o._book_entry("NVDA", "squeeze", 100.0, 10, "", "entry"))
+        for _ in range(5):                       # 커밋 대기 중에도 루프가 돈다
+            await asyncio.sleep(0.01)
+            ticks.append(entry.done())
+        writer.gate.set()
+        await asyncio.wait_for(entry, timeout=2)
+
+    asyncio.run(run())
+    assert ticks == [False] * 5
+    assert [t["reason"] for t in o.db.get_trades("NVDA")] == ["entry"]
+    writer.close()
+
+
+class _Stream:
+    def __init__(self):
+        self.aggregator = None
+
+    watch = track = hold = lambda self, syms: None
+
+    async def run(self):
+        await asyncio.sleep(0.05)
+
+
+def _stream_orch(seed):
+    from core.websocket_stream import Bucket3Stream
+
+    o = _orch([])
+    o.db.list_open_positions = lambda: []
+    o._seed_task = None
+    o._stream = type("_WS", (_Stream, Bucket3Stream), {})()
+    o.bar_agg = type("_Agg", (), {"seed": staticmethod(seed)})()
+    return o
+
+
+def test_seed_failure_is_logged(caplog):
+    def seed(syms):
+        raise RuntimeError("rest down")
+
+    o = _stream_orch(seed)
+
+    async def run():
+        await o.run_bucket3_stream(["NVDA"])
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert o._seed_task.done()
+    assert "rest down" in caplog.text
+
+
+def test_pending_seed_is_cancelled_when_stream_ends():
+    import threading
+
+    gate = threading.Event()
+    o = _stream_orch(lambda syms: gate.wait(2))
+    asyncio.run(o.run_bucket3_stream(["NVDA"]))
+    gate.set()
+    assert o._seed_task.cancelled()
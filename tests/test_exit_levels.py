@@ -0,0 +1,109 @@
+import asyncio
+
+from core.exit_levels import HARD, SOFT, ExitLevelBook
+from core.orchestrator import Orchestrator
+from core.price_snapshot import PriceSnapshot
+
+
+def _book():
+    book = ExitLevelBook()
+    book.arm("NVDA", entry=100.0, peak=100.0, atr=2.0, stop_pct=0.05, atr_mult=2.0, qty=10)
+    return book
+
+
+def test_new_high_raises_levels():
+    book = _book()
+    before = book.get("NVDA").trail
+    assert book.check("NVDA", 120.0) is None
+    lv = book.get("NVDA")
+    assert lv.peak == 120.0 and lv.trail > before
+    # 재무장 시 메모리 고점 유지
+    book.arm("NVDA", entry=100.0, peak=110.0, atr=2.0, stop_pct=0.05, atr_mult=2.0, qty=10)
+    assert book.get("NVDA").peak == 120.0
+
+
+def test_stop_breach_fires_once():
+    book = _book()
+    assert book.check("NVDA", 99.0) is None
+    kind, reason, lv = book.check("NVDA", 94.0)
+    assert (kind, reason, lv.qty) == (HARD, "stop_loss", 10)
+    assert book.check("NVDA", 93.0) is None
+
+
+def test_breakeven_trap_after_ten_percent_peak():
+    book = _book()
+    book.check("NVDA", 111.0)
+    kind, reason, _ = book.check("NVDA", 99.5)
+    assert (kind, reason) == (HARD, "breakeven_trap")
+
+
+def test_trailing_breach_is_soft():
+    book = ExitLevelBook()
+    book.arm("NVDA", entry=100.0, peak=100.0, atr=5.0, stop_pct=0.05, atr_mult=3.0, qty=10)
+    book.check("NVDA", 160.0)
+    lv = book.get("NVDA")
+    assert lv.trail > lv.stop   # 큰 수익 구간에선 가변 트레일링이 더 타이트
+    kind, reason, _ = book.check("NVDA", lv.trail - 0.01)
+    assert (kind, reason) == (SOFT, "trailing_stop")
+    assert book.get("NVDA") is not None
+
+
+class _DB:
+    def get_open_position(self, symbol):
+        return {"symbol": symbol, "qty": 10}
+
+
+def _orch():
+    o = Orchestrator.__new__(Orchestrator)
+    o._event_exits  = True
+    o.exit_levels   = _book()
+    o._level_eval_at = {}
+    o._evaluating   = set()
+    o._stream       = None
+    o.db            = _DB()
+    o.prices        = PriceSnapshot(lambda syms: {})
+    o.sent = []
+    o.evaluated = []
+
+    async def exit_order(sym, qty, price, reason, strategy):
+        o.sent.append((sym, qty, reason))
+        return True
+
+    async def exit_one(pos, now):
+        o.evaluated.append(pos["symbol"])
+
+    o._exit_order = exit_order
+    o._exit_one   = exit_one
+    return o
+
+
+def test_on_price_breakeven_trap_exits_immediately():
+    o = _orch()
+    asyncio.run(o.on_price("NVDA", 111.0))
+    assert o.sent == []
+    asyncio.run(o.on_price("NVDA", 99.5))
+    assert o.sent == [("NVDA", 10, "breakeven_trap")]
+    assert o.evaluated == []
+    assert o.prices.get("NVDA") == 99.5
+
+
+def test_on_price_stop_loss_goes_through_cycle_evaluation():
+    o = _orch()
+    asyncio.run(o.on_price("NVDA", 94.0))
+    # 손절 교차도 개미 털기 판정을 거치도록 _exit_one 재평가로 보냄
+    assert o.sent == [] and o.evaluated == ["NVDA"]
+    assert o.prices.get("NVDA") == 94.0
+
+    # 재평가 간격 안의 교차는 건너뛰되, 해제된 손절 레벨은 복원
+    o.exit_levels.arm("NVDA", entry=100.0, peak=100.0, atr=2.0, stop_pct=0.05, atr_mult=2.0, qty=10)
+    asyncio.run(o.on_price("NVDA", 93.5))
+    assert o.evaluated == ["NVDA"]
+    assert o.exit_levels.get("NVDA") is not None
+
+
+def test_on_price_skips_symbol_already_being_evaluated():
+    o = _orch()
+    o._evaluating.add("NVDA")
+    asyncio.run(o.on_price("NVDA", 94.0))
+    assert o.evaluated == [] and o.sent == []
+    assert o.exit_levels.get("NVDA") is not None
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+
+from backtest.engine import run_backtest
+from backtest.vector_engine import run_backtest_vectorized
+from tests.test_vector_engine import _MOM, _RISK, _key, _session_bars
+from trader.fill_model import FillModel
+from trader.paper import PaperSimBroker
+
+_M = FillModel(min_spread_bps=10.0, range_spread=0.1, impact=1.0, participation=0.1)
+
+
+def test_market_order_spread_impact_and_participation_cap():
+    # 고저폭 3% → 스프레드 0.3%, ask = 10.015
+    n, px = _M.fill_bars("buy", [100, 5_000, 100], 10.0, 10.2, 9.9, [10_000, 10_000, 0])
+    assert n.tolist() == [100, 1_000, 0]                 # 거래량 10% 상한 · 거래 없는 봉 미체결
+    assert px[0] == pytest.approx(10.015 * (1 + 0.003 * np.sqrt(0.01)))
+    assert px[0] < px[1] <= 10.2 and np.isnan(px[2])     # 큰 주문일수록 충격 ↑, 고가 이내
+    n, px = _M.exit_order(100, 10.0, 10.2, 9.9, 10_000)
+    assert n == 100 and 9.9 <= px < 10.0 * (1 - 0.0015)
+
+
+def test_limit_and_ioc_semantics():
+    # 비시장성 지정가: DAY 는 저가 관통 시 지정가 체결, IOC 는 취소
+    assert _M.fill_bars("buy", 100, 10.0, 10.2, 9.8, 10_000, limit=9.9)[0] == 100
+    assert _M.fill_bars("buy", 100, 10.0, 10.2, 9.8, 10_000, limit=9.9)[1] == 9.9
+    assert _M.fill_bars("buy", 100, 10.0, 10.2, 9.8, 10_000, limit=9.9, ioc=True)[0] == 0
+    assert _M.fill_bars("buy", 100, 10.0, 10.2, 9.9, 10_000, limit=9.9)[0] == 0   # 닿기만 하면 미체결
+    # ask×1.002 IOC: 충격 비용이 지정가를 넘는 수량은 미체결 (부분 체결)
+    # 고저폭 10% → 스프레드 1%: √(n/10,000) ≤ 0.2 → 400주까지
+    small, px_small = _M.entry_order(100, 10.0, 10.5, 9.5, 10_000)
+    big, px_big = _M.entry_order(1_000, 10.0, 10.5, 9.5, 10_000)
+    limit = 10.05 * 1.002
+    assert small == 100 and px_small <= limit
+    assert big == 400 and px_big == pytest.approx(limit)
+
+
+@pytest.mark.parametrize("participation", [0.1, 0.02])
+def test_engines_agree_with_fill_model(participation):
+    dfs = {f"S{i}": _session_bars(i, drop=0.1 * (i % 2)) for i in range(4)}
+    kw = dict(initial_cash=20_000.0, max_positions=3, fill_model=FillModel(participation=participation))
+    loop = run_backtest(dfs, _MOM, _RISK, **kw)
+    vec  = run_backtest_vectorized(dfs, _MOM, _RISK, **kw)
+    assert len(loop["trades"]) > 5
+    assert [_key(t) for t in vec["trades"]] == [_key(t) for t in loop["trades"]]
+    assert vec["equity_curve"].equals(loop["equity_curve"])
+
+    # 다음 봉 시가 도착 — 진입 봉 종가가 아닌 시가 + 스프레드 이상으로 체결
+    for t in loop["trades"]:
+        bar = dfs[t.symbol].loc[t.entry_ts]
+        assert t.entry_price > bar["open"]
+        assert t.qty <= np.floor(participation * bar["volume"])
+
+
+def test_paper_broker_uses_fill_model():
+    b = PaperSimBroker(cash=10_000.0)
+    b.set_price("AAA", 10.0)                              # 호가 없음 → ±5bps
+    r = b.submit_order("AAA", 100, "buy", type="limit", price=10.005 * 1.002, tif="IOC")
+    assert r["ok"] and r["qty"] == 100 and r["price"] == pytest.approx(10.005)
+    assert not b.submit_order("AAA", 10, "buy", type="limit", price=9.9, tif="DAY")["ok"]
+
+    b.set_quote("AAA", 9.99, 10.01, volume=500)          # 거래량 500 → 50주 상한
+    r = b.submit_market_order("AAA", 100, "sell")
+    assert r["status"] == "partially_filled" and r["qty"] == 50 and r["price"] < 9.99
+    assert b.list_positions() == {"AAA": 50}
+    assert b.cash == pytest.approx(10_000.0 - 100 * 10.005 + 50 * r["price"])
+
+
+def test_entry_on_last_bar_frees_slot():
+    dfs = {f"S{i}": _session_bars(i, drop=0.1 * (i % 2)) for i in range(4)}
+    first = run_backtest(dfs, _MOM, _RISK, initial_cash=20_000.0, max_positions=1)["trades"][0]
+    dfs[first.symbol] = dfs[first.symbol].loc[: first.entry_ts]      # 신호 봉이 종목 마지막 봉
+    kw = dict(initial_cash=20_000.0, max_positions=1, fill_model=FillModel())
+    loop = run_backtest(dfs, _MOM, _RISK, **kw)
+    vec  = run_backtest_vectorized(dfs, _MOM, _RISK, **kw)
+    assert loop["trades"] and all(t.symbol != first.symbol for t in loop["trades"])
+    assert [_key(t) for t in vec["trades"]] == [_key(t) for t in loop["trades"]]
+    assert vec["equity_curve"].equals(loop["equity_curve"])
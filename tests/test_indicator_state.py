@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from strategy.indicator_state import IndicatorState, IndicatorStore
+from strategy.signals import compute_indicators
+
+_FLOAT_COLS = (
+    "rsi_14", "macd", "macd_signal", "macd_hist", "atr_14", "squeeze_mom",
+    "bb_upper", "bb_mid", "bb_lower", "sma_10", "sma_20", "sma_50", "sma_200", "vol_ma20",
+)
+_BOOL_COLS = ("squeeze_on", "squeeze_off", "squeeze_rising")
+
+
+def _random_ohlcv(n=400, seed=7):
+    rng   = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    idx   = pd.date_range("2024-03-05 14:30", periods=n, freq="5min", tz="UTC")
+    return pd.DataFrame({
+        "open":   close,
+        "high":   close + rng.uniform(0, 1, n),
+        "low":    close - rng.uniform(0, 1, n),
+        "close":  close,
+        "volume": rng.uniform(1e3, 1e4, n),
+    }, index=idx)
+
+
+def test_every_bar_matches_batch_indicators():
+    df  = _random_ohlcv()
+    ref = compute_indicators(df)
+    st  = IndicatorState()
+    for i, (ts, row) in enumerate(df.iterrows()):
+        vals = st.update(row["high"], row["low"], row["close"], row["volume"], ts)
+        for col in _FLOAT_COLS:
+            expected = ref[col].iloc[i]
+            if np.isnan(expected):
+                assert np.isnan(vals[col]), (col, i)
+            else:
+                assert vals[col] == pytest.approx(expected, rel=1e-9, abs=1e-9), (col, i)
+        for col in _BOOL_COLS:
+            assert vals[col] == bool(ref[col].iloc[i]), (col, i)
+
+
+def test_store_advances_only_new_bars():
+    df    = _random_ohlcv()
+    store = IndicatorStore()
+    store.update("NVDA", "5Min", df.iloc[:200], partial_last=False)
+    st = store.get("NVDA", "5Min")
+    assert len(st) == 200
+
+    # 롤링 윈도(앞부분이 잘린 프레임)여도 마지막 상태 봉이 있으면 이어서 반영
+    vals = store.update("NVDA", "5Min", df.iloc[100:250], partial_last=False)
+    assert store.get("NVDA", "5Min") is st and len(st) == 250
+    assert vals["atr_14"] == pytest.approx(compute_indicators(df.iloc[:250])["atr_14"].iloc[-1])
+
+
+def test_store_partial_last_bar_does_not_commit():
+    df    = _random_ohlcv()
+    store = IndicatorStore()
+    vals  = store.update("NVDA", "5Min", df.iloc[:120])
+    assert len(store.get("NVDA", "5Min")) == 119
+    assert vals["vol_ma20"] == pytest.approx(df["volume"].iloc[100:120].mean())
+
+    # 진행 중 봉이 갱신돼도 확정 상태는 그대로
+    revised = df.iloc[:120].copy()
+    revised.iloc[-1, revised.columns.get_loc("volume")] = 0.0
+    store.update("NVDA", "5Min", revised)
+    assert len(store.get("NVDA", "5Min")) == 119
+
+
+def test_store_rebuilds_on_gap():
+    df    = _random_ohlcv()
+    store = IndicatorStore()
+    store.update("NVDA", "5Min", df.iloc[:100], partial_last=False)
+    vals = store.update("NVDA", "5Min", df.iloc[200:300], partial_last=False)
+    assert len(store.get("NVDA", "5Min")) == 100
+    assert vals["rsi_14"] == pytest.approx(compute_indicators(df.iloc[200:300])["rsi_14"].iloc[-1])
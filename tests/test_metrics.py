@@ -0,0 +1,82 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analyzer import compute_metrics
+from backtest.engine import BacktestTrade, run_backtest
+from backtest.metrics import (
+    daily_returns, equity_from_positions, excursions, max_drawdown_abs, max_drawdown_pct,
+    performance, position_matrix, rolling_drawdown_pct, sharpe, sortino,
+)
+from tests.test_vector_engine import _MOM, _RISK, _session_bars
+
+
+def _minute_equity():
+    """3거래일 1분봉 자산 — 일중 급락 후 회복, 일말 자산 100 → 101 → 99 → 102."""
+    parts = []
+    for day, (start, end) in zip(pd.bdate_range("2024-03-04", periods=3), [(100, 101), (101, 99), (99, 102)]):
+        idx = pd.date_range(day + pd.Timedelta(hours=14, minutes=30), periods=390, freq="1min", tz="UTC")
+        path = np.linspace(start, end, 390)
+        path[200] = start * 0.9       # 장중 -10% 스파이크
+        parts.append(pd.Series(path, index=idx))
+    return pd.concat(parts)
+
+
+def test_sharpe_uses_daily_returns():
+    eq = _minute_equity()
+    rets = daily_returns(eq)
+    assert rets.round(10).tolist() == [0.01, round(99 / 101 - 1, 10), round(102 / 99 - 1, 10)]
+    expected = rets.mean() / rets.std(ddof=1) * math.sqrt(252)
+    assert sharpe(rets) == pytest.approx(expected)
+    assert performance(eq)["sharpe"] == pytest.approx(expected)
+    downside = math.sqrt(np.mean(np.minimum(rets, 0) ** 2))
+    assert sortino(rets) == pytest.approx(rets.mean() / downside * math.sqrt(252))
+
+
+def test_intraday_and_rolling_drawdown():
+    eq = _minute_equity()
+    # 일말 기준이면 -1.98% 이지만 장중 스파이크는 -10.9%
+    assert max_drawdown_pct(eq) == pytest.approx((99 * 0.9 / 101 - 1) * 100)
+    roll = rolling_drawdown_pct(eq, window="60min")
+    # 창 안 고점 기준 — 누적 고점보다 얕지만 장중 스파이크는 잡고, 창이 지나면 0 으로 회복
+    assert max_drawdown_pct(eq) < roll.min() < -10.0 and roll.iloc[-1] == 0.0
+    assert max_drawdown_abs([5, -3, -4, 10, -1]) == -7.0
+
+
+def test_equity_from_position_matrix():
+    # 봉 3개 × 종목 2개 — 두 번째 종목은 봉 1 에 가격 없음 → 평가 제외
+    qty = position_matrix(3, 2, [0, 1, 2], [0, 1, 0], [10, 5, -10])
+    assert qty.tolist() == [[10, 0], [10, 5], [0, 5]]
+    price = np.array([[2.0, 3.0], [2.5, np.nan], [3.0, 4.0]])
+    assert equity_from_positions([80.0, 55.0, 60.0], qty, price).tolist() == [100.0, 80.0, 80.0]
+
+
+def test_excursions():
+    idx = pd.date_range("2024-03-04 14:30", periods=5, freq="5min", tz="UTC")
+    df = pd.DataFrame({"low": [9, 8, 9.5, 10, 7], "high": [10, 11, 12, 10.5, 13], "close": 10.0}, index=idx)
+    t = BacktestTrade("A", "momentum", idx[1], 10.0, 1, exit_ts=idx[3], exit_price=10.0)
+    out = excursions([t], {"A": df})
+    assert out.iloc[0].tolist() == pytest.approx([-20.0, 20.0])
+
+
+def test_backtest_result_reports_exposure_and_excursions():
+    dfs = {f"S{i}": _session_bars(i) for i in range(3)}
+    res = run_backtest(dfs, _MOM, _RISK, initial_cash=20_000.0)
+    assert 0 < res["time_in_market_pct"] <= 100 and 0 < res["exposure_pct"] <= 100
+    assert res["turnover"] > 0 and len(res["daily_returns"]) == 3
+    df = res["summary_df"]
+    assert (df["mae_pct"] <= 0).all() and (df["mfe_pct"] >= 0).all()
+
+
+def test_analyzer_daily_risk_from_trades():
+    df = pd.DataFrame({
+        "strategy": "squeeze", "pnl": [10.0, -4.0, 6.0, -12.0, 8.0],
+        "pnl_pct": [1.0, -0.4, 0.6, -1.2, 0.8], "hold_minutes": 30,
+        "date": ["2024-03-04", "2024-03-04", "2024-03-06", "2024-03-07", "2024-03-08"],
+    })
+    m = compute_metrics(df)["squeeze"]
+    day = pd.Series([6.0, 0.0, 6.0, -12.0, 8.0])       # 3/5 무거래일 0 포함
+    assert m.sharpe == round(day.mean() / day.std(ddof=1) * math.sqrt(252), 2)
+    assert m.max_drawdown == -12.0
@@ -0,0 +1,63 @@
+import time
+
+import numpy as np
+import pytest
+
+from backtest.montecarlo import bootstrap, bucket_bootstrap, format_lines
+from core.bucket_capital import BASE_WEIGHTS
+from storage.db import PositionDB
+from storage.journal import format_stats_message
+from tests.test_rollup import _seed
+
+_PNL = np.array([120.0, -80.0, 45.0, -60.0, 200.0, -150.0, 30.0, 90.0, -40.0, 10.0])
+
+
+def test_seed_is_deterministic_and_ordered():
+    a = bootstrap(_PNL, 5_000.0, paths=20_000, seed=7)
+    b = bootstrap(_PNL, 5_000.0, paths=20_000, seed=7)
+    assert a == b
+    assert a.final_lo <= a.final_med <= a.final_hi
+    assert a.mdd_tail <= a.mdd_med <= 0.0
+    # 손익 순서만 섞으므로 중앙값은 표본 합 근처
+    assert a.final_med == pytest.approx(5_000.0 + _PNL.sum(), abs=_PNL.std() * 2)
+
+
+def test_ruin_extremes():
+    win = bootstrap([10.0, 25.0, 5.0], 1_000.0, paths=5_000, seed=1)
+    assert win.ruin_prob == 0.0 and win.loss_prob == 0.0 and win.mdd_med == 0.0
+
+    # 매 거래 -100 × 10건 = -1000 → 시작 1000 의 50% 를 반드시 잃음
+    lose = bootstrap([-100.0, -120.0], 1_000.0, paths=5_000, horizon=10, seed=1)
+    assert lose.ruin_prob == 100.0 and lose.loss_prob == 100.0
+
+
+def test_chunked_matches_single_block(monkeypatch):
+    import backtest.montecarlo as mc
+
+    full = bootstrap(_PNL, 5_000.0, paths=3_000, seed=3)
+    monkeypatch.setattr(mc, "_BLOCK_CELLS", 1_000)      # 100경로씩 30묶음
+    chunked = bootstrap(_PNL, 5_000.0, paths=3_000, seed=3)
+    assert chunked.ruin_prob == full.ruin_prob
+    assert chunked.final_lo == pytest.approx(full.final_lo, rel=0.05)
+
+
+def test_100k_paths_in_seconds():
+    pnl = np.random.default_rng(0).normal(5.0, 80.0, size=120)
+    t0 = time.perf_counter()
+    res = bootstrap(pnl, 14_800.0, paths=100_000, seed=0)
+    assert time.perf_counter() - t0 < 10.0
+    assert res.paths == 100_000 and res.trades == 120
+
+
+def test_bucket_start_equity_and_stats_message(tmp_path):
+    res = bucket_bootstrap({"squeeze": _PNL, "B4": _PNL, "empty": []}, 10_000.0, paths=1_000, seed=0)
+    assert set(res) == {"squeeze", "B4"}
+    assert res["squeeze"].start_equity == 10_000.0 * BASE_WEIGHTS["squeeze"]
+    assert res["B4"].start_equity == 10_000.0
+    assert len(format_lines(res)) == 4
+
+    db = PositionDB(str(tmp_path / "trade.db"))
+    _seed(db)
+    assert "몬테카를로" not in format_stats_message(db, days=30)
+    msg = format_stats_message(db, days=30, equity=14_800.0, mc_paths=2_000)
+    assert "몬테카를로" in msg and "etf_swing" in msg and "파산확률" in msg
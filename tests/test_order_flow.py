@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from strategy.exit_strategy import detect_blowoff_top
+from strategy.squeeze import (
+    analyze_order_flow,
+    analyze_order_flow_batch,
+    is_distribution_detected,
+)
+
+
+def _bars(rows):
+    return pd.DataFrame(rows, columns=["open", "high", "low", "close", "volume"])
+
+
+def test_order_flow_close_location_split():
+    df = _bars([
+        (10, 11, 9, 10.5, 1000),    # 매수 75% / 매도 25%
+        (10, 10, 10, 10, 400),      # 고가=저가 → 반반
+        (0, 11, 9, 10, 999),        # open=0 → 제외
+    ])
+    flow = analyze_order_flow(df, lookback_bars=3)
+    assert flow["buy_vol"] == 950 and flow["sell_vol"] == 450
+    assert flow["signal"] == "bullish"
+    assert set(flow) == {"buy_vol", "sell_vol", "ratio", "signal", "strength"}
+
+
+def test_batch_matches_single_symbol():
+    rng = np.random.default_rng(1)
+    dfs = {}
+    for i, n in enumerate((1, 3, 8, 30)):
+        close = 10 + rng.normal(0, 1, n).cumsum()
+        dfs[f"S{i}"] = pd.DataFrame({
+            "open": close + rng.normal(0, 0.3, n), "high": close + 1, "low": close - 1,
+            "close": close, "volume": rng.uniform(1e3, 1e5, n),
+        })
+    dfs["NONE"] = None
+    batch = analyze_order_flow_batch(dfs, lookback_bars=5)
+    for sym, df in dfs.items():
+        expected = analyze_order_flow(df if df is not None else pd.DataFrame(), 5)
+        assert batch[sym] == expected
+
+
+def test_distribution_needs_volume_surge_and_stall():
+    calm = [(10, 10.2, 9.8, 10, 1000)] * 20
+    dump = [(10, 10.1, 9.0, 9.1, 5000)] * 5
+    ok, reason = is_distribution_detected(_bars(calm + dump))
+    assert ok and "분배 감지" in reason
+    ok, _ = is_distribution_detected(_bars(dump))      # 20봉 평균 없음 → 거래량 조건 불충족
+    assert not ok
+
+
+def test_blowoff_top_volume_spike_with_upper_wick():
+    rows = [(10, 10.5, 9.9, 10.4, 1000)] * 4 + [(10.4, 12, 10.3, 10.5, 9000)]
+    ok, reason = detect_blowoff_top(_bars(rows))
+    assert ok and "Blow-off" in reason
+    assert detect_blowoff_top(_bars(rows[:4])) == (False, "")
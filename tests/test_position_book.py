@@ -0,0 +1,93 @@
+import threading
+import time
+from concurrent.futures import Future
+
+from storage.db import PositionDB
+from storage.position_book import PositionBook
+from storage.sqlite_writer import SQLiteWriter
+
+
+def _book(tmp_path, writer=None):
+    return PositionBook(PositionDB(str(tmp_path / "trade.db"), writer=writer))
+
+
+def test_reads_are_served_from_memory_and_persisted_in_order(tmp_path):
+    writer = SQLiteWriter(flush_ms=60_000)
+    book = _book(tmp_path, writer)
+    book.open_position("NVDA", "squeeze", 100.0, 10)
+    book.open_position("SPY", "etf_swing", 500.0, 2)
+    book.update_peak("NVDA", 110.0)
+    book.update_peak("NVDA", 105.0)          # 더 낮은 고점은 무시
+    book.update_partial_stage("NVDA", 1, 7)
+    book.record_trade("NVDA", "sell", 3, 110.0, "squeeze", "partial")
+    book.close_position("SPY")
+
+    pos = book.get_open_position("NVDA")
+    assert (pos["peak_price"], pos["qty"], pos["partial_stage"]) == (110.0, 7, 1)
+    assert book.get_open_position("SPY") is None
+    assert book.count_open("squeeze") == 1 and book.count_open("etf_swing") == 0
+
+    book.flush()
+    assert book.db.get_open_position("NVDA") == pos
+    assert book.db.get_open_position("SPY") is None
+    # 위임 조회는 flush 후 실행 → 방금 쓴 체결이 보임
+    assert [t["reason"] for t in book.get_trades("NVDA")] == ["partial"]
+    writer.close()
+
+
+def test_returned_rows_are_copies(tmp_path):
+    book = _book(tmp_path)
+    book.open_position("NVDA", "squeeze", 100.0, 10)
+    book.get_open_position("NVDA")["qty"] = 0
+    book.list_open_positions()[0]["qty"] = 0
+    assert book.get_open_position("NVDA")["qty"] == 10
+    book.close()
+
+
+def test_restart_loads_open_positions(tmp_path):
+    book = _book(tmp_path)
+    book.open_position("NVDA", "squeeze", 100.0, 10, "Tech")
+    book.open_position("AMD", "squeeze", 50.0, 5, "Tech")
+    book.close_position("AMD")
+    book.close()
+
+    reloaded = _book(tmp_path)
+    assert [p["symbol"] for p in reloaded.list_open_positions()] == ["NVDA"]
+    assert reloaded.count_open("squeeze") == 1
+    assert reloaded.count_open_by_sector() == {"Tech": 1}
+    reloaded.close()
+
+
+class _GatedWriter(SQLiteWriter):
+    """durable 커밋 Future 를 gate 가 열릴 때까지 미해결로 두는 writer."""
+
+    def __init__(self):
+        super().__init__(flush_ms=60_000)
+        self.gate = threading.Event()
+
+    def submit_many(self, path, statements, durable=False):
+        fut = super().submit_many(path, statements, durable=durable)
+        if not durable:
+            return fut
+        held = Future()
+        threading.Thread(target=lambda: (self.gate.wait(), held.set_result(fut.result())),
+                         daemon=True).start()
+        return held
+
+
+def test_durable_wait_does_not_hold_write_lock(tmp_path):
+    writer = _GatedWriter()
+    book = _book(tmp_path, writer)
+    t = threading.Thread(target=book.open_position, args=("NVDA", "squeeze", 100.0, 10))
+    t.start()
+    time.sleep(0.05)
+    assert t.is_alive()                          # 커밋 대기 중
+    t0 = time.monotonic()
+    book.update_peak("NVDA", 110.0)              # 같은 락을 쓰는 쓰기가 막히지 않음
+    assert time.monotonic() - t0 < 0.05
+    fut = book.db.close_position("NVDA", wait=False)
+    assert not fut.done()
+    writer.gate.set()
+    t.join(timeout=2)
+    assert not t.is_alive() and fut.result(timeout=2) is not None
+    writer.close()
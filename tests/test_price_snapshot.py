@@ -0,0 +1,46 @@
+from core.price_snapshot import PriceSnapshot
+
+
+class _Clock:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+def test_refresh_batches_symbols_in_one_call():
+    calls = []
+
+    def fetch(symbols):
+        calls.append(list(symbols))
+        return {s: 10.0 + i for i, s in enumerate(symbols)}
+
+    snap = PriceSnapshot(fetch, clock=_Clock())
+    snap.refresh(["AAPL", "NVDA", "AAPL", "TSLA"])
+    assert calls == [["AAPL", "NVDA", "TSLA"]]
+    assert snap.get("NVDA") == 11.0
+    assert snap.get("MSFT") == 0.0          # 미조회 → 호출부 단건 폴백
+
+
+def test_stale_prices_are_rejected():
+    clock = _Clock()
+    snap  = PriceSnapshot(lambda syms: {s: 5.0 for s in syms}, max_age=15, clock=clock)
+    snap.refresh(["AMD"])
+    clock.t += 10
+    assert snap.get("AMD") == 5.0 and snap.age("AMD") == 10
+    clock.t += 10
+    assert snap.get("AMD") == 0.0
+    assert snap.get("AMD", max_age=30) == 5.0
+
+
+def test_failed_batch_and_zero_prices_are_ignored():
+    def fetch(symbols):
+        raise RuntimeError("429")
+
+    snap = PriceSnapshot(fetch, clock=_Clock())
+    assert snap.refresh(["AMD"]) == {}
+    snap.put("AMD", 0.0)
+    assert snap.get("AMD") == 0.0
+    snap.put("AMD", 7.5)
+    assert snap.get("AMD") == 7.5
@@ -0,0 +1,88 @@
+import threading
+import time
+
+from data.rate_limit import RateLimiter
+from data.reference import ReferenceStore
+
+_INFO = {"floatShares": 8e6, "shortPercentOfFloat": 0.25, "shortRatio": 6.0, "marketCap": 1.2e8,
+         "currentPrice": 4.2}
+
+
+class _Provider:
+    def __init__(self, delay: float = 0.0):
+        self.delay, self.fail, self.calls = delay, False, []
+        self.lock = threading.Lock()
+
+    def __call__(self, symbol):
+        with self.lock:
+            self.calls.append(symbol)
+        time.sleep(self.delay)
+        if self.fail:
+            raise TimeoutError("provider down")
+        return {**_INFO, "marketCap": _INFO["marketCap"] * len(self.calls)}
+
+
+def _store(tmp_path, provider, **kw):
+    return ReferenceStore(tmp_path / "ref.parquet", fetcher=provider,
+                          limiter=RateLimiter(rate=1000.0, burst=100), **kw)
+
+
+def test_refresh_persists_and_reloads(tmp_path):
+    p = _Provider()
+    s = _store(tmp_path, p)
+    assert s.refresh(["GME", "AMC", "GME", "BB"]) == 3
+    assert sorted(p.calls) == ["AMC", "BB", "GME"]
+    assert "currentPrice" not in s.get("GME")
+    s.get("GME")["floatShares"] = 0.0                # 호출부 수정이 저장값에 새지 않음
+    assert s.get("GME")["floatShares"] == 8e6
+
+    again = _store(tmp_path, _Provider())
+    assert again.symbols() == s.symbols()
+    assert again.get("AMC") == s.get("AMC")
+    assert again.age("AMC") < 60
+
+
+def test_stale_value_served_without_blocking(tmp_path):
+    p = _Provider()
+    s = _store(tmp_path, p, ttl=0.0)
+    s.refresh(["GME"])
+    old = s.get("GME", timeout=0)
+
+    p.delay = 0.5
+    t0 = time.perf_counter()
+    assert s.get("GME") == old                  # stale → 즉시 반환, 백그라운드 갱신
+    assert time.perf_counter() - t0 < 0.1
+    time.sleep(0.7)
+    assert s.get("GME")["marketCap"] > old["marketCap"]
+
+
+def test_miss_waits_only_up_to_timeout(tmp_path):
+    p = _Provider(delay=0.5)
+    s = _store(tmp_path, p, timeout=0.05)
+    t0 = time.perf_counter()
+    assert s.get("NEW") == {}
+    assert time.perf_counter() - t0 < 0.3
+    s.get("NEW")                                # 진행 중 조회와 공유 — 중복 요청 없음
+    time.sleep(0.6)
+    assert s.get("NEW")["floatShares"] == 8e6
+    assert p.calls == ["NEW"]
+
+
+def test_failed_refresh_keeps_previous_values(tmp_path):
+    p = _Provider()
+    s = _store(tmp_path, p)
+    s.refresh(["GME"])
+    before = s.get("GME")
+    p.fail = True
+    assert s.refresh(["GME"]) == 0
+    assert s.get("GME") == before
+    assert _store(tmp_path, _Provider()).get("GME") == before
+
+
+def test_put_seeds_store_without_fetch(tmp_path):
+    p = _Provider()
+    s = _store(tmp_path, p)
+    assert s.put("GME", _INFO)["floatShares"] == 8e6
+    assert s.get("GME", timeout=0)["marketCap"] == 1.2e8
+    assert s.put("GME", {}) == s.get("GME")          # 빈 info 는 기존 값 유지
+    assert p.calls == []
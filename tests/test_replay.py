@@ -0,0 +1,139 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import core.bucket_capital as bucket_mod
+import core.orchestrator as orch_mod
+import core.regime_engine as regime_mod
+from backtest.replay import (
+    HistoricalFeed, ReplayBroker, ReplayStrategy, SimClock, SqueezeReplay, _replay_env, run_replay,
+)
+
+
+def _session(day):
+    start = pd.Timestamp(f"{day} 09:30", tz="America/New_York")
+    return pd.date_range(start, periods=78, freq="5min").tz_convert("UTC")
+
+
+def _frame(idx, close, volume, first_open=None):
+    open_ = np.r_[close[0] if first_open is None else first_open, close[:-1]]
+    return pd.DataFrame({"open": open_, "high": np.maximum(open_, close) * 1.002,
+                         "low": np.minimum(open_, close) * 0.998, "close": close,
+                         "volume": volume}, index=idx)
+
+
+def _gap_day_bars():
+    """20일 횡보 후 +29% 갭업 · 10시 30분 거래량 폭발 · 11시 이후 하락하는 B3 종목 + 평평한 QQQ."""
+    days = pd.bdate_range("2024-05-01", periods=21)
+    sqz, qqq = [], []
+    for i, d in enumerate(days):
+        idx = _session(d.date())
+        if i < 20:
+            sqz.append(_frame(idx, np.full(78, 10.0), np.full(78, 1000.0)))
+        else:
+            k = np.arange(78)
+            close = 13.0 * 1.01 ** np.minimum(k, 30) * 0.97 ** np.maximum(k - 30, 0)
+            vol = np.full(78, 20_000.0)
+            vol[12] = 2_000_000
+            sqz.append(_frame(idx, close, vol, first_open=13.0 / 1.01))
+        qqq.append(_frame(idx, np.full(78, 400.0), np.full(78, 1e5)))
+    return {"SQZ": pd.concat(sqz), "QQQ": pd.concat(qqq)}, days[-1]
+
+
+def test_feed_hides_unclosed_bars_and_builds_partial_day():
+    dfs, last_day = _gap_day_bars()
+    clock = SimClock()
+    feed = HistoricalFeed(dfs, clock, base="5Min")
+    now = pd.Timestamp(f"{last_day.date()} 10:02", tz="America/New_York")
+    clock.set(now.to_pydatetime())
+
+    five = feed.bars("SQZ", "5Min", 500)
+    assert five.index[-1] + pd.Timedelta("5min") <= now
+    assert feed.last("SQZ") == five["close"].iloc[-1]
+
+    today = dfs["SQZ"].loc[pd.Timestamp(f"{last_day.date()}", tz="America/New_York"):now - pd.Timedelta("5min")]
+    daily = feed.bars("SQZ", "1Day", 25)
+    assert len(daily) == 21
+    assert daily.iloc[-1].tolist() == [today["open"].iloc[0], today["high"].max(), today["low"].min(),
+                                       today["close"].iloc[-1], today["volume"].sum()]
+    assert daily.iloc[-2]["close"] == 10.0
+
+    session = feed.bars("SQZ", "5Min", 60, session=True)
+    assert len(session) == len(today) == 6
+    assert feed.bars("SQZ", "1Min", 10) is None
+
+
+def test_clock_is_simulated_only_inside_replay():
+    dfs, _ = _gap_day_bars()
+    clock = SimClock()
+    feed = HistoricalFeed(dfs, clock, base="5Min")
+    sim = datetime(2024, 5, 29, 15, 0, tzinfo=timezone.utc)
+    clock.set(sim)
+    with _replay_env(feed, regime="bull", vix=15.0):
+        assert orch_mod.datetime.now(timezone.utc) == sim
+        assert orch_mod.time.monotonic() == sim.timestamp()
+        assert bucket_mod._date.today() == clock.today()
+        assert regime_mod.datetime.now(timezone.utc) == sim
+        assert regime_mod._date.today() == clock.today()
+    assert orch_mod.datetime is datetime
+    assert regime_mod.datetime is datetime
+    assert abs(orch_mod.datetime.now(timezone.utc) - datetime.now(timezone.utc)).total_seconds() < 5
+
+
+def test_replay_strategy_requires_on_step():
+    with pytest.raises(TypeError):
+        ReplayStrategy()
+
+    class _Noop(ReplayStrategy):
+        async def on_step(self, orch, now, new_bars):
+            return None
+
+    assert _Noop().name == ""
+
+
+def test_squeeze_replay_runs_orchestrator_decisions():
+    dfs, last_day = _gap_day_bars()
+    calls = []
+
+    class Probe(ReplayStrategy):
+        async def on_step(self, orch, now, new_bars):
+            calls.append((now, sorted(new_bars), orch._is_tradeable()))
+
+    start = pd.Timestamp(f"{last_day.date()}", tz="America/New_York")
+    res = run_replay(dfs, {}, [SqueezeReplay(["SQZ"]), Probe()], base="5Min", trade_from=start)
+
+    fills = res["fills"]
+    assert fills["side"].tolist()[0] == "buy"
+    assert fills["reason"].iloc[0].startswith("Gap&Go")
+    assert fills["ts"].iloc[0] == pd.Timestamp(f"{last_day.date()} 10:35", tz="America/New_York")
+    assert fills["qty"][fills["side"] == "buy"].sum() == fills["qty"][fills["side"] == "sell"].sum()
+    assert len(res["trades"]) >= 1 and all(t.strategy == "squeeze" and t.exit_reason for t in res["trades"])
+
+    eq = res["equity_curve"]
+    assert len(eq) == len(calls) == 78
+    assert eq.iloc[-1] - 14_800.0 == pytest.approx(res["summary_df"]["pnl"].sum())
+    assert calls[0][1] == ["QQQ", "SQZ"]
+    assert [c[2] for c in calls[:3]] == [True, True, True]   # 9:35~ 정규장
+    assert not any(c[2] for c in calls if 11 * 60 + 30 < _et_minutes(c[0]) < 13 * 60)   # 데드존
+
+
+def test_broker_fills_limits_at_bar_price_or_rejects():
+    dfs, last_day = _gap_day_bars()
+    clock = SimClock()
+    clock.set(pd.Timestamp(f"{last_day.date()} 10:02", tz="America/New_York").to_pydatetime())
+    broker = ReplayBroker(HistoricalFeed(dfs, clock, base="5Min"), cash=10_000.0)
+    last = broker.feed.last("SQZ")
+
+    assert broker.submit_order("SQZ", 10, "buy", type="limit", price=last * 0.99)["ok"] is False
+    r = broker.submit_order("SQZ", 10, "buy", type="limit", price=last * 1.01)
+    assert r["ok"] and r["price"] == last and broker.cash == pytest.approx(10_000.0 - 10 * last)
+    assert broker.submit_order("SQZ", 10, "sell", type="limit", price=last * 1.01)["ok"] is False
+    assert broker.submit_order("SQZ", 10, "sell", type="limit", price=last * 0.99)["price"] == last
+    assert broker.trades[-1].exit_price == last and not broker.qty
+
+
+def _et_minutes(now):
+    et = pd.Timestamp(now).tz_convert("America/New_York")
+    return et.hour * 60 + et.minute
@@ -0,0 +1,115 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import stats
+from analyzer import compute_metrics, load_rollup_metrics
+from storage.db import PositionDB
+from storage.sqlite_writer import SQLiteWriter
+
+_TODAY = pd.Timestamp.now(tz="UTC").normalize()
+
+
+def _seed(db: PositionDB, n: int = 60) -> None:
+    for i in range(n):
+        day   = (_TODAY - pd.Timedelta(days=i % 9)).strftime("%Y-%m-%d")
+        entry = 10.0 + i % 4
+        db.record_closed_trade(
+            f"S{i % 7}", ("squeeze", "etf_swing", "value_long")[i % 3], entry,
+            entry + (i % 7 - 3) * 0.37, 5 + i % 11,
+            f"{day}T14:00:00+00:00", f"{day}T14:{i % 50 + 5:02d}:00+00:00",
+            exit_reason=("stop_loss", "trailing_stop", "eod", "target")[i % 4],
+        )
+
+
+@pytest.fixture(params=[False, True], ids=["direct", "writer"])
+def db(tmp_path, request):
+    writer = SQLiteWriter() if request.param else None
+    db = PositionDB(str(tmp_path / "trade.db"), writer=writer)
+    _seed(db)
+    db.flush()
+    yield db
+    if writer:
+        writer.close()
+
+
+def _raw(db: PositionDB) -> pd.DataFrame:
+    return pd.read_sql("SELECT * FROM closed_trades", db._conn)
+
+
+def test_rollup_matches_raw_aggregation(db):
+    df = _raw(db)
+    rows = {r["strategy"]: r for r in db.get_rollup(by=("strategy",))}
+    assert set(rows) == set(df["strategy"])
+    for strat, grp in df.groupby("strategy"):
+        r = rows[strat]
+        wins, losses = grp[grp["pnl"] > 0], grp[grp["pnl"] <= 0]
+        assert r["total"] == len(grp)
+        assert r["wins"] == len(wins) and r["losses"] == len(losses)
+        assert r["total_pnl"] == pytest.approx(grp["pnl"].sum())
+        assert r["avg_pnl_pct"] == pytest.approx(grp["pnl_pct"].mean())
+        assert r["avg_win_pct"] == pytest.approx(wins["pnl_pct"].mean())
+        assert r["avg_loss_pct"] == pytest.approx(losses["pnl_pct"].mean())
+        assert r["std_pnl_pct"] == pytest.approx(grp["pnl_pct"].std(ddof=0))
+        assert r["avg_hold_min"] == pytest.approx(grp["hold_minutes"].mean())
+        assert r["best_pct"] == pytest.approx(grp["pnl_pct"].max())
+        assert r["worst_pct"] == pytest.approx(grp["pnl_pct"].min())
+        assert r["profit_factor"] == pytest.approx(
+            grp.loc[grp["pnl"] > 0, "pnl"].sum() / -grp.loc[grp["pnl"] < 0, "pnl"].sum()
+        )
+
+
+def test_reporting_paths_match_raw(db):
+    df = _raw(db)
+    for strat, grp in df.groupby("strategy"):
+        r = db.get_rollup(by=("strategy",), strategy=strat)[0]
+        fast, slow = stats.bucket_report_from_rollup(r, strat), stats.bucket_report(grp, strat)
+        # 롤업 기대값은 거래당 평균 손익 — 본전(pnl=0) 거래를 패로 셈하는 원본 공식과만 다름
+        assert fast.pop("expectancy") == round(grp["pnl"].mean(), 2)
+        slow.pop("expectancy")
+        assert fast == slow
+
+    db.flush()
+    assert load_rollup_metrics(db._path, days=30) == compute_metrics(df)
+
+    daily = {r["date"]: r["total"] for r in db.get_rollup(by=("date",))}
+    assert daily == df.groupby("date").size().to_dict()
+
+
+def test_backfill_on_existing_db(tmp_path):
+    path = str(tmp_path / "trade.db")
+    db = PositionDB(path)
+    _seed(db, 30)
+    expected = db.get_rollup(by=("date", "strategy", "exit_reason"))
+    db._conn.execute("DELETE FROM closed_trades_rollup")
+    db._conn.commit()
+    db._conn.close()
+
+    reopened = PositionDB(path)
+    assert reopened.get_rollup(by=("date", "strategy", "exit_reason")) == expected
+
+
+def test_closed_trade_and_rollup_commit_together(tmp_path):
+    path = str(tmp_path / "trade.db")
+    PositionDB(path)._conn.close()
+    writer = SQLiteWriter()
+    try:
+        fut = writer.submit_many(path, [
+            ("INSERT INTO closed_trades (symbol, strategy, entry_price, exit_price, qty, "
+             "entry_ts, exit_ts, date) VALUES ('X', 'squeeze', 1, 2, 1, '', '', '2024-01-01')", ()),
+            ("INSERT INTO no_such_table VALUES (1)", ()),
+        ])
+        ok = writer.submit(
+            path,
+            "INSERT INTO closed_trades (symbol, strategy, entry_price, exit_price, qty, "
+            "entry_ts, exit_ts, date) VALUES ('Y', 'squeeze', 1, 2, 1, '', '', '2024-01-01')",
+        )
+        with pytest.raises(sqlite3.OperationalError):
+            fut.result(5)
+        ok.result(5)
+    finally:
+        writer.close()
+    conn = sqlite3.connect(path)
+    assert conn.execute("SELECT symbol FROM closed_trades").fetchall() == [("Y",)]
+    conn.close()
@@ -0,0 +1,98 @@
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data.alpaca_bars as ab
+import data.reference as ref
+import strategy.scanner as sc
+from data.rate_limit import RateLimiter
+
+
+def _daily(gap_pct: float, rvol: float = 8.0, price: float = 5.0) -> pd.DataFrame:
+    """60일 일봉 — 마지막 날 시가 갭 gap_pct, 거래량 rvol 배."""
+    n = 60
+    close = np.full(n, price)
+    df = pd.DataFrame({
+        "open": close.copy(), "high": close * 1.2, "low": close * 0.8,
+        "close": close, "volume": np.full(n, 1_000_000.0),
+    }, index=pd.bdate_range("2024-01-01", periods=n))
+    df.iloc[-1, df.columns.get_loc("open")]   = price * (1 + gap_pct / 100)
+    df.iloc[-1, df.columns.get_loc("volume")] = 1_000_000.0 * rvol
+    return df
+
+
+class _Ticker:
+    calls: list = []
+    delay: dict = {}
+    lock = threading.Lock()
+
+    def __init__(self, symbol):
+        self.symbol = symbol
+
+    @property
+    def info(self):
+        with self.lock:
+            self.calls.append(("info", self.symbol))
+        time.sleep(self.delay.get(self.symbol, 0.0))
+        return {"floatShares": 8e6, "shortPercentOfFloat": 0.25, "shortRatio": 6.0}
+
+    @property
+    def news(self):
+        with self.lock:
+            self.calls.append(("news", self.symbol))
+        return [{"title": "FDA approval"}] if self.symbol != "QUIET" else []
+
+
+@pytest.fixture
+def universe(monkeypatch, tmp_path):
+    bars = {"FAST": _daily(40), "SLOW": _daily(60), "QUIET": _daily(25), "FLAT": _daily(1)}
+    _Ticker.calls, _Ticker.delay = [], {"SLOW": 0.6}
+    monkeypatch.setattr(ab, "fetch_bars_many", lambda syms, tf, n: {s: bars[s] for s in syms if s in bars})
+    monkeypatch.setattr(ab, "fetch_bars", lambda sym, tf, n: bars.get(sym))
+    monkeypatch.setattr(sc.yf, "Ticker", _Ticker)
+    store = ref.ReferenceStore(tmp_path / "reference.parquet", fetcher=lambda s: _Ticker(s).info,
+                               limiter=RateLimiter(rate=1000.0, burst=100))
+    monkeypatch.setattr(ref, "_STORE", store)
+    return list(bars)
+
+
+def test_scan_matches_single_symbol_path(universe):
+    got = sc.scan_gap_candidates(universe, use_dynamic=False)
+    assert [c.symbol for c in got] == ["SLOW", "FAST", "QUIET"]
+
+    for c in got:
+        ref = sc._fetch_gap_data(c.symbol)
+        ref.score = sc._score_candidate(ref, sc.DEFAULT_CRITERIA) + (5.0 if ref.has_news else 0.0)
+        assert (c.gap_pct, c.rvol, c.atr, c.float_shares, c.short_pct, c.score) == \
+               (ref.gap_pct, ref.rvol, ref.atr, ref.float_shares, ref.short_pct, min(ref.score, 100.0))
+    assert got[0].squeeze_setup and got[0].catalyst_type == "fda"
+    assert all(c.premarket_price == 5.0 for c in got)     # 당일 봉 최근가 (시가 아님)
+
+
+def test_bar_filter_skips_network_lookups(universe):
+    sc.scan_gap_candidates(universe, use_dynamic=False)
+    assert not [c for c in _Ticker.calls if c[1] == "FLAT"]
+
+
+def test_streams_before_slowest_ticker(universe):
+    t0 = time.perf_counter()
+    it = sc.iter_gap_candidates(universe, use_dynamic=False, max_workers=4)
+    first = next(it)
+    assert first.symbol in ("FAST", "QUIET")
+    assert time.perf_counter() - t0 < 0.4
+    assert {c.symbol for c in it} | {first.symbol} == {"FAST", "SLOW", "QUIET"}
+
+
+def test_rate_limiter_spaces_calls():
+    lim = RateLimiter(rate=50.0, burst=2)
+    t0 = time.perf_counter()
+    threads = [threading.Thread(target=lim.acquire) for _ in range(12)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # 버스트 2 이후 10회는 1/50 초 간격
+    assert time.perf_counter() - t0 >= 10 / 50.0 * 0.9
@@ -47,3 +47,19 @@ def test_short_df_rsi_fallback():
     df  = _make_ohlcv(5)  # too short for RSI
     val = latest_rsi(df)
     assert val == 50.0  # fallback value
+
+
+def test_linreg_series_matches_polyfit():
+    from strategy.signals import _linreg_series
+    rng = np.random.default_rng(0)
+    s   = pd.Series(rng.normal(0, 1, 80).cumsum())
+    s.iloc[[3, 40]] = np.nan
+    out = _linreg_series(s, 14)
+    x   = np.arange(14, dtype=float)
+    for i in range(len(s)):
+        y = s.values[max(0, i - 13): i + 1]
+        if i < 13 or np.isnan(y).any():
+            assert np.isnan(out.iloc[i])
+        else:
+            slope, intercept = np.polyfit(x, y, 1)
+            assert abs(out.iloc[i] - (intercept + slope * 13)) < 1e-9
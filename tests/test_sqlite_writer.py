@@ -0,0 +1,92 @@
+import sqlite3
+import time
+
+import pytest
+
+from storage.db import PositionDB
+from storage.sqlite_writer import SQLiteWriter
+
+
+def _table(path):
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE log (id INTEGER PRIMARY KEY AUTOINCREMENT, v INTEGER)")
+
+
+def _rows(path):
+    with sqlite3.connect(path) as conn:
+        return [r[0] for r in conn.execute("SELECT v FROM log ORDER BY id")]
+
+
+def test_writes_are_group_committed(tmp_path):
+    path = str(tmp_path / "w.db")
+    _table(path)
+    w = SQLiteWriter(flush_ms=200, batch_rows=1000)
+    futs = [w.submit(path, "INSERT INTO log (v) VALUES (?)", (i,)) for i in range(500)]
+    w.flush()
+    assert _rows(path) == list(range(500))
+    assert w.commits <= 3
+    assert [f.result() for f in futs] == list(range(1, 501))   # lastrowid
+    w.close()
+
+
+def test_batch_rows_and_durable_commit_without_waiting_for_timer(tmp_path):
+    path = str(tmp_path / "w.db")
+    _table(path)
+    w = SQLiteWriter(flush_ms=60_000, batch_rows=3)
+    for i in range(3):
+        w.submit(path, "INSERT INTO log (v) VALUES (?)", (i,))
+    w.submit(path, "INSERT INTO log (v) VALUES (?)", (3,), durable=True).result(timeout=2)
+    assert _rows(path) == [0, 1, 2, 3]
+    w.close()
+
+
+def test_failed_statement_does_not_block_others(tmp_path):
+    path = str(tmp_path / "w.db")
+    _table(path)
+    w = SQLiteWriter(flush_ms=5)
+    bad = w.submit(path, "INSERT INTO missing (v) VALUES (?)", (1,))
+    ok  = w.submit(path, "INSERT INTO log (v) VALUES (?)", (2,))
+    assert ok.result(timeout=2) == 1
+    assert bad.exception(timeout=2) is not None
+    w.close()
+
+
+def test_position_db_reads_see_queued_writes(tmp_path):
+    w  = SQLiteWriter(flush_ms=60_000)
+    db = PositionDB(str(tmp_path / "trade.db"), writer=w)
+    t0 = time.monotonic()
+    db.open_position("NVDA", "squeeze", 100.0, 10)
+    for px in (101.0, 102.0, 103.0):
+        db.update_peak("NVDA", px)
+    db.record_trade("NVDA", "buy", 10, 100.0, "squeeze", "entry")
+    assert time.monotonic() - t0 < 0.5           # 호출부는 커밋을 기다리지 않음
+    assert db.get_open_position("NVDA")["peak_price"] == 103.0
+    assert len(db.get_trades("NVDA")) == 1
+    w.close()
+
+
+def test_position_db_durable_writes_wait_for_commit(tmp_path):
+    path = str(tmp_path / "trade.db")
+    w  = SQLiteWriter(flush_ms=60_000)
+    db = PositionDB(path, writer=w)
+    db.update_peak("NVDA", 1.0)                  # 비-durable: 큐에만 쌓임
+    db.open_position("NVDA", "squeeze", 100.0, 10)
+    with sqlite3.connect(path) as conn:          # flush 없이 다른 연결에서 보임
+        assert conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0] == 1
+
+    w.close()
+    with pytest.raises(RuntimeError):            # writer 실패는 호출부로 전파
+        db.close_position("NVDA")
+
+
+def test_position_db_close_commits_queued_writes(tmp_path):
+    path = str(tmp_path / "trade.db")
+    w  = SQLiteWriter(flush_ms=60_000)
+    db = PositionDB(path, writer=w)
+    db.record_trade("NVDA", "buy", 10, 100.0, "squeeze", "entry")
+    db.close()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0] == 1
+    with pytest.raises(sqlite3.ProgrammingError):
+        db.get_trades()
+    w.close()
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.run import bucket_cfg
+from backtest.sweep import apply_params, check_grid, expand_grid, pack_bars, parse_grid, run_combo, sweep, unpack_bars
+
+
+def _bars(seed, n=300):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-03-04 14:30", periods=n, freq="5min", tz="UTC")
+    close = 10 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, n)))
+    vol = rng.integers(1_000, 5_000, n).astype(float) * np.where(rng.random(n) < 0.15, 5, 1)
+    return pd.DataFrame({"open": close, "high": close * 1.01, "low": close * 0.99,
+                         "close": close, "volume": vol}, index=idx)
+
+
+_CFG = {
+    "risk": {"stop_loss_pct": 0.03, "take_profit_pct": 0.04, "trailing_stop_pct": 0.01,
+             "trail_after_profit_pct": 0.04, "rsi_overbought_exit": 80.0},
+    "squeeze": {"scalp_sl_pct": 0.03, "scalp_tp_pct": 0.04, "atr_multiplier": 2.0},
+    "momentum_rules": {"lookback_minutes": 30, "min_intraday_change_pct": 1.5,
+                       "vol_spike_ratio": 1.5, "min_price_usd": 3.0, "rsi_entry_max": 80.0},
+}
+
+
+def test_parse_and_expand_grid():
+    grid = parse_grid(["risk.stop_loss_pct=0.03,0.05", "momentum_rules.require_macd_positive=true,false"])
+    assert grid == {"risk.stop_loss_pct": [0.03, 0.05],
+                    "momentum_rules.require_macd_positive": [True, False]}
+    combos = expand_grid(grid)
+    assert len(combos) == 4
+    assert combos[0] == {"momentum_rules.require_macd_positive": True, "risk.stop_loss_pct": 0.03}
+    with pytest.raises(ValueError):
+        parse_grid(["stop_loss_pct=0.1"])
+
+
+def test_squeeze_keys_override_risk_and_unread_keys_rejected():
+    _, risk = bucket_cfg(_CFG, "squeeze")
+    assert (risk["stop_loss_pct"], risk["take_profit_pct"], risk["atr_multiplier"]) == (0.03, 0.04, 2.0)
+    _, risk = bucket_cfg(apply_params(_CFG, {"risk.stop_loss_pct": 0.5}), "squeeze")
+    assert risk["stop_loss_pct"] == 0.03
+
+    check_grid({"squeeze.scalp_sl_pct": [0.02], "risk.trailing_stop_pct": [0.01]}, "squeeze")
+    check_grid({"fills.min_spread_bps": [5]}, "squeeze", fills=True)
+    for key, bucket in [("risk.stop_loss_pct", "squeeze"), ("momentum_rules.vol_spike_ratio", "etf_swing"),
+                        ("squeeze.scalp_sl_pct", "value_long"), ("fills.min_spread_bps", "squeeze")]:
+        with pytest.raises(ValueError, match=key):
+            check_grid({key: [1]}, bucket)
+    with pytest.raises(ValueError):
+        sweep({"S0": _bars(0, 50)}, [{"risk.take_profit_pct": 0.1}], _CFG, "squeeze", workers=1)
+
+
+def test_apply_params_copies():
+    out = apply_params(_CFG, {"risk.stop_loss_pct": 0.1, "squeeze.scalp_tp_pct": 0.3})
+    assert out["risk"]["stop_loss_pct"] == 0.1 and out["squeeze"]["scalp_tp_pct"] == 0.3
+    assert _CFG["risk"]["stop_loss_pct"] == 0.03
+
+
+def test_shared_memory_roundtrip():
+    dfs = {"A": _bars(1, 50), "B": _bars(2, 70)}
+    dfs["B"].index = dfs["B"].index.tz_convert("America/New_York")
+    shm, layout, total = pack_bars(dfs)
+    try:
+        back = unpack_bars(shm, layout, total)
+        for sym, df in dfs.items():
+            pd.testing.assert_frame_equal(back[sym], df, check_freq=False, check_index_type=False)
+            assert str(back[sym].index.tz) == str(df.index.tz)
+        del back
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def test_pool_matches_serial():
+    dfs = {f"S{i}": _bars(i) for i in range(3)}
+    combos = expand_grid({"squeeze.scalp_sl_pct": [0.02, 0.04], "momentum_rules.vol_spike_ratio": [1.2, 2.0]})
+    serial = sweep(dfs, combos, _CFG, "squeeze", workers=1)
+    pooled = sweep(dfs, combos, _CFG, "squeeze", workers=2)
+    pd.testing.assert_frame_equal(serial, pooled)
+    assert list(serial.columns[:2]) == ["momentum_rules.vol_spike_ratio", "squeeze.scalp_sl_pct"]
+    assert {"trades", "sharpe", "profit_factor", "max_drawdown_pct"} <= set(serial.columns)
+    assert serial["trades"].sum() > 0
+    assert serial.iloc[0].to_dict() == run_combo(combos[0], dfs, _CFG, {"bucket": "squeeze", "cash": 14_800.0})
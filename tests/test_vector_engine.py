@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backtest.engine import run_backtest
+from backtest.vector_engine import run_backtest_vectorized
+
+_RISK = {
+    "stop_loss_pct": 0.03, "take_profit_pct": 0.04, "trailing_stop_pct": 0.01,
+    "trail_after_profit_pct": 0.04, "rsi_overbought_exit": 80.0,
+    "eod_exit_minutes_before_close": 15, "atr_multiplier": 2.0, "per_trade_risk_pct": 0.01,
+}
+_MOM = {
+    "lookback_minutes": 30, "min_intraday_change_pct": 1.5, "vol_spike_ratio": 1.5,
+    "min_price_usd": 3.0, "rsi_entry_max": 80.0, "require_macd_positive": True,
+}
+
+
+def _session_bars(seed, days=3, drop=0.0):
+    """정규장 5분봉 랜덤워크 — 간헐적 급등·거래량 스파이크 포함."""
+    rng = np.random.default_rng(seed)
+    idx = pd.DatetimeIndex([])
+    for d in pd.bdate_range("2024-03-04", periods=days):
+        idx = idx.append(pd.date_range(d + pd.Timedelta(hours=14, minutes=30),
+                                       d + pd.Timedelta(hours=20, minutes=55), freq="5min", tz="UTC"))
+    n = len(idx)
+    close = 10 * np.exp(np.cumsum(rng.normal(0.0004, 0.008, n) + np.where(rng.random(n) < 0.02, 0.04, 0)))
+    volume = rng.integers(1_000, 5_000, n).astype(float) * np.where(rng.random(n) < 0.15, 5, 1)
+    df = pd.DataFrame({"open": close, "high": close * 1.01, "low": close * 0.99,
+                       "close": close, "volume": volume}, index=idx)
+    return df[rng.random(n) >= drop] if drop else df
+
+
+def _key(t):
+    return (t.symbol, t.entry_ts, t.exit_ts, t.entry_price, t.exit_price, t.qty, t.exit_reason)
+
+
+@pytest.mark.parametrize("max_positions", [1, 3])
+def test_vectorized_reproduces_loop_engine(max_positions):
+    dfs = {f"S{i}": _session_bars(i, drop=0.1 * (i % 2)) for i in range(4)}
+    dfs["NONE"] = None
+    kw = dict(initial_cash=20_000.0, max_positions=max_positions)
+
+    loop = run_backtest(dfs, _MOM, _RISK, **kw)
+    vec  = run_backtest_vectorized(dfs, _MOM, _RISK, **kw)
+
+    assert len(loop["trades"]) > 5
+    assert len({t.exit_reason for t in loop["trades"]}) >= 3
+    assert [_key(t) for t in vec["trades"]] == [_key(t) for t in loop["trades"]]
+    pd.testing.assert_series_equal(vec["equity_curve"], loop["equity_curve"])
+    for k in ("total_pnl", "win_rate", "max_drawdown_pct", "sharpe_approx"):
+        assert vec[k] == loop[k]
+
+
+def test_vectorized_daily_bars_without_timezone():
+    idx = pd.bdate_range("2023-01-02", periods=160)
+    dfs = {}
+    for i in range(3):
+        df = _session_bars(10 + i, days=3).iloc[:160].copy()
+        df.index = idx
+        dfs[f"D{i}"] = df
+    loop = run_backtest(dfs, _MOM, _RISK, initial_cash=10_000.0)
+    vec  = run_backtest_vectorized(dfs, _MOM, _RISK, initial_cash=10_000.0)
+    assert [_key(t) for t in vec["trades"]] == [_key(t) for t in loop["trades"]]
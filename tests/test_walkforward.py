@@ -0,0 +1,88 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import backtest.walkforward as wf
+from backtest.walkforward import make_folds, pick_best, stitch_equity, walk_forward
+
+
+def _bars(seed, days=30):
+    rng = np.random.default_rng(seed)
+    idx = pd.date_range("2024-03-04", periods=days * 24, freq="1h", tz="UTC")
+    n = len(idx)
+    close = 10 * np.exp(np.cumsum(rng.normal(0.0005, 0.01, n)))
+    vol = rng.integers(1_000, 5_000, n).astype(float) * np.where(rng.random(n) < 0.15, 5, 1)
+    return pd.DataFrame({"open": close, "high": close * 1.01, "low": close * 0.99,
+                         "close": close, "volume": vol}, index=idx)
+
+
+_CFG = {
+    "risk": {"stop_loss_pct": 0.03, "take_profit_pct": 0.04, "trailing_stop_pct": 0.01,
+             "trail_after_profit_pct": 0.04, "rsi_overbought_exit": 80.0},
+    "squeeze": {"scalp_sl_pct": 0.03, "scalp_tp_pct": 0.04, "atr_multiplier": 2.0},
+    "momentum_rules": {"lookback_minutes": 30, "min_intraday_change_pct": 1.5,
+                       "vol_spike_ratio": 1.5, "min_price_usd": 3.0, "rsi_entry_max": 80.0},
+}
+_COMBOS = [{"squeeze.scalp_sl_pct": sl, "momentum_rules.vol_spike_ratio": v}
+           for sl in (0.02, 0.04) for v in (1.2, 2.0)]
+
+
+def test_folds_on_fixed_grid():
+    start, end = pd.Timestamp("2024-03-04 14:30", tz="UTC"), pd.Timestamp("2024-04-02", tz="UTC")
+    folds = make_folds(start, end, train_days=6, test_days=3)
+    assert folds[0].train_start >= start.normalize()
+    assert all(f.test_start - f.train_start == pd.Timedelta(days=6) for f in folds)
+    assert all(a.test_end == b.test_start for a, b in zip(folds, folds[1:]))
+    assert folds[-1].test_end <= end
+    # 기간을 늘려도 기존 폴드 경계는 그대로
+    longer = make_folds(start, end + pd.Timedelta(days=9), 6, 3)
+    assert longer[: len(folds)] == folds and len(longer) == len(folds) + 3
+
+
+def test_pick_best_prefers_min_trades():
+    rows = [{"sharpe": 3.0, "trades": 1}, {"sharpe": 1.0, "trades": 9},
+            {"sharpe": 2.0, "trades": 9}, {"sharpe": 2.0, "trades": 9}]
+    assert pick_best(rows, "sharpe", min_trades=5) == 2
+    assert pick_best(rows, "sharpe", min_trades=0) == 0
+
+
+def test_stitch_compounds():
+    idx = pd.date_range("2024-01-01", periods=4, freq="D", tz="UTC")
+    a = pd.Series([100.0, 110.0], index=idx[:2])
+    b = pd.Series([100.0, 90.0], index=idx[2:])
+    out = stitch_equity([a, pd.Series(dtype=float), b], cash=100.0)
+    assert out.tolist() == pytest.approx([100.0, 110.0, 110.0, 99.0])
+
+
+def test_cache_pool_and_extension(tmp_path):
+    full = {f"S{i}": _bars(i) for i in range(3)}
+    short = {s: df[df.index < pd.Timestamp("2024-03-25", tz="UTC")] for s, df in full.items()}
+    kw = dict(base_cfg=_CFG, bucket="squeeze", train_days=6, test_days=3,
+              min_trades=1, warmup=50, cache_dir=str(tmp_path))
+
+    first = walk_forward(short, _COMBOS, workers=2, **kw)
+    assert first["cached"] == 0 and first["computed"] == len(first["folds"]) > 1
+    assert first["folds"]["test_trades"].sum() > 0
+
+    serial = walk_forward(short, _COMBOS, workers=1, **{**kw, "cache_dir": str(tmp_path / "s")})
+    pd.testing.assert_frame_equal(first["folds"], serial["folds"])
+    pd.testing.assert_series_equal(first["equity_curve"], serial["equity_curve"])
+
+    again = walk_forward(full, _COMBOS, workers=1, **kw)
+    n_old = len(first["folds"])
+    assert again["cached"] == n_old and again["computed"] == len(again["folds"]) - n_old > 0
+    pd.testing.assert_frame_equal(again["folds"].iloc[:n_old], first["folds"])
+    assert again["oos"]["folds"] == len(again["folds"])
+
+
+def test_engine_change_invalidates_cache(tmp_path, monkeypatch):
+    dfs = {f"S{i}": _bars(i) for i in range(2)}
+    dfs = {s: df[df.index < pd.Timestamp("2024-03-25", tz="UTC")] for s, df in dfs.items()}
+    kw = dict(base_cfg=_CFG, bucket="squeeze", train_days=6, test_days=3,
+              min_trades=1, warmup=50, cache_dir=str(tmp_path), workers=1)
+
+    first = walk_forward(dfs, _COMBOS, **kw)
+    assert walk_forward(dfs, _COMBOS, **kw)["computed"] == 0
+    monkeypatch.setattr(wf, "engine_hash", lambda: "changed")
+    again = walk_forward(dfs, _COMBOS, **kw)
+    assert again["cached"] == 0 and again["computed"] == first["computed"]
@@ -0,0 +1,132 @@
+# trader/fill_model.py
+"""
+체결 모델 — 백테스트 엔진 · PaperSimBroker 공용.
+
+실주문과 같은 의미로 체결을 흉내낸다.
+  - 시장가:      매수는 ask, 매도는 bid 에서 시작해 충격 비용만큼 불리하게 체결
+  - 지정가:      도달 호가가 지정가 이내면 즉시 체결 (지정가를 넘는 충격 구간은 미체결 → 부분 체결)
+  - IOC:         즉시 체결분 외 잔량 취소
+  - DAY 지정가:  봉 안에서 지정가를 관통(매수 저가 < 지정가)하면 지정가로 체결
+  - 참여율 상한: 봉 거래량 × participation 을 넘는 수량은 체결 불가 (부분 체결)
+
+스프레드는 호가가 있으면 (ask - bid) / mid, 봉만 있으면 max(하한 bps, 고저폭 × range_spread) 로 추정.
+충격 비용 = 스프레드 × impact × √(체결량 / 봉 거래량) — 얇은 종목·큰 주문일수록 크게.
+
+모든 계산은 numpy 배열 단위 (종목 전체 봉을 한 번에 평가 가능).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class FillModel:
+    min_spread_bps:       float = 10.0    # 스프레드 하한 (bid-ask 폭, bps)
+    range_spread:         float = 0.1     # 봉 고저폭 중 스프레드로 보는 비율
+    impact:               float = 1.0     # 충격 계수 (스프레드 배수, 참여율 100% 기준)
+    participation:        float = 0.1     # 봉 거래량 대비 최대 체결 비율
+    entry_limit_pct:      float = 0.002   # 진입 IOC 지정가 = ask × (1 + 이 값) — Orchestrator 와 동일
+    commission_per_share: float = 0.0     # Alpaca 무료 티어
+
+    @classmethod
+    def from_cfg(cls, cfg: Optional[dict]) -> "FillModel":
+        """config.yaml fills 섹션 → FillModel (없는 키는 기본값)."""
+        names = {f.name for f in fields(cls)}
+        return cls(**{k: float(v) for k, v in (cfg or {}).items() if k in names})
+
+    # ── 봉 기준 ───────────────────────────────────────────────────────
+
+    def spread(self, open_, high, low) -> np.ndarray:
+        """봉 스프레드 추정 (시가 대비 비율)."""
+        o = np.asarray(open_, dtype=float)
+        rng = (np.asarray(high, dtype=float) - np.asarray(low, dtype=float)) / np.where(o > 0, o, np.nan)
+        return np.maximum(self.min_spread_bps / 10_000.0, self.range_spread * rng)
+
+    def touch(self, side: str, open_, high, low) -> np.ndarray:
+        """봉 시가 시점 최우선 호가 — 매수 ask, 매도 bid."""
+        sgn = 1.0 if side == "buy" else -1.0
+        return np.asarray(open_, dtype=float) * (1.0 + sgn * self.spread(open_, high, low) / 2.0)
+
+    def fill_bars(
+        self, side: str, qty, open_, high, low, volume,
+        limit=None, ioc: bool = False,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        봉 시가에 도착한 주문의 해당 봉 체결 (배열 브로드캐스트).
+
+        Args:
+            side:   "buy" | "sell"
+            qty:    주문 수량
+            limit:  지정가 (None/NaN = 시장가)
+            ioc:    True 면 즉시 체결분 외 취소, False(DAY) 면 봉 중 지정가 관통 시 체결
+
+        Returns:
+            (체결 수량 int64, 체결가 — 미체결 NaN)
+        """
+        o, h, l, v = (np.asarray(x, dtype=float) for x in (open_, high, low, volume))
+        spread = self.spread(o, h, l)
+        touch  = self.touch(side, o, h, l)
+        lim    = np.full(np.shape(touch), np.nan) if limit is None else np.asarray(limit, dtype=float)
+        return self._execute(side, np.asarray(qty, dtype=float), touch, spread, v,
+                             np.floor(self.participation * v), h, l, lim, ioc)
+
+    def entry_order(self, qty, open_, high, low, volume) -> Tuple[np.ndarray, np.ndarray]:
+        """실전 진입 주문 — ask × (1 + entry_limit_pct) IOC 지정가 매수."""
+        limit = self.touch("buy", open_, high, low) * (1.0 + self.entry_limit_pct)
+        return self.fill_bars("buy", qty, open_, high, low, volume, limit=limit, ioc=True)
+
+    def exit_order(self, qty, open_, high, low, volume) -> Tuple[np.ndarray, np.ndarray]:
+        """청산 주문 — 시장성 매도 (미체결 잔량은 다음 봉에 재주문)."""
+        return self.fill_bars("sell", qty, open_, high, low, volume)
+
+    # ── 호가 기준 (Paper) ─────────────────────────────────────────────
+
+    def fill_quote(
+        self, side: str, qty: int, bid: float, ask: float,
+        limit: Optional[float] = None, ioc: bool = False, volume: Optional[float] = None,
+    ) -> Tuple[int, float]:
+        """
+        현재 호가에 즉시 체결 — (체결 수량, 체결가 — 미체결 NaN).
+
+        호가창이 없으므로 비시장성 지정가는 tif 와 무관하게 미체결.
+        volume 미지정 시 참여율 상한 · 충격 비용 없음 (스프레드만 반영).
+        """
+        mid    = (bid + ask) / 2.0
+        spread = np.asarray((ask - bid) / mid if mid > 0 else 0.0)
+        touch  = np.asarray(ask if side == "buy" else bid, dtype=float)
+        v      = np.asarray(np.inf if volume is None else float(volume))
+        cap    = np.inf if volume is None else np.floor(self.participation * float(volume))
+        lim    = np.asarray(np.nan if limit is None else float(limit))
+        n, px = self._execute(side, np.asarray(float(qty)), touch, spread, v, np.asarray(cap),
+                              np.asarray(np.inf), np.asarray(-np.inf), lim, True)
+        return int(n), float(px)
+
+    # ── 공통 ─────────────────────────────────────────────────────────
+
+    def _execute(self, side, qty, touch, spread, volume, cap, high, low, limit, ioc):
+        sgn  = 1.0 if side == "buy" else -1.0
+        want = np.minimum(qty, cap)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # 지정가 여유 (호가 대비) — 시장가는 NaN, 음수면 비시장성
+            room = sgn * (limit / touch - 1.0)
+            k    = room / (spread * self.impact)
+            # 충격 비용이 지정가 여유 안에 드는 최대 수량: spread·impact·√(n/v) ≤ room
+            by_price = np.where(np.isfinite(volume), np.floor(volume * k * k), np.inf)
+            n = np.where(np.isnan(room), want, np.where(room >= 0, np.minimum(want, by_price), 0.0))
+            slip = np.where(np.isfinite(volume), spread * self.impact * np.sqrt(n / volume), 0.0)
+            px = touch * (1.0 + sgn * slip)
+        # 봉 범위 · 지정가 밖 체결 불가
+        if sgn > 0:
+            px = np.minimum(px, high)
+            px = np.where(np.isnan(limit), px, np.minimum(px, limit))
+            rest = (not ioc) & (room < 0) & (low < limit)
+        else:
+            px = np.maximum(px, low)
+            px = np.where(np.isnan(limit), px, np.maximum(px, limit))
+            rest = (not ioc) & (room < 0) & (high > limit)
+        n  = np.where(rest, want, n)
+        px = np.where(rest, limit, px)
+        return n.astype(np.int64), np.where(n > 0, px, np.nan)
@@ -1,18 +1,42 @@
+from typing import Optional
+
+from trader.fill_model import FillModel
+
+
 class PaperSimBroker:
+    """
+    실주문 없는 시뮬 브로커 — 체결은 trader.fill_model (백테스트와 같은 규칙).
+
+    호가(set_quote)가 없으면 최근가 ± 스프레드 하한/2 로 bid/ask 를 잡는다.
+    지정가는 즉시 체결 가능한 만큼만 체결 (IOC · DAY 모두 — 대기 주문 없음).
+    """
+
     def __init__(
         self,
         cash: float = 100_000.0,
-        commission_per_share: float = 0.0,   # Alpaca 무료 티어
-        slippage_bps: float = 5.0,           # 5 basis points 시장 충격
+        fill_model: Optional[FillModel] = None,
     ):
         self.cash       = float(cash)
         self.positions: dict = {}
         self.last:      dict = {}
-        self._commission = float(commission_per_share)
-        self._slip_bps   = float(slippage_bps)
+        self.quotes:    dict = {}     # {symbol: (bid, ask, volume)}
+        self.fills      = fill_model or FillModel()
 
     def set_price(self, symbol: str, price: float) -> None:
         self.last[symbol] = float(price)
+        self.quotes.pop(symbol, None)
+
+    def set_quote(self, symbol: str, bid: float, ask: float, volume: Optional[float] = None) -> None:
+        """호가 · (선택) 최근 봉 거래량 — 거래량을 주면 참여율 상한 · 충격 비용 반영."""
+        self.quotes[symbol] = (float(bid), float(ask), volume)
+        self.last[symbol]   = (float(bid) + float(ask)) / 2.0
+
+    def _quote(self, symbol: str):
+        if symbol in self.quotes:
+            return self.quotes[symbol]
+        last = self.last.get(symbol, 0.0)
+        half = last * self.fills.min_spread_bps / 20_000.0
+        return last - half, last + half, None
 
     def get_account(self) -> dict:
         pv = sum(
@@ -24,31 +48,52 @@ class PaperSimBroker:
     def list_positions(self) -> dict:
         return {k: v for k, v in self.positions.items() if v > 0}
 
-    def submit_market_order(self, symbol: str, qty: int, side: str) -> dict:
-        raw_price = self.last.get(symbol, 0.0)
-        if raw_price <= 0:
+    def submit_order(
+        self,
+        symbol: str,
+        qty:    int,
+        side:   str,
+        type:   str = "market",
+        price:  Optional[float] = None,
+        tif:    str = "DAY",
+        **kwargs,
+    ) -> dict:
+        """지정가/시장가 주문 (Alpaca · Toss submit_order 와 동일 시그니처)."""
+        bid, ask, volume = self._quote(symbol)
+        if bid <= 0 or ask <= 0:
             return {"ok": False, "reason": "no price"}
 
-        slip = self._slip_bps / 10_000.0
-        fill_price = raw_price * (1.0 + slip) if side == "buy" else raw_price * (1.0 - slip)
-        commission = self._commission * qty
+        side = side.lower()
+        if side == "sell":
+            qty = min(int(qty), self.positions.get(symbol, 0))
+            if qty <= 0:
+                return {"ok": False, "reason": "no position"}
+        limit = float(price) if type.lower() == "limit" and price else None
+        filled, fill_price = self.fills.fill_quote(
+            side, qty, bid, ask, limit=limit, ioc=tif.upper() == "IOC", volume=volume,
+        )
+        if filled <= 0:
+            return {"ok": False, "reason": "not marketable" if limit else "no liquidity",
+                    "symbol": symbol, "qty": 0, "side": side}
 
+        commission = self.fills.commission_per_share * filled
         if side == "buy":
-            cost = fill_price * qty + commission
-            if cost > self.cash:
+            if fill_price * filled + commission > self.cash:
                 return {"ok": False, "reason": "insufficient cash"}
-            self.cash -= cost
-            self.positions[symbol] = self.positions.get(symbol, 0) + qty
+            self.cash -= fill_price * filled + commission
+            self.positions[symbol] = self.positions.get(symbol, 0) + filled
         else:
-            owned    = self.positions.get(symbol, 0)
-            sell_qty = min(qty, owned)
-            self.positions[symbol] = owned - sell_qty
-            self.cash += fill_price * sell_qty - commission
+            self.positions[symbol] -= filled
+            self.cash += fill_price * filled - commission
 
         return {
-            "ok":    True,
+            "ok":     True,
             "symbol": symbol,
-            "qty":   qty,
-            "side":  side,
-            "price": fill_price,
+            "qty":    filled,
+            "side":   side,
+            "price":  fill_price,
+            "status": "filled" if filled == qty else "partially_filled",
         }
+
+    def submit_market_order(self, symbol: str, qty: int, side: str) -> dict:
+        return self.submit_order(symbol, qty, side, type="market")